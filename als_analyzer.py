@@ -0,0 +1,275 @@
+# als_analyzer.py
+import gzip
+import json
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from git_objects import CatFileBatch, git_dir, lfs_object_path, parse_lfs_pointer
+from metadata_store import cache_dir
+from snapshot_export import atomic_write_json
+
+
+ALS_SUMMARY_DIR = "als_summaries"
+ALS_SUMMARY_VERSION = 2          # bump when the summary format changes to re-parse old entries
+ALS_POLL_INTERVAL_MS = 300
+
+TRACK_KINDS = {"AudioTrack": "audio", "MidiTrack": "midi", "GroupTrack": "group"}
+MAIN_TRACK_TAGS = {"MasterTrack", "MainTrack"}             # Live 12 renamed the master track
+PLUGIN_DEVICE_TAGS = {"PluginDevice", "AuPluginDevice"}
+PLUGIN_INFO_TAGS = {"VstPluginInfo", "Vst3PluginInfo", "AuPluginInfo"}
+PLUGIN_NAME_TAGS = {"PlugName", "Name"}                     # VST2 uses PlugName, VST3/AU use Name
+CLIP_TAGS = {"AudioClip", "MidiClip"}
+
+
+def summarize_als(fileobj):
+    """
+    🎛️ Streams an Ableton Live set (gzipped as Live saves it, or plain XML as
+    stored by the `.als` filter) and returns a summary dict:
+    tempo, time_signature, tracks {audio, midi, group}, returns, devices,
+    plugins, samples and a per-track `track_list` (name, devices, clips,
+    samples) used for diffs.
+
+    Uses gunzip + `iterparse` and drops every element as soon as it closes,
+    so memory stays flat however big the set is.
+    """
+    tempo = None
+    numerator = denominator = None
+    tracks = {"audio": 0, "midi": 0, "group": 0}
+    returns = 0
+    devices, plugins, samples = set(), set(), set()
+    track_list = []
+
+    stack = []          # open elements (tags only matter, children are dropped on close)
+    in_master = False
+    track = None        # track currently open, and its depth in `stack`
+    track_depth = None
+    clip = None
+    clip_depth = None
+    sample_ref_depth = None
+    sample_rel = sample_abs = sample_name = None
+
+    head = fileobj.read(2)
+    stream = _Prefixed(head, fileobj)
+    with (gzip.GzipFile(fileobj=stream) if head == b"\x1f\x8b" else nullcontext(stream)) as xml:
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                parent = stack[-1].tag if stack else None
+                value = elem.get("Value")
+
+                if parent == "Tracks" and (tag in TRACK_KINDS or tag == "ReturnTrack"):
+                    if tag == "ReturnTrack":
+                        returns += 1
+                    else:
+                        tracks[TRACK_KINDS[tag]] += 1
+                    track = {
+                        "id": elem.get("Id"), "kind": TRACK_KINDS.get(tag, "return"), "name": None,
+                        "devices": [], "clips": [], "samples": [],
+                    }
+                    track_depth = len(stack)
+                elif tag in MAIN_TRACK_TAGS:
+                    in_master = True
+                elif track is not None and parent == "Name" and len(stack) == track_depth + 2 and value:
+                    if tag == "UserName" or (tag == "EffectiveName" and not track["name"]):
+                        track["name"] = value
+                elif parent == "Devices":
+                    if tag not in PLUGIN_DEVICE_TAGS:
+                        devices.add(tag)
+                        if track is not None:
+                            track["devices"].append(tag)
+                elif parent in PLUGIN_INFO_TAGS and tag in PLUGIN_NAME_TAGS and value:
+                    plugins.add(value)
+                    if track is not None:
+                        track["devices"].append(value)
+                elif tag in CLIP_TAGS and track is not None and clip is None:
+                    clip = {"name": "", "time": elem.get("Time")}
+                    clip_depth = len(stack)
+                elif clip is not None and tag == "Name" and len(stack) == clip_depth + 1 and value:
+                    clip["name"] = value
+                elif tag == "SampleRef":
+                    sample_ref_depth = len(stack)
+                    sample_rel = sample_abs = sample_name = None
+                elif sample_ref_depth is not None and parent == "FileRef" and value:
+                    if tag == "RelativePath":
+                        sample_rel = value
+                    elif tag == "Path":
+                        sample_abs = value
+                    elif tag == "Name":
+                        sample_name = value   # Live 10 and older: no flat path attribute
+                elif in_master and tempo is None and tag == "Manual" and parent == "Tempo" and value:
+                    tempo = float(value)
+                elif numerator is None and tag == "Numerator" and parent == "RemoteableTimeSignature":
+                    numerator = value
+                elif denominator is None and tag == "Denominator" and parent == "RemoteableTimeSignature":
+                    denominator = value
+
+                stack.append(elem)
+                continue
+
+            # event == "end"
+            stack.pop()
+            if tag in MAIN_TRACK_TAGS:
+                in_master = False
+            elif tag == "SampleRef" and sample_ref_depth == len(stack):
+                sample = sample_rel or sample_abs or sample_name
+                if sample:
+                    sample = sample.replace("\\", "/")
+                    samples.add(sample)
+                    if track is not None and sample not in track["samples"]:
+                        track["samples"].append(sample)
+                sample_ref_depth = None
+            elif clip is not None and clip_depth == len(stack):
+                label = clip["name"] or tag
+                track["clips"].append(f"{label} @ {clip['time']}" if clip["time"] else label)
+                clip = None
+            elif track is not None and track_depth == len(stack):
+                track_list.append(track)
+                track = None
+            if stack:
+                stack[-1].remove(elem)   # each parent holds at most one child at a time
+            elem.clear()
+
+    return {
+        "version": ALS_SUMMARY_VERSION,
+        "tempo": tempo,
+        "time_signature": f"{numerator}/{denominator}" if numerator and denominator else None,
+        "tracks": tracks,
+        "track_count": sum(tracks.values()),
+        "returns": returns,
+        "devices": sorted(devices),
+        "plugins": sorted(plugins),
+        "samples": sorted(samples),
+        "track_list": track_list,
+    }
+
+
+def format_summary_tooltip(summary):
+    """Multi-line tooltip text for the history table."""
+    if not summary or summary.get("error"):
+        return ""
+    tracks = summary["tracks"]
+    lines = [
+        f"Tempo: {summary['tempo']:g} BPM" if summary.get("tempo") else "Tempo: –",
+        f"Time signature: {summary.get('time_signature') or '–'}",
+        f"Tracks: {tracks['audio']} audio, {tracks['midi']} MIDI, {tracks['group']} group, "
+        f"{summary['returns']} returns",
+    ]
+    if summary["plugins"]:
+        lines.append("Plugins: " + ", ".join(summary["plugins"]))
+    if summary["devices"]:
+        lines.append("Devices: " + ", ".join(summary["devices"]))
+    if summary["samples"]:
+        shown = summary["samples"][:15]
+        more = len(summary["samples"]) - len(shown)
+        lines.append("Samples:\n  " + "\n  ".join(shown) + (f"\n  … +{more} more" if more else ""))
+    return "\n".join(lines)
+
+
+class AlsAnalyzer:
+    """
+    📇 Summaries of `.als` revisions, cached per blob SHA.
+
+    Each summary is stored once as `.dawgit_cache/als_summaries/<blob>.json`
+    and kept in memory, so every distinct revision is parsed exactly once no
+    matter how many commits share it.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self.dir = cache_dir(self.project_path) / ALS_SUMMARY_DIR
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._memory = {}
+        self._pool = None
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def cached(self, blob_sha):
+        if blob_sha in self._memory:
+            return self._memory[blob_sha]
+        path = self.dir / f"{blob_sha}.json"
+        if path.exists():
+            try:
+                summary = json.loads(path.read_text())
+                if summary.get("version") == ALS_SUMMARY_VERSION:
+                    self._memory[blob_sha] = summary
+                    return summary
+            except Exception as e:
+                print(f"[WARN] Ignoring unreadable ALS summary {path.name}: {e}")
+        return None
+
+    def summaries(self, blob_shas, parse=True):
+        """
+        {blob_sha: summary or None}; uncached blobs are streamed out of one
+        `cat-file --batch`, or left as None with `parse=False`.
+        """
+        result = {}
+        missing = []
+        for sha in dict.fromkeys(blob_shas):
+            summary = self.cached(sha)
+            if summary is None:
+                missing.append(sha)
+            result[sha] = summary
+
+        if missing and parse:
+            with CatFileBatch(self.project_path) as batch:
+                for sha in missing:
+                    result[sha] = self._parse_blob(batch, sha)
+        return result
+
+    def summaries_async(self, blob_shas):
+        """Parses `blob_shas` on a worker thread; the future resolves to `summaries(blob_shas)`."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dawgit-als")
+        return self._pool.submit(self.summaries, list(blob_shas))
+
+    def _parse_blob(self, batch, blob_sha):
+        obj_type, reader = batch.open(blob_sha)
+        if reader is None:
+            return None
+        try:
+            head = reader.read(len(b"version https://git-lfs"))
+            if head.startswith(b"version "):
+                # LFS pointer — parse the real file from the local LFS store
+                pointer = parse_lfs_pointer(head + reader.read())
+                local = lfs_object_path(git_dir(self.project_path), pointer[0]) if pointer else None
+                if not local or not local.exists():
+                    return None  # not fetched yet — try again once it is
+                with open(local, "rb") as f:
+                    summary = summarize_als(f)
+            else:
+                summary = summarize_als(_Prefixed(head, reader))
+        except (OSError, EOFError, ET.ParseError, ValueError) as e:
+            # Cached too, so a broken revision is not re-read on every refresh.
+            # The rest of the blob is drained by the next `batch.open()`.
+            print(f"[WARN] Could not analyze ALS blob {blob_sha[:7]}: {e}")
+            summary = {"version": ALS_SUMMARY_VERSION, "error": str(e)}
+
+        atomic_write_json(self.dir / f"{blob_sha}.json", summary)
+        self._memory[blob_sha] = summary
+        if "error" not in summary:
+            print(f"[DEBUG] Analyzed ALS blob {blob_sha[:7]}: {summary['track_count']} tracks")
+        return summary
+
+
+class _Prefixed:
+    """File-like that replays bytes already read before continuing with `reader`."""
+
+    def __init__(self, prefix, reader):
+        self._prefix = prefix
+        self._reader = reader
+
+    def read(self, n=-1):
+        if self._prefix:
+            if n is None or n < 0:
+                data, self._prefix = self._prefix + self._reader.read(), b""
+                return data
+            data, self._prefix = self._prefix[:n], self._prefix[n:]
+            if len(data) < n:
+                data += self._reader.read(n - len(data))
+            return data
+        return self._reader.read(n)
@@ -0,0 +1,148 @@
+# als_diff.py
+import json
+from collections import Counter
+
+from als_analyzer import ALS_SUMMARY_VERSION
+from metadata_store import cache_dir
+from snapshot_export import atomic_write_json
+
+
+ALS_DIFF_DIR = "als_diffs"
+
+
+def _added_removed(before, after):
+    """(added, removed) between two lists, keeping duplicates (two identical clips count twice)."""
+    a, b = Counter(before), Counter(after)
+    return sorted((b - a).elements()), sorted((a - b).elements())
+
+
+def _track_key(track, index):
+    # Live keeps a track's Id stable across saves; fall back to name/position for odd files
+    return track.get("id") or track.get("name") or f"#{index}"
+
+
+def _track_label(track):
+    return track.get("name") or f"{track.get('kind', 'track').title()} {track.get('id') or ''}".strip()
+
+
+def diff_summaries(before, after):
+    """
+    🔀 Compares two `.als` summaries (see `als_analyzer.summarize_als`).
+
+    Returns a dict with tempo / time signature changes, tracks added, removed
+    and renamed, per-track device, clip and sample changes, and the samples
+    referenced by one set but not the other.
+    """
+    diff = {
+        "version": ALS_SUMMARY_VERSION,
+        "tempo": None,
+        "time_signature": None,
+        "tracks_added": [],
+        "tracks_removed": [],
+        "tracks_renamed": [],
+        "tracks_changed": [],
+        "samples_added": [],
+        "samples_removed": [],
+    }
+    if before.get("tempo") != after.get("tempo"):
+        diff["tempo"] = [before.get("tempo"), after.get("tempo")]
+    if before.get("time_signature") != after.get("time_signature"):
+        diff["time_signature"] = [before.get("time_signature"), after.get("time_signature")]
+
+    old = {_track_key(t, i): t for i, t in enumerate(before.get("track_list", []))}
+    new = {_track_key(t, i): t for i, t in enumerate(after.get("track_list", []))}
+
+    diff["tracks_added"] = [_track_label(t) for key, t in new.items() if key not in old]
+    diff["tracks_removed"] = [_track_label(t) for key, t in old.items() if key not in new]
+
+    for key, track in new.items():
+        previous = old.get(key)
+        if previous is None:
+            continue
+        if _track_label(previous) != _track_label(track):
+            diff["tracks_renamed"].append([_track_label(previous), _track_label(track)])
+        changes = {"track": _track_label(track)}
+        for field in ("devices", "clips", "samples"):
+            added, removed = _added_removed(previous.get(field, []), track.get(field, []))
+            if added:
+                changes[f"{field}_added"] = added
+            if removed:
+                changes[f"{field}_removed"] = removed
+        if len(changes) > 1:
+            diff["tracks_changed"].append(changes)
+
+    diff["samples_added"], diff["samples_removed"] = _added_removed(
+        before.get("samples", []), after.get("samples", [])
+    )
+    return diff
+
+
+def _bpm(value):
+    return f"{value:g}" if value is not None else "–"
+
+
+def format_als_diff(diff):
+    """Human-readable lines for the snapshot browser; empty list when nothing changed."""
+    if not diff:
+        return []
+    lines = []
+    if diff["tempo"]:
+        old, new = diff["tempo"]
+        lines.append(f"🥁 Tempo {_bpm(old)} → {_bpm(new)} BPM")
+    if diff["time_signature"]:
+        lines.append("🎼 Time signature {} → {}".format(*diff["time_signature"]))
+    lines += [f"➕ Track added: {name}" for name in diff["tracks_added"]]
+    lines += [f"➖ Track removed: {name}" for name in diff["tracks_removed"]]
+    lines += [f"✏️ Track renamed: {old} → {new}" for old, new in diff["tracks_renamed"]]
+    for changes in diff["tracks_changed"]:
+        track = changes["track"]
+        for field, label in (("devices", "device"), ("clips", "clip"), ("samples", "sample")):
+            for item in changes.get(f"{field}_added", []):
+                lines.append(f"  {track}: + {label} {item}")
+            for item in changes.get(f"{field}_removed", []):
+                lines.append(f"  {track}: − {label} {item}")
+    lines += [f"🎧 Sample now used: {s}" for s in diff["samples_added"]]
+    lines += [f"🎧 Sample no longer used: {s}" for s in diff["samples_removed"]]
+    return lines
+
+
+class AlsDiffer:
+    """
+    📑 Diffs `.als` revisions by blob SHA, straight from the object store.
+
+    Summaries come from an `AlsAnalyzer` (parsed once per blob); results are
+    cached per (blob_a, blob_b) pair in `.dawgit_cache/als_diffs` and in memory.
+    """
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.dir = cache_dir(analyzer.project_path) / ALS_DIFF_DIR
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._memory = {}
+
+    def diff(self, blob_a, blob_b):
+        """Diff from `blob_a` (older) to `blob_b` (newer), or None if either set can't be read."""
+        key = (blob_a, blob_b)
+        if key in self._memory:
+            return self._memory[key]
+
+        path = self.dir / f"{blob_a}_{blob_b}.json"
+        if path.exists():
+            try:
+                diff = json.loads(path.read_text())
+                if diff.get("version") == ALS_SUMMARY_VERSION:
+                    self._memory[key] = diff
+                    return diff
+            except Exception as e:
+                print(f"[WARN] Ignoring unreadable ALS diff {path.name}: {e}")
+
+        summaries = self.analyzer.summaries([blob_a, blob_b])
+        before, after = summaries.get(blob_a), summaries.get(blob_b)
+        if not before or not after or before.get("error") or after.get("error"):
+            return None
+
+        diff = diff_summaries(before, after)
+        atomic_write_json(path, diff)
+        self._memory[key] = diff
+        print(f"[DEBUG] Diffed ALS {blob_a[:7]} → {blob_b[:7]}: {len(format_als_diff(diff))} changes")
+        return diff
@@ -0,0 +1,438 @@
+# als_filter.py
+import io
+import os
+import sys
+import gzip
+import shlex
+import argparse
+from pathlib import Path
+
+from git_objects import READ_CHUNK_SIZE, CatFileBatch, git_dir, lfs_object_path, parse_lfs_pointer, run_git
+from ref_transaction import list_refs
+from role_notes import read_role_notes, write_role_notes
+
+
+ALS_FILTER_NAME = "dawgit-als"
+ALS_FILTER_ATTRIBUTES = f"*.als filter={ALS_FILTER_NAME}"
+ALS_GZIP_LEVEL = 6
+GZIP_MAGIC = b"\x1f\x8b"
+PKT_MAX_PAYLOAD = 65516
+MIGRATION_BUNDLE_NAME = "pre-als-filter.bundle"
+ALS_FILTER_ENTRY = "als-filter"    # first argument that makes the app binary run `main()` instead of the GUI
+
+
+def clean_als(data):
+    """
+    Gzipped set → plain XML for the object store, byte for byte (line endings
+    included), so a checkout gives Live back exactly the XML it wrote.
+    Anything that isn't gzip (already clean, LFS pointer) is passed through
+    untouched.
+    """
+    if not data.startswith(GZIP_MAGIC):
+        return data
+    return gzip.decompress(data)
+
+
+def smudge_als(data):
+    """Plain XML from the object store → gzipped set Live can open. Gzipped data passes through."""
+    if data.lstrip()[:5] != b"<?xml":
+        return data
+    return gzip.compress(data, compresslevel=ALS_GZIP_LEVEL, mtime=0)
+
+
+def smudge_als_stream(src, dst):
+    """`smudge_als` for large sets: reads `src` and writes to `dst` a chunk at a time."""
+    head = src.read(READ_CHUNK_SIZE)
+    if head.lstrip()[:5] != b"<?xml":
+        out = dst
+    else:
+        out = gzip.GzipFile(filename="", mode="wb", fileobj=dst, compresslevel=ALS_GZIP_LEVEL, mtime=0)
+    try:
+        chunk = head
+        while chunk:
+            out.write(chunk)
+            chunk = src.read(READ_CHUNK_SIZE)
+    finally:
+        if out is not dst:
+            out.close()     # writes the gzip trailer; leaves `dst` open
+
+
+# --- git long-running filter protocol (gitattributes "filter.<driver>.process") ---
+
+def _read_pkt(stream):
+    header = stream.read(4)
+    if len(header) < 4:
+        raise EOFError("git closed the filter pipe")
+    length = int(header, 16)
+    return None if length == 0 else stream.read(length - 4)   # None = flush packet
+
+
+def _write_pkt(stream, data):
+    stream.write(b"%04x" % (len(data) + 4) + data)
+
+
+def _flush(stream):
+    stream.write(b"0000")
+    stream.flush()
+
+
+def _read_pkt_text(stream):
+    lines = []
+    while (pkt := _read_pkt(stream)) is not None:
+        lines.append(pkt.decode().rstrip("\n"))
+    return lines
+
+
+def run_filter_process(stdin, stdout):
+    """
+    🗜️ Serves git's long-running filter protocol (version 2) on binary streams.
+
+    Git starts one of these per command (`add`, `checkout`, `status`…) instead
+    of one process per `.als`, so the Python start-up cost is paid once.
+    """
+    if _read_pkt_text(stdin)[:2] != ["git-filter-client", "version=2"]:
+        raise ValueError("Unexpected filter handshake")
+    _write_pkt(stdout, b"git-filter-server\n")
+    _write_pkt(stdout, b"version=2\n")
+    _flush(stdout)
+    offered = set(_read_pkt_text(stdin))
+    for capability in ("capability=clean", "capability=smudge"):
+        if capability in offered:
+            _write_pkt(stdout, capability.encode() + b"\n")
+    _flush(stdout)
+
+    while True:
+        try:
+            headers = dict(line.split("=", 1) for line in _read_pkt_text(stdin))
+        except EOFError:
+            return
+        content = io.BytesIO()
+        while (pkt := _read_pkt(stdin)) is not None:
+            content.write(pkt)
+
+        try:
+            convert = clean_als if headers.get("command") == "clean" else smudge_als
+            result = convert(content.getvalue())
+        except Exception as e:
+            print(f"[ERROR] {ALS_FILTER_NAME} failed on {headers.get('pathname')}: {e}", file=sys.stderr)
+            _write_pkt(stdout, b"status=error\n")
+            _flush(stdout)
+            continue
+
+        _write_pkt(stdout, b"status=success\n")
+        _flush(stdout)
+        for start in range(0, len(result), PKT_MAX_PAYLOAD):
+            _write_pkt(stdout, result[start:start + PKT_MAX_PAYLOAD])
+        _flush(stdout)
+        _flush(stdout)   # empty list = keep status=success
+
+
+# --- setup ---
+
+def filter_command():
+    """
+    The command git runs as the filter. The packaged app has no interpreter or
+    source file to point at, so there the app binary itself is called with
+    `als-filter` (dispatched at the top of daw_git_gui.py).
+    """
+    if getattr(sys, "frozen", False):
+        return f"{shlex.quote(sys.executable)} {ALS_FILTER_ENTRY} process"
+    return f"{shlex.quote(sys.executable)} {shlex.quote(str(Path(__file__).resolve()))} process"
+
+
+def configure_als_filter(repo_path):
+    """Registers the filter driver in the repo's local git config (not versioned, so needed per clone)."""
+    run_git(repo_path, "config", f"filter.{ALS_FILTER_NAME}.process", filter_command())
+    run_git(repo_path, "config", f"filter.{ALS_FILTER_NAME}.required", "true")
+
+
+def uses_als_filter(repo_path):
+    attributes = Path(repo_path) / ".gitattributes"
+    return attributes.exists() and f"filter={ALS_FILTER_NAME}" in attributes.read_text(errors="replace")
+
+
+def ensure_als_filter_config(repo_path):
+    """Re-registers the driver when `.gitattributes` asks for it (fresh clone, moved app)."""
+    if not uses_als_filter(repo_path):
+        return False
+    configured = run_git(repo_path, "config", "--get", f"filter.{ALS_FILTER_NAME}.process", check=False)
+    if configured.decode().strip() != filter_command():
+        configure_als_filter(repo_path)
+        print(f"[DEBUG] Registered {ALS_FILTER_NAME} filter for {repo_path}")
+    return True
+
+
+def rewrite_attributes(text):
+    """Swaps any `*.als` rule (e.g. the LFS one from setup) for the DAW filter rule."""
+    lines = [line for line in text.splitlines() if line.split()[:1] != ["*.als"]]
+    return "\n".join([*lines, ALS_FILTER_ATTRIBUTES]) + "\n"
+
+
+def enable_als_filter(repo_path):
+    """
+    Turns the filter on for future saves: `.als` files are stored as plain XML
+    from the next snapshot on. Use `migrate_history` to convert older takes.
+    """
+    repo_path = Path(repo_path)
+    configure_als_filter(repo_path)
+    attributes = repo_path / ".gitattributes"
+    existing = attributes.read_text() if attributes.exists() else ""
+    attributes.write_text(rewrite_attributes(existing))
+    print(f"[DEBUG] {ALS_FILTER_NAME} filter enabled for {repo_path}")
+    return {"status": "ok", "attributes": str(attributes)}
+
+
+# --- size report ---
+
+def _dir_size(path):
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def repo_size_report(repo_path):
+    """Bytes used by git objects (packed + loose) and the local LFS store."""
+    stats = {}
+    for line in run_git(repo_path, "count-objects", "-v").decode().splitlines():
+        key, _, value = line.partition(":")
+        stats[key.strip()] = int(value.strip() or 0)
+    report = {
+        "packed_bytes": stats.get("size-pack", 0) * 1024,
+        "loose_bytes": stats.get("size", 0) * 1024,
+        "lfs_bytes": _dir_size(git_dir(repo_path) / "lfs" / "objects"),
+    }
+    report["total_bytes"] = sum(report.values())
+    return report
+
+
+def _mb(n):
+    return f"{n / 1024 ** 2:.1f} MB"
+
+
+def format_size_report(before, after=None):
+    rows = [("Git objects", "packed_bytes", "loose_bytes"), ("LFS store", "lfs_bytes"), ("Total", "total_bytes")]
+    lines = []
+    for label, *keys in rows:
+        old = sum(before[k] for k in keys)
+        if after is None:
+            lines.append(f"{label}: {_mb(old)}")
+        else:
+            new = sum(after[k] for k in keys)
+            lines.append(f"{label}: {_mb(old)} → {_mb(new)}")
+    return "\n".join(lines)
+
+
+# --- history migration ---
+
+class _HistoryRewriter:
+    """Rebuilds commits with `.als` blobs cleaned; trees/blobs are memoised by SHA."""
+
+    def __init__(self, repo_path, batch):
+        self.repo_path = repo_path
+        self.batch = batch
+        self.lfs_dir = git_dir(repo_path)
+        self.blobs, self.trees, self.commits = {}, {}, {}
+        self.missing_lfs = set()
+        self.attributes_blob = self._write("blob", ALS_FILTER_ATTRIBUTES.encode() + b"\n")
+
+    def _write(self, obj_type, data):
+        return run_git(self.repo_path, "hash-object", "-t", obj_type, "-w", "--stdin", input=data).decode().strip()
+
+    def blob(self, sha):
+        if sha not in self.blobs:
+            data = self.batch.read(sha)
+            pointer = parse_lfs_pointer(data)
+            if pointer:
+                local = lfs_object_path(self.lfs_dir, pointer[0])
+                if local.exists():
+                    data = local.read_bytes()
+                else:
+                    self.missing_lfs.add(pointer[0])   # keep the pointer, content isn't local
+            cleaned = clean_als(data)
+            self.blobs[sha] = sha if cleaned == data and not pointer else self._write("blob", cleaned)
+        return self.blobs[sha]
+
+    def tree(self, sha, root=False):
+        """(new tree SHA, whether the tree contains any .als)."""
+        if (sha, root) in self.trees:
+            return self.trees[(sha, root)]
+        entries, has_als, attributes = [], False, None
+        for record in run_git(self.repo_path, "ls-tree", "-z", sha).split(b"\0"):
+            if not record:
+                continue
+            meta, name = record.split(b"\t", 1)
+            mode, obj_type, oid = meta.decode().split()
+            if obj_type == "tree":
+                oid, child_has_als = self.tree(oid)
+                has_als |= child_has_als
+            elif obj_type == "blob" and name.lower().endswith(b".als"):
+                oid, has_als = self.blob(oid), True
+            elif root and name == b".gitattributes":
+                text = self.batch.read(oid).decode("utf-8", "replace")
+                oid = attributes = self._write("blob", rewrite_attributes(text).encode())
+            entries.append(f"{mode} {obj_type} {oid}\t".encode() + name)
+        if root and has_als and attributes is None:
+            entries.append(f"100644 blob {self.attributes_blob}\t.gitattributes".encode())
+        new_sha = run_git(self.repo_path, "mktree", "-z", input=b"\0".join(entries) + b"\0").decode().strip()
+        self.trees[(sha, root)] = (new_sha, has_als)
+        return new_sha, has_als
+
+    def commit(self, sha):
+        raw = self.batch.read(sha)
+        header, _, message = raw.partition(b"\n\n")
+        lines, skipping = [], False
+        for line in header.split(b"\n"):
+            if skipping and line.startswith(b" "):
+                continue                      # continuation of a dropped signature
+            skipping = line.startswith(b"gpgsig")  # signatures can't survive a rewrite
+            if skipping:
+                continue
+            if line.startswith(b"tree "):
+                line = b"tree " + self.tree(line[5:].decode(), root=True)[0].encode()
+            elif line.startswith(b"parent "):
+                line = b"parent " + self.commits[line[7:].decode()].encode()
+            lines.append(line)
+        self.commits[sha] = self._write("commit", b"\n".join(lines) + b"\n\n" + message)
+        return self.commits[sha]
+
+    def tag(self, sha, target):
+        raw = self.batch.read(sha)
+        _, rest = raw.split(b"\n", 1)    # first line is "object <sha>"
+        return self._write("tag", b"object " + target.encode() + b"\n" + rest)
+
+
+def _remap_roles(repo_path, commits):
+    """
+    Moves role notes and the local role store from old take SHAs onto their
+    rewritten ones. Returns the number of roles moved.
+    """
+    from metadata_store import RoleStore    # metadata_store → snapshot_export imports this module
+
+    moved = {old: new for old, new in commits.items() if old != new}
+    updates = {}
+    for sha, role in read_role_notes(repo_path).items():
+        if sha in moved:
+            updates[sha] = None                 # old SHAs still exist until gc — clear them explicitly
+            updates[moved[sha]] = role
+    if updates:
+        write_role_notes(repo_path, updates, message="Move roles onto converted takes")
+
+    store = RoleStore(repo_path)
+    if any(sha in moved for sha in store.roles):
+        store.replace_all({moved.get(sha, sha): role for sha, role in store.roles.items()})
+    return sum(1 for sha in updates if sha not in moved)
+
+
+def migrate_history(repo_path, keep_bundle=True, gc=True):
+    """
+    🔁 Rewrites every branch and tag so past takes store `.als` as plain XML
+    too, then repacks so git can delta-compress consecutive versions.
+
+    The working tree must be clean. With `keep_bundle` the old history is
+    saved first as `.git/dawgit/pre-als-filter.bundle`. Commit SHAs change,
+    so clones must be re-cloned; roles move with their takes. Stashes are
+    left as they are. Returns sizes before and after.
+    """
+    repo_path = Path(repo_path)
+    if run_git(repo_path, "status", "--porcelain", "--untracked-files=no").strip():
+        return {"status": "error", "message": "Save or discard your changes before converting history."}
+    refs = list_refs(repo_path, "refs/heads", "refs/tags")
+    if not refs:
+        return {"status": "error", "message": "Nothing to convert yet."}
+
+    before = repo_size_report(repo_path)
+    enable_als_filter(repo_path)
+
+    bundle = None
+    if keep_bundle:
+        bundle = git_dir(repo_path) / "dawgit" / MIGRATION_BUNDLE_NAME
+        bundle.parent.mkdir(parents=True, exist_ok=True)
+        run_git(repo_path, "bundle", "create", str(bundle), "--branches", "--tags")
+
+    tips = sorted({peeled for _sha, peeled in refs.values()})
+    order = run_git(repo_path, "rev-list", "--reverse", "--topo-order", *tips).decode().split()
+    head = run_git(repo_path, "symbolic-ref", "-q", "HEAD", check=False).decode().strip()
+    head_sha = run_git(repo_path, "rev-parse", "HEAD").decode().strip()
+
+    with CatFileBatch(repo_path) as batch:
+        rewriter = _HistoryRewriter(repo_path, batch)
+        for sha in order:
+            rewriter.commit(sha)
+        commands = []
+        for ref, (sha, peeled) in refs.items():
+            new = rewriter.commits.get(peeled)
+            if new is None:
+                continue                                  # tag on a non-commit object
+            if sha != peeled:
+                new = rewriter.tag(sha, new)              # annotated tag → new tag object
+            if new != sha:
+                commands.append(f"update {ref} {new} {sha}")
+
+    if commands:
+        run_git(repo_path, "update-ref", "--stdin", input=("\n".join(commands) + "\n").encode())
+    if not head:   # detached HEAD — move it onto the rewritten take
+        run_git(repo_path, "update-ref", "--no-deref", "HEAD", rewriter.commits.get(head_sha, head_sha))
+    roles = _remap_roles(repo_path, rewriter.commits)
+
+    # Index now points at the new trees; worktree files already match after cleaning
+    run_git(repo_path, "reset", "-q")
+    run_git(repo_path, "checkout", "HEAD", "--", ".gitattributes", check=False)
+
+    if gc:
+        # Only the rewritten refs' reflogs are dropped: refs/stash keeps its
+        # entries (and the old takes they sit on) until normal gc expiry
+        logged = [ref for ref in ["HEAD", *(command.split()[1] for command in commands)]
+                  if run_git(repo_path, "rev-parse", "-q", "--verify", f"{ref}@{{0}}", check=False).strip()]
+        if logged:
+            run_git(repo_path, "reflog", "expire", "--expire=now", "--expire-unreachable=now", *logged)
+        run_git(repo_path, "gc", "--prune=now", "-q")
+
+    after = repo_size_report(repo_path)
+    print(f"[DEBUG] Converted {len(order)} takes, {len(commands)} refs:\n{format_size_report(before, after)}")
+    return {
+        "status": "ok",
+        "commits": len(order),
+        "refs": len(commands),
+        "roles": roles,
+        "before": before,
+        "after": after,
+        "bundle": str(bundle) if bundle else None,
+        "missing_lfs": sorted(rewriter.missing_lfs),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delta-friendly storage of Ableton sets.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("process", help="Run as git's long-running filter (used by git itself)")
+    for name in ("enable", "report", "migrate"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument("repo", help="Path to the project repository")
+    sub.choices["migrate"].add_argument("--no-bundle", action="store_true", help="Don't keep a backup bundle")
+    args = parser.parse_args(argv)
+
+    if args.command == "process":
+        run_filter_process(sys.stdin.buffer, sys.stdout.buffer)
+        return 0
+    if args.command == "enable":
+        enable_als_filter(args.repo)
+        return 0
+    if args.command == "report":
+        print(format_size_report(repo_size_report(args.repo)))
+        return 0
+
+    result = migrate_history(args.repo, keep_bundle=not args.no_bundle)
+    if result["status"] != "ok":
+        print(result["message"])
+        return 1
+    print(format_size_report(result["before"], result["after"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
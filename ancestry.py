@@ -0,0 +1,324 @@
+# ancestry.py
+import heapq
+import struct
+from bisect import bisect_left
+from pathlib import Path
+
+from git_objects import git_dir, is_ancestor as git_is_ancestor, run_git
+
+
+COMMIT_GRAPH_WRITE_ARGS = ("commit-graph", "write", "--reachable", "--split", "--changed-paths")
+GRAPH_PARENT_NONE = 0x70000000
+GRAPH_EXTRA_EDGES = 0x80000000
+GRAPH_LAST_EDGE = 0x80000000
+BLOOM_SEEDS = (0x293AE76F, 0x7E646E2C)
+REACHABLE_CACHE_SIZE = 8                # tips whose full ancestry is kept in memory
+
+
+def write_commit_graph(project_path):
+    """(Re)writes the commit-graph for every reachable commit — incremental with `--split`."""
+    run_git(project_path, *COMMIT_GRAPH_WRITE_ARGS)
+
+
+def graph_files(project_path):
+    """Commit-graph files, base layer first: a split chain if there is one, else the single file."""
+    info = git_dir(project_path) / "objects" / "info"
+    chain = info / "commit-graphs" / "commit-graph-chain"
+    if chain.exists():
+        return [info / "commit-graphs" / f"graph-{h.strip()}.graph"
+                for h in chain.read_text().split() if h.strip()]
+    single = info / "commit-graph"
+    return [single] if single.exists() else []
+
+
+def _murmur3(data, seed, signed_tail):
+    """32-bit murmur3 as git computes it for Bloom filters (v1 sign-extends high bytes)."""
+    c1, c2, mask = 0xCC9E2D51, 0x1B873593, 0xFFFFFFFF
+    h = seed
+    byte = (lambda b: (b - 256 if b > 127 else b) & mask) if signed_tail else (lambda b: b)
+    blocks = len(data) // 4
+    for i in range(blocks):
+        b0, b1, b2, b3 = (byte(x) for x in data[4 * i:4 * i + 4])
+        k = (b0 | (b1 << 8) | (b2 << 16) | (b3 << 24)) & mask
+        k = (k * c1) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        k = (k * c2) & mask
+        h ^= k
+        h = ((h << 13) | (h >> 19)) & mask
+        h = (h * 5 + 0xE6546B64) & mask
+    tail = data[4 * blocks:]
+    k = 0
+    if len(tail) >= 3:
+        k ^= byte(tail[2]) << 16
+    if len(tail) >= 2:
+        k ^= byte(tail[1]) << 8
+    if tail:
+        k ^= byte(tail[0])
+        k = (k * c1) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        k = (k * c2) & mask
+        h ^= k & mask
+    h ^= len(data)
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & mask
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & mask
+    h ^= h >> 16
+    return h
+
+
+class _Layer:
+    """One commit-graph file: chunk offsets into its bytes."""
+
+    def __init__(self, path, base):
+        self.data = data = Path(path).read_bytes()
+        if data[:4] != b"CGPH" or data[4] != 1:
+            raise ValueError(f"Not a commit-graph: {path}")
+        self.hash_len = 32 if data[5] == 2 else 20
+        chunks = {}
+        entries = data[6]
+        for i in range(entries + 1):
+            chunk_id, offset = struct.unpack_from(">4sQ", data, 8 + 12 * i)
+            chunks[chunk_id] = offset
+        self.fanout = chunks[b"OIDF"]
+        self.oids = chunks[b"OIDL"]
+        self.cdat = chunks[b"CDAT"]
+        self.edges = chunks.get(b"EDGE")
+        self.bidx = chunks.get(b"BIDX")
+        self.bdat = chunks.get(b"BDAT")
+        self.count = struct.unpack_from(">I", data, self.fanout + 255 * 4)[0]
+        self.base = base        # global position of this layer's first commit
+
+    def find(self, oid):
+        first = struct.unpack_from(">I", self.data, self.fanout + 4 * (oid[0] - 1))[0] if oid[0] else 0
+        last = struct.unpack_from(">I", self.data, self.fanout + 4 * oid[0])[0]
+        keys = _OidView(self.data, self.oids, self.hash_len)
+        i = bisect_left(keys, oid, first, last)
+        if i < last and keys[i] == oid:
+            return i
+        return None
+
+
+class _OidView:
+    """Sequence view of an OIDL chunk so `bisect` can search it without copying."""
+
+    def __init__(self, data, start, n):
+        self.data, self.start, self.n = data, start, n
+
+    def __getitem__(self, i):
+        offset = self.start + i * self.n
+        return self.data[offset:offset + self.n]
+
+
+class CommitGraph:
+    """
+    📈 Reader for git's commit-graph (single file or `--split` chain): commit
+    positions, parents, topological levels (generation numbers), commit times
+    and changed-path Bloom filters, without asking git about each commit.
+    """
+
+    def __init__(self, paths):
+        self.layers = []
+        base = 0
+        for path in paths:
+            layer = _Layer(path, base)
+            self.layers.append(layer)
+            base += layer.count
+        self.count = base
+        self.paths = [Path(p) for p in paths]
+
+    def _layer(self, pos):
+        for layer in reversed(self.layers):
+            if pos >= layer.base:
+                return layer, pos - layer.base
+        raise IndexError(pos)
+
+    def position(self, sha):
+        oid = bytes.fromhex(sha)
+        for layer in self.layers:
+            local = layer.find(oid)
+            if local is not None:
+                return layer.base + local
+        return None
+
+    def sha(self, pos):
+        layer, local = self._layer(pos)
+        offset = layer.oids + local * layer.hash_len
+        return layer.data[offset:offset + layer.hash_len].hex()
+
+    def _cdat(self, pos):
+        layer, local = self._layer(pos)
+        offset = layer.cdat + local * (layer.hash_len + 16) + layer.hash_len
+        return layer, struct.unpack_from(">IIII", layer.data, offset)
+
+    def parents(self, pos):
+        layer, (p1, p2, _, _) = self._cdat(pos)
+        parents = []
+        if p1 != GRAPH_PARENT_NONE:
+            parents.append(p1)
+        if p2 == GRAPH_PARENT_NONE:
+            return parents
+        if not p2 & GRAPH_EXTRA_EDGES:
+            parents.append(p2)
+            return parents
+        # Octopus merge: the rest of the parents are listed in the EDGE chunk
+        index = p2 & ~GRAPH_EXTRA_EDGES
+        while True:
+            edge = struct.unpack_from(">I", layer.data, layer.edges + 4 * index)[0]
+            parents.append(edge & ~GRAPH_LAST_EDGE)
+            if edge & GRAPH_LAST_EDGE:
+                return parents
+            index += 1
+
+    def generation(self, pos):
+        """Topological level: 1 for root commits, 1 + the highest parent's level otherwise."""
+        _, (_, _, word, _) = self._cdat(pos)
+        return word >> 2
+
+    def commit_time(self, pos):
+        _, (_, _, word, low) = self._cdat(pos)
+        return ((word & 0x3) << 32) | low
+
+    def may_have_changed(self, pos, path):
+        """
+        False only if the commit certainly didn't touch `path` (per its Bloom
+        filter); True if it may have, or if there's no filter for it.
+        """
+        layer, local = self._layer(pos)
+        if layer.bidx is None or layer.bdat is None:
+            return True
+        version, hashes, _ = struct.unpack_from(">III", layer.data, layer.bdat)
+        end = struct.unpack_from(">I", layer.data, layer.bidx + 4 * local)[0]
+        start = struct.unpack_from(">I", layer.data, layer.bidx + 4 * (local - 1))[0] if local else 0
+        if end <= start:
+            return True
+        data_start = layer.bdat + 12
+        bloom = layer.data[data_start + start:data_start + end]
+        bits = len(bloom) * 8
+        key = path.strip("/").encode()
+        h0, h1 = (_murmur3(key, seed, signed_tail=version == 1) for seed in BLOOM_SEEDS)
+        for i in range(hashes):
+            bit = (h0 + i * h1) % (2 ** 32) % bits
+            if not bloom[bit // 8] & (1 << (bit % 8)):
+                return False
+        return True
+
+
+class Ancestry:
+    """
+    🧬 Ancestry queries on the commit-graph instead of full history walks.
+
+    `is_ancestor` walks back from the descendant but never below the
+    ancestor's generation, so it only touches commits between the two.
+    `reachable_from` caches a tip's whole history as a set, making repeated
+    membership checks O(1). `merge_base` walks highest-generation first, so
+    the first common commit it meets is a best merge base.
+
+    Nothing here writes the graph — that is left to the maintenance
+    scheduler (repo_maintenance.py), off the GUI thread. Commits the graph
+    doesn't cover yet (new since the last write, or not reachable from any
+    ref) are answered by `git merge-base`.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self.graph = None
+        self._stamp = None
+        self._reachable = {}
+
+    def _files_stamp(self):
+        files = graph_files(self.project_path)
+        return tuple((str(p), p.stat().st_mtime_ns) for p in files if p.exists())
+
+    def _load(self):
+        stamp = self._files_stamp()
+        if stamp != self._stamp:
+            self.graph = CommitGraph([p for p, _ in stamp]) if stamp else None
+            self._stamp = stamp
+            self._reachable.clear()
+        return self.graph
+
+    def refresh(self):
+        """Reloads the graph if the maintenance scheduler rewrote it."""
+        return self._load()
+
+    def resolve(self, rev):
+        return run_git(self.project_path, "rev-parse", "--verify", f"{rev}^{{commit}}").decode().strip()
+
+    def _positions(self, *shas):
+        """Graph positions for `shas`, or None if any of them isn't in the graph."""
+        graph = self._load()
+        positions = [graph.position(sha) if graph else None for sha in shas]
+        return None if None in positions else positions
+
+    def is_ancestor(self, ancestor, descendant):
+        """True if `ancestor` is `descendant` or reachable from it."""
+        a, d = self.resolve(ancestor), self.resolve(descendant)
+        if a == d:
+            return True
+        positions = self._positions(a, d)
+        if positions is None:
+            return git_is_ancestor(self.project_path, a, d)
+        target, start = positions
+        cached = self._reachable.get(d)
+        if cached is not None:
+            return target in cached
+        graph = self.graph
+        floor = graph.generation(target)
+        seen, stack = {start}, [start]
+        while stack:
+            pos = stack.pop()
+            for parent in graph.parents(pos):
+                if parent == target:
+                    return True
+                if parent not in seen and graph.generation(parent) > floor:
+                    seen.add(parent)
+                    stack.append(parent)
+        return False
+
+    def reachable_from(self, rev):
+        """Set of positions of every commit reachable from `rev` (cached per tip)."""
+        tip = self.resolve(rev)
+        positions = self._positions(tip)
+        if positions is None:
+            return None
+        if tip not in self._reachable:
+            graph = self.graph
+            seen, stack = {positions[0]}, [positions[0]]
+            while stack:
+                for parent in graph.parents(stack.pop()):
+                    if parent not in seen:
+                        seen.add(parent)
+                        stack.append(parent)
+            while len(self._reachable) >= REACHABLE_CACHE_SIZE:
+                self._reachable.pop(next(iter(self._reachable)))
+            self._reachable[tip] = frozenset(seen)
+        return self._reachable[tip]
+
+    def contains(self, rev, sha):
+        """True if commit `sha` is in `rev`'s history — O(1) after the first call for that tip."""
+        reachable = self.reachable_from(rev)
+        if reachable is None:
+            return self.is_ancestor(sha, rev)
+        positions = self._positions(self.resolve(sha))
+        return positions is not None and positions[0] in reachable
+
+    def merge_base(self, rev_a, rev_b):
+        """A best common ancestor of two commits (SHA), or None if their histories never meet."""
+        a, b = self.resolve(rev_a), self.resolve(rev_b)
+        positions = self._positions(a, b)
+        if positions is None:
+            out = run_git(self.project_path, "merge-base", a, b, check=False).decode().strip()
+            return out or None
+        graph = self.graph
+        ancestors = self.reachable_from(a)
+        heap, seen = [(-graph.generation(positions[1]), positions[1])], {positions[1]}
+        while heap:
+            _, pos = heapq.heappop(heap)
+            if pos in ancestors:
+                return graph.sha(pos)
+            for parent in graph.parents(pos):
+                if parent not in seen:
+                    seen.add(parent)
+                    heapq.heappush(heap, (-graph.generation(parent), parent))
+        return None
@@ -0,0 +1,257 @@
+# audio_diff.py
+import json
+import math
+import operator
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+from metadata_store import cache_dir
+from peaks import AudioStream, open_audio_blob
+from snapshot_export import atomic_write_json
+
+
+AUDIO_DIFF_VERSION = 1
+AUDIO_DIFF_DIR = "audio_diffs"
+AUDIO_DIFF_HOP = 1024               # frames per analysis hop — all that's kept per file (~170k hops/hour)
+AUDIO_DIFF_WINDOW_SEC = 0.5         # resolution of the changed-regions strip
+AUDIO_DIFF_MAX_LAG_SEC = 2.0        # how far a re-bounce may be shifted and still be aligned
+AUDIO_DIFF_ALIGN_SEC = 30.0         # audio used to find that shift
+AUDIO_DIFF_ALIGN_MARGIN = 0.05      # correlation a shift must gain over "no shift" to be believed
+AUDIO_DIFF_LEVEL_DB = 1.0           # window loudness change that counts as "changed"
+AUDIO_DIFF_SPECTRAL_DB = 1.5        # window tone (spectral tilt) change that counts as "changed"
+AUDIO_DIFF_SILENCE_DB = -60.0
+MIX_NAME_HINTS = ("mix", "bounce", "master", "print")
+
+_sumprod = getattr(math, "sumprod", None) or (lambda a, b: sum(map(operator.mul, a, b)))
+
+
+class AudioFeatures:
+    """Per-hop energy, peak and first/second-difference energy of one file (mono-folded)."""
+
+    def __init__(self, sample_rate, frames, hop):
+        self.sample_rate = sample_rate
+        self.frames = frames
+        self.hop = hop
+        self.energy = array("d")    # mean square, full scale = 1
+        self.peak = array("d")
+        self.slope = array("d")     # energy of the first difference  (≈ +6 dB/oct — upper mids and highs)
+        self.curve = array("d")     # energy of the second difference (≈ +12 dB/oct — air)
+
+    @property
+    def duration(self):
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def hop_seconds(self):
+        return self.hop / self.sample_rate
+
+
+def analyze_audio(stream, hop=AUDIO_DIFF_HOP):
+    """
+    Streams a WAV/AIFF once and reduces it to per-hop features, so memory is
+    bounded by the hop count, not the file. Difference energies come from the
+    lag-0/1/2 autocorrelations (Σ(x[n]-x[n-1])² ≈ 2R0-2R1, second difference
+    ≈ 6R0-8R1+2R2), so every per-sample step is an array slice or a C-level
+    sum of products.
+    """
+    audio = AudioStream(stream)
+    channels = audio.channels
+    norm = 1.0 / (audio.full_scale ** 2)
+    features = AudioFeatures(audio.sample_rate, audio.frames, hop)
+    step = hop * channels
+    for samples in audio.chunks(hop * 64):
+        for start in range(0, len(samples), step):
+            window = samples[start:start + step]
+            count = len(window)
+            r0 = r1 = r2 = 0
+            for c in range(channels):
+                x = window[c::channels]
+                r0 += _sumprod(x, x)
+                r1 += _sumprod(x[1:], x[:-1])
+                r2 += _sumprod(x[2:], x[:-2])
+            features.energy.append(r0 * norm / count)
+            features.slope.append(max(0, 2 * r0 - 2 * r1) * norm / count)
+            features.curve.append(max(0, 6 * r0 - 8 * r1 + 2 * r2) * norm / count)
+            features.peak.append(max(max(window), -min(window)) / audio.full_scale)
+    return features
+
+
+def _db(power, floor=AUDIO_DIFF_SILENCE_DB * 2):
+    return 10 * math.log10(power) if power > 0 else floor
+
+
+def estimate_offset(a, b, max_lag_sec=AUDIO_DIFF_MAX_LAG_SEC, span_sec=AUDIO_DIFF_ALIGN_SEC):
+    """
+    Seconds by which `b` lags `a`, from the cross-correlation of their
+    loudness envelopes over the first `span_sec`. 0.0 when the files can't be
+    compared hop for hop (different rates) or are silent.
+    """
+    if a.sample_rate != b.sample_rate or a.hop != b.hop:
+        return 0.0
+    max_lag = int(max_lag_sec / a.hop_seconds)
+    span = int(span_sec / a.hop_seconds)
+
+    def envelope(features):
+        env = [_db(e) for e in features.energy[:span + max_lag]]
+        mean = sum(env) / len(env) if env else 0.0
+        return [v - mean for v in env]
+
+    env_a, env_b = envelope(a), envelope(b)
+
+    def correlation(lag):
+        x = env_a[max(0, -lag):span]
+        y = env_b[max(0, lag):max(0, lag) + len(x)]
+        x = x[:len(y)]
+        if len(x) < 8:
+            return 0.0
+        denom = math.sqrt(_sumprod(x, x) * _sumprod(y, y))
+        return _sumprod(x, y) / denom if denom else 0.0
+
+    scores = {lag: correlation(lag) for lag in range(-max_lag, max_lag + 1)}
+    best_lag = max(scores, key=lambda lag: (round(scores[lag], 9), -abs(lag)))
+    if scores[best_lag] <= 0 or scores[best_lag] - scores.get(0, 0.0) < AUDIO_DIFF_ALIGN_MARGIN:
+        return 0.0      # repetitive material correlates at many lags — don't shift on a hunch
+    # Parabolic interpolation between neighbouring lags for sub-hop precision
+    left, right = scores.get(best_lag - 1), scores.get(best_lag + 1)
+    shift = 0.0
+    if left is not None and right is not None:
+        curvature = left - 2 * scores[best_lag] + right
+        if curvature < 0:
+            shift = max(-0.5, min(0.5, 0.5 * (left - right) / curvature))
+    return (best_lag + shift) * a.hop_seconds
+
+
+def _window_stats(features, start_sec, end_sec):
+    """(rms dB, peak dB, slope tilt dB, curve tilt dB) over a time range, or None past the end."""
+    # Hops wholly inside the window, so a change just across its edge doesn't bleed in
+    first = max(0, math.ceil(start_sec / features.hop_seconds - 1e-9))
+    last = min(len(features.energy), math.floor(end_sec / features.hop_seconds + 1e-9))
+    if first >= last:
+        first = max(0, int(start_sec / features.hop_seconds))
+        last = min(len(features.energy), first + 1)
+    if first >= last:
+        return None
+    energy = sum(features.energy[first:last]) / (last - first)
+    if _db(energy) <= AUDIO_DIFF_SILENCE_DB:
+        return (_db(energy), _db(max(features.peak[first:last]) ** 2), 0.0, 0.0)
+    slope = sum(features.slope[first:last]) / (last - first)
+    curve = sum(features.curve[first:last]) / (last - first)
+    return (_db(energy), _db(max(features.peak[first:last]) ** 2),
+            _db(slope) - _db(energy), _db(curve) - _db(energy))
+
+
+def diff_features(a, b, window_sec=AUDIO_DIFF_WINDOW_SEC):
+    """
+    Compares two analysed files after aligning `b` to `a`. Returns a JSON-able
+    dict with per-window level/peak/tone deltas and the merged changed regions
+    (in `a`'s timeline).
+    """
+    offset = estimate_offset(a, b)
+    total = max(a.duration, b.duration - offset)
+    windows, changed = [], []
+    silent = (AUDIO_DIFF_SILENCE_DB * 2, AUDIO_DIFF_SILENCE_DB * 2, 0.0, 0.0)
+    for k in range(int(math.ceil(total / window_sec - 0.05))):   # ignore a last sliver under 5% of a window
+        start = k * window_sec
+        stats_a = _window_stats(a, start, start + window_sec) or silent
+        stats_b = _window_stats(b, start + offset, start + offset + window_sec) or silent
+        level = stats_b[0] - stats_a[0]
+        peak = stats_b[1] - stats_a[1]
+        spectral = math.hypot(stats_b[2] - stats_a[2], stats_b[3] - stats_a[3])
+        audible = max(stats_a[0], stats_b[0]) > AUDIO_DIFF_SILENCE_DB
+        is_changed = audible and (abs(level) > AUDIO_DIFF_LEVEL_DB or spectral > AUDIO_DIFF_SPECTRAL_DB)
+        windows.append([round(level, 2), round(peak, 2), round(spectral, 2), int(is_changed)])
+        if is_changed:
+            end = min(start + window_sec, total)
+            if changed and abs(changed[-1][1] - start) < 1e-9:
+                changed[-1][1] = round(end, 3)
+            else:
+                changed.append([round(start, 3), round(end, 3)])
+
+    loudness = _db(sum(b.energy) / len(b.energy) if b.energy else 0) - \
+        _db(sum(a.energy) / len(a.energy) if a.energy else 0)
+    return {
+        "version": AUDIO_DIFF_VERSION,
+        "durations": [round(a.duration, 3), round(b.duration, 3)],
+        "sample_rates": [a.sample_rate, b.sample_rate],
+        "offset": round(offset, 4),
+        "window": window_sec,
+        "windows": windows,              # [level Δ dB, peak Δ dB, tone distance dB, changed]
+        "changed": changed,              # [[start, end]] seconds
+        "changed_seconds": round(sum(end - start for start, end in changed), 3),
+        "loudness_delta": round(loudness, 2),
+    }
+
+
+def comparable_audio(files_a, files_b):
+    """
+    Paths present in both takes with different content, mixdowns first.
+    `files_*` are [(path, blob SHA)]; returns [(path, blob_a, blob_b)].
+    """
+    before = dict(files_a)
+    pairs = [(path, before[path], oid) for path, oid in files_b if path in before and before[path] != oid]
+    return sorted(pairs, key=lambda p: (not any(h in PurePosixPath(p[0]).stem.lower() for h in MIX_NAME_HINTS),
+                                        p[0]))
+
+
+class AudioDiffer:
+    """
+    🎚️ Compares two audio blobs (e.g. a take's mixdown against an earlier
+    bounce) straight from the object store. Results are cached per
+    (blob_a, blob_b) pair in `.dawgit_cache/audio_diffs` and in memory.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self.dir = cache_dir(self.project_path) / AUDIO_DIFF_DIR
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._memory = {}
+        self._pool = None
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _features(self, oid):
+        with open_audio_blob(self.project_path, oid) as (key, stream):
+            if stream is None:
+                raise FileNotFoundError(f"LFS object {key[:12]} not fetched")
+            return analyze_audio(stream)
+
+    def cached(self, blob_a, blob_b):
+        key = (blob_a, blob_b)
+        if key in self._memory:
+            return self._memory[key]
+        path = self.dir / f"{blob_a}_{blob_b}.json"
+        if path.exists():
+            try:
+                diff = json.loads(path.read_text())
+                if diff.get("version") == AUDIO_DIFF_VERSION:
+                    self._memory[key] = diff
+                    return diff
+            except Exception as e:
+                print(f"[WARN] Ignoring unreadable audio diff {path.name}: {e}")
+        return None
+
+    def diff(self, blob_a, blob_b):
+        """Diff from `blob_a` (older) to `blob_b` (newer). Raises if either can't be decoded."""
+        diff = self.cached(blob_a, blob_b)
+        if diff is not None:
+            return diff
+        diff = diff_features(self._features(blob_a), self._features(blob_b))
+        atomic_write_json(self.dir / f"{blob_a}_{blob_b}.json", diff)
+        self._memory[(blob_a, blob_b)] = diff
+        print(f"[DEBUG] Audio diff {blob_a[:7]} → {blob_b[:7]}: {len(diff['changed'])} changed regions")
+        return diff
+
+    def diff_async(self, blob_a, blob_b):
+        """A Future for `diff()` — already done when the pair is cached."""
+        diff = self.cached(blob_a, blob_b)
+        if diff is not None:
+            future = Future()
+            future.set_result(diff)
+            return future
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dawgit-audio-diff")
+        return self._pool.submit(self.diff, blob_a, blob_b)
@@ -0,0 +1,369 @@
+# audio_index.py
+import os
+import sqlite3
+import tempfile
+import subprocess
+import multiprocessing
+from pathlib import Path, PurePosixPath
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from git_objects import (
+    CatFileBatch, LFS_POINTER_MAX_SIZE, git_dir, git_env, lfs_object_path, list_tree, parse_lfs_pointer, run_git
+)
+from metadata_store import index_path
+
+try:
+    import mutagen
+except ImportError:   # listed in requirements.txt; without it only sizes are indexed
+    mutagen = None
+
+
+AUDIO_INDEX_NAME = "audio_index.sqlite"
+AUDIO_EXTENSIONS = {".wav", ".wave", ".aif", ".aiff", ".flac", ".mp3", ".m4a", ".aac", ".ogg", ".caf"}
+AUDIO_INDEX_WORKERS = min(4, os.cpu_count() or 2)
+AUDIO_PROBE_BATCH = 16                 # files per worker task, to amortise process round-trips
+AUDIO_POLL_INTERVAL_MS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    duration REAL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    bits INTEGER,
+    format TEXT,
+    error TEXT,
+    probed INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS snapshot_assets (
+    sha TEXT NOT NULL,
+    path TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (sha, path)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS indexed (
+    sha TEXT PRIMARY KEY,
+    parent TEXT
+);
+"""
+
+
+def audio_index_path(project_path):
+    return index_path(project_path, AUDIO_INDEX_NAME)
+
+
+def is_audio(path):
+    return PurePosixPath(path).suffix.lower() in AUDIO_EXTENSIONS
+
+
+def format_size(n):
+    for unit, scale in (("GB", 1024 ** 3), ("MB", 1024 ** 2), ("KB", 1024)):
+        if n >= scale:
+            return f"{n / scale:.1f} {unit}"
+    return f"{n} B"
+
+
+def probe_audio(path):
+    """Duration, sample rate, channels and bit depth of one audio file (None where unknown)."""
+    info = {"duration": None, "sample_rate": None, "channels": None, "bits": None, "format": None}
+    if mutagen is None:
+        return info
+    audio = mutagen.File(path)
+    if audio is None or audio.info is None:
+        raise ValueError("Not a recognised audio file")
+    info.update(
+        duration=getattr(audio.info, "length", None),
+        sample_rate=getattr(audio.info, "sample_rate", None),
+        channels=getattr(audio.info, "channels", None),
+        bits=getattr(audio.info, "bits_per_sample", None),
+        format=type(audio).__name__,
+    )
+    return info
+
+
+def _probe_batch(repo_path, items):
+    """
+    Worker-process half: probes [(key, suffix, local path or None, blob sha)].
+    Plain blobs are streamed into a temp file first (mutagen needs to seek);
+    LFS objects are read in place from the local store.
+    """
+    results = []
+    for key, suffix, local, blob in items:
+        try:
+            if local:
+                results.append((key, probe_audio(local)))
+                continue
+            with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+                subprocess.run(["git", "cat-file", "blob", blob], cwd=repo_path, env=git_env(),
+                               stdout=tmp, stderr=subprocess.DEVNULL, check=True)
+                tmp.flush()
+                results.append((key, probe_audio(tmp.name)))
+        except Exception as e:
+            results.append((key, {"error": str(e)}))
+    return results
+
+
+class AudioIndex:
+    """
+    🔊 Duration, sample rate, channels, bit depth and size of every audio file
+    in every take, keyed by blob SHA (or LFS OID) so each distinct file is
+    probed once, however many takes contain it.
+
+    Trees are indexed with one `ls-tree` per take (sizes come from the tree or
+    the LFS pointer) — by `update()` in the calling thread, or by
+    `update_async()` on a worker thread. Probing runs in a process pool; call
+    `collect()` from the owning thread to queue probes for indexed trees and
+    store finished results.
+    """
+
+    def __init__(self, project_path, workers=AUDIO_INDEX_WORKERS):
+        self.project_path = Path(project_path)
+        self.path = audio_index_path(self.project_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = self._connect()
+        self.conn.executescript(_SCHEMA)
+        self.workers = workers
+        self._pool = None
+        self._tree_pool = None
+        self._futures = set()
+        self._tree_futures = set()
+        self._indexing = set()    # takes whose trees a worker is indexing
+        self._pending = set()     # keys submitted but not collected yet
+        self._git_dir = git_dir(self.project_path)
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def close(self):
+        self.shutdown()
+        self.conn.close()
+
+    def shutdown(self):
+        if self._tree_pool is not None:
+            self._tree_pool.shutdown(wait=True, cancel_futures=True)
+            self._tree_pool = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._futures.clear()
+        self._tree_futures.clear()
+        self._indexing.clear()
+        self._pending.clear()
+
+    def _executor(self):
+        if self._pool is None:
+            # spawn: safe next to Qt's threads, and the same on every platform
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _indexed(self, shas, conn=None):
+        found = set()
+        shas = list(shas)
+        for i in range(0, len(shas), 500):
+            chunk = shas[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(r[0] for r in (conn or self.conn).execute(
+                f"SELECT sha FROM indexed WHERE sha IN ({marks})", chunk
+            ))
+        return found
+
+    def _first_parents(self, shas):
+        parents = {}
+        if shas:
+            out = run_git(self.project_path, "rev-list", "--no-walk=unsorted", "--parents", *shas).decode()
+            for line in out.splitlines():
+                parts = line.split()
+                parents[parts[0]] = parts[1] if len(parts) > 1 else None
+        return parents
+
+    def _index_tree(self, conn, batch, sha, parent):
+        rows, probes = [], {}
+        for mode, obj_type, oid, size, path in list_tree(self.project_path, sha):
+            if obj_type != "blob" or not is_audio(path):
+                continue
+            key, local = oid, None
+            if size <= LFS_POINTER_MAX_SIZE:
+                pointer = parse_lfs_pointer(batch.read(oid) or b"")
+                if pointer:
+                    key, size = f"lfs:{pointer[0]}", pointer[1]
+                    candidate = lfs_object_path(self._git_dir, pointer[0])
+                    if not candidate.exists():
+                        rows.append((sha, path, key, size))   # not fetched — counted by size only
+                        continue
+                    local = str(candidate)
+            rows.append((sha, path, key, size))
+            probes[key] = (key, PurePosixPath(path).suffix, local, oid, size)
+        conn.executemany(
+            "INSERT OR REPLACE INTO snapshot_assets(sha, path, key, size) VALUES (?, ?, ?, ?)", rows
+        )
+        conn.execute("INSERT OR REPLACE INTO indexed(sha, parent) VALUES (?, ?)", (sha, parent))
+        return probes
+
+    def index_trees(self, shas, conn=None):
+        """
+        Indexes the trees of `shas` and their first parents (for "new since
+        previous take"). Returns {key: probe} for every audio file seen. Pass
+        no `conn` from a worker thread: it then uses a connection of its own.
+        """
+        own = conn is None
+        conn = self._connect() if own else conn
+        try:
+            shas = list(dict.fromkeys(shas))
+            parents = self._first_parents(shas)
+            todo = shas + [p for p in parents.values() if p]
+            done = self._indexed(todo, conn)
+            todo = [sha for sha in dict.fromkeys(todo) if sha not in done]
+            parents.update(self._first_parents([sha for sha in todo if sha not in parents]))
+
+            probes = {}
+            if todo:
+                with CatFileBatch(self.project_path) as batch:
+                    for sha in todo:
+                        probes.update(self._index_tree(conn, batch, sha, parents.get(sha)))
+                conn.commit()
+            return probes
+        finally:
+            if own:
+                conn.close()
+
+    def update(self, shas):
+        """
+        Indexes the trees of `shas` here and queues probes for audio not seen
+        before. Returns the number of files queued.
+        """
+        return self._queue_probes(self.index_trees(shas, self.conn))
+
+    def update_async(self, shas):
+        """
+        Indexes the trees of `shas` on a worker thread; `collect()` queues
+        their probes once it's done. Returns the number of takes handed over.
+        """
+        shas = [sha for sha in dict.fromkeys(shas) if sha not in self._indexing]
+        shas = [sha for sha in shas if sha not in self._indexed(shas)]
+        if not shas:
+            return 0
+        if self._tree_pool is None:
+            self._tree_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dawgit-audio-trees")
+        future = self._tree_pool.submit(self.index_trees, shas)
+        future.shas = shas
+        self._tree_futures.add(future)
+        self._indexing.update(shas)
+        return len(shas)
+
+    def _queue_probes(self, probes):
+        # Probes lost to a shutdown (probed = 0, nothing in flight) are simply queued again
+        known = set()
+        keys = [k for k in probes if k not in self._pending]
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            known.update(r[0] for r in self.conn.execute(
+                f"SELECT key FROM assets WHERE probed = 1 AND key IN ({marks})", chunk
+            ))
+        new = [probes[k] for k in keys if k not in known]
+        if not new:
+            return 0
+
+        self.conn.executemany("INSERT OR IGNORE INTO assets(key, size) VALUES (?, ?)",
+                              [(key, size) for key, _, _, _, size in new])
+        self.conn.commit()
+        for i in range(0, len(new), AUDIO_PROBE_BATCH):
+            items = [(key, suffix, local, blob) for key, suffix, local, blob, _ in new[i:i + AUDIO_PROBE_BATCH]]
+            self._futures.add(self._executor().submit(_probe_batch, str(self.project_path), items))
+            self._pending.update(item[0] for item in items)
+        print(f"[DEBUG] Audio index: probing {len(new)} new files")
+        return len(new)
+
+    def pending(self):
+        return bool(self._futures or self._tree_futures)
+
+    def wait(self, timeout=None):
+        """Blocks until queued work is done; tree indexing queues its probes only at `collect()`."""
+        wait(set(self._tree_futures) | set(self._futures), timeout=timeout)
+
+    def collect(self):
+        """
+        Queues probes for trees a worker finished indexing and stores results
+        of finished probes. Returns the number of takes indexed plus files
+        stored — anything above 0 means totals changed.
+        """
+        stored = 0
+        for future in [f for f in self._tree_futures if f.done()]:
+            self._tree_futures.discard(future)
+            self._indexing.difference_update(future.shas)
+            try:
+                self._queue_probes(future.result())
+            except Exception as e:
+                print(f"[WARN] Audio tree indexing failed: {e}")
+                continue
+            stored += len(future.shas)
+
+        finished = {f for f in self._futures if f.done()}
+        for future in finished:
+            self._futures.discard(future)
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"[WARN] Audio probe batch failed: {e}")
+                continue
+            for key, info in results:
+                self._pending.discard(key)
+                self.conn.execute(
+                    "UPDATE assets SET duration = ?, sample_rate = ?, channels = ?, bits = ?, format = ?, error = ?, "
+                    "probed = 1 WHERE key = ?",
+                    (info.get("duration"), info.get("sample_rate"), info.get("channels"), info.get("bits"),
+                     info.get("format"), info.get("error"), key)
+                )
+                stored += 1
+        if stored:
+            self.conn.commit()
+        return stored
+
+    def asset(self, key):
+        row = self.conn.execute(
+            "SELECT size, duration, sample_rate, channels, bits, format, error, probed FROM assets WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("size", "duration", "sample_rate", "channels", "bits", "format", "error", "probed"), row))
+
+    def totals(self, shas):
+        """
+        {sha: {"bytes", "files", "new", "waiting", "duration", "sample_rates", "bit_depths"}}
+        for indexed takes. `new` counts files whose content wasn't in the previous take;
+        `waiting` counts files still being probed (their details aren't in the totals yet).
+        """
+        result = {}
+        for sha in shas:
+            row = self.conn.execute("SELECT parent FROM indexed WHERE sha = ?", (sha,)).fetchone()
+            if row is None:
+                continue
+            parent = row[0]
+            files = self.conn.execute(
+                """
+                SELECT s.key, s.size, a.duration, a.sample_rate, a.bits, a.probed FROM snapshot_assets s
+                LEFT JOIN assets a ON a.key = s.key WHERE s.sha = ?
+                """,
+                (sha,)
+            ).fetchall()
+            previous = {r[0] for r in self.conn.execute("SELECT key FROM snapshot_assets WHERE sha = ?", (parent,))} \
+                if parent else set()
+            result[sha] = {
+                "bytes": sum(f[1] for f in files),
+                "files": len(files),
+                "new": sum(1 for f in files if f[0] not in previous),
+                "waiting": sum(1 for f in files if f[5] == 0),
+                "duration": sum(f[2] or 0 for f in files),
+                "sample_rates": sorted({f[3] for f in files if f[3]}),
+                "bit_depths": sorted({f[4] for f in files if f[4]}),
+            }
+        return result
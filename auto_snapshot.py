@@ -0,0 +1,224 @@
+# auto_snapshot.py
+import time
+import fnmatch
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from git import Repo
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from commit_pipeline import StatusSnapshot, commit_snapshot, take_status
+from daw_bundle import BundleDigest, daw_documents
+from git_objects import repo_lock
+from metadata_store import file_signature
+
+
+AUTO_SNAPSHOT_DEBOUNCE_MS = 3000        # a save burst must go quiet this long before we commit
+AUTO_SNAPSHOT_MIN_INTERVAL_S = 60       # never auto-commit more often than this
+AUTO_SNAPSHOT_MESSAGE = "Auto snapshot: {files}"
+AUTO_SNAPSHOT_LOCK_WAIT_S = 5           # then give up and retry after another debounce window
+
+# Files a DAW or the OS rewrites on its own — changes to only these never make a snapshot
+NOISE_PATTERNS = (
+    "*.asd", "*.tmp", "*.bak", "*.swp", "*.log", "*.als~", "*.logicx~",
+    ".DS_Store", "._*", "Icon\r", "Backup/*", "Ableton Project Info/*",
+    "PROJECT_MARKER.json", ".dawgit_roles.json", ".dawgit_roles.log",
+    ".dawgit_cache/*", ".dawgit_checkout_work/*",
+)
+
+
+def is_noise(path):
+    """True if a project-relative path is DAW/OS housekeeping rather than music."""
+    name = Path(path).name
+    return any(fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(name, pattern) for pattern in NOISE_PATTERNS)
+
+
+def _commit_in_background(project_path, message_template):
+    """
+    Worker-thread half of an auto snapshot. Uses its own Repo object — GitPython
+    repos are not shared across threads. Holds the repo lock so it never runs
+    alongside a checkout or commit started from the GUI.
+    """
+    lock = repo_lock(project_path)
+    if not lock.acquire(timeout=AUTO_SNAPSHOT_LOCK_WAIT_S):
+        return {"status": "skipped", "message": "Another git action is running.", "retry": True}
+    try:
+        return _commit_locked(Repo(project_path), message_template)
+    finally:
+        lock.release()
+
+
+def _commit_locked(repo, message_template):
+    if repo.head.is_detached:
+        # Detached HEAD is read-only snapshot mode — committing here would make an orphan take
+        return {"status": "skipped", "message": "Viewing an older snapshot — auto-save is paused."}
+    status = take_status(repo)
+    relevant = {path: code for path, code in status.changes.items() if not is_noise(path)}
+    if not relevant:
+        return {"status": "skipped", "message": "Only noise files changed."}
+
+    names = sorted(Path(p).name for p in relevant)
+    files = ", ".join(names[:3]) + (f" +{len(names) - 3}" if len(names) > 3 else "")
+    snapshot = StatusSnapshot(relevant, status.taken_at, status.elapsed)
+    return commit_snapshot(repo, message_template.format(files=files), status=snapshot)
+
+
+class AutoSnapshotEngine(QObject):
+    """
+    🎹 Commits automatically when the DAW finishes saving.
+
+    Watches the project folder (Ableton saves to a temp file and renames it over
+    the `.als`, which shows up as a directory change) and the session files
+    themselves. Every event restarts a debounce timer; when it fires, the session
+    files must have stopped changing size/mtime, and at least `min_interval_s`
+    must have passed since the last auto snapshot. The status scan and commit run
+    on a worker thread; results come back through Qt signals.
+
+    A `.logicx` bundle is watched folder by folder and compared by its
+    `BundleDigest`, which only rescans the folders that reported a change.
+    """
+
+    committed = pyqtSignal(dict)
+    skipped = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, project_path, debounce_ms=AUTO_SNAPSHOT_DEBOUNCE_MS,
+                 min_interval_s=AUTO_SNAPSHOT_MIN_INTERVAL_S, message=AUTO_SNAPSHOT_MESSAGE, parent=None):
+        super().__init__(parent)
+        self.project_path = Path(project_path)
+        self.debounce_ms = debounce_ms
+        self.min_interval_s = min_interval_s
+        self.message = message
+        self.last_commit_at = 0.0
+        self._signatures = {}
+        self._bundles = {}
+        self._future = None
+        self._rerun = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dawgit-autosnapshot")
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_fs_event)
+        self._watcher.fileChanged.connect(self._on_fs_event)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_quiet)
+
+        # Polls the worker from the GUI thread so results are delivered there
+        self._poll = QTimer(self)
+        self._poll.setInterval(50)
+        self._poll.timeout.connect(self._collect_result)
+
+    # --- lifecycle ---
+
+    def is_running(self):
+        return bool(self._watcher.directories())
+
+    def start(self):
+        if self.is_running():
+            return
+        self._watcher.addPath(str(self.project_path))
+        self._watch_session_files()
+        print(f"[DEBUG] Auto-snapshot watching {self.project_path}")
+
+    def stop(self):
+        self._timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        print("[DEBUG] Auto-snapshot stopped")
+
+    def shutdown(self):
+        """Stops watching and waits for an in-flight commit to finish."""
+        self.stop()
+        self._poll.stop()
+        self._executor.shutdown(wait=True)
+
+    # --- events ---
+
+    def _session_files(self):
+        return daw_documents(self.project_path)
+
+    def _bundle(self, path):
+        if path not in self._bundles:
+            self._bundles[path] = BundleDigest(path)
+        return self._bundles[path]
+
+    def _signature(self, path):
+        return self._bundle(path).digest() if path.is_dir() else file_signature(path)
+
+    def _watch_session_files(self):
+        # A rename-over-save replaces the inode, which drops the watch — re-add every time
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        for path in self._session_files():
+            targets = self._bundle(path).directories() if path.is_dir() else [str(path)]
+            new = [t for t in targets if t not in watched]
+            if new:
+                self._watcher.addPaths(new)
+
+    def _on_fs_event(self, path=None):
+        if path:
+            for root, bundle in self._bundles.items():
+                if path == str(root) or path.startswith(f"{root}/"):
+                    # Folder watches miss files rewritten in place, so one event
+                    # anywhere in the bundle re-stats all of it (nothing is read)
+                    bundle.invalidate(None)
+        self._watch_session_files()
+        self.notify_saved()
+
+    def notify_saved(self):
+        """Records a save event and (re)starts the debounce window."""
+        self._signatures = {p: self._signature(p) for p in self._session_files()}
+        self._timer.start(self.debounce_ms)
+
+    def _on_quiet(self):
+        # Still being written? A growing/moving file means the DAW is mid-save.
+        # Bundles are rescanned too: writes into existing files raise no folder event.
+        for bundle in self._bundles.values():
+            bundle.invalidate(None)
+        current = {p: self._signature(p) for p in self._session_files()}
+        if current != self._signatures:
+            self._signatures = current
+            self._timer.start(self.debounce_ms)
+            return
+
+        wait_s = self.last_commit_at + self.min_interval_s - time.monotonic()
+        if self.last_commit_at and wait_s > 0:
+            self._timer.start(int(wait_s * 1000) + 1)
+            return
+
+        self.commit_now()
+
+    # --- committing ---
+
+    def commit_now(self):
+        """Starts a background snapshot; if one is already running, another follows it."""
+        if self._future is not None:
+            self._rerun = True
+            return
+        self._future = self._executor.submit(_commit_in_background, str(self.project_path), self.message)
+        self._poll.start()
+
+    def _collect_result(self):
+        if self._future is None or not self._future.done():
+            return
+        future, self._future = self._future, None
+        self._poll.stop()
+
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"[ERROR] Auto snapshot failed: {e}")
+            self.failed.emit(str(e))
+        else:
+            if result["status"] == "success":
+                self.last_commit_at = time.monotonic()
+                self.committed.emit(result)
+            else:
+                print(f"[DEBUG] Auto snapshot skipped: {result['message']}")
+                self.skipped.emit(result["message"])
+                self._rerun = self._rerun or result.get("retry", False)
+
+        if self._rerun:
+            self._rerun = False
+            self._timer.start(self.debounce_ms)
@@ -0,0 +1,233 @@
+# backup_catalog.py
+import json
+import shutil
+import time
+from pathlib import Path
+from datetime import datetime
+
+from metadata_store import cache_dir
+from snapshot_export import atomic_write_json, hash_file
+
+
+CATALOG_FILENAME = "backup_catalog.json"
+BACKUP_MAX_BYTES = 5 * 1024 ** 3      # 5 GB across all catalogued backups
+BACKUP_MAX_AGE_DAYS = 30
+BACKUP_KEEP_MIN = 3                   # never evict the newest N backups
+
+
+def catalog_path(project_path):
+    return cache_dir(project_path) / CATALOG_FILENAME
+
+
+class BackupCatalog:
+    """
+    🗂️ Index of every backup DAW Git has made for a project.
+
+    Each entry records where the backup lives, which project files it holds, and
+    their sizes and SHA-256 hashes, so a single file can be restored from any
+    backup without walking backup folders. Retention is enforced by age and total
+    size, evicting least-recently-used backups first.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self.path = catalog_path(self.project_path)
+        self.data = self._load()
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                if isinstance(data.get("backups"), list):
+                    return data
+            except Exception as e:
+                print(f"[WARN] Ignoring unreadable backup catalog {self.path}: {e}")
+        return {"project": self.project_path.name, "backups": []}
+
+    def save(self):
+        cache_dir(self.project_path)     # recreated with its .gitignore if it was removed
+        atomic_write_json(self.path, self.data)
+
+    @property
+    def backups(self):
+        return self.data["backups"]
+
+    def get(self, backup_id):
+        return next((b for b in self.backups if b["id"] == backup_id), None)
+
+    def latest(self, kind=None):
+        """Newest backup (optionally of one kind) whose files are still on disk."""
+        for entry in sorted(self.backups, key=lambda b: b["created"], reverse=True):
+            if kind and entry["kind"] != kind:
+                continue
+            if Path(entry["root"]).exists():
+                return entry
+        return None
+
+    def _known_hash(self, rel_path, size, mtime_ns):
+        """Reuses a hash from an earlier backup when the stored copy has the same size and mtime."""
+        for entry in reversed(self.backups):
+            record = entry["files"].get(rel_path)
+            if record and record["size"] == size and record.get("mtime_ns") == mtime_ns:
+                return record["sha256"]
+        return None
+
+    def register(self, kind, root, files, owns_root=True, label=None):
+        """
+        Records a backup that has just been written.
+
+        `files` maps project-relative paths to the stored copy's path relative to
+        `root`. `owns_root` is False when several backups share a folder (e.g. the
+        project's `Backup/` dir) so eviction deletes only this backup's files.
+        """
+        root = Path(root)
+        now = time.time()
+        records = {}
+        total = 0
+        for rel_path, stored in files.items():
+            stored_path = root / stored
+            if not stored_path.is_file():
+                continue
+            st = stored_path.stat()
+            sha = self._known_hash(rel_path, st.st_size, st.st_mtime_ns) or hash_file(stored_path)
+            records[rel_path] = {
+                "stored": Path(stored).as_posix(),
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sha256": sha,
+            }
+            total += st.st_size
+
+        entry = {
+            "id": f"{kind}-{datetime.fromtimestamp(now).strftime('%Y%m%d-%H%M%S-%f')}",
+            "kind": kind,
+            "label": label,
+            "root": str(root),
+            "owns_root": owns_root,
+            "created": now,
+            "last_used": now,
+            "bytes": total,
+            "files": records,
+        }
+        self.backups.append(entry)
+        self.save()
+        print(f"[DEBUG] Catalogued {kind} backup {entry['id']} ({len(records)} files, {total} bytes)")
+        return entry
+
+    def register_folder(self, kind, folder, owns_root=True, label=None):
+        """Catalogues every file under `folder`, stored under the same relative path."""
+        folder = Path(folder)
+        files = {
+            p.relative_to(folder).as_posix(): p.relative_to(folder).as_posix()
+            for p in folder.rglob("*") if p.is_file()
+        }
+        return self.register(kind, folder, files, owns_root=owns_root, label=label)
+
+    def find_file(self, rel_path, backup_id=None):
+        """
+        Returns (entry, stored Path) for `rel_path` from the given backup, or from
+        the newest backup that contains it.
+        """
+        candidates = [self.get(backup_id)] if backup_id else sorted(
+            self.backups, key=lambda b: b["created"], reverse=True
+        )
+        for entry in candidates:
+            if not entry or rel_path not in entry["files"]:
+                continue
+            stored = Path(entry["root"]) / entry["files"][rel_path]["stored"]
+            if stored.exists():
+                return entry, stored
+        return None, None
+
+    def restore_file(self, rel_path, backup_id=None, dest_root=None, verify=True):
+        """📥 Copies one file out of a backup into the project. Returns the restored Path or None."""
+        dest = self._restore(rel_path, backup_id, dest_root, verify)
+        if dest:
+            self.save()
+        return dest
+
+    def restore_backup(self, backup_id, dest_root=None):
+        """Restores every file recorded in one backup, saving the catalog once. Returns the restored paths."""
+        entry = self.get(backup_id)
+        if not entry:
+            return []
+        restored = []
+        for rel_path in entry["files"]:
+            dest = self._restore(rel_path, backup_id, dest_root)
+            if dest:
+                restored.append(dest)
+        if restored:
+            self.save()
+        return restored
+
+    def _restore(self, rel_path, backup_id=None, dest_root=None, verify=True):
+        """Copies one file out and marks its backup used, without saving the catalog."""
+        entry, stored = self.find_file(rel_path, backup_id)
+        if not entry:
+            print(f"[WARN] No backup holds {rel_path}")
+            return None
+
+        if verify and hash_file(stored) != entry["files"][rel_path]["sha256"]:
+            print(f"[ERROR] Backup copy of {rel_path} in {entry['id']} is corrupt — not restoring")
+            return None
+
+        dest = Path(dest_root or self.project_path) / rel_path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(stored, dest)
+        entry["last_used"] = time.time()
+        return dest
+
+    def _delete(self, entry, keep=()):
+        """Removes a backup's files. A root another entry in `keep` still uses is never removed."""
+        root = Path(entry["root"])
+        shared = any(Path(other["root"]) == root for other in keep if other["id"] != entry["id"])
+        if entry.get("owns_root", True):
+            if shared:
+                print(f"[DEBUG] Keeping {root} — still used by another backup")
+            else:
+                shutil.rmtree(root, ignore_errors=True)
+        else:
+            for record in entry["files"].values():
+                (root / record["stored"]).unlink(missing_ok=True)
+
+    def enforce_retention(self, max_bytes=BACKUP_MAX_BYTES, max_age_days=BACKUP_MAX_AGE_DAYS,
+                          keep_min=BACKUP_KEEP_MIN, dry_run=False):
+        """
+        🧹 Evicts backups older than `max_age_days`, then least-recently-used backups
+        until the total is under `max_bytes`. The newest `keep_min` are always kept.
+        Entries whose folders were deleted by hand are dropped from the catalog.
+        Returns the list of evicted entries.
+        """
+        live = [b for b in self.backups if Path(b["root"]).exists()]
+        newest = sorted(live, key=lambda b: b["created"], reverse=True)
+        protected = {b["id"] for b in newest[:keep_min]}
+
+        evicted = []
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+        if cutoff is not None:
+            evicted += [b for b in live if b["id"] not in protected and b["created"] < cutoff]
+
+        remaining = [b for b in live if b not in evicted]
+        total = sum(b["bytes"] for b in remaining)
+        if max_bytes is not None:
+            for entry in sorted(remaining, key=lambda b: b["last_used"]):
+                if total <= max_bytes:
+                    break
+                if entry["id"] in protected:
+                    continue
+                evicted.append(entry)
+                total -= entry["bytes"]
+
+        if dry_run:
+            return evicted
+
+        evicted_ids = {b["id"] for b in evicted}
+        kept = [b for b in live if b["id"] not in evicted_ids]
+        for entry in evicted:
+            print(f"[DEBUG] Evicting backup {entry['id']} ({entry['bytes']} bytes)")
+            self._delete(entry, keep=kept)
+
+        self.data["backups"] = [b for b in live if b["id"] not in evicted_ids]
+        self.save()
+        return evicted
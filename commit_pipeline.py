@@ -0,0 +1,125 @@
+# commit_pipeline.py
+import os
+import time
+import tempfile
+
+
+NOTHING_TO_COMMIT_MSG = "Nothing new to commit — your project hasn't changed."
+STATUS_ARGS = ("--porcelain=v1", "-z", "--no-renames", "--untracked-files=all")
+
+
+class StatusSnapshot:
+    """
+    📋 One `git status` pass: {path: XY code} for every changed, deleted or
+    untracked path, plus when it was taken. Ignored files never appear.
+    """
+
+    def __init__(self, changes, taken_at, elapsed=0.0):
+        self.changes = changes
+        self.taken_at = taken_at
+        self.elapsed = elapsed
+
+    @property
+    def paths(self):
+        return list(self.changes)
+
+    def is_clean(self):
+        return not self.changes
+
+
+def parse_status(raw):
+    """{path: XY code} from `git status --porcelain=v1 -z --no-renames` output."""
+    return {entry[3:]: entry[:2] for entry in raw.split("\0") if len(entry) > 3}
+
+
+def take_status(repo):
+    """
+    Reads the working-tree status once with `git status --porcelain -z`.
+    Git only re-hashes files whose stat data changed, so this is the single
+    tree scan a commit needs.
+    """
+    start = time.perf_counter()
+    raw = repo.git.status(*STATUS_ARGS)
+    return StatusSnapshot(parse_status(raw), time.time(), time.perf_counter() - start)
+
+
+def _index_info(repo, paths, prehashed):
+    """`update-index --index-info` lines for paths whose blob was hashed ahead of time."""
+    lines, staged = [], []
+    for path in paths:
+        oid = prehashed(path)
+        full = os.path.join(repo.working_tree_dir, path)
+        if not oid or os.path.islink(full):
+            continue
+        mode = "100755" if os.access(full, os.X_OK) else "100644"
+        lines.append(f"{mode} {oid}\t{path}")
+        staged.append(path)
+    return lines, staged
+
+
+def stage_paths(repo, paths, prehashed=None):
+    """
+    Stages exactly `paths` (additions, edits and deletions) in one `git add`,
+    fed NUL-separated on stdin so no path is globbed or length-limited.
+
+    `prehashed(path)` may return a blob id written ahead of time (see
+    prehash.py); those paths go straight into the index with
+    `update-index --index-info` instead of being read again by `git add`.
+    """
+    paths = list(paths)
+    total = len(paths)
+    if prehashed:
+        lines, staged = _index_info(repo, paths, prehashed)
+        if lines:
+            with tempfile.TemporaryFile() as info:
+                info.write("\0".join(lines).encode("utf-8", "surrogateescape") + b"\0")
+                info.seek(0)
+                repo.git.execute(["git", "update-index", "--add", "-z", "--index-info"], istream=info)
+            staged = set(staged)
+            paths = [path for path in paths if path not in staged]
+    if not paths:
+        return total
+    with tempfile.TemporaryFile() as pathspec:
+        pathspec.write("\0".join(paths).encode("utf-8") + b"\0")
+        pathspec.seek(0)
+        repo.git.execute(
+            ["git", "--literal-pathspecs", "add", "--all", "--pathspec-from-file=-", "--pathspec-file-nul"],
+            istream=pathspec
+        )
+    return total
+
+
+def commit_snapshot(repo, message, status=None, prehashed=None):
+    """
+    💾 Stages the paths from a status snapshot and commits them.
+
+    Pass `status` to reuse a snapshot the caller already took; otherwise one
+    is taken here. `prehashed` is handed to `stage_paths`.
+    Returns {"status": "success", "sha", "files", "timings"}
+    or {"status": "error", "message"}. `timings` holds seconds per phase.
+    """
+    timings = {}
+    total_start = time.perf_counter()
+
+    if status is None:
+        status = take_status(repo)
+    timings["status"] = status.elapsed
+
+    if status.is_clean():
+        return {"status": "error", "message": NOTHING_TO_COMMIT_MSG, "timings": timings}
+
+    start = time.perf_counter()
+    stage_paths(repo, status.paths, prehashed=prehashed)
+    timings["stage"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    repo.git.commit("-q", "-m", message)
+    sha = repo.head.commit.hexsha
+    timings["commit"] = time.perf_counter() - start
+
+    timings["total"] = time.perf_counter() - total_start
+    print(
+        f"[DEBUG] Committed {len(status.changes)} paths as {sha[:7]} — "
+        + ", ".join(f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in timings.items())
+    )
+    return {"status": "success", "sha": sha, "files": status.paths, "timings": timings}
@@ -0,0 +1,172 @@
+# daw_bundle.py
+import os
+import shutil
+import hashlib
+from pathlib import Path, PurePosixPath
+
+
+DAW_DOCUMENT_SUFFIXES = (".als", ".logicx")
+BUNDLE_SUFFIXES = (".logicx",)          # directory bundles: one document, many files
+
+
+def is_bundle(path):
+    path = Path(path)
+    return path.suffix in BUNDLE_SUFFIXES and path.is_dir()
+
+
+def daw_documents(folder):
+    """
+    DAW session documents directly in `folder`: `.als` files and `.logicx`
+    bundles, each as one Path. One `scandir`, never descends into bundles.
+    """
+    documents = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if Path(entry.name).suffix in DAW_DOCUMENT_SUFFIXES:
+                    documents.append(Path(entry.path))
+    except FileNotFoundError:
+        return []
+    return sorted(documents)
+
+
+def document_of(rel_path):
+    """
+    The DAW document a repo-relative path belongs to: the bundle for files
+    inside a `.logicx`, the path itself for an `.als`, else None.
+    """
+    parts = PurePosixPath(rel_path).parts
+    for i, part in enumerate(parts):
+        if PurePosixPath(part).suffix in BUNDLE_SUFFIXES:
+            return "/".join(parts[:i + 1])
+    return rel_path if PurePosixPath(rel_path).suffix in DAW_DOCUMENT_SUFFIXES else None
+
+
+def group_by_document(paths):
+    """Collapses paths inside bundles to the bundle: {path or bundle: [paths]}, order kept."""
+    grouped = {}
+    for path in paths:
+        grouped.setdefault(document_of(path) or path, []).append(path)
+    return grouped
+
+
+def document_files(document):
+    """Files making up a document: the file itself, or every file in the bundle."""
+    document = Path(document)
+    if not document.is_dir():
+        return [document]
+    return sorted(p for p in document.rglob("*") if p.is_file())
+
+
+def copy_document(src, dest):
+    """Copies an `.als` file or a whole `.logicx` bundle (replacing an older copy of the bundle)."""
+    src, dest = Path(src), Path(dest)
+    if src.is_dir():
+        if dest.exists():
+            shutil.rmtree(dest)
+        shutil.copytree(src, dest, symlinks=True)
+    else:
+        shutil.copy2(src, dest)
+    return dest
+
+
+class BundleDigest:
+    """
+    🌳 Merkle-style digest of a `.logicx` bundle.
+
+    Each directory's digest hashes its children's names with their digests
+    (files use size + mtime, like git's index, so nothing is read). Directories
+    are rescanned only after `invalidate()` and only their ancestors are
+    rehashed. Folder watches don't fire when a file is rewritten in place, so
+    the auto-snapshot engine invalidates the whole bundle on any event under
+    it: a check is then one `scandir` per folder, still without reading a file.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._entries = {}    # rel dir → {name: ("f", signature) | ("d", None)}
+        self._digests = {}    # rel dir → digest
+        self._dirty = {""}    # "" is the bundle root
+        self.scans = 0
+
+    def invalidate(self, path=None):
+        """Marks the directory holding `path` (or the whole bundle) for a rescan."""
+        if path is None:
+            self._dirty = {""} | set(self._entries)
+            return
+        path = Path(path)
+        try:
+            rel = path.relative_to(self.root).as_posix()
+        except ValueError:
+            return
+        rel = "" if rel == "." else rel
+        while rel and rel not in self._entries:   # a file, or a folder we haven't seen yet
+            rel = str(PurePosixPath(rel).parent)
+            rel = "" if rel == "." else rel
+        self._dirty.add(rel)
+
+    def directories(self):
+        """Every directory in the bundle (absolute), e.g. to watch for changes."""
+        self.digest()
+        return [str(self.root / rel) if rel else str(self.root) for rel in sorted(self._entries)]
+
+    def _scan(self, rel):
+        self.scans += 1
+        entries = {}
+        try:
+            with os.scandir(self.root / rel) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        entries[entry.name] = ("d", None)
+                    else:
+                        st = entry.stat(follow_symlinks=False)
+                        entries[entry.name] = ("f", f"{st.st_size}:{st.st_mtime_ns}:{st.st_mode & 0o111}")
+        except FileNotFoundError:
+            return None
+        return entries
+
+    def _drop(self, rel):
+        prefix = f"{rel}/"
+        for key in [k for k in self._entries if k == rel or k.startswith(prefix)]:
+            self._entries.pop(key, None)
+            self._digests.pop(key, None)
+
+    def digest(self):
+        """Current digest, rescanning only invalidated directories. None if the bundle is gone."""
+        stale = set()
+        queue = sorted(self._dirty)
+        self._dirty = set()
+        while queue:
+            rel = queue.pop()
+            entries = self._scan(rel)
+            if entries is None:
+                self._drop(rel)
+                if not rel:
+                    return None
+                continue
+            previous = self._entries.get(rel, {})
+            for name, (kind, _) in previous.items():
+                if kind == "d" and entries.get(name, ("f",))[0] != "d":
+                    self._drop(f"{rel}/{name}" if rel else name)
+            for name, (kind, _) in entries.items():
+                child = f"{rel}/{name}" if rel else name
+                if kind == "d" and child not in self._entries:
+                    queue.append(child)
+            self._entries[rel] = entries
+            stale.add(rel)
+
+        # Rehash stale directories and their ancestors, deepest first
+        for rel in list(stale):
+            while rel:
+                rel = str(PurePosixPath(rel).parent)
+                rel = "" if rel == "." else rel
+                stale.add(rel)
+        for rel in sorted(stale, key=lambda r: (r.count("/") + bool(r)), reverse=True):
+            if rel not in self._entries:
+                continue
+            h = hashlib.sha1()
+            for name, (kind, signature) in sorted(self._entries[rel].items()):
+                child = f"{rel}/{name}" if rel else name
+                h.update(f"{kind} {name} {signature if kind == 'f' else self._digests.get(child)}\n".encode())
+            self._digests[rel] = h.hexdigest()
+        return self._digests.get("")
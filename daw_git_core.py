@@ -1,5 +1,4 @@
 import os
-import json
 import subprocess
 import shutil
 import re
@@ -7,6 +6,13 @@ from pathlib import Path
 from datetime import datetime
 from git import Repo, GitCommandError
 
+from backup_catalog import BackupCatalog
+from commit_pipeline import commit_snapshot
+from ref_transaction import RefTransaction
+from daw_bundle import daw_documents
+from metadata_store import RoleStore, cache_dir
+from role_notes import read_role_notes, set_role_note
+
 
 def sanitize_git_input(user_input: str, allow_spaces=False):
     """Remove dangerous characters and enforce safe Git naming."""
@@ -49,7 +55,7 @@ class GitProjectManager:
             print("❌ Invalid or missing project path. Aborting Git setup.")
             return {"status": "invalid", "message": "Missing or invalid project path."}
 
-        daw_files = list(self.project_path.glob("*.als")) + list(self.project_path.glob("*.logicx"))
+        daw_files = daw_documents(self.project_path)
         print(f"[DEBUG] Found DAW files: {daw_files}")
 
         is_test_mode = os.getenv("DAWGIT_TEST_MODE") == "1"
@@ -94,7 +100,7 @@ class GitProjectManager:
                 self.repo = Repo.init(self.project_path)
 
                 default_ignores = {
-                    ".DS_Store", "PROJECT_MARKER.json", ".dawgit_roles.json",
+                    ".DS_Store", "PROJECT_MARKER.json", ".dawgit_roles.json", ".dawgit_roles.log",
                     "*.asd", "*.bak", "*.tmp", "*.swp", "Ableton Project Info/*"
                 }
 
@@ -136,28 +142,35 @@ class GitProjectManager:
         return {"status": "ok"}
     
 
-    def commit_changes(self, message):
+    def commit_changes(self, message, status=None, prehashed=None):
+        """
+        Commits exactly the paths that changed. `status` may be a StatusSnapshot
+        the caller already took (see `commit_pipeline.take_status`); otherwise one is taken.
+        `prehashed` looks up blob ids hashed in the background (see prehash.py).
+        """
         if not self.repo:
             return {"status": "error", "message": "No Git repo available."}
 
         if not message or not message.strip():
             return {"status": "error", "message": "Commit message cannot be empty."}
 
-        daw_files = list(self.project_path.glob("*.als")) + list(self.project_path.glob("*.logicx"))
+        daw_files = daw_documents(self.project_path)
         if not daw_files:
             return {"status": "error", "message": "No DAW file to commit."}
 
         try:
-            self.repo.git.add(A=True)
-            self.repo.git.commit("-m", message.strip())
-            sha = self.repo.head.commit.hexsha
-            return {"status": "success", "sha": sha}
+            result = commit_snapshot(self.repo, message.strip(), status=status, prehashed=prehashed)
         except GitCommandError as e:
-            msg = str(e)
-            if "nothing to commit" in msg:
-                return {"status": "error", "message": "Nothing new to commit — your project hasn't changed."}
-            return {"status": "error", "message": msg}
-        
+            return {"status": "error", "message": str(e)}
+        if result["status"] == "success":
+            self.last_commit_timings = result["timings"]
+        return result
+
+
+    def ref_transaction(self):
+        """Batch of tag/branch creations and deletions applied in one `git update-ref --stdin`."""
+        return RefTransaction(self.project_path)
+
 
     def get_current_branch(self):
         try:
@@ -202,27 +215,34 @@ class GitProjectManager:
             return "(detached)"
 
 
+    @property
+    def role_store(self):
+        """RoleStore for this project, loaded once and kept in memory."""
+        store = getattr(self, "_role_store", None)
+        if store is None or store.project_path != Path(self.project_path):
+            store = RoleStore(self.project_path)
+            self._role_store = store
+        return store
+
+
     def assign_commit_role(self, sha, role):
-        meta_file = self.project_path / ".dawgit_roles.json"
-        roles = {}
-        if meta_file.exists():
+        self.role_store.set(sha, role)
+        if self.repo:
             try:
-                roles = json.loads(meta_file.read_text())
-            except Exception:
-                roles = {}
-        roles[sha] = role
-        meta_file.write_text(json.dumps(roles, indent=2))
+                set_role_note(self.project_path, sha, role)
+            except Exception as e:
+                print(f"[WARN] Could not write role note for {sha[:7]}: {e}")
         return True
 
 
     def get_commit_roles(self):
-        meta_file = self.project_path / ".dawgit_roles.json"
-        if meta_file.exists():
+        roles = dict(self.role_store.roles)
+        if self.repo:
             try:
-                return json.loads(meta_file.read_text())
-            except Exception:
-                return {}
-        return {}
+                roles.update(read_role_notes(self.project_path))
+            except Exception as e:
+                print(f"[WARN] Role notes unavailable: {e}")
+        return roles
 
 
     def custom_env(self):
@@ -298,7 +318,7 @@ def backup_latest_commit_state(repo, project_path, commit_sha=None):
         return
 
     latest_commit = commit_sha or repo.head.commit.hexsha
-    backup_dir = project_path / ".dawgit_cache" / "latest_snapshot" / latest_commit
+    backup_dir = cache_dir(project_path) / "latest_snapshot" / latest_commit
 
     if backup_dir.exists():
         print(f"[backup] Already safe — folder exists for: {latest_commit}")
@@ -319,3 +339,7 @@ def backup_latest_commit_state(repo, project_path, commit_sha=None):
         except Exception as e:
             print(f"[backup] Failed to copy {item.name}: {e}")
 
+    catalog = BackupCatalog(project_path)
+    catalog.register_folder("commit", backup_dir, label=latest_commit)
+    catalog.enforce_retention()
+
@@ -5,6 +5,8 @@ from ui_strings import SNAPSHOT_MODE_UNKNOWN
 import os
 import sys
 import re
+import inspect
+import functools
 import fnmatch
 import json
 import signal
@@ -16,11 +18,55 @@ from pathlib import Path
 from datetime import datetime
 import traceback
 
+# --- Helper entry points ---
+# The packaged app is its own interpreter: audio-probe workers (spawned by the
+# audio index) and git's .als filter (`als-filter process`) both start it
+# again, and neither may build a QApplication or open windows
+import multiprocessing
+from als_filter import ALS_FILTER_ENTRY, main as als_filter_main
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if sys.argv[1:2] == [ALS_FILTER_ENTRY]:
+        sys.exit(als_filter_main(sys.argv[2:]))
+
 # --- App Modules ---
 from gui_layout import build_main_ui
 from daw_git_core import GitProjectManager
 from pages_controller import PagesController
 from daw_git_core import sanitize_git_input
+from snapshot_export import export_incremental, export_commit_archive, archive_name
+from snapshot_import import import_changed_files
+from backup_catalog import BackupCatalog
+from history_search import HistoryIndex, SEARCH_RESULT_LIMIT, parse_query
+from path_history import PathHistoryIndex
+from commit_pipeline import commit_snapshot
+from git_objects import repo_lock
+from auto_snapshot import AutoSnapshotEngine
+from prehash import Prehasher, PREHASH_SCAN_INTERVAL_MS
+from repo_maintenance import MaintenanceScheduler
+from ancestry import Ancestry
+from ref_transaction import RefTransactionError
+from lfs_store import LFS_PLAN_POLL_INTERVAL_MS, LfsStore
+from repo_analytics import ANALYTICS_POLL_INTERVAL_MS, RepoAnalytics
+from als_analyzer import AlsAnalyzer, ALS_POLL_INTERVAL_MS, format_summary_tooltip
+from als_diff import AlsDiffer, format_als_diff
+from als_filter import ensure_als_filter_config
+from sample_index import SampleIndex
+from audio_index import AudioIndex, AUDIO_POLL_INTERVAL_MS, format_size
+from peaks import PeakCache, PEAK_POLL_INTERVAL_MS
+from audio_diff import AudioDiffer, comparable_audio
+from daw_bundle import copy_document, daw_documents, document_files, document_of, group_by_document
+from metadata_store import RoleStore, ROLE_COMPACT_DELAY_MS, ROLES_LOG_NAME, METADATA_FLUSH_DELAY_MS, metadata_cache
+from role_notes import (
+    ROLE_NOTES_REF,
+    clear_role_note,
+    configure_notes_fetch,
+    configure_notes_rewrite,
+    push_role_notes,
+    read_role_notes,
+    set_role_note,
+    write_role_notes
+)
 from ui_strings import (
     # === General Status & Info ===
     STATUS_READY,
@@ -102,6 +148,8 @@ from ui_strings import (
     REBASE_FAILED_TITLE,
     REBASE_FAILED_MSG,
     UNEXPECTED_ERROR_TITLE,
+    CLEANUP_FAILED_TITLE,
+    CLEANUP_FAILED_MSG,
     UNEXPECTED_ERROR_MSG,
     UNEXPECTED_ISSUE_TITLE,
     UNEXPECTED_ISSUE_MSG,
@@ -123,6 +171,51 @@ from ui_strings import (
     BACKUP_RESTORED_MSG,
     NO_BACKUP_FOUND_TITLE,
     NO_BACKUP_FOUND_MSG,
+    EXPORT_SNAPSHOT_DONE_MSG,
+    EXPORT_ARCHIVE_ACTION,
+    EXPORT_ARCHIVE_DONE_MSG,
+    IMPORT_SNAPSHOT_DONE_MSG,
+
+    # === Auto Save ===
+    AUTO_SNAPSHOT_ENABLED_MSG,
+    AUTO_SNAPSHOT_DISABLED_MSG,
+    AUTO_SNAPSHOT_SAVED_MSG,
+    AUTO_SNAPSHOT_FAILED_MSG,
+    MAINTENANCE_DONE_MSG,
+    SIZE_ADDED_MSG,
+    SIZE_ADDED_TOOLTIP,
+    LFS_PRUNE_TITLE,
+    LFS_PRUNE_CONFIRM_MSG,
+    LFS_PRUNE_NOTHING_MSG,
+    LFS_PRUNE_NO_REMOTE_MSG,
+    LFS_PRUNE_UNPUSHED_MSG,
+    LFS_PRUNE_DONE_MSG,
+    LFS_PRUNE_OVER_BUDGET_MSG,
+    LFS_PRUNE_CHECKING_MSG,
+    LFS_PRUNE_FAILED_MSG,
+    # === History Search ===
+    CHANGED_FILES_MORE,
+    SEARCH_RESULTS_MSG,
+    SEARCH_NO_RESULTS_MSG,
+    ALS_DIFF_TITLE,
+    ALS_DIFF_NO_CHANGES,
+    ALS_DIFF_UNAVAILABLE,
+    WAVEFORM_LOADING,
+    WAVEFORM_UNAVAILABLE,
+    WAVEFORM_TOOLTIP,
+    AUDIO_DIFF_LOADING,
+    AUDIO_DIFF_UNAVAILABLE,
+    AUDIO_DIFF_SUMMARY,
+    AUDIO_DIFF_NO_CHANGES,
+    AUDIO_DIFF_OFFSET,
+    SAMPLES_OK,
+    CHANGED_BUNDLE_FILES,
+    SAMPLES_MISSING,
+    SAMPLES_MISSING_TOOLTIP,
+    SAMPLES_EXTERNAL_TOOLTIP,
+    AUDIO_TOTALS_MSG,
+    AUDIO_TOTALS_TOOLTIP,
+    AUDIO_TOTALS_PENDING_TOOLTIP,
 
     # === Remote ===
     REMOTE_ADDED_TITLE,
@@ -199,7 +292,7 @@ from PyQt6.QtWidgets import (
     QTableWidget, QMenu, QWidget, QVBoxLayout, QLabel, 
     QStackedWidget
 )
-from PyQt6.QtGui import QAction  # ✅ Add this
+from PyQt6.QtGui import QAction, QColor  # ✅ Add this
 from PyQt6.QtCore import Qt, QSettings, QTimer, pyqtSlot
 from PyQt6.QtGui import QAction
 
@@ -213,10 +306,30 @@ class NumericItem(QTableWidgetItem):
             return self.number < other.number
         return super().__lt__(other)
     
+
+def holds_repo_lock(method):
+    """
+    Runs a GUI git action under the repo lock, so a background auto snapshot
+    never commits while a checkout, switch or commit is half done.
+    """
+    code = method.__code__
+    max_args = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount - 1
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if max_args is not None:
+            args = args[:max_args]     # Qt passes extra signal arguments (e.g. `checked`) slots may not take
+        if not getattr(self, "project_path", None):
+            return method(self, *args, **kwargs)
+        with repo_lock(self.project_path):
+            return method(self, *args, **kwargs)
+    return wrapper
+
 # from PyQt6.QtWidgets import 
 
 # --- App Bootstrap ---
-if QApplication.instance() is None:
+# (not in spawned workers, which re-import this script as __mp_main__)
+if QApplication.instance() is None and __name__ != "__mp_main__":
     _app = QApplication(sys.argv)
 
 # --- Developer Configuration ---
@@ -502,24 +615,37 @@ class DAWGitApp(QMainWindow):
 
         timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
         backup_files = []
+        catalog_files = {}
 
-        # Backup DAW files
-        for ext in ("*.als", "*.logicx"):
-            for file in self.project_path.glob(ext):
-                backup_name = f"{file.stem} [{timestamp}]{file.suffix}"
-                dest = backup_dir / backup_name
-                shutil.copy2(file, dest)
-                backup_files.append(str(dest.relative_to(self.project_path)))
+        # Backup DAW documents (a .logicx bundle is copied whole)
+        for file in daw_documents(self.project_path):
+            backup_name = f"{file.stem} [{timestamp}]{file.suffix}"
+            dest = copy_document(file, backup_dir / backup_name)
+            backup_files.append(str(dest.relative_to(self.project_path)))
+            for part in document_files(file):
+                inner = part.relative_to(file).as_posix()   # "." for a single-file document
+                if inner == ".":
+                    catalog_files[file.name] = backup_name
+                else:
+                    catalog_files[f"{file.name}/{inner}"] = f"{backup_name}/{inner}"
 
-        # Backup role data
+        # Backup role data (fold any pending log records into the snapshot first)
+        if getattr(self, "role_store", None):
+            self.save_commit_roles()
         roles_file = self.project_path / ".dawgit_roles.json"
         if roles_file.exists():
             dest = backup_dir / f"dawgit_roles_backup_{timestamp}.json"
             shutil.copy2(roles_file, dest)
             backup_files.append(str(dest.relative_to(self.project_path)))
+            catalog_files[roles_file.name] = dest.name
 
         print(f"[DEBUG] Backed up: {backup_files}")
 
+        # 🗂️ Backup/ is shared by every run, so eviction only removes this run's files
+        catalog = BackupCatalog(self.project_path)
+        catalog.register("daw", backup_dir, catalog_files, owns_root=False, label=timestamp)
+        catalog.enforce_retention()
+
         # ✅ Update PROJECT_MARKER.json
         if hasattr(self, "project_marker"):
             self.project_marker.setdefault("backup_info", {})["last_backup_time"] = datetime.now().isoformat()
@@ -537,25 +663,161 @@ class DAWGitApp(QMainWindow):
             self.project_marker = {}
             return
 
+        # 📇 Served from memory unless the file's mtime/size changed on disk
         marker_path = Path(self.project_path) / "PROJECT_MARKER.json"
-        if marker_path.exists():
-            try:
-                with open(marker_path, "r") as f:
-                    self.project_marker = json.load(f)
-                    print(f"[DEBUG] Loaded PROJECT_MARKER.json from {marker_path}")
-            except Exception as e:
-                print(f"[ERROR] Failed to load PROJECT_MARKER.json: {e}")
-                self.project_marker = {}
-        else:
-            self.project_marker = {}
-            print("[DEBUG] No PROJECT_MARKER.json found — using defaults")
+        self.project_marker = metadata_cache.get(marker_path)
 
 
     def handle_auto_save_toggle(self, state):
         if state == Qt.CheckState.Checked.value:
-            self.status_message("✅ Auto-save enabled — will commit automatically")
+            engine = self._get_auto_snapshot_engine()
+            if engine is None:
+                return
+            engine.start()
+            self.status_message(AUTO_SNAPSHOT_ENABLED_MSG)
         else:
-            self.status_message("⏸️ Auto-save disabled")
+            engine = getattr(self, "auto_snapshot", None)
+            if engine is not None:
+                engine.stop()
+            self.status_message(AUTO_SNAPSHOT_DISABLED_MSG)
+
+
+    def _get_prehasher(self):
+        """⚡ Background pre-hasher for the current project (recreated if the project changed)."""
+        if not self.project_path:
+            return None
+        prehasher = getattr(self, "prehasher", None)
+        if prehasher is not None and prehasher.project_path == Path(self.project_path):
+            return prehasher
+        if prehasher is not None:
+            prehasher.shutdown()
+        self.prehasher = Prehasher(self.project_path)
+        return self.prehasher
+
+
+    def _ensure_prehash_scanner(self):
+        """
+        Periodically queues new/changed large files for hashing so the next commit
+        finds their objects already written. Off in test mode.
+        """
+        if os.getenv("DAWGIT_TEST_MODE") == "1" or getattr(self, "_prehash_timer", None):
+            return
+        self._prehash_timer = QTimer(self)
+        self._prehash_timer.setInterval(PREHASH_SCAN_INTERVAL_MS)
+        self._prehash_timer.timeout.connect(self._run_prehash_scan)
+        self._prehash_timer.start()
+        self._run_prehash_scan()
+
+
+    def _prehashed_lookup(self):
+        """Blob ids the background pre-hasher already wrote, for staging; None if it isn't running."""
+        prehasher = getattr(self, "prehasher", None)
+        if prehasher is None or prehasher.project_path != Path(self.project_path):
+            return None
+        return prehasher.prehashed
+
+
+    def closeEvent(self, event):
+        """Stops every background worker so the app doesn't exit with git processes or audio probes still running."""
+        if getattr(self, "_prehash_timer", None):
+            self._prehash_timer.stop()
+        prehasher = getattr(self, "prehasher", None)
+        if prehasher is not None:
+            prehasher.shutdown()
+            self.prehasher = None
+        if getattr(self, "_als_poll_timer", None):
+            self._als_poll_timer.stop()
+        analyzer = getattr(self, "als_analyzer", None)
+        if analyzer is not None:
+            analyzer.shutdown()
+        scheduler = getattr(self, "maintenance", None)
+        if scheduler is not None:
+            scheduler.shutdown()
+            self.maintenance = None
+        self.cancel_waveform()
+        self.cancel_audio_diff()
+        for timer in ("_audio_poll_timer", "_analytics_poll_timer", "_lfs_plan_timer"):
+            if getattr(self, timer, None):
+                getattr(self, timer).stop()
+        # Queued probe batches and decodes are cancelled, not drained by the interpreter's exit hook
+        for attr, stop in (("auto_snapshot", "shutdown"), ("audio_index", "close"), ("peak_cache", "shutdown"),
+                           ("audio_differ", "shutdown"), ("repo_analytics", "close"), ("lfs_store", "shutdown")):
+            worker = getattr(self, attr, None)
+            if worker is not None:
+                getattr(worker, stop)()
+                setattr(self, attr, None)
+        super().closeEvent(event)
+
+
+    def _run_prehash_scan(self):
+        if not self.repo or not self.project_path:
+            return
+        prehasher = self._get_prehasher()
+        if prehasher is not None:
+            prehasher.scan_async()
+
+
+    def _ensure_maintenance_scheduler(self):
+        """
+        🧹 Starts the idle-time maintenance scheduler for the current project
+        (recreated if the project changed). Off in test mode.
+        """
+        if os.getenv("DAWGIT_TEST_MODE") == "1" or not self.project_path or not self.repo:
+            return None
+        scheduler = getattr(self, "maintenance", None)
+        if scheduler is not None and scheduler.project_path == Path(self.project_path):
+            return scheduler
+        if scheduler is not None:
+            scheduler.shutdown()
+        app = QApplication.instance()
+        scheduler = MaintenanceScheduler(
+            self.project_path,
+            is_focused=lambda: app.applicationState() == Qt.ApplicationState.ApplicationActive,
+            parent=self
+        )
+        scheduler.finished.connect(self._on_maintenance_finished)
+        if not getattr(self, "_maintenance_state_hooked", False):
+            # Coming back to the app interrupts a run between tasks
+            app.applicationStateChanged.connect(self._on_application_state_changed)
+            self._maintenance_state_hooked = True
+        scheduler.start()
+        self.maintenance = scheduler
+        return scheduler
+
+
+    def _on_application_state_changed(self, state):
+        scheduler = getattr(self, "maintenance", None)
+        if scheduler is not None and state == Qt.ApplicationState.ApplicationActive:
+            scheduler.note_activity()
+
+
+    def _on_maintenance_finished(self, result):
+        before, after = sum(result["before"].values()), sum(result["after"].values())
+        self.show_status_message(MAINTENANCE_DONE_MSG.format(before=before, after=after))
+
+
+    def _get_auto_snapshot_engine(self):
+        """🎹 Background auto-snapshot engine for the current project (recreated if the project changed)."""
+        if not self.project_path or not self.repo:
+            return None
+        engine = getattr(self, "auto_snapshot", None)
+        if engine is not None and engine.project_path == Path(self.project_path):
+            return engine
+        if engine is not None:
+            engine.shutdown()
+        engine = AutoSnapshotEngine(self.project_path, parent=self)
+        engine.committed.connect(self._on_auto_snapshot_committed)
+        engine.failed.connect(lambda error: self.show_status_message(AUTO_SNAPSHOT_FAILED_MSG.format(error=error)))
+        self.auto_snapshot = engine
+        return engine
+
+
+    def _on_auto_snapshot_committed(self, result):
+        """Runs on the GUI thread once a background snapshot landed — refresh without any modal dialog."""
+        self.current_commit_id = result["sha"]
+        self.load_commit_history()
+        self.update_status_label()
+        self.show_status_message(AUTO_SNAPSHOT_SAVED_MSG.format(sha=result["sha"][:7]))
             
 
     def save_project_marker(self):
@@ -567,12 +829,17 @@ class DAWGitApp(QMainWindow):
             return
 
         marker_path = Path(self.project_path) / "PROJECT_MARKER.json"
-        try:
-            with open(marker_path, "w") as f:
-                json.dump(self.project_marker, f, indent=2)
-                print(f"[DEBUG] Saved PROJECT_MARKER.json to {marker_path}")
-        except Exception as e:
-            print(f"[ERROR] Failed to save PROJECT_MARKER.json: {e}")
+        metadata_cache.put(marker_path, self.project_marker)
+        self._schedule_metadata_flush()
+
+
+    def _schedule_metadata_flush(self):
+        """Coalesces marker/settings saves into one atomic write per burst."""
+        if not hasattr(self, "_metadata_flush_timer"):
+            self._metadata_flush_timer = QTimer(self)
+            self._metadata_flush_timer.setSingleShot(True)
+            self._metadata_flush_timer.timeout.connect(metadata_cache.flush)
+        self._metadata_flush_timer.start(METADATA_FLUSH_DELAY_MS)
 
 
     def change_project_folder(self):
@@ -698,6 +965,7 @@ class DAWGitApp(QMainWindow):
                     print(f"[WARNING] Could not remove {file}: {e}")
 
 
+    @holds_repo_lock
     def checkout_branch(self, branch_name):
         """
         Switch to a different branch/version line safely.
@@ -736,6 +1004,7 @@ class DAWGitApp(QMainWindow):
             print(f"[ERROR] Branch switch failed: {e}")
 
 
+    @holds_repo_lock
     def stash_uncommitted_changes(self, message="DAWGit auto-stash"):
         result = self.git.stash_uncommitted_changes(message)
         if result["status"] == "stashed":
@@ -770,6 +1039,7 @@ class DAWGitApp(QMainWindow):
             return ""
 
 
+    @holds_repo_lock
     def init_git(self):
         print("[DEBUG] Calling GitProjectManager.init_repo()")
         self.git = GitProjectManager(self.project_path, app=self)  # ✅ Only call once
@@ -823,6 +1093,7 @@ class DAWGitApp(QMainWindow):
         try:
             repo_path = Path(path or self.project_path)
             self.repo = Repo(repo_path)
+            ensure_als_filter_config(repo_path)   # filter driver config isn't versioned — re-register per clone
             self.load_commit_roles()
 
             if self.repo.head.is_valid():
@@ -962,6 +1233,7 @@ class DAWGitApp(QMainWindow):
             ".DS_Store",
             "PROJECT_MARKER.json",
             ".dawgit_roles.json",
+            ".dawgit_roles.log",
             ".dawgit_meta.json",  # optional, in case you add it
         }
         excluded_paths = [".dawgit_cache/", ".dawgit_checkout_work/"]
@@ -1009,11 +1281,13 @@ class DAWGitApp(QMainWindow):
         Used to decide whether to stash before switching.
         """
         dirty = self.repo.git.status("--porcelain").splitlines()
-        relevant = [line.split()[-1] for line in dirty if line.endswith(".als") or line.endswith(".logicx")]
+        # Files inside a .logicx bundle count as changes to the bundle
+        relevant = sorted({document_of(line[3:].strip().strip('"')) for line in dirty} - {None})
         print("[DEBUG] Filtered relevant_dirty files:", relevant)
         return bool(relevant)
 
 
+    @holds_repo_lock
     def return_to_latest_clicked(self):
         try:
             if not self.repo:
@@ -1039,6 +1313,7 @@ class DAWGitApp(QMainWindow):
                     ".DS_Store",
                     "PROJECT_MARKER.json",
                     ".dawgit_roles.json",
+                    ".dawgit_roles.log",
                     ".dawgit_meta.json",
                 }
                 excluded_paths = [".dawgit_cache/", ".dawgit_checkout_work/"]
@@ -1080,6 +1355,7 @@ class DAWGitApp(QMainWindow):
                     ".DS_Store",
                     "PROJECT_MARKER.json",
                     ".dawgit_roles.json",
+                    ".dawgit_roles.log",
                     ".dawgit_cache",  # ✅ NEW — allow StudioGit cache folder as safe
                 }
                 reset_tracked = []
@@ -1349,7 +1625,7 @@ class DAWGitApp(QMainWindow):
 
             # ✅ Auto-ignore backup and temp files
             ignore_entries = [
-                "*.als~", "*.logicx~", "*.asd", "*.tmp", ".DS_Store", "Backup/"
+                "*.als~", "*.logicx~", "*.asd", "*.tmp", ".DS_Store", "Backup/", ROLES_LOG_NAME
             ]
             gitignore_path = self.project_path / ".gitignore"
             existing = gitignore_path.read_text().splitlines() if gitignore_path.exists() else []
@@ -1441,6 +1717,7 @@ class DAWGitApp(QMainWindow):
                 self.repo.delete_remote("origin")
 
             self.repo.create_remote("origin", url)
+            configure_notes_fetch(self.project_path)
             QMessageBox.information(self, REMOTE_ADDED_TITLE, REMOTE_ADDED_MSG.format(url=url))
 
             # Optionally push current branch
@@ -1452,6 +1729,7 @@ class DAWGitApp(QMainWindow):
                     env=self.custom_env(),
                     check=True
                 )
+                push_role_notes(self.project_path)
                 QMessageBox.information(
                     self, "Pushed",
                     f"🚀 Your current branch '{current_branch}' has been pushed to remote."
@@ -1487,6 +1765,7 @@ class DAWGitApp(QMainWindow):
 
 
 
+    @holds_repo_lock
     def safe_switch_branch(self, target_branch):
         # ✅ Detect uncommitted changes and trigger backup
         if self.repo.is_dirty(untracked_files=True):
@@ -1571,6 +1850,7 @@ class DAWGitApp(QMainWindow):
         self.commit_changes(commit_message=default_message)
 
 
+    @holds_repo_lock
     def commit_changes(self, commit_message=None):
         # 🔒 Normalize and validate project_path early
         if isinstance(self.project_path, str):
@@ -1629,7 +1909,7 @@ class DAWGitApp(QMainWindow):
                     self._show_warning("Commit cancelled. Please enter a valid commit message.")
                 return {"status": "error", "message": "Empty or cancelled commit message."}
 
-        result = self.git.commit_changes(commit_message)
+        result = self.git.commit_changes(commit_message, prehashed=self._prehashed_lookup())
 
         if result["status"] != "success":
             if "nothing to commit" in result.get("message", ""):
@@ -1658,6 +1938,7 @@ class DAWGitApp(QMainWindow):
                         env=self.custom_env(),
                         check=True
                     )
+                    push_role_notes(self.project_path)
                 except subprocess.CalledProcessError as e:
                     print(f"[DEBUG] Remote push failed: {e}")
                     QMessageBox.critical(
@@ -1718,22 +1999,21 @@ class DAWGitApp(QMainWindow):
 
 
     def _create_editable_snapshot_copy(self):
-        """Creates a safe editable copy of the current .als file into .dawgit_checkout_work/"""
+        """Creates a safe editable copy of the current .als file (or .logicx bundle) into .dawgit_checkout_work/"""
         try:
             editable_dir = Path(self.project_path) / ".dawgit_checkout_work"
             editable_dir.mkdir(exist_ok=True)
-            als_files = list(Path(self.project_path).glob("*.als"))
+            document = self.get_active_daw_file()
 
-            if als_files:
-                als_file = als_files[0]
-                editable_name = f"{self.project_path.name}_editable.als"
+            if document:
+                editable_name = f"{self.project_path.name}_editable{document.suffix}"
                 editable_path = editable_dir / editable_name
-                shutil.copy2(als_file, editable_path)
+                copy_document(document, editable_path)
                 self.editable_checkout_path = editable_path
                 print(f"[DEBUG] Created editable snapshot copy at: {editable_path}")
                 return editable_path
             else:
-                print("[WARN] No .als file found for editable copy.")
+                print("[WARN] No DAW document found for editable copy.")
                 return None
         except Exception as e:
             print(f"[ERROR] Editable snapshot creation failed: {e}")
@@ -1793,6 +2073,7 @@ class DAWGitApp(QMainWindow):
         QMessageBox.information(self, CURRENT_COMMIT_TITLE, body)
 
     
+    @holds_repo_lock
     def create_new_version_line(self, branch_name: str):
         if not self.project_path:
             return {"status": "error", "message": "No project path set"}
@@ -1811,7 +2092,7 @@ class DAWGitApp(QMainWindow):
             files_to_commit = [marker_path.relative_to(self.project_path).as_posix()]
 
             # ✅ Step 2: Create placeholder DAW file if none exist
-            daw_files = list(Path(self.project_path).glob("*.als")) + list(Path(self.project_path).glob("*.logicx"))
+            daw_files = daw_documents(self.project_path)
             if not daw_files:
                 if self.is_snapshot_mode():
                     placeholder_path = Path(self.project_path) / "auto_placeholder.als"
@@ -1857,6 +2138,7 @@ class DAWGitApp(QMainWindow):
                         env=self.custom_env(),
                         check=True
                     )
+                    push_role_notes(self.project_path)
                 except subprocess.CalledProcessError as e:
                     print(f"[DEBUG] Remote push failed: {e}")
                     QMessageBox.critical(
@@ -1908,8 +2190,7 @@ class DAWGitApp(QMainWindow):
 
         # Check if commit is reachable from current branch
         try:
-            reachable = [c.hexsha for c in self.repo.iter_commits()]
-            if commit_sha not in reachable:
+            if not self._get_ancestry().contains("HEAD", commit_sha):
                 delete_action.setEnabled(False)
                 delete_action.setToolTip(CROSS_BRANCH_COMMIT_MSG)
         except Exception as e:
@@ -1917,9 +2198,14 @@ class DAWGitApp(QMainWindow):
 
         delete_action.triggered.connect(self.delete_selected_commit)
         menu.addAction(delete_action)
+
+        export_action = QAction(EXPORT_ARCHIVE_ACTION, self)
+        export_action.triggered.connect(lambda: self.export_snapshot_archive(commit_sha))
+        menu.addAction(export_action)
         menu.exec(self.snapshot_page.commit_table.viewport().mapToGlobal(position))
 
 
+    @holds_repo_lock
     def cleanup_workspace(self):
         """Remove .dawgit_backups, placeholder files, orphan branches, and temp tags."""
         from git import GitCommandError
@@ -1934,24 +2220,31 @@ class DAWGitApp(QMainWindow):
         if placeholder_path.exists():
             placeholder_path.unlink()
 
-        # 3. Delete orphan branches (not reachable from main)
+        # 3 + 4. Orphan branches (no common ancestor with main) and temp/test tags
+        #        all go in one atomic `update-ref --stdin` batch
+        refs = self.git.ref_transaction()
+        current = None if self.repo.head.is_detached else self.repo.active_branch.name
         try:
             main_sha = self.repo.commit("main").hexsha
+            ancestry = self._get_ancestry()
             for branch in list(self.repo.branches):
-                if branch.name != "main":
+                if branch.name not in ("main", current):   # the checked-out line stays, orphan or not
                     branch_sha = self.repo.commit(branch.name).hexsha
-                    # Skip if main and branch share no common ancestor (i.e., orphan)
-                    try:
-                        self.repo.git.merge_base(main_sha, branch_sha)
-                    except GitCommandError:
-                        self.repo.git.branch("-D", branch.name)
+                    if ancestry.merge_base(main_sha, branch_sha) is None:
+                        refs.delete_branch(branch.name)
         except GitCommandError:
             pass  # skip if main doesn't exist yet
 
-        # 4. Delete temp tags (e.g., temp-* or test tags)
-        for tag in self.repo.tags:
-            if tag.name.startswith("temp") or "test" in tag.name:
-                self.repo.delete_tag(tag)
+        for ref in refs.refs():
+            if ref.startswith("refs/tags/"):
+                name = ref[len("refs/tags/"):]
+                if name.startswith("temp") or "test" in name:
+                    refs.delete_tag(name)
+        try:
+            refs.apply()
+        except RefTransactionError as e:
+            print(f"[ERROR] Cleanup ref transaction failed: {e}")
+            QMessageBox.warning(self, CLEANUP_FAILED_TITLE, CLEANUP_FAILED_MSG.format(error=e))
         
         # Force GitPython to refresh heads and tags after cleanup
         self.repo = self.repo.__class__(self.repo.working_tree_dir)
@@ -2094,7 +2387,7 @@ class DAWGitApp(QMainWindow):
         """Return the most recently modified .als or .logicx file, skipping placeholders and test files."""
         path = Path(self.repo.working_tree_dir)
         daw_files = sorted(
-            list(path.glob("*.als")) + list(path.glob("*.logicx")),
+            daw_documents(path),
             key=lambda x: x.stat().st_mtime,
             reverse=True
         )
@@ -2162,7 +2455,7 @@ class DAWGitApp(QMainWindow):
                 # Fallback continues to original logic
 
         repo_path = Path(self.repo.working_tree_dir)
-        daw_files = list(repo_path.glob("*.als")) + list(repo_path.glob("*.logicx"))
+        daw_files = daw_documents(repo_path)
 
         if not daw_files:
             self._show_warning("No DAW project file (.als or .logicx) found in this version.")
@@ -2195,9 +2488,10 @@ class DAWGitApp(QMainWindow):
 
 
 
+    @holds_repo_lock
     def rebase_delete_commit(self, commit_id):
         try:
-            reachable_commits = [c.hexsha for c in self.repo.iter_commits()]
+            reachable = self._get_ancestry().contains("HEAD", commit_id)
             try:
                 current_branch = self.repo.active_branch.name
             except TypeError:
@@ -2207,10 +2501,10 @@ class DAWGitApp(QMainWindow):
                 self, "DEBUG",
                 f"🧠 Trying to delete commit: {commit_id[:10]}\n"
                 f"🌿 Current branch: {current_branch}\n\n"
-                f"📜 Reachable commits:\n" + "\n".join(c[:10] for c in reachable_commits)
+                f"📜 Reachable from HEAD: {'yes' if reachable else 'no'}"
             )
 
-            if commit_id not in reachable_commits:
+            if not reachable:
                 QMessageBox.warning(
                     self,
                     "Can't Delete Snapshot",
@@ -2262,23 +2556,23 @@ class DAWGitApp(QMainWindow):
 
     
     def _set_commit_id_from_selected_row(self):
-        selected_items = self.snapshot_page.commit_table.selectedItems()
-        if not selected_items:
+        # currentRow(), like the tag and role actions: with a two-take comparison
+        # selected, the row order of selectedItems() says nothing about which take is meant
+        commit_table = self.snapshot_page.commit_table
+        row = commit_table.currentRow()
+        if row < 0 or not commit_table.selectionModel().isRowSelected(row):
             print("[WARN] No items selected in history table.")
             self.current_commit_id = None
             return
 
-        for item in selected_items:
-            if item.column() == 2:  # ✅ Column 2 = Commit ID column
-                sha = item.toolTip()
-                print(f"[DEBUG] Selected row = {item.row()}, SHA = {sha}")
-                if sha and isinstance(sha, str) and sha.strip():
-                    self.current_commit_id = sha
-                    print(f"[DEBUG] ✅ SHA set from selected row: {sha}")
-                    self.snapshot_page.commit_table.scrollToItem(
-                        item, QAbstractItemView.ScrollHint.PositionAtCenter
-                    )
-                    return
+        item = commit_table.item(row, 2)  # ✅ Column 2 = Commit ID column
+        sha = item.toolTip() if item else None
+        print(f"[DEBUG] Selected row = {row}, SHA = {sha}")
+        if sha and isinstance(sha, str) and sha.strip():
+            self.current_commit_id = sha
+            print(f"[DEBUG] ✅ SHA set from selected row: {sha}")
+            commit_table.scrollToItem(item, QAbstractItemView.ScrollHint.PositionAtCenter)
+            return
 
         print("[WARN] No SHA found in selected items.")
         self.current_commit_id = None        
@@ -2289,8 +2583,8 @@ class DAWGitApp(QMainWindow):
         Saves commit roles to a local JSON config file for persistence across sessions.
         """
         settings_path = self.project_path / ".dawgit_settings.json"
-        with open(settings_path, "w") as f:
-            json.dump({"commit_roles": self.commit_roles}, f)
+        metadata_cache.put(settings_path, {"commit_roles": dict(self.commit_roles)})
+        self._schedule_metadata_flush()
 
 
     # def load_settings(self):
@@ -2307,23 +2601,58 @@ class DAWGitApp(QMainWindow):
     #         self.load_commit_roles()
 
 
+    def _get_role_store(self):
+        """
+        Returns the RoleStore for the current project, loading it on first use.
+        `self.commit_roles` is the store's own dict, so reads never touch disk.
+        """
+        if not self.project_path:
+            return None
+        store = getattr(self, "role_store", None)
+        if store is None or store.project_path != Path(self.project_path):
+            store = RoleStore(self.project_path)
+            self.role_store = store
+            self.commit_roles = store.roles
+        elif self.commit_roles is not store.roles:
+            # Someone swapped in a new dict — adopt it as the current map
+            store.replace_all(self.commit_roles)
+            self.commit_roles = store.roles
+        return store
+
+
     def save_commit_roles(self):
         """
-        Saves the commit role mapping to a hidden JSON file in the project directory.
+        Compacts the role log into `.dawgit_roles.json` and mirrors roles into the project marker.
         """
         if self.project_path:
-            meta_file = Path(self.project_path) / ".dawgit_roles.json"
+            if hasattr(self, "_role_compact_timer"):
+                self._role_compact_timer.stop()
             try:
-                with open(meta_file, "w") as f:
-                    json.dump(self.commit_roles, f)
-                print(f"[DEBUG] Saved commit roles to {meta_file}")
+                store = self._get_role_store()
+                store.compact()
+                print(f"[DEBUG] Saved commit roles to {store.snapshot_path}")
             except Exception as e:
                 print(f"[ERROR] Failed to save commit roles: {e}")
+                return
+
+            # ✅ Update marker once per compaction instead of once per tag
+            if hasattr(self, "project_marker"):
+                self.project_marker.setdefault("repository_info", {})["commit_roles"] = dict(self.commit_roles)
+                self.save_project_marker()
+
+
+    def _schedule_role_compaction(self):
+        """Debounces compaction so a burst of tagging rewrites the snapshot once."""
+        if not hasattr(self, "_role_compact_timer"):
+            self._role_compact_timer = QTimer(self)
+            self._role_compact_timer.setSingleShot(True)
+            self._role_compact_timer.timeout.connect(self.save_commit_roles)
+        self._role_compact_timer.start(ROLE_COMPACT_DELAY_MS)
 
 
     def assign_commit_role(self, commit_sha: str, role: str):
         """
-        Assigns a role to a commit and saves the mapping.
+        Assigns a role to a commit by appending one record to the role log.
         """
         if not commit_sha:
             print("[ERROR] Cannot assign role — invalid commit SHA:", commit_sha)
@@ -2332,38 +2661,67 @@ class DAWGitApp(QMainWindow):
         if not hasattr(self, "commit_roles"):
             self.commit_roles = {}
 
-        self.commit_roles[commit_sha] = role
-        print(f"[DEBUG] Role '{role}' assigned to commit {commit_sha}")  # Log the assignment
+        store = self._get_role_store()
+        if store is None:
+            self.commit_roles[commit_sha] = role
+            print("[WARN] No project path — role kept in memory only")
+            return
 
-        # Save the updated commit_roles to disk
-        self.save_commit_roles()
+        store.set(commit_sha, role)
+        if self.repo:
+            try:
+                set_role_note(self.project_path, commit_sha, role)
+            except Exception as e:
+                print(f"[WARN] Could not write role note for {commit_sha[:7]}: {e}")
         print(f"[DEBUG] Assigned role '{role}' to commit {commit_sha}")
         self.show_status_message(f"🎧 Snapshot tagged as '{role}': {commit_sha[:7]}")
-
-        # ✅ Update marker
-        if hasattr(self, "project_marker"):
-            self.project_marker.setdefault("repository_info", {}).setdefault("commit_roles", {})[commit_sha] = role
-            self.save_project_marker()
+        self._schedule_role_compaction()
 
 
     def load_commit_roles(self):
         if not self.project_path:
             print("[DEBUG] Skipping role load — no project path set.")
             self.commit_roles = {}
+            self.role_store = None
             return
 
-        roles_path = Path(self.project_path) / ".dawgit_roles.json"
-        if roles_path.exists():
-            try:
-                with roles_path.open("r") as f:
-                    self.commit_roles = json.load(f)
-                    print(f"[DEBUG] Loaded commit roles from {roles_path}")
-            except Exception as e:
-                print(f"[ERROR] Failed to load commit roles: {e}")
-                self.commit_roles = {}
+        store = getattr(self, "role_store", None)
+        if store is not None and store.project_path == Path(self.project_path):
+            # Already loaded for this project — one stat tells us if the files moved
+            store.refresh_if_changed()
+            self.commit_roles = store.roles
         else:
-            print(f"[DEBUG] No commit role file found at {roles_path}")
-            self.commit_roles = {}
+            self.role_store = None
+            store = self._get_role_store()
+            print(f"[DEBUG] Loaded {len(self.commit_roles)} commit roles from {store.snapshot_path}")
+
+        self._sync_role_notes(store)
+
+
+    def _sync_role_notes(self, store):
+        """
+        Overlays roles stored as Git notes (refs/notes/dawgit-roles) onto the local map.
+        The first sync per project also copies roles that only exist in
+        `.dawgit_roles.json` into notes, enables note rewriting on rebase and
+        adds the notes ref to the remotes' fetch refspecs.
+        """
+        if not getattr(self, "repo", None):
+            return
+        try:
+            if not getattr(store, "notes_synced", False):
+                configure_notes_rewrite(self.project_path)
+                configure_notes_fetch(self.project_path)
+                notes = read_role_notes(self.project_path)
+                legacy = {sha: role for sha, role in store.roles.items() if sha not in notes}
+                if legacy:
+                    print(f"[DEBUG] Moving {len(legacy)} roles into {ROLE_NOTES_REF}")
+                    write_role_notes(self.project_path, legacy, message="Import roles from .dawgit_roles.json")
+                store.notes_synced = True
+
+            notes = read_role_notes(self.project_path)
+            self.commit_roles.update(notes)
+        except Exception as e:
+            print(f"[WARN] Role notes unavailable — using local roles only: {e}")
 
 
     @pyqtSlot()
@@ -2406,14 +2764,9 @@ class DAWGitApp(QMainWindow):
         clean_label = label.strip()
         self.current_commit_id = sha
         self.assign_commit_role(sha, clean_label)
-        self.save_commit_roles()
         self.status_message(f"✏️ Commit tagged as '{clean_label}': {sha[:7]}")
 
-        if os.getenv("DAWGIT_TEST_MODE") == "1":
-            print("[DEBUG] DAWGIT_TEST_MODE active — running load_commit_history directly")
-            self.load_commit_history()
-        else:
-            QTimer.singleShot(100, self.load_commit_history)
+        self.refresh_commit_rows({sha})
 
 
     @pyqtSlot()
@@ -2457,18 +2810,18 @@ class DAWGitApp(QMainWindow):
             if confirm != QMessageBox.StandardButton.Yes:
                 return
 
-            self.commit_roles.pop(existing_main, None)
+            self._get_role_store().remove(existing_main)
+            try:
+                clear_role_note(self.project_path, existing_main)
+            except Exception as e:
+                print(f"[WARN] Could not clear role note for {existing_main[:7]}: {e}")
 
         self.current_commit_id = sha
         self.assign_commit_role(sha, ROLE_KEY_MAIN_MIX)
-        self.save_commit_roles()
         self.status_message(STATUS_TAGGED_AS_MAIN_MIX.format(sha=sha[:7]))
 
-        if os.getenv("DAWGIT_TEST_MODE") == "1":
-            print("[DEBUG] DAWGIT_TEST_MODE active — running load_commit_history directly")
-            self.load_commit_history()
-        else:
-            QTimer.singleShot(100, self.load_commit_history)
+        # 🎯 Only the new and the previous main mix rows changed
+        self.refresh_commit_rows({sha, existing_main})
 
 
     @pyqtSlot()
@@ -2496,14 +2849,9 @@ class DAWGitApp(QMainWindow):
 
         self.current_commit_id = sha
         self.assign_commit_role(sha, safe_label)
-        self.save_commit_roles()
         self.status_message(f"🎨 Commit tagged as '{safe_label}': {sha[:7]}")
 
-        if os.getenv("DAWGIT_TEST_MODE") == "1":
-            print("[DEBUG] DAWGIT_TEST_MODE active — running load_commit_history directly")
-            self.load_commit_history()
-        else:
-            QTimer.singleShot(100, self.load_commit_history)
+        self.refresh_commit_rows({sha})
 
 
     @pyqtSlot()
@@ -2529,14 +2877,9 @@ class DAWGitApp(QMainWindow):
 
         self.current_commit_id = sha
         self.assign_commit_role(sha, safe_label)
-        self.save_commit_roles()
         self.status_message(f"🎛️ Commit tagged as '{safe_label}': {sha[:7]}")
 
-        if os.getenv("DAWGIT_TEST_MODE") == "1":
-            print("[DEBUG] DAWGIT_TEST_MODE active — running load_commit_history directly")
-            self.load_commit_history()
-        else:
-            QTimer.singleShot(100, self.load_commit_history)
+        self.refresh_commit_rows({sha})
 
 
     def show_commit_checkout_info(self, commit):
@@ -2570,6 +2913,7 @@ class DAWGitApp(QMainWindow):
         QMessageBox.information(self, title, body)
     
 
+    @holds_repo_lock
     def auto_commit(self, message: str, tag: str = ""):
         if not self.repo:
             QMessageBox.warning(self, NO_REPO_TITLE, NO_REPO_SAVE_MSG)
@@ -2586,9 +2930,9 @@ class DAWGitApp(QMainWindow):
             self.snapshot_button.setToolTip(SAVING_SNAPSHOT_LABEL)
 
         try:
-            subprocess.run(["git", "add", "-A"], cwd=self.project_path, env=self.custom_env(), check=True)
-
-            if not self.repo.is_dirty(index=True, working_tree=True, untracked_files=True):
+            # 💾 Stage only what status reports as changed — no full-tree add, no second dirty scan
+            result = commit_snapshot(self.repo, message, prehashed=self._prehashed_lookup())
+            if result["status"] != "success":
                 QMessageBox.information(
                     self,
                     "No Changes",
@@ -2596,14 +2940,14 @@ class DAWGitApp(QMainWindow):
                 )
                 return
 
-            commit = self.repo.index.commit(message)
-            commit_sha = commit.hexsha
+            commit_sha = result["sha"]
 
             if tag:
-                if tag in [t.name for t in self.repo.tags]:
-                    print(f"⚠️ Tag '{tag}' already exists. Skipping tag creation.")
-                else:
-                    self.repo.create_tag(tag, ref=commit_sha)
+                with self.git.ref_transaction() as refs:
+                    if refs.exists(f"refs/tags/{tag}"):
+                        print(f"⚠️ Tag '{tag}' already exists. Skipping tag creation.")
+                    else:
+                        refs.create_tag(tag, commit_sha)
 
             if self.remote_checkbox.isChecked():
                 try:
@@ -2613,6 +2957,7 @@ class DAWGitApp(QMainWindow):
                         env=self.custom_env(),
                         check=True
                     )
+                    push_role_notes(self.project_path)
                 except subprocess.CalledProcessError:
                     print("[WARN] Skipping remote push: no remote set")
 
@@ -2720,8 +3065,7 @@ class DAWGitApp(QMainWindow):
         """Returns True if the commit can be deleted from the current branch"""
         try:
             # Check if commit is in current branch history
-            reachable = commit_id in [c.hexsha for c in self.repo.iter_commits()]
-            if not reachable:
+            if not self._get_ancestry().contains("HEAD", commit_id):
                 return False
 
             # Check if it's a protected commit (🎼 marker)
@@ -2734,6 +3078,7 @@ class DAWGitApp(QMainWindow):
             return False
             
 
+    @holds_repo_lock
     def checkout_selected_commit(self, commit_sha=None):
         """⬅️ Checkout a specific commit by SHA or from selected table row, even if benign files exist."""
         result = {"status": "success"}
@@ -2803,7 +3148,7 @@ class DAWGitApp(QMainWindow):
                 print(f"[WARN] Snapshot backup failed: {e}")
 
             # 🔧 Discard tracked noise files
-            safe_to_reset = {".DS_Store", "PROJECT_MARKER.json", ".dawgit_roles.json"}
+            safe_to_reset = {".DS_Store", "PROJECT_MARKER.json", ".dawgit_roles.json", ".dawgit_roles.log"}
             reset_targets = [p.a_path for p in self.repo.index.diff(None) if Path(p.a_path).name in safe_to_reset]
             if reset_targets:
                 print(f"[DEBUG] Resetting safe dirty files: {reset_targets}")
@@ -2888,6 +3233,7 @@ class DAWGitApp(QMainWindow):
 
 
 
+    @holds_repo_lock
     def switch_version_line(self):
         if not self.repo:
             QMessageBox.warning(
@@ -3005,24 +3351,14 @@ class DAWGitApp(QMainWindow):
                 self._last_dirty_state = True
                 return True
 
-            # ✅ Treat any changed .als or .logicx file as a reason to allow commit
-            for ext in ("*.als", "*.logicx"):
-                for daw_file in self.project_path.glob(ext):
-                    rel_path = daw_file.relative_to(self.project_path)
-
-                    if daw_file.suffix == ".logicx" and daw_file.is_dir():
-                        # 🔍 Look for dirty files inside the .logicx bundle
-                        for subfile in daw_file.rglob("*"):
-                            sub_rel = subfile.relative_to(self.project_path)
-                            if any(sub_rel.as_posix() in line for line in status_output):
-                                print(f"[DEBUG] Unsaved LogicX change: {sub_rel}")
-                                self._last_dirty_state = True
-                                return True
-                    else:
-                        if any(str(rel_path) in line for line in status_output):
-                            print(f"[DEBUG] Unsaved DAW file detected: {rel_path}")
-                            self._last_dirty_state = True
-                            return True
+            # ✅ Treat any changed .als or .logicx file as a reason to allow commit —
+            # status paths inside a bundle map straight to the bundle, no walk needed
+            for line in status_output:
+                document = document_of(line[3:].strip().strip('"'))
+                if document:
+                    print(f"[DEBUG] Unsaved DAW document detected: {document}")
+                    self._last_dirty_state = True
+                    return True
 
             # ✅ Only log once when status goes clean
             if getattr(self, "_last_dirty_state", None) is not False:
@@ -3046,12 +3382,17 @@ class DAWGitApp(QMainWindow):
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_dir = project_path.parent / f"Backup_{project_path.name}_{timestamp}"
             backup_dir.mkdir(parents=True, exist_ok=True)
+            documents = set(daw_documents(project_path))
 
             for file in project_path.glob("*.*"):
-                if file.is_file():
-                    shutil.copy(file, backup_dir / file.name)
+                if file.is_file() or file in documents:
+                    copy_document(file, backup_dir / file.name)
 
             print(f"🔒 Unsaved changes backed up to: {backup_dir}")
+
+            catalog = BackupCatalog(project_path)
+            catalog.register_folder("unsaved", backup_dir, label=timestamp)
+            catalog.enforce_retention()
             return backup_dir
         except Exception as e:
             print(f"[ERROR] Failed to back up unsaved changes: {e}")
@@ -3080,25 +3421,17 @@ class DAWGitApp(QMainWindow):
             if not target_dir:
                 return
 
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            snapshot_name = f"{self.project_path.name}_snapshot_{timestamp}"
-            dest = os.path.join(target_dir, snapshot_name)
-
-            for item in os.listdir(self.project_path):
-                if item == ".git":
-                    continue  # 🚫 Skip Git internals
-                src = os.path.join(self.project_path, item)
-                dst = os.path.join(dest, item)
-                if os.path.isdir(src):
-                    shutil.copytree(src, dst, dirs_exist_ok=True)
-                else:
-                    os.makedirs(os.path.dirname(dst), exist_ok=True)
-                    shutil.copy2(src, dst)
+            # 🔗 Unchanged files are hardlinked from the previous export at this target
+            result = export_incremental(self.project_path, target_dir)
 
             QMessageBox.information(
                 self,
                 "Snapshot Exported",
-                f"📦 A snapshot of your project has been saved to:\n\n{dest}"
+                EXPORT_SNAPSHOT_DONE_MSG.format(
+                    path=result["path"],
+                    copied=result["copied"],
+                    linked=result["linked"]
+                )
             )
 
         except Exception as e:
@@ -3111,6 +3444,38 @@ class DAWGitApp(QMainWindow):
             )
 
 
+    def export_snapshot_archive(self, commit_sha=None):
+        """
+        📦 Export any take as a zip straight from Git history — no checkout needed.
+        """
+        commit_sha = commit_sha or self.current_commit_id
+        if not self.repo or not commit_sha:
+            QMessageBox.warning(self, NO_SNAPSHOT_SELECTED_TITLE, NO_SNAPSHOT_SELECTED_MSG)
+            return None
+
+        target_dir = QFileDialog.getExistingDirectory(self, "Select Folder to Save Snapshot")
+        if not target_dir:
+            return None
+
+        try:
+            out_path = Path(target_dir) / archive_name(self.project_path, commit_sha[:7], fmt="zip")
+            result = export_commit_archive(self.project_path, commit_sha, out_path, fmt="zip")
+            QMessageBox.information(
+                self,
+                "Snapshot Exported",
+                EXPORT_ARCHIVE_DONE_MSG.format(sha=commit_sha[:7], path=result["path"])
+            )
+            return result
+        except Exception as e:
+            print(f"[ERROR] Snapshot archive export failed: {e}")
+            QMessageBox.critical(
+                self,
+                "Export Failed",
+                f"⚠️ Something went wrong while exporting your snapshot:\n\n{e}"
+            )
+            return None
+
+
     def import_snapshot(self):
         import traceback
         try:
@@ -3127,24 +3492,22 @@ class DAWGitApp(QMainWindow):
                 )
                 return
 
-            for item in os.listdir(src_folder):
-                if item == ".git":
-                    continue  # 🚫 Never import Git folder
-
-                s = os.path.join(src_folder, item)
-                d = os.path.join(target_path, item)
-
-                if os.path.isdir(s):
-                    shutil.copytree(s, d, dirs_exist_ok=True)
-                else:
-                    shutil.copy2(s, d)
+            # 🔍 Only new or different files are copied — identical samples stay untouched
+            result = import_changed_files(target_path, src_folder)
 
             QMessageBox.information(
                 self,
                 "Snapshot Imported",
-                f"📂 Your snapshot has been added to:\n\n{target_path}"
+                IMPORT_SNAPSHOT_DONE_MSG.format(
+                    path=target_path,
+                    added=result["added"],
+                    changed=result["changed"],
+                    unchanged=result["unchanged"]
+                )
             )
-            self.init_git()
+            if result["added"] or result["changed"]:
+                self.init_git()
+            return result
 
         except Exception as e:
             print("❌ Error during snapshot import:")
@@ -3194,13 +3557,7 @@ class DAWGitApp(QMainWindow):
             print("❌ No Git repo loaded.")
             return
 
-        if not self.repo.head.is_valid():
-            print("⚠️ Repo exists but has no commits yet.")
-            return
-
         print(f"[DEBUG] Repo valid: {self.repo.head.is_valid()}")
-        print(f"[DEBUG] HEAD SHA: {self.repo.head.commit.hexsha}")
-        print(f"[DEBUG] Total commits: {self.repo.git.rev_list('--count', 'HEAD')}")
 
         # Ensure project_path is set
         if not self.project_path:
@@ -3211,6 +3568,8 @@ class DAWGitApp(QMainWindow):
             print("❌ No Git repo loaded.")
             return
 
+        self._ensure_prehash_scanner()
+        self._ensure_maintenance_scheduler()
         self.load_commit_roles()  # Load commit roles first
 
         # Show loading message on UI
@@ -3222,10 +3581,10 @@ class DAWGitApp(QMainWindow):
         if not self.repo.head.is_valid():
             print("⚠️ Repo exists but has no commits yet.")
             self.snapshot_page.clear_table()
-            self.snapshot_page.commit_table.insertRow(0)
-            placeholders = ["–", "–", "No commits yet", "–", "–", "–", "–", "–", "–"]
-            for col, text in enumerate(placeholders):
-                self.snapshot_page.commit_table.setItem(0, col, QTableWidgetItem(text))
+            commit_table = self.snapshot_page.commit_table
+            commit_table.insertRow(0)
+            for col in range(commit_table.columnCount()):
+                commit_table.setItem(0, col, QTableWidgetItem("No commits yet" if col == 2 else "–"))
             if hasattr(self, "status_label"):
                 self.snapshot_page.status_label.setText(SNAPSHOT_HISTORY_LOADED)
             self.update_status_label()
@@ -3254,91 +3613,21 @@ class DAWGitApp(QMainWindow):
         total_commits = int(self.repo.git.rev_list('--count', 'HEAD').strip())
         self.total_commits = total_commits
 
+        changed_by_sha = self._changed_files_for([c.hexsha for c in commits])
+        als_by_sha = self._als_summaries_for([c.hexsha for c in commits])
+        samples_by_sha = self._sample_status_for([c.hexsha for c in commits])
+        audio_by_sha = self._audio_totals_for([c.hexsha for c in commits])
+        sizes_by_sha = self._sizes_added_for([c.hexsha for c in commits])
+
         for idx, commit in enumerate(commits):
             row = commit_table.rowCount()
             commit_table.insertRow(row)
-
-            sha_short = commit.hexsha[:7]
-            short_msg = commit.message.strip().split("\n")[0]
-            date_str = datetime.fromtimestamp(commit.committed_date).strftime("%b %d, %H:%M")
-
-            files_in_commit = commit.tree.traverse()
-            file_list = [item.path for item in files_in_commit if item.type == 'blob']
-            file_count = str(len(file_list))
-            daw_type = "Ableton" if any(".als" in f for f in file_list) else "Logic" if any(".logicx" in f for f in file_list) else "Unknown"
-            
-            role = self.commit_roles.get(commit.hexsha, "")
-
-            # Commit number — read-only
-            index_num = total_commits - (offset + idx)
-            item0 = NumericItem(index_num)
-            item0.setFlags(item0.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            commit_table.setItem(row, 0, item0)
-
-            # Role — read-only
-            item1 = QTableWidgetItem(self.pretty_role(role))
-            item1.setFlags(item1.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            commit_table.setItem(row, 1, item1)
-
-            # Commit ID — read-only with tooltip
-            item2 = QTableWidgetItem(sha_short)
-            item2.setToolTip(commit.hexsha)
-            item2.setFlags(item2.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            commit_table.setItem(row, 2, item2)
-
-            # Commit message — editable
-            item3 = QTableWidgetItem(short_msg)
-            item3.setFlags(item3.flags() | Qt.ItemFlag.ItemIsEditable)
-            commit_table.setItem(row, 3, item3)
-
-            # Branch names — read-only
-            try:
-                result = subprocess.run(
-                    ["git", "branch", "--contains", commit.hexsha],
-                    cwd=self.project_path,
-                    env=self.custom_env(),
-                    capture_output=True,
-                    text=True
-                )
-                branches = [line.strip().lstrip("* ").strip() for line in result.stdout.strip().splitlines()]
-                if current_branch in branches:
-                    branches = [f"🎯 MAIN" if b == "main" and b == current_branch
-                                else "MAIN" if b == "main"
-                                else f"🎯 {b}" if b == current_branch
-                                else b
-                                for b in branches]
-                # branch_str = ", ".join(branches)
-                if "main" in branches:
-                    branch_str = "MAIN"
-                else:
-                    branch_str = branches[0]
-            except Exception as e:
-                print(f"[ERROR] Failed to get branches for {sha_short}: {e}")
-                branch_str = "–"
-            item4 = QTableWidgetItem(branch_str)
-            item4.setFlags(item4.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            commit_table.setItem(row, 4, item4)
-
-            # DAW type — read-only
-            item5 = QTableWidgetItem(daw_type)
-            item5.setFlags(item5.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            commit_table.setItem(row, 5, item5)
-
-            # File count — read-only
-            item6 = QTableWidgetItem(file_count)
-            item6.setFlags(item6.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            commit_table.setItem(row, 6, item6)
-
-            # Tags — editable
-            tag = self.get_tag_for_commit(commit.hexsha) or ""
-            item7 = QTableWidgetItem(tag)
-            item7.setFlags(item7.flags() | Qt.ItemFlag.ItemIsEditable)
-            commit_table.setItem(row, 7, item7)
-
-            # Date — read-only
-            item8 = QTableWidgetItem(date_str)
-            item8.setFlags(item8.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            commit_table.setItem(row, 8, item8)
+            self._fill_commit_row(
+                commit_table, row, commit, total_commits - (offset + idx), current_branch,
+                changed=changed_by_sha.get(commit.hexsha), als_summary=als_by_sha.get(commit.hexsha),
+                sample_status=samples_by_sha.get(commit.hexsha), audio_totals=audio_by_sha.get(commit.hexsha),
+                size_added=sizes_by_sha.get(commit.hexsha)
+            )
 
         commit_table.setSortingEnabled(True)
 
@@ -3372,6 +3661,844 @@ class DAWGitApp(QMainWindow):
             commit_table.verticalScrollBar().valueChanged.connect(self.handle_commit_scroll)
         
         
+    def _tree_document_summary(self, commit):
+        """
+        (document count, DAW type) for a take's tree. Trees never change, so the
+        answer is kept per tree SHA and reloading or filtering history skips the walk.
+        """
+        if not hasattr(self, "_tree_documents"):
+            self._tree_documents = {}
+        cache = self._tree_documents
+        tree_sha = commit.tree.hexsha
+        if tree_sha not in cache:
+            file_list = self.repo.git.ls_tree("-r", "--name-only", "-z", tree_sha).split("\0")
+            documents = group_by_document([f for f in file_list if f])   # a .logicx bundle counts as one file
+            daw_type = "Ableton" if any(d.endswith(".als") for d in documents) else "Logic" if any(d.endswith(".logicx") for d in documents) else "Unknown"
+            cache[tree_sha] = (str(len(documents)), daw_type)
+        return cache[tree_sha]
+
+
+    def _fill_commit_row(self, commit_table, row, commit, index_num, current_branch, branches=None, changed=None,
+                         als_summary=None, sample_status=None, audio_totals=None, size_added=None):
+        """
+        Fills one history table row. `branches` may be passed in (e.g. from the
+        search index) to skip the per-row `git branch --contains` call;
+        `changed` is the commit's [(status, path)] list from the path index;
+        `als_summary` is the session summary from the ALS analyzer;
+        `sample_status` is the take's entry from the sample index.
+        """
+        sha_short = commit.hexsha[:7]
+        short_msg = commit.message.strip().split("\n")[0]
+        date_str = datetime.fromtimestamp(commit.committed_date).strftime("%b %d, %H:%M")
+
+        file_count, daw_type = self._tree_document_summary(commit)
+        
+        role = self.commit_roles.get(commit.hexsha, "")
+
+        # Commit number — read-only
+        item0 = NumericItem(index_num)
+        item0.setFlags(item0.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 0, item0)
+
+        # Role — read-only
+        item1 = QTableWidgetItem(self.pretty_role(role))
+        item1.setFlags(item1.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 1, item1)
+
+        # Commit ID — read-only with tooltip
+        item2 = QTableWidgetItem(sha_short)
+        item2.setToolTip(commit.hexsha)
+        item2.setFlags(item2.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 2, item2)
+
+        # Commit message — editable
+        item3 = QTableWidgetItem(short_msg)
+        item3.setFlags(item3.flags() | Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 3, item3)
+
+        # Branch names — read-only
+        branch_str = self._commit_branch_label(commit.hexsha, current_branch, branches)
+        item4 = QTableWidgetItem(branch_str)
+        item4.setFlags(item4.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 4, item4)
+
+        # DAW type — read-only
+        item5 = QTableWidgetItem(daw_type)
+        item5.setFlags(item5.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 5, item5)
+
+        # File count — read-only
+        item6 = QTableWidgetItem(file_count)
+        item6.setFlags(item6.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 6, item6)
+
+        # Tags — editable
+        tag = self.get_tag_for_commit(commit.hexsha) or ""
+        item7 = QTableWidgetItem(tag)
+        item7.setFlags(item7.flags() | Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 7, item7)
+
+        # Date — read-only
+        item8 = QTableWidgetItem(date_str)
+        item8.setFlags(item8.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 8, item8)
+
+        # Changed files — read-only, full list in the tooltip; bundle contents fold into the bundle
+        if changed:
+            changed = self._group_changed_by_document(changed)
+            first = Path(changed[0][1]).name
+            text = first if len(changed) == 1 else CHANGED_FILES_MORE.format(name=first, more=len(changed) - 1)
+            tooltip = "\n".join(
+                f"{status} {CHANGED_BUNDLE_FILES.format(path=path, count=count) if count > 1 else path}"
+                for status, path, count in changed
+            )
+        else:
+            text, tooltip = "–", ""
+        item9 = QTableWidgetItem(text)
+        item9.setToolTip(tooltip)
+        item9.setFlags(item9.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 9, item9)
+
+        # Tempo + track count from the .als summary — read-only, details in the tooltip
+        summary = als_summary if als_summary and not als_summary.get("error") else None
+        summary_tip = format_summary_tooltip(summary)
+        tempo_text = f"{summary['tempo']:g}" if summary and summary.get("tempo") else "–"
+        tracks_text = str(summary["track_count"]) if summary else "–"
+        for col, text in ((10, tempo_text), (11, tracks_text)):
+            item = QTableWidgetItem(text)
+            item.setToolTip(summary_tip)
+            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            commit_table.setItem(row, col, item)
+
+        # Sample integrity — flags takes whose set references samples that aren't in the take
+        tips = []
+        if not sample_status or not sample_status["samples"]:
+            samples_text = "–"
+        elif sample_status["missing"]:
+            samples_text = SAMPLES_MISSING.format(count=len(sample_status["missing"]))
+            tips.append(SAMPLES_MISSING_TOOLTIP.format(paths="\n".join(sample_status["missing"])))
+        else:
+            samples_text = SAMPLES_OK.format(count=sample_status["samples"])
+        if sample_status and sample_status["external"]:
+            tips.append(SAMPLES_EXTERNAL_TOOLTIP.format(paths="\n".join(sample_status["external"])))
+        item12 = QTableWidgetItem(samples_text)
+        item12.setToolTip("\n\n".join(tips))
+        item12.setFlags(item12.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        if sample_status and sample_status["missing"]:
+            item12.setForeground(QColor("#c0392b"))
+        commit_table.setItem(row, 12, item12)
+
+        # Audio assets — size/count/new come from the tree, durations etc. fill in as probes finish
+        if audio_totals and audio_totals["files"]:
+            size = format_size(audio_totals["bytes"])
+            audio_text = AUDIO_TOTALS_MSG.format(size=size, count=audio_totals["files"], new=audio_totals["new"])
+            if audio_totals["waiting"]:
+                audio_tip = AUDIO_TOTALS_PENDING_TOOLTIP.format(
+                    count=audio_totals["files"], size=size, new=audio_totals["new"]
+                )
+            else:
+                minutes, seconds = divmod(int(round(audio_totals["duration"])), 60)
+                audio_tip = AUDIO_TOTALS_TOOLTIP.format(
+                    count=audio_totals["files"], size=size, new=audio_totals["new"],
+                    duration=f"{minutes}:{seconds:02}",
+                    rates=", ".join(f"{rate / 1000:g} kHz" for rate in audio_totals["sample_rates"]) or "–",
+                    bits=", ".join(f"{bits}-bit" for bits in audio_totals["bit_depths"]) or "–",
+                )
+        else:
+            audio_text, audio_tip = "–", ""
+        item13 = QTableWidgetItem(audio_text)
+        item13.setToolTip(audio_tip)
+        item13.setFlags(item13.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 13, item13)
+
+        # Bytes this take added to history (blobs, trees and LFS content first seen here) — sorts by size
+        if size_added:
+            item14 = NumericItem(size_added["added"], SIZE_ADDED_MSG.format(size=format_size(size_added["added"])))
+            item14.setToolTip(SIZE_ADDED_TOOLTIP.format(
+                size=format_size(size_added["added"]), objects=size_added["objects"],
+                disk=format_size(size_added["disk"]), lfs=format_size(size_added["lfs_bytes"]),
+                largest=size_added["largest_path"] or "–",
+            ))
+        else:
+            item14 = NumericItem(-1, "–")
+        item14.setFlags(item14.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        commit_table.setItem(row, 14, item14)
+
+
+    def _group_changed_by_document(self, changed):
+        """[(status, path, file count)] with the files inside a .logicx bundle folded into the bundle."""
+        statuses = {}
+        for status, path in changed:
+            statuses.setdefault(document_of(path) or path, []).append(status)
+        return [(codes[0] if len(set(codes)) == 1 else "M", path, len(codes)) for path, codes in statuses.items()]
+
+
+    def refresh_commit_rows(self, shas):
+        """
+        Re-renders only the history rows for `shas` (e.g. after tagging or a ref
+        transaction). Falls back to a full reload when none of them is on screen.
+        Returns the number of rows refreshed.
+        """
+        shas = {sha for sha in shas if sha}
+        if not shas or not self.repo or not hasattr(self, "snapshot_page"):
+            return 0
+
+        commit_table = self.snapshot_page.commit_table
+        rows = []
+        for row in range(commit_table.rowCount()):
+            item = commit_table.item(row, 2)
+            if item and item.toolTip() in shas:
+                rows.append((row, item.toolTip()))
+        if not rows:
+            self.load_commit_history()
+            return 0
+
+        try:
+            current_branch = self.repo.active_branch.name
+        except TypeError:
+            current_branch = "(detached HEAD)"
+        changed_by_sha = self._changed_files_for([sha for _, sha in rows])
+        als_by_sha = self._als_summaries_for([sha for _, sha in rows])
+        samples_by_sha = self._sample_status_for([sha for _, sha in rows])
+        audio_by_sha = self._audio_totals_for([sha for _, sha in rows])
+        sizes_by_sha = self._sizes_added_for([sha for _, sha in rows])
+
+        # Sorting would move rows under us while we rewrite their cells
+        sorting = commit_table.isSortingEnabled()
+        commit_table.setSortingEnabled(False)
+        for row, sha in rows:
+            number = getattr(commit_table.item(row, 0), "number", row + 1)
+            self._fill_commit_row(
+                commit_table, row, self.repo.commit(sha), number, current_branch,
+                changed=changed_by_sha.get(sha), als_summary=als_by_sha.get(sha),
+                sample_status=samples_by_sha.get(sha), audio_totals=audio_by_sha.get(sha),
+                size_added=sizes_by_sha.get(sha)
+            )
+        commit_table.setSortingEnabled(sorting)
+        self.update_role_buttons()
+        print(f"[DEBUG] Refreshed {len(rows)} history rows")
+        return len(rows)
+
+
+    def _commit_branch_label(self, commit_sha, current_branch, branches=None):
+        sha_short = commit_sha[:7]
+        try:
+            if branches is None:
+                result = subprocess.run(
+                    ["git", "branch", "--contains", commit_sha],
+                    cwd=self.project_path,
+                    env=self.custom_env(),
+                    capture_output=True,
+                    text=True
+                )
+                branches = [line.strip().lstrip("* ").strip() for line in result.stdout.strip().splitlines()]
+            if current_branch in branches:
+                branches = [f"🎯 MAIN" if b == "main" and b == current_branch
+                            else "MAIN" if b == "main"
+                            else f"🎯 {b}" if b == current_branch
+                            else b
+                            for b in branches]
+            # branch_str = ", ".join(branches)
+            if "main" in branches:
+                return "MAIN"
+            return branches[0]
+        except Exception as e:
+            print(f"[ERROR] Failed to get branches for {sha_short}: {e}")
+            return "–"
+
+
+    def _get_path_index(self):
+        index = getattr(self, "path_index", None)
+        if index is None or index.project_path != Path(self.project_path):
+            if index is not None:
+                index.close()
+            index = PathHistoryIndex(self.project_path)
+            self.path_index = index
+        return index
+
+
+    def _changed_files_for(self, shas):
+        """Changed-file lists for a page of commits, from the incrementally updated path index."""
+        if not shas or not self.project_path:
+            return {}
+        try:
+            index = self._get_path_index()
+            index.update()
+            return index.changed_files(shas)
+        except Exception as e:
+            print(f"[WARN] Path index unavailable: {e}")
+            return {}
+
+
+    def _get_als_analyzer(self):
+        analyzer = getattr(self, "als_analyzer", None)
+        if analyzer is None or analyzer.project_path != Path(self.project_path):
+            analyzer = AlsAnalyzer(self.project_path)
+            self.als_analyzer = analyzer
+        return analyzer
+
+
+    def _als_blob_for(self, commit):
+        """Blob SHA of the take's main `.als` (the placeholder set only if it's the only one)."""
+        sets = sorted(
+            (b for b in commit.tree.blobs if b.name.endswith(".als")),
+            key=lambda b: (b.name == "auto_placeholder.als", b.name)
+        )
+        return sets[0].hexsha if sets else None
+
+
+    def _get_als_differ(self):
+        differ = getattr(self, "als_differ", None)
+        analyzer = self._get_als_analyzer()
+        if differ is None or differ.analyzer is not analyzer:
+            differ = AlsDiffer(analyzer)
+            self.als_differ = differ
+        return differ
+
+
+    def _get_ancestry(self):
+        ancestry = getattr(self, "ancestry", None)
+        if ancestry is None or ancestry.project_path != Path(self.project_path):
+            ancestry = Ancestry(self.project_path)
+            self.ancestry = ancestry
+        return ancestry
+
+
+    def _ordered_takes(self, sha_a, sha_b):
+        """(older, newer) commits — by date, with ancestry deciding same-second saves."""
+        older, newer = sorted((self.repo.commit(sha_a), self.repo.commit(sha_b)),
+                              key=lambda c: c.committed_datetime)
+        if self._get_ancestry().is_ancestor(newer.hexsha, older.hexsha):
+            older, newer = newer, older
+        return older, newer
+
+
+    def show_als_diff(self, sha_a, sha_b):
+        """🔀 Shows what changed in the Ableton set between two selected takes (older → newer)."""
+        view = self.snapshot_page.als_diff_view
+        try:
+            older, newer = self._ordered_takes(sha_a, sha_b)
+            blob_a, blob_b = self._als_blob_for(older), self._als_blob_for(newer)
+            diff = self._get_als_differ().diff(blob_a, blob_b) if blob_a and blob_b else None
+        except Exception as e:
+            print(f"[WARN] ALS diff unavailable: {e}")
+            view.setVisible(False)
+            return None
+
+        title = ALS_DIFF_TITLE.format(older=older.hexsha[:7], newer=newer.hexsha[:7])
+        if diff is None:
+            body = ALS_DIFF_UNAVAILABLE
+        else:
+            body = "\n".join(format_als_diff(diff)) or ALS_DIFF_NO_CHANGES
+        view.setPlainText(f"{title}\n{body}")
+        view.setVisible(True)
+        return diff
+
+
+    def _get_peak_cache(self):
+        cache = getattr(self, "peak_cache", None)
+        if cache is None or cache.project_path != Path(self.project_path):
+            if cache is not None:
+                cache.shutdown()
+            cache = PeakCache(self.project_path)
+            self.peak_cache = cache
+        return cache
+
+
+    def show_waveforms(self, sha):
+        """〰️ Lists a take's WAV/AIFF files under the history and previews the first — nothing is checked out."""
+        page = self.snapshot_page
+        try:
+            files = self._get_peak_cache().audio_files(sha) if self.project_path else []
+        except Exception as e:
+            print(f"[WARN] Waveform preview unavailable: {e}")
+            files = []
+        if not files:
+            self.cancel_waveform()
+            page.waveform_panel.setVisible(False)
+            return []
+
+        page.waveform_combo.blockSignals(True)
+        page.waveform_combo.clear()
+        for path, oid in files:
+            page.waveform_combo.addItem(path, oid)
+        page.waveform_combo.blockSignals(False)
+        page.waveform_panel.setVisible(True)
+        self.show_waveform(files[0][1], files[0][0])
+        return files
+
+
+    def _cancel_preview(self, attr):
+        """Drops a preview request nobody will draw; a decode that hasn't started yet never runs."""
+        request = getattr(self, attr, None)
+        if request is not None:
+            request[-1].cancel()   # no-op once the decode is running or done
+            setattr(self, attr, None)
+
+
+    def cancel_waveform(self):
+        self._cancel_preview("_waveform_request")
+
+
+    def cancel_audio_diff(self):
+        self._cancel_preview("_audio_diff_request")
+
+
+    def show_waveform(self, oid, path=""):
+        """Draws one file's peaks: instantly when cached, otherwise once the background decode finishes."""
+        self.cancel_waveform()
+        future = self._get_peak_cache().peaks_async(oid)
+        self._waveform_request = (oid, path, future)
+        if future.done() or os.getenv("DAWGIT_TEST_MODE") == "1":
+            self._draw_waveform()
+        else:
+            self.snapshot_page.waveform_view.set_message(WAVEFORM_LOADING)
+            QTimer.singleShot(PEAK_POLL_INTERVAL_MS, self._draw_waveform)
+
+
+    def _draw_waveform(self):
+        if getattr(self, "_waveform_request", None) is None:
+            return   # cancelled: the selection moved on
+        oid, path, future = self._waveform_request
+        if not future.done() and os.getenv("DAWGIT_TEST_MODE") != "1":
+            QTimer.singleShot(PEAK_POLL_INTERVAL_MS, self._draw_waveform)
+            return
+        view = self.snapshot_page.waveform_view
+        try:
+            peaks = future.result()
+        except Exception as e:
+            view.set_message(WAVEFORM_UNAVAILABLE.format(error=e))
+            view.setToolTip(path)
+            return
+        minutes, seconds = divmod(peaks.duration, 60)
+        view.set_peaks(peaks)
+        view.setToolTip(WAVEFORM_TOOLTIP.format(
+            path=path, duration=f"{int(minutes)}:{seconds:04.1f}", rate=peaks.sample_rate / 1000,
+            channels=peaks.channels
+        ))
+
+
+    def _get_audio_differ(self):
+        differ = getattr(self, "audio_differ", None)
+        if differ is None or differ.project_path != Path(self.project_path):
+            if differ is not None:
+                differ.shutdown()
+            differ = AudioDiffer(self.project_path)
+            self.audio_differ = differ
+        return differ
+
+
+    def show_audio_diff(self, sha_a, sha_b):
+        """🎚️ Lists audio that changed between two takes and shows the changed regions of the first (mixdowns first)."""
+        page = self.snapshot_page
+        try:
+            older, newer = self._ordered_takes(sha_a, sha_b)
+            cache = self._get_peak_cache()
+            pairs = comparable_audio(cache.audio_files(older.hexsha), cache.audio_files(newer.hexsha))
+        except Exception as e:
+            print(f"[WARN] Audio diff unavailable: {e}")
+            pairs = []
+        if not pairs:
+            self.cancel_audio_diff()
+            page.audio_diff_panel.setVisible(False)
+            return []
+
+        page.audio_diff_combo.blockSignals(True)
+        page.audio_diff_combo.clear()
+        for path, blob_a, blob_b in pairs:
+            page.audio_diff_combo.addItem(path, (blob_a, blob_b))
+        page.audio_diff_combo.blockSignals(False)
+        page.audio_diff_panel.setVisible(True)
+        path, blob_a, blob_b = pairs[0]
+        self.show_audio_diff_for(blob_a, blob_b, path=path)
+        return pairs
+
+
+    def show_audio_diff_for(self, blob_a, blob_b, path=""):
+        """Draws one pair's changed regions: instantly when cached, otherwise once the background analysis is done."""
+        self.cancel_audio_diff()
+        future = self._get_audio_differ().diff_async(blob_a, blob_b)
+        self._audio_diff_request = (path, future)
+        if future.done() or os.getenv("DAWGIT_TEST_MODE") == "1":
+            self._draw_audio_diff()
+        else:
+            self.snapshot_page.audio_diff_strip.set_diff(None)
+            self.snapshot_page.audio_diff_label.setText(AUDIO_DIFF_LOADING)
+            QTimer.singleShot(PEAK_POLL_INTERVAL_MS, self._draw_audio_diff)
+
+
+    def _draw_audio_diff(self):
+        if getattr(self, "_audio_diff_request", None) is None:
+            return   # cancelled: the selection moved on
+        path, future = self._audio_diff_request
+        if not future.done() and os.getenv("DAWGIT_TEST_MODE") != "1":
+            QTimer.singleShot(PEAK_POLL_INTERVAL_MS, self._draw_audio_diff)
+            return
+        page = self.snapshot_page
+        try:
+            diff = future.result()
+        except Exception as e:
+            page.audio_diff_strip.set_diff(None)
+            page.audio_diff_label.setText(AUDIO_DIFF_UNAVAILABLE.format(error=e))
+            return
+        page.audio_diff_strip.set_diff(diff)
+        if diff["changed"]:
+            text = AUDIO_DIFF_SUMMARY.format(path=path, count=len(diff["changed"]),
+                                             seconds=diff["changed_seconds"], delta=diff["loudness_delta"])
+        else:
+            text = AUDIO_DIFF_NO_CHANGES.format(path=path, delta=diff["loudness_delta"])
+        page.audio_diff_label.setText(text)
+        page.audio_diff_strip.setToolTip(AUDIO_DIFF_OFFSET.format(offset=diff["offset"]) if diff["offset"] else "")
+        return diff
+
+
+    def _als_summaries_for(self, shas):
+        """
+        {commit_sha: .als summary} for a page of commits. Commits that share an
+        `.als` revision share one cached summary; new revisions are parsed once,
+        on a worker thread (right away in test mode), and their rows fill in
+        when it lands.
+        """
+        if not shas or not self.project_path or not self.repo:
+            return {}
+        try:
+            blob_by_commit = self._als_blobs_for(shas)
+            analyzer = self._get_als_analyzer()
+            if os.getenv("DAWGIT_TEST_MODE") == "1":
+                summaries = analyzer.summaries(blob_by_commit.values())
+            else:
+                summaries = analyzer.summaries(blob_by_commit.values(), parse=False)
+                missing = [blob for blob, summary in summaries.items() if summary is None]
+                if missing:
+                    self._parse_als_async(analyzer, missing)
+            return {sha: summaries.get(blob) for sha, blob in blob_by_commit.items()}
+        except Exception as e:
+            print(f"[WARN] ALS summaries unavailable: {e}")
+            return {}
+
+
+    def _parse_als_async(self, analyzer, blobs):
+        if not hasattr(self, "_als_futures"):
+            self._als_futures = []
+        self._als_futures.append(analyzer.summaries_async(blobs))
+        timer = getattr(self, "_als_poll_timer", None)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setInterval(ALS_POLL_INTERVAL_MS)
+            timer.timeout.connect(self._poll_als_summaries)
+            self._als_poll_timer = timer
+        if not timer.isActive():
+            timer.start()
+
+
+    def _poll_als_summaries(self):
+        """Refreshes the shown rows once background `.als` parses have landed."""
+        futures = getattr(self, "_als_futures", [])
+        done = [future for future in futures if future.done()]
+        self._als_futures = [future for future in futures if not future.done()]
+        if not self._als_futures:
+            self._als_poll_timer.stop()
+
+        parsed = False
+        for future in done:
+            try:
+                parsed = parsed or any(summary is not None for summary in future.result().values())
+            except Exception as e:
+                print(f"[WARN] ALS summaries unavailable: {e}")
+        if parsed:   # sets that still can't be read (LFS object not fetched) don't trigger a refresh
+            commit_table = self.snapshot_page.commit_table
+            shown = [commit_table.item(r, 2).toolTip() for r in range(commit_table.rowCount())
+                     if commit_table.item(r, 2)]
+            if shown:
+                self.refresh_commit_rows(shown)
+
+
+    def _als_blobs_for(self, shas):
+        blob_by_commit = {}
+        for sha in shas:
+            blob = self._als_blob_for(self.repo.commit(sha))
+            if blob:
+                blob_by_commit[sha] = blob
+        return blob_by_commit
+
+
+    def _get_sample_index(self):
+        index = getattr(self, "sample_index", None)
+        if index is None or index.project_path != Path(self.project_path):
+            if index is not None:
+                index.close()
+            index = SampleIndex(self.project_path, self._get_als_analyzer())
+            self.sample_index = index
+        return index
+
+
+    def _sample_status_for(self, shas):
+        """{commit_sha: {"samples", "missing", "external"}} — one batched pass for the whole page."""
+        if not shas or not self.project_path or not self.repo:
+            return {}
+        try:
+            index = self._get_sample_index()
+            # Sets still being parsed in the background are indexed when their rows refresh
+            index.update(self._als_blobs_for(shas), parse=os.getenv("DAWGIT_TEST_MODE") == "1")
+            return index.status(shas)
+        except Exception as e:
+            print(f"[WARN] Sample index unavailable: {e}")
+            return {}
+
+
+    def _get_audio_index(self):
+        index = getattr(self, "audio_index", None)
+        if index is None or index.project_path != Path(self.project_path):
+            if index is not None:
+                index.close()
+            index = AudioIndex(self.project_path)
+            self.audio_index = index
+        return index
+
+
+    def _audio_totals_for(self, shas):
+        """
+        {commit_sha: audio totals} — trees are indexed on a worker thread (right
+        away in test mode) and new files probed in the background; rows fill in
+        as each lands.
+        """
+        if not shas or not self.project_path or not self.repo:
+            return {}
+        try:
+            index = self._get_audio_index()
+            index.collect()
+            if os.getenv("DAWGIT_TEST_MODE") == "1":
+                index.update(shas)
+            elif index.update_async(shas):
+                self._ensure_audio_poll()
+            return index.totals(shas)
+        except Exception as e:
+            print(f"[WARN] Audio index unavailable: {e}")
+            return {}
+
+
+    def _ensure_audio_poll(self):
+        """Picks up finished audio probes and refreshes their rows. Off in test mode."""
+        if os.getenv("DAWGIT_TEST_MODE") == "1":
+            return
+        timer = getattr(self, "_audio_poll_timer", None)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setInterval(AUDIO_POLL_INTERVAL_MS)
+            timer.timeout.connect(self._poll_audio_index)
+            self._audio_poll_timer = timer
+        if not timer.isActive():
+            timer.start()
+
+
+    def _poll_audio_index(self):
+        index = getattr(self, "audio_index", None)
+        if index is None:
+            self._audio_poll_timer.stop()
+            return
+        if index.collect():
+            commit_table = self.snapshot_page.commit_table
+            shown = [commit_table.item(r, 2).toolTip() for r in range(commit_table.rowCount())
+                     if commit_table.item(r, 2)]
+            self.refresh_commit_rows(shown)
+        if not index.pending():
+            self._audio_poll_timer.stop()
+
+
+    def _get_repo_analytics(self):
+        analytics = getattr(self, "repo_analytics", None)
+        if analytics is None or analytics.project_path != Path(self.project_path):
+            if analytics is not None:
+                analytics.close()
+            analytics = RepoAnalytics(self.project_path)
+            self.repo_analytics = analytics
+            self._analytics_future = None
+        return analytics
+
+
+    def _update_repo_analytics(self):
+        """Indexes new history — right away in test mode, otherwise on a worker thread polled from here."""
+        analytics = self._get_repo_analytics()
+        if os.getenv("DAWGIT_TEST_MODE") == "1":
+            analytics.update()
+            return
+        if getattr(self, "_analytics_future", None) is not None or analytics.is_current():
+            return
+        self._analytics_future = analytics.update_async()
+        timer = getattr(self, "_analytics_poll_timer", None)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setInterval(ANALYTICS_POLL_INTERVAL_MS)
+            timer.timeout.connect(self._poll_repo_analytics)
+            self._analytics_poll_timer = timer
+        timer.start()
+
+
+    def _poll_repo_analytics(self):
+        future = getattr(self, "_analytics_future", None)
+        if future is not None and not future.done():
+            return
+        self._analytics_poll_timer.stop()
+        if future is None:
+            return
+        self._analytics_future = None
+        try:
+            added = future.result()
+        except Exception as e:
+            print(f"[WARN] Repo analytics update failed: {e}")
+            return
+        if added:
+            commit_table = self.snapshot_page.commit_table
+            shown = [commit_table.item(r, 2).toolTip() for r in range(commit_table.rowCount())
+                     if commit_table.item(r, 2)]
+            self.refresh_commit_rows(shown)
+        if getattr(self, "pages", None) and self.pages.currentWidget() is getattr(self, "analytics_page", None):
+            self.show_repo_analytics()
+
+
+    def _sizes_added_for(self, shas):
+        """{commit_sha: bytes added to history} — takes indexed since the last update fill in when it lands."""
+        if not shas or not self.project_path or not self.repo:
+            return {}
+        try:
+            self._update_repo_analytics()
+            return self._get_repo_analytics().sizes(shas)
+        except Exception as e:
+            print(f"[WARN] Repo analytics unavailable: {e}")
+            return {}
+
+
+    def show_repo_analytics(self):
+        """📊 Fills the project size page from the index, and again once a background update lands."""
+        if not self.project_path or not self.repo or not hasattr(self, "analytics_page"):
+            return None
+        try:
+            self._update_repo_analytics()
+            report = self._get_repo_analytics().report()
+        except Exception as e:
+            print(f"[WARN] Repo analytics unavailable: {e}")
+            return None
+        self.analytics_page.set_report(report, updating=getattr(self, "_analytics_future", None) is not None)
+        return report
+
+
+    def snapshot_is_self_contained(self, sha):
+        """🎧 True if every sample the take's set uses is in the take, None if it has no readable set."""
+        status = self._sample_status_for([sha]).get(sha)
+        return None if status is None else not status["missing"]
+
+
+    def snapshots_touching(self, path, rev=None):
+        """🗂️ SHAs of every take that changed a file or folder (optionally only on one version line)."""
+        index = self._get_path_index()
+        index.update()
+        return index.snapshots_for(path, rev=rev)
+
+
+    def _get_history_index(self):
+        index = getattr(self, "history_index", None)
+        if index is None or index.project_path != Path(self.project_path):
+            if index is not None:
+                index.close()
+            index = HistoryIndex(self.project_path)
+            self.history_index = index
+        return index
+
+
+    def apply_history_filter(self, query):
+        """
+        🔎 Filters the history table through the local search index.
+        An empty query restores the normal paginated history.
+        """
+        query = (query or "").strip()
+        if not query:
+            self.load_commit_history()
+            return []
+
+        if not self.repo or not self.project_path or not self.repo.head.is_valid():
+            return []
+
+        start = time.perf_counter()
+        try:
+            index = self._get_history_index()
+            index.update()
+            index.sync_roles(self.commit_roles)
+
+            text, facets = parse_query(query)
+            path = facets.pop("path", None)
+            if path:
+                # 🗂️ path: facet is answered by the path index; other terms narrow it further
+                shas = self.snapshots_touching(path)
+                rest = " ".join([text] + [f"{k}:{v}" for k, v in facets.items()]).strip()
+                if rest:
+                    allowed = set(index.search(rest, limit=len(shas) + SEARCH_RESULT_LIMIT))
+                    shas = [sha for sha in shas if sha in allowed]
+                shas = shas[:SEARCH_RESULT_LIMIT]
+            else:
+                shas = index.search(query)
+            branches_by_sha = index.branches_for(shas)
+            changed_by_sha = self._changed_files_for(shas)
+            als_by_sha = self._als_summaries_for(shas)
+            samples_by_sha = self._sample_status_for(shas)
+            audio_by_sha = self._audio_totals_for(shas)
+            sizes_by_sha = self._sizes_added_for(shas)
+        except Exception as e:
+            print(f"[ERROR] History search failed: {e}")
+            return []
+
+        try:
+            current_branch = self.repo.active_branch.name
+        except TypeError:
+            current_branch = "(detached HEAD)"
+
+        take_numbers = self._take_numbers_for(shas)
+
+        commit_table = self.snapshot_page.commit_table
+        commit_table.setSortingEnabled(False)
+        self.snapshot_page.clear_table()
+        for sha in shas:
+            try:
+                commit = self.repo.commit(sha)
+            except Exception:
+                continue  # rewritten away and garbage-collected since it was indexed
+            index_num = take_numbers.get(sha, 0)
+            row = commit_table.rowCount()
+            commit_table.insertRow(row)
+            self._fill_commit_row(
+                commit_table, row, commit, index_num, current_branch,
+                branches=branches_by_sha.get(sha), changed=changed_by_sha.get(sha),
+                als_summary=als_by_sha.get(sha), sample_status=samples_by_sha.get(sha),
+                audio_totals=audio_by_sha.get(sha), size_added=sizes_by_sha.get(sha)
+            )
+        commit_table.setSortingEnabled(True)
+        commit_table.sortItems(0, Qt.SortOrder.DescendingOrder)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"[DEBUG] History search '{query}' → {len(shas)} results in {elapsed_ms:.1f} ms")
+        self.snapshot_page.status_label.setText(
+            SEARCH_RESULTS_MSG.format(count=commit_table.rowCount()) if shas
+            else SEARCH_NO_RESULTS_MSG.format(query=query)
+        )
+        return shas
+
+
+    def _take_numbers_for(self, shas):
+        """
+        {sha: take number}. Takes on the current line are numbered by position;
+        others by their depth, worked out from one `rev-list --parents` over
+        the history that isn't on the current line.
+        """
+        head_line = self.repo.git.rev_list("HEAD").split()
+        numbers = {sha: len(head_line) - i for i, sha in enumerate(head_line)}
+        missing = [sha for sha in shas if sha not in numbers]
+        if missing:
+            out = self.repo.git.rev_list("--topo-order", "--reverse", "--parents", *missing, "--not", "HEAD")
+            for line in out.splitlines():
+                sha, *parents = line.split()
+                numbers[sha] = 1 + max((numbers.get(p, 0) for p in parents), default=0)
+        return {sha: numbers[sha] for sha in shas if sha in numbers}
+
+
     # Lazy-load scroll handler helper
     def handle_commit_scroll(self):
         scroll_bar = self.snapshot_page.commit_table.verticalScrollBar()
@@ -3464,6 +4591,7 @@ class DAWGitApp(QMainWindow):
         self.current_commit_id = None
 
 
+    @holds_repo_lock
     def start_new_version_line(self):
         raw_input, ok = QInputDialog.getText(
             self,
@@ -3551,6 +4679,7 @@ class DAWGitApp(QMainWindow):
             print(f"[DEBUG] QTimer.singleShot failed: {e}")
 
 
+    @holds_repo_lock
     def switch_branch(self, branch_name=None):
         if not self.repo:
             QMessageBox.warning(self, NO_REPO_TITLE, NO_REPO_MSG)
@@ -3699,6 +4828,16 @@ class DAWGitApp(QMainWindow):
 
 
     def restore_last_backup(self):
+        # 🗂️ Catalogued backups restore straight from their recorded file list
+        catalog = BackupCatalog(self.project_path)
+        entry = catalog.latest(kind="unsaved")
+        if entry:
+            restored = catalog.restore_backup(entry["id"])
+            if restored:
+                QMessageBox.information(self, BACKUP_RESTORED_TITLE, BACKUP_RESTORED_MSG.format(path=entry["root"]))
+                return
+
+        # Fallback: backup folders made before the catalog existed
         backups = sorted(Path(self.project_path.parent).glob(f"Backup_{self.project_path.name}_*"), reverse=True)
         if not backups:
             QMessageBox.warning(self, NO_BACKUP_FOUND_TITLE, "There are no backup folders for this project.")
@@ -3711,6 +4850,95 @@ class DAWGitApp(QMainWindow):
         QMessageBox.information(self, BACKUP_RESTORED_TITLE, BACKUP_RESTORED_MSG.format(path=latest_backup))
 
 
+    def _get_lfs_store(self):
+        store = getattr(self, "lfs_store", None)
+        if store is None or store.project_path != Path(self.project_path):
+            if store is not None:
+                store.shutdown()
+            store = LfsStore(self.project_path)
+            self.lfs_store = store
+            self._lfs_plan_request = None
+        return store
+
+
+    def prune_lfs_store(self, dry_run=False):
+        """
+        💾 Shows what pruning the LFS store to its budget would free, and prunes once confirmed.
+        The plan is worked out on a worker thread (right away in test mode) — checking the
+        remote can take a while — and the confirmation shows once it's ready.
+        """
+        if not self.project_path or not self.repo:
+            return None
+        store = self._get_lfs_store()
+        if os.getenv("DAWGIT_TEST_MODE") == "1":
+            return self._confirm_lfs_prune(store.plan(), dry_run)
+        if getattr(self, "_lfs_plan_request", None) is not None:
+            return None     # already checking
+        self._lfs_plan_request = (dry_run, store.plan_async())
+        self.show_status_message(LFS_PRUNE_CHECKING_MSG)
+        timer = getattr(self, "_lfs_plan_timer", None)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setInterval(LFS_PLAN_POLL_INTERVAL_MS)
+            timer.timeout.connect(self._poll_lfs_plan)
+            self._lfs_plan_timer = timer
+        timer.start()
+        return None
+
+
+    def _poll_lfs_plan(self):
+        request = getattr(self, "_lfs_plan_request", None)
+        if request is not None and not request[1].done():
+            return
+        self._lfs_plan_timer.stop()
+        if request is None:
+            return
+        self._lfs_plan_request = None
+        dry_run, future = request
+        try:
+            plan = future.result()
+        except Exception as e:
+            QMessageBox.warning(self, LFS_PRUNE_TITLE, LFS_PRUNE_FAILED_MSG.format(error=e))
+            return
+        self._confirm_lfs_prune(plan, dry_run)
+
+
+    def _confirm_lfs_prune(self, plan, dry_run=False):
+        """Asks before deleting exactly the objects in `plan` — the remote isn't asked again."""
+        if plan["remote"] is None:
+            QMessageBox.warning(self, LFS_PRUNE_TITLE, LFS_PRUNE_NO_REMOTE_MSG.format(
+                total=format_size(plan["bytes"]), budget=format_size(plan["budget"])))
+            return plan
+        over = LFS_PRUNE_OVER_BUDGET_MSG.format(retained=format_size(plan["retained_bytes"])) \
+            if plan["over_budget"] else ""
+        if plan["over_budget"] and plan["unpushed_bytes"]:
+            over += LFS_PRUNE_UNPUSHED_MSG.format(size=format_size(plan["unpushed_bytes"]), remote=plan["remote"])
+        if not plan["prune"]:
+            QMessageBox.information(self, LFS_PRUNE_TITLE, LFS_PRUNE_NOTHING_MSG.format(
+                total=format_size(plan["bytes"]), budget=format_size(plan["budget"])) + over)
+            return plan
+        if dry_run:
+            return plan
+
+        confirm = QMessageBox.question(
+            self, LFS_PRUNE_TITLE,
+            LFS_PRUNE_CONFIRM_MSG.format(total=format_size(plan["bytes"]), budget=format_size(plan["budget"]),
+                                         count=len(plan["prune"]), reclaim=format_size(plan["reclaim_bytes"]),
+                                         remote=plan["remote"]) + over,
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return plan
+
+        result = self._get_lfs_store().prune(plan=plan)
+        if result["status"] != "success":
+            QMessageBox.warning(self, LFS_PRUNE_TITLE, result["message"])
+            return result
+        QMessageBox.information(self, LFS_PRUNE_TITLE, LFS_PRUNE_DONE_MSG.format(
+            reclaim=format_size(result["reclaim_bytes"]), after=format_size(result["after_bytes"])))
+        return result
+
+
 
     def timerEvent(self, event):
         if isinstance(self.project_path, str):
@@ -3897,17 +5125,9 @@ class DAWGitApp(QMainWindow):
         if not self.project_path or not self.project_path.exists():
             return None
 
-        # Check for .als first (Ableton)
-        als_files = list(self.project_path.glob("*.als"))
-        if als_files:
-            return als_files[0]
-
-        # Then check for Logic Pro
-        logicx_files = list(self.project_path.glob("*.logicx"))
-        if logicx_files:
-            return logicx_files[0]
-
-        return None
+        # .als first (Ableton), then Logic Pro — a .logicx bundle is one document
+        documents = sorted(daw_documents(self.project_path), key=lambda p: p.suffix != ".als")
+        return documents[0] if documents else None
 
 
     def load_project_folder(self, folder_path):
@@ -3969,7 +5189,7 @@ class DAWGitApp(QMainWindow):
 
 
     def is_valid_daw_folder(self, path):
-        return any(path.glob("*.als")) or any(path.glob("*.logicx"))        
+        return bool(daw_documents(path))
 
     
     def load_saved_project_path(self):
@@ -4015,7 +5235,7 @@ class DAWGitApp(QMainWindow):
             return None
 
         # Ensure that there is at least one DAW file in the folder (.als or .logicx)
-        daw_files = list(resolved_path.glob("*.als")) + list(resolved_path.glob("*.logicx"))
+        daw_files = daw_documents(resolved_path)
         if not daw_files and not os.getenv("DAWGIT_TEST_MODE"):
             print("⚠️ No DAW file found in saved folder.")
             return None
@@ -4030,9 +5250,7 @@ class DAWGitApp(QMainWindow):
         if not self.project_path:
             return
 
-        als_file = next(self.project_path.glob("*.als"), None)
-        logicx_file = next(self.project_path.glob("*.logicx"), None)
-        daw_file = als_file or logicx_file
+        daw_file = self.get_active_daw_file()
 
         if daw_file and daw_file.exists():
             try:
@@ -0,0 +1,237 @@
+# git_objects.py
+import os
+import hashlib
+import threading
+import subprocess
+from pathlib import Path
+
+
+LFS_POINTER_PREFIX = b"version https://git-lfs.github.com/spec/v1"
+LFS_POINTER_MAX_SIZE = 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def git_env():
+    env = os.environ.copy()
+    env["PATH"] = "/usr/local/bin:/opt/homebrew/bin:" + os.environ["PATH"]
+    return env
+
+
+_repo_locks = {}
+_repo_locks_guard = threading.Lock()
+
+
+def repo_lock(repo_path):
+    """
+    Process-wide lock for git work that writes the index or refs of one repo.
+    Background writers (auto snapshots) and GUI actions take it so they never
+    race each other into `index.lock`.
+    """
+    key = os.path.realpath(repo_path)
+    with _repo_locks_guard:
+        return _repo_locks.setdefault(key, threading.RLock())
+
+
+def run_git(repo_path, *args, input=None, check=True):
+    """Runs a git command in `repo_path` and returns stdout as bytes."""
+    result = subprocess.run(
+        ["git", *args],
+        cwd=repo_path,
+        env=git_env(),
+        input=input,
+        capture_output=True,
+        check=check
+    )
+    return result.stdout
+
+
+def resolve_commit(repo_path, rev):
+    """Resolves a SHA, tag, or branch name to a full commit SHA."""
+    return run_git(repo_path, "rev-parse", "--verify", f"{rev}^{{commit}}").decode().strip()
+
+
+def is_ancestor(repo_path, ancestor, descendant):
+    """True if `ancestor` is reachable from `descendant` (i.e. a fast-forward)."""
+    result = subprocess.run(
+        ["git", "merge-base", "--is-ancestor", ancestor, descendant],
+        cwd=repo_path,
+        env=git_env(),
+        capture_output=True
+    )
+    return result.returncode == 0
+
+
+def git_dir(repo_path):
+    out = run_git(repo_path, "rev-parse", "--absolute-git-dir").decode().strip()
+    return Path(out)
+
+
+def list_tree(repo_path, treeish):
+    """
+    Yields (mode, type, oid, size, path) for every entry under `treeish`, recursively.
+    Uses a single `ls-tree -r -z -l` pass; `size` is None for non-blobs.
+    """
+    out = run_git(repo_path, "ls-tree", "-r", "-z", "-l", "--full-tree", treeish)
+    for record in out.split(b"\0"):
+        if not record:
+            continue
+        meta, path = record.split(b"\t", 1)
+        mode, obj_type, oid, size = meta.decode().split()
+        yield mode, obj_type, oid, (int(size) if size != "-" else None), path.decode("utf-8", "surrogateescape")
+
+
+def parse_lfs_pointer(data: bytes):
+    """Returns (oid, size) if `data` is a Git LFS pointer file, else None."""
+    if len(data) > LFS_POINTER_MAX_SIZE or not data.startswith(LFS_POINTER_PREFIX):
+        return None
+    oid = size = None
+    for line in data.decode("utf-8", "replace").splitlines():
+        if line.startswith("oid sha256:"):
+            oid = line[len("oid sha256:"):].strip()
+        elif line.startswith("size "):
+            try:
+                size = int(line[len("size "):].strip())
+            except ValueError:
+                return None
+    if not oid or size is None:
+        return None
+    return oid, size
+
+
+def lfs_object_path(repo_git_dir, oid):
+    """Location of an LFS object in the local store (`.git/lfs/objects/ab/cd/<oid>`)."""
+    return Path(repo_git_dir) / "lfs" / "objects" / oid[0:2] / oid[2:4] / oid
+
+
+class BlobReader:
+    """File-like view over one object in a `cat-file --batch` stream. Never buffers more than a chunk."""
+
+    def __init__(self, stream, size):
+        self._stream = stream
+        self.size = size
+        self._remaining = size
+
+    def read(self, n=-1):
+        if self._remaining <= 0:
+            return b""
+        if n is None or n < 0 or n > self._remaining:
+            n = self._remaining
+        data = self._stream.read(n)
+        self._remaining -= len(data)
+        return data
+
+    def drain(self):
+        while self._remaining > 0:
+            self.read(READ_CHUNK_SIZE)
+        self._stream.read(1)  # trailing LF after every object
+
+
+class CatFileBatch:
+    """
+    Long-lived `git cat-file --batch` process for reading many objects without
+    spawning one git per object. Use as a context manager.
+    """
+
+    def __init__(self, repo_path):
+        self.repo_path = repo_path
+        self._proc = None
+        self._current = None
+
+    def __enter__(self):
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=self.repo_path,
+            env=git_env(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._proc:
+            for pipe in (self._proc.stdin, self._proc.stdout):
+                try:
+                    pipe.close()    # closing stdout too: a half-read object would leave cat-file blocked
+                except Exception:
+                    pass
+            self._proc.wait()
+            self._proc = None
+
+    def open(self, oid):
+        """Returns (type, BlobReader) for `oid`, or (None, None) if the object is missing."""
+        if self._current:
+            self._current.drain()
+            self._current = None
+
+        self._proc.stdin.write(f"{oid}\n".encode())
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().decode().strip()
+        parts = header.split()
+        if len(parts) != 3 or parts[1] == "missing":
+            return None, None
+
+        _, obj_type, size = parts
+        self._current = BlobReader(self._proc.stdout, int(size))
+        return obj_type, self._current
+
+    def read(self, oid):
+        """Reads a whole object into memory — only for small objects (pointers, trees, commits)."""
+        obj_type, reader = self.open(oid)
+        if reader is None:
+            return None
+        data = reader.read()
+        reader.drain()
+        self._current = None
+        return data
+
+
+def existing_commits(repo_path, shas):
+    """Filters `shas` down to commits that exist in the repo, in one `cat-file --batch-check` call."""
+    shas = list(shas)
+    if not shas:
+        return set()
+    out = run_git(repo_path, "cat-file", "--batch-check", input="\n".join(shas).encode() + b"\n")
+    found = set()
+    for line in out.decode().splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[1] == "commit":
+            found.add(parts[0])
+    return found
+
+
+def git_blob_hash(path, chunk_size=READ_CHUNK_SIZE):
+    """Computes the blob SHA-1 Git would assign to a file (same as `git hash-object`), streaming."""
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(f"blob {size}\0".encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def path_attributes(repo_path, paths, *attrs):
+    """
+    Maps each of `paths` to the given gitattributes that apply to it, in one
+    `check-attr` call. Attributes left unspecified are omitted.
+    """
+    paths = list(paths)
+    if not paths:
+        return {}
+    out = run_git(repo_path, "check-attr", "-z", "--stdin", *attrs, input="\0".join(paths).encode() + b"\0")
+    fields = out.split(b"\0")
+    found = {}
+    for i in range(0, len(fields) - 2, 3):
+        path, attr, value = (f.decode("utf-8", "surrogateescape") for f in fields[i:i + 3])
+        found.setdefault(path, {})
+        if value != "unspecified":
+            found[path][attr] = value
+    return found
+
+
+def lfs_tracked_paths(repo_path, paths):
+    """Returns the subset of `paths` whose `filter` attribute is `lfs`, in one `check-attr` call."""
+    return {path for path, attrs in path_attributes(repo_path, paths, "filter").items() if attrs.get("filter") == "lfs"}
@@ -5,6 +5,7 @@ from snapshot_browser_page import SnapshotBrowserPage
 from branch_manager_page import BranchManagerPage
 from commit_page import CommitPage
 from project_setup_page import ProjectSetupPage
+from repo_analytics_page import RepoAnalyticsPage
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
@@ -28,6 +29,7 @@ from ui_strings import (
     TAB_BRANCH_MANAGER,
     TAB_COMMIT_PAGE,
     TAB_PROJECT_SETUP,
+    TAB_REPO_ANALYTICS,
     TAB_SNAPSHOT_BROWSER,
     TOOLTIP_ENABLE_AUTOCOMMIT,
     TOOLTIP_OPEN_IN_FINDER,
@@ -57,6 +59,9 @@ def build_main_ui(app):
     app.setup_page = ProjectSetupPage(app)
     app.pages.add_page("setup", app.setup_page)
 
+    app.analytics_page = RepoAnalyticsPage(app)
+    app.pages.add_page("analytics", app.analytics_page)
+
     if app.project_path:
         app.pages.switch_to("snapshots")
     else:
@@ -102,11 +107,18 @@ def build_main_ui(app):
     nav_layout.addWidget(app.goto_branch_btn)
     nav_layout.addWidget(app.goto_snapshots_btn)
     nav_layout.addWidget(app.goto_commit_btn)
+
+    # 📊 Filled when opened; refreshed again if new history is still being indexed
+    app.goto_analytics_btn = QPushButton(TAB_REPO_ANALYTICS)
+    app.goto_analytics_btn.clicked.connect(lambda: app.pages.switch_to("analytics"))
+    app.goto_analytics_btn.clicked.connect(lambda: app.show_repo_analytics())
+    nav_layout.addWidget(app.goto_analytics_btn)
     main_layout.addLayout(nav_layout)
 
     app.status_label = app.snapshot_page.status_label
 
-    QTimer.singleShot(500, lambda: app.branch_page.populate_branches())
+    # Bound to the page itself so Qt drops the call if the window is gone by then
+    QTimer.singleShot(500, app.branch_page.populate_branches)
     app.update_role_buttons()
     app.safe_single_shot(250, app.load_commit_history, parent=app)
 
@@ -0,0 +1,338 @@
+# history_search.py
+import re
+import json
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+
+from git_objects import existing_commits, is_ancestor, run_git
+from metadata_store import index_path
+
+
+HISTORY_INDEX_NAME = "history_index.sqlite"
+SEARCH_RESULT_LIMIT = 200
+FACET_KEYS = ("role", "branch", "tag", "file", "path", "after", "before")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    committed INTEGER NOT NULL,
+    subject TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '',
+    files TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS commits_committed ON commits(committed);
+CREATE INDEX IF NOT EXISTS commits_role ON commits(role);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS commits_fts USING fts5(
+    subject, body, role, tags, files,
+    content='commits', content_rowid='rowid',
+    tokenize="unicode61 remove_diacritics 2"
+);
+
+CREATE TRIGGER IF NOT EXISTS commits_ai AFTER INSERT ON commits BEGIN
+    INSERT INTO commits_fts(rowid, subject, body, role, tags, files)
+    VALUES (new.rowid, new.subject, new.body, new.role, new.tags, new.files);
+END;
+CREATE TRIGGER IF NOT EXISTS commits_ad AFTER DELETE ON commits BEGIN
+    INSERT INTO commits_fts(commits_fts, rowid, subject, body, role, tags, files)
+    VALUES ('delete', old.rowid, old.subject, old.body, old.role, old.tags, old.files);
+END;
+CREATE TRIGGER IF NOT EXISTS commits_au AFTER UPDATE ON commits BEGIN
+    INSERT INTO commits_fts(commits_fts, rowid, subject, body, role, tags, files)
+    VALUES ('delete', old.rowid, old.subject, old.body, old.role, old.tags, old.files);
+    INSERT INTO commits_fts(rowid, subject, body, role, tags, files)
+    VALUES (new.rowid, new.subject, new.body, new.role, new.tags, new.files);
+END;
+
+CREATE TABLE IF NOT EXISTS commit_branches (
+    branch TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    PRIMARY KEY (branch, sha)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS commit_branches_sha ON commit_branches(sha);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def history_index_path(project_path):
+    return index_path(project_path, HISTORY_INDEX_NAME)
+
+
+def parse_query(text):
+    """
+    Splits a filter-box query into free text and facets.
+
+    `bassline role:main_mix branch:main after:2025-01-01 file:Samples/kick`
+    → ("bassline", {"role": "main_mix", "branch": "main", "after": ..., "file": ...})
+    """
+    facets = {}
+    words = []
+    for token in (text or "").split():
+        key, sep, value = token.partition(":")
+        if sep and key.lower() in FACET_KEYS and value:
+            facets[key.lower()] = value
+        else:
+            words.append(token)
+    return " ".join(words), facets
+
+
+def _fts_match(text, column=None):
+    """Turns free text into an FTS5 prefix query; every word must match."""
+    terms = [t for t in re.split(r"[^\w]+", text, flags=re.UNICODE) if t]
+    if not terms:
+        return None
+    prefix = f"{column} : " if column else ""
+    return " AND ".join(f'{prefix}"{t}"*' for t in terms)
+
+
+def _to_timestamp(value, end_of_day=False):
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            dt = datetime.strptime(value, fmt)
+            if end_of_day and fmt == "%Y-%m-%d":
+                dt = dt.replace(hour=23, minute=59, second=59)
+            return int(dt.timestamp())
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_log(raw):
+    """Parses `git log --name-only -z` output written with the format used by HistoryIndex.update()."""
+    for chunk in raw.decode("utf-8", "replace").split("\x1e"):
+        if not chunk.strip("\0\n"):
+            continue
+        parts = chunk.split("\x1f", 4)
+        if len(parts) < 5:
+            continue
+        sha, committed, subject, body, rest = parts
+        files = [f for f in rest.lstrip("\0\n").split("\0") if f.strip()]
+        yield sha, int(committed), subject, body.strip(), files
+
+
+class HistoryIndex:
+    """
+    🔎 Local SQLite FTS5 index over snapshot history.
+
+    Stores each commit's subject, body, touched files, role, tags, and the
+    version lines that contain it. `update()` only walks commits and branch
+    moves that happened since the last update, so refreshing is cheap;
+    `search()` answers from the index without touching Git.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self.path = history_index_path(self.project_path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- bookkeeping ---
+
+    def _get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT INTO meta(key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value))
+        )
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+
+    # --- writing ---
+
+    def add_commits(self, records):
+        """
+        Inserts (sha, committed, subject, body, files) records, given newest first
+        as `git log` emits them; existing SHAs are left alone. Rows are stored oldest
+        first so rowid breaks ties between commits made in the same second.
+        """
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO commits(sha, committed, subject, body, files) VALUES (?, ?, ?, ?, ?)",
+            ((sha, committed, subject, body, "\n".join(files))
+             for sha, committed, subject, body, files in reversed(list(records)))
+        )
+
+    def _current_refs(self):
+        out = run_git(
+            self.project_path, "for-each-ref",
+            "--format=%(objectname) %(*objectname) %(refname)", "refs/heads", "refs/tags"
+        ).decode()
+        branches, tags = {}, {}
+        for line in out.splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                sha, ref = parts
+            elif len(parts) == 3:
+                _, sha, ref = parts  # annotated tag: use the peeled commit
+            else:
+                continue
+            if ref.startswith("refs/heads/"):
+                branches[ref[len("refs/heads/"):]] = sha
+            else:
+                tags.setdefault(sha, []).append(ref[len("refs/tags/"):])
+        return branches, tags
+
+    def update(self):
+        """
+        Brings the index up to date with the repo's branches and tags.
+        Returns the number of newly indexed commits.
+        """
+        branches, tags = self._current_refs()
+        indexed_tips = self._get_meta("branch_tips", {})
+        head = run_git(self.project_path, "rev-parse", "--verify", "-q", "HEAD", check=False).decode().strip()
+
+        # 1️⃣ New commits reachable from any branch, tag, or a detached HEAD, excluding what we already walked
+        wanted = sorted(set(branches.values()) | set(tags) | ({head} if head else set()))
+        walked = self._get_meta("walked_tips", [])
+        known = sorted(existing_commits(self.project_path, walked)) if walked else []
+        before = self.count()
+        if wanted:
+            args = ["log", "--no-renames", "--name-only", "-z",
+                    "--format=%x1e%H%x1f%ct%x1f%s%x1f%b%x1f", *wanted]
+            if known:
+                args += ["--not", *known]
+            self.add_commits(_parse_log(run_git(self.project_path, *args, check=False)))
+        added = self.count() - before
+
+        # Takes removed by a rewrite (e.g. deleting a take) must not show up in search
+        lost = [sha for sha in known if sha not in wanted]
+        tips = sorted(existing_commits(self.project_path, wanted)) if lost else []
+        if tips and int(run_git(self.project_path, "rev-list", "--count", *lost, "--not", *tips).decode()):
+            self._prune_unreachable(tips)
+
+        # 2️⃣ Version-line membership, only for branches that moved
+        for name in set(indexed_tips) - set(branches):
+            self.conn.execute("DELETE FROM commit_branches WHERE branch = ?", (name,))
+        for name, tip in branches.items():
+            old_tip = indexed_tips.get(name)
+            if old_tip == tip:
+                continue
+            if old_tip and is_ancestor(self.project_path, old_tip, tip):
+                revs = run_git(self.project_path, "rev-list", tip, "--not", old_tip).decode().split()
+            else:
+                self.conn.execute("DELETE FROM commit_branches WHERE branch = ?", (name,))
+                revs = run_git(self.project_path, "rev-list", tip).decode().split()
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO commit_branches(branch, sha) VALUES (?, ?)",
+                ((name, sha) for sha in revs)
+            )
+
+        # 3️⃣ Tags are few — rewrite only rows whose tag list changed
+        self._sync_column("tags", {sha: " ".join(sorted(names)) for sha, names in tags.items()})
+
+        self._set_meta("branch_tips", branches)
+        self._set_meta("walked_tips", wanted)
+        self.conn.commit()
+        if added:
+            print(f"[DEBUG] History index: +{added} commits ({self.count()} total)")
+        return added
+
+    def _prune_unreachable(self, tips):
+        """Drops indexed commits that are no longer reachable from the commits `tips` (one `rev-list`)."""
+        reachable = set(run_git(self.project_path, "rev-list", *tips).decode().split())
+        stale = [sha for (sha,) in self.conn.execute("SELECT sha FROM commits") if sha not in reachable]
+        for i in range(0, len(stale), 500):
+            chunk = stale[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            self.conn.execute(f"DELETE FROM commits WHERE sha IN ({marks})", chunk)
+            self.conn.execute(f"DELETE FROM commit_branches WHERE sha IN ({marks})", chunk)
+        if stale:
+            print(f"[DEBUG] History index: dropped {len(stale)} rewritten-away commits")
+        return len(stale)
+
+    def _sync_column(self, column, values):
+        current = dict(self.conn.execute(f"SELECT sha, {column} FROM commits WHERE {column} != ''"))
+        changes = [(value, sha) for sha, value in values.items() if current.get(sha, "") != value]
+        changes += [("", sha) for sha in current if sha not in values]
+        if changes:
+            self.conn.executemany(f"UPDATE commits SET {column} = ? WHERE sha = ?", changes)
+        return len(changes)
+
+    def sync_roles(self, roles):
+        """Mirrors the {sha: role} map into the index; only changed rows are rewritten."""
+        changed = self._sync_column("role", {sha: role for sha, role in roles.items() if role})
+        self.conn.commit()
+        return changed
+
+    # --- reading ---
+
+    def search(self, query="", limit=SEARCH_RESULT_LIMIT, **facets):
+        """
+        Returns matching commit SHAs, newest first.
+
+        `query` may mix free text with facets (see `parse_query`); keyword
+        arguments override facets parsed from the text.
+        """
+        text, parsed = parse_query(query)
+        parsed.update({k: v for k, v in facets.items() if v})
+
+        where, params = [], []
+        match_parts = []
+        if text:
+            match_parts.append(_fts_match(text))
+        if parsed.get("file"):
+            match_parts.append(_fts_match(parsed["file"], column="files"))
+        match_parts = [m for m in match_parts if m]
+        if match_parts:
+            where.append("c.rowid IN (SELECT rowid FROM commits_fts WHERE commits_fts MATCH ?)")
+            params.append(" AND ".join(f"({m})" for m in match_parts))
+        if parsed.get("role"):
+            where.append("c.role = ?")
+            params.append(parsed["role"])
+        if parsed.get("tag"):
+            where.append("(' ' || c.tags || ' ') LIKE ?")
+            params.append(f"% {parsed['tag']} %")
+        if parsed.get("branch"):
+            where.append("c.sha IN (SELECT sha FROM commit_branches WHERE branch = ?)")
+            params.append(parsed["branch"])
+        if parsed.get("after"):
+            ts = _to_timestamp(parsed["after"])
+            if ts is not None:
+                where.append("c.committed >= ?")
+                params.append(ts)
+        if parsed.get("before"):
+            ts = _to_timestamp(parsed["before"], end_of_day=True)
+            if ts is not None:
+                where.append("c.committed <= ?")
+                params.append(ts)
+
+        sql = "SELECT c.sha FROM commits c"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY c.committed DESC, c.rowid DESC LIMIT ?"
+        params.append(limit)
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def branches_for(self, shas):
+        """{sha: [branch, ...]} for the given SHAs, from the index."""
+        shas = list(shas)
+        result = {sha: [] for sha in shas}
+        for i in range(0, len(shas), 500):
+            chunk = shas[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for branch, sha in self.conn.execute(
+                f"SELECT branch, sha FROM commit_branches WHERE sha IN ({marks}) ORDER BY branch", chunk
+            ):
+                result[sha].append(branch)
+        return result
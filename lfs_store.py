@@ -0,0 +1,450 @@
+# lfs_store.py
+import os
+import re
+import json
+import time
+import base64
+import subprocess
+import urllib.request
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from git_objects import (
+    CatFileBatch, LFS_POINTER_MAX_SIZE, existing_commits, git_dir, git_env, lfs_object_path, list_tree,
+    parse_lfs_pointer, run_git
+)
+from role_notes import read_role_notes
+
+
+LFS_BUDGET_KEY = "dawgit.lfsBudget"             # per-repo git config, e.g. `20g`
+LFS_KEEP_RECENT_KEY = "dawgit.lfsKeepRecent"
+LFS_BUDGET_DEFAULT = 20 * 1024 ** 3
+LFS_KEEP_RECENT_DEFAULT = 20                    # newest takes across all version lines
+LFS_PRUNE_GRACE_S = 24 * 3600                   # objects written this recently may belong to a take in progress
+LFS_NO_REMOTE_MSG = "Add a remote first — stored audio is only removed once a remote has a copy."
+LFS_VERIFY_BATCH = 100                          # objects per LFS batch API request
+LFS_VERIFY_TIMEOUT_S = 30
+LFS_MEDIA_TYPE = "application/vnd.git-lfs+json"
+LFS_PLAN_POLL_INTERVAL_MS = 500
+
+_OID_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _config_int(project_path, key, default):
+    # --type=int understands k/m/g suffixes, so `git config dawgit.lfsBudget 20g` works
+    out = run_git(project_path, "config", "--type=int", "--get", key, check=False).decode().strip()
+    try:
+        return int(out) if out else default
+    except ValueError:
+        print(f"[WARN] Ignoring invalid {key}={out!r}")
+        return default
+
+
+def lfs_settings(project_path):
+    """(budget in bytes, takes kept regardless of budget) from the repo's git config."""
+    return (_config_int(project_path, LFS_BUDGET_KEY, LFS_BUDGET_DEFAULT),
+            _config_int(project_path, LFS_KEEP_RECENT_KEY, LFS_KEEP_RECENT_DEFAULT))
+
+
+def set_lfs_settings(project_path, budget=None, keep_recent=None):
+    if budget is not None:
+        run_git(project_path, "config", LFS_BUDGET_KEY, str(int(budget)))
+    if keep_recent is not None:
+        run_git(project_path, "config", LFS_KEEP_RECENT_KEY, str(int(keep_recent)))
+
+
+def local_objects(project_path):
+    """{oid: (Path, size, mtime)} for every object in `.git/lfs/objects`."""
+    root = git_dir(project_path) / "lfs" / "objects"
+    objects = {}
+    if not root.exists():
+        return objects
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if not _OID_RE.match(name):
+                continue    # partial downloads, stray files
+            path = Path(dirpath) / name
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            objects[name] = (path, st.st_size, st.st_mtime)
+    return objects
+
+
+def retained_snapshots(project_path, keep_recent=LFS_KEEP_RECENT_DEFAULT):
+    """
+    {commit sha: [reasons]} for takes whose LFS content must stay local: the
+    checked-out take, every version line's tip, tagged and role-marked takes,
+    stash entries, takes only a reflog still points at (dropped by a reset or
+    rebase, but restorable), and the `keep_recent` newest takes.
+    """
+    retained = {}
+
+    def keep(sha, reason):
+        retained.setdefault(sha, []).append(reason)
+
+    head = run_git(project_path, "rev-parse", "-q", "--verify", "HEAD^{commit}", check=False).decode().strip()
+    if not head:
+        return retained
+    keep(head, "current")
+
+    refs = run_git(project_path, "for-each-ref", "--format=%(objectname) %(*objectname) %(refname)",
+                   "refs/heads", "refs/tags").decode()
+    for line in refs.splitlines():
+        parts = line.split()
+        if len(parts) == 3:
+            target, peeled, ref = parts      # annotated tags: the peeled commit
+        elif len(parts) == 2:
+            (target, ref), peeled = parts, None
+        else:
+            continue
+        if ref.startswith("refs/heads/"):
+            keep(target, f"branch:{ref[len('refs/heads/'):]}")
+        else:
+            keep(peeled or target, f"tag:{ref[len('refs/tags/'):]}")
+
+    for sha, role in read_role_notes(project_path).items():
+        keep(sha, f"role:{role}")
+
+    # A stash entry's index and untracked-files states are its second and third parents
+    stashes = run_git(project_path, "log", "-g", "--format=%H %P", "refs/stash", check=False).decode()
+    for i, line in enumerate(stashes.splitlines()):
+        sha, *parents = line.split()
+        for commit in [sha, *parents[1:]]:
+            keep(commit, f"stash@{{{i}}}")
+
+    orphaned = run_git(project_path, "rev-list", "--reflog", "--not", "--branches", "--tags", "--remotes",
+                       check=False).decode()
+    for sha in orphaned.split():
+        keep(sha, "reflog")
+
+    if keep_recent:
+        recent = run_git(project_path, "rev-list", "--all", "--date-order", f"--max-count={keep_recent}").decode()
+        for sha in recent.split():
+            keep(sha, "recent")
+
+    # Tags may point at blobs or trees; only commits have takes
+    commits = existing_commits(project_path, retained)
+    return {sha: reasons for sha, reasons in retained.items() if sha in commits}
+
+
+def _index_blobs(project_path):
+    """Blob SHAs staged in the index that are small enough to be LFS pointers."""
+    out = run_git(project_path, "ls-files", "-s", "-z").decode("utf-8", "surrogateescape")
+    oids = {entry.split()[1] for entry in out.split("\0") if entry}
+    if not oids:
+        return set()
+    checks = run_git(project_path, "cat-file", "--batch-check", input="\n".join(oids).encode() + b"\n").decode()
+    small = set()
+    for line in checks.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[1] == "blob" and int(parts[2]) <= LFS_POINTER_MAX_SIZE:
+            small.add(parts[0])
+    return small
+
+
+def lfs_references(project_path, shas):
+    """
+    {LFS oid: {commit sha, …}} — which of `shas` need each LFS object to be
+    checked out. Staged-but-uncommitted pointers count under "index". One
+    `ls-tree` per take; pointer blobs are read once however many takes share them.
+    """
+    references = {}
+    pointers = {}       # blob SHA → LFS oid (or None)
+
+    with CatFileBatch(project_path) as batch:
+        def pointer(blob):
+            if blob not in pointers:
+                parsed = parse_lfs_pointer(batch.read(blob) or b"")
+                pointers[blob] = parsed[0] if parsed else None
+            return pointers[blob]
+
+        for sha in shas:
+            for _mode, obj_type, blob, size, _path in list_tree(project_path, sha):
+                if obj_type == "blob" and size is not None and size <= LFS_POINTER_MAX_SIZE:
+                    oid = pointer(blob)
+                    if oid:
+                        references.setdefault(oid, set()).add(sha)
+        for blob in _index_blobs(project_path):
+            oid = pointer(blob)
+            if oid:
+                references.setdefault(oid, set()).add("index")
+    return references
+
+
+def lfs_remote(project_path):
+    """Name of the remote LFS objects are pushed to — `origin`, else the only/first one — or None."""
+    remotes = run_git(project_path, "remote", check=False).decode().split()
+    if not remotes:
+        return None
+    return "origin" if "origin" in remotes else sorted(remotes)[0]
+
+
+def _local_remote_dir(url):
+    if url.startswith("file://"):
+        return Path(urlsplit(url).path)
+    if "://" not in url and not re.match(r"^[^/]+:", url):
+        return Path(url)
+    return None
+
+
+def _ssh_target(url):
+    """(user@host, port, path) for an `ssh://` or scp-style remote URL, else None."""
+    if url.startswith("ssh://"):
+        parts = urlsplit(url)
+        host = f"{parts.username}@{parts.hostname}" if parts.username else parts.hostname
+        return host, parts.port, parts.path.lstrip("/")
+    match = re.match(r"^([^/:]+):(?!//)(.+)$", url)
+    if match:
+        return match.group(1), None, match.group(2)
+    return None
+
+
+def _lfs_endpoint(project_path, remote, url):
+    """(batch API base URL, extra headers) the way git-lfs derives them, or None if unsupported."""
+    for key in ("lfs.url", f"remote.{remote}.lfsurl"):
+        configured = run_git(project_path, "config", "--get", key, check=False).decode().strip()
+        if configured:
+            return configured.rstrip("/"), {}
+    ssh = _ssh_target(url)
+    if ssh is not None:
+        host, port, path = ssh
+        cmd = ["ssh", *(["-p", str(port)] if port else []), host, "git-lfs-authenticate", path, "download"]
+        try:
+            out = subprocess.run(cmd, capture_output=True, check=True, timeout=LFS_VERIFY_TIMEOUT_S,
+                                 stdin=subprocess.DEVNULL).stdout
+            auth = json.loads(out)
+            return auth["href"].rstrip("/"), auth.get("header", {})
+        except (OSError, subprocess.SubprocessError, ValueError, KeyError) as e:
+            print(f"[WARN] git-lfs-authenticate failed for {host}: {e}")
+            return None
+    if url.startswith(("http://", "https://")):
+        base = url.rstrip("/")
+        return (base if base.endswith(".git") else base + ".git") + "/info/lfs", {}
+    return None
+
+
+def _credentials(project_path, url):
+    """Basic auth header from git's credential helpers, without prompting; {} if there are none."""
+    parts = urlsplit(url)
+    query = f"protocol={parts.scheme}\nhost={parts.netloc}\npath={parts.path.lstrip('/')}\n\n"
+    env = {**git_env(), "GIT_TERMINAL_PROMPT": "0", "GCM_INTERACTIVE": "never"}
+    try:
+        out = subprocess.run(["git", "credential", "fill"], cwd=project_path, env=env, input=query.encode(),
+                             capture_output=True, timeout=LFS_VERIFY_TIMEOUT_S).stdout.decode()
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    fields = dict(line.split("=", 1) for line in out.splitlines() if "=" in line)
+    if "username" not in fields or "password" not in fields:
+        return {}
+    token = base64.b64encode(f"{fields['username']}:{fields['password']}".encode()).decode()
+    return {"Authorization": f"Basic {token}"}
+
+
+def _batch_has(endpoint, headers, objects):
+    """Oids among `objects` [(oid, size)] the LFS server says it can serve."""
+    found = set()
+    for i in range(0, len(objects), LFS_VERIFY_BATCH):
+        chunk = objects[i:i + LFS_VERIFY_BATCH]
+        body = json.dumps({"operation": "download", "transfers": ["basic"],
+                           "objects": [{"oid": oid, "size": size} for oid, size in chunk]}).encode()
+        request = urllib.request.Request(f"{endpoint}/objects/batch", data=body, method="POST", headers={
+            "Accept": LFS_MEDIA_TYPE, "Content-Type": LFS_MEDIA_TYPE, **headers})
+        with urllib.request.urlopen(request, timeout=LFS_VERIFY_TIMEOUT_S) as response:
+            reply = json.loads(response.read())
+        sizes = dict(chunk)
+        for obj in reply.get("objects", []):
+            if "error" not in obj and obj.get("actions", {}).get("download") \
+                    and sizes.get(obj.get("oid")) == obj.get("size"):
+                found.add(obj["oid"])
+    return found
+
+
+def verify_on_remote(project_path, remote, objects):
+    """
+    Oids among `objects` [(oid, size)] that `remote` has — like
+    `git lfs prune --verify-remote`. A remote that's a local folder is checked
+    on disk, others through the LFS batch API. Anything that can't be
+    confirmed (offline, no access, unsupported URL) counts as not pushed.
+    """
+    if not objects:
+        return set()
+    url = run_git(project_path, "remote", "get-url", remote, check=False).decode().strip()
+    local = _local_remote_dir(url) if url else None
+    if local is not None:
+        if not local.is_absolute():
+            local = Path(project_path) / local
+        try:
+            store = git_dir(local)
+        except subprocess.CalledProcessError:
+            return set()
+        found = set()
+        for oid, size in objects:
+            try:
+                if lfs_object_path(store, oid).stat().st_size == size:
+                    found.add(oid)
+            except OSError:
+                continue
+        return found
+
+    endpoint = _lfs_endpoint(project_path, remote, url) if url else None
+    if endpoint is None:
+        print(f"[WARN] Can't check LFS objects on '{remote}' ({url or 'no URL'})")
+        return set()
+    base, headers = endpoint
+    if not headers and base.startswith("https://"):
+        headers = _credentials(project_path, base)
+    try:
+        return _batch_has(base, headers, list(objects))
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Couldn't verify LFS objects on '{remote}': {e}")
+        return set()
+
+
+class LfsStore:
+    """
+    💾 Keeps `.git/lfs/objects` within a size budget.
+
+    Every bounce, stem and `.als` saved in a take lands in the local LFS store
+    and nothing ever removes it. `plan()` works out which objects the retained
+    takes (see `retained_snapshots`) still need and which of the rest to drop —
+    oldest first, until the store fits `budget`. `prune()` deletes them;
+    `prune(dry_run=True)` only reports how many bytes it would reclaim, and
+    `prune(plan=...)` deletes exactly a plan the user already confirmed.
+    `plan_async()` works the plan out on a worker thread, since checking the
+    remote can take a while.
+
+    Only objects the remote is confirmed to have are ever dropped (see
+    `verify_on_remote`), so every take stays recoverable. Without a remote
+    nothing is pruned.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self._pool = None
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def plan_async(self, budget=None, keep_recent=None):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dawgit-lfs-plan")
+        return self._pool.submit(self.plan, budget=budget, keep_recent=keep_recent)
+
+    def plan(self, budget=None, keep_recent=None, now=None):
+        """
+        Returns {"objects", "bytes", "budget", "keep_recent", "retained_objects", "retained_bytes",
+        "snapshots", "remote", "unpushed_objects", "unpushed_bytes", "prune": [(oid, size)],
+        "reclaim_bytes", "after_bytes", "over_budget"}. `remote` is None when the
+        repo has none, and then nothing is planned for pruning.
+        `budget`/`keep_recent` default to the repo's settings (`lfs_settings`).
+        """
+        default_budget, default_keep = lfs_settings(self.project_path)
+        budget = default_budget if budget is None else budget
+        keep_recent = default_keep if keep_recent is None else keep_recent
+        now = time.time() if now is None else now
+
+        objects = local_objects(self.project_path)
+        total = sum(size for _, size, _ in objects.values())
+        snapshots = retained_snapshots(self.project_path, keep_recent)
+        references = lfs_references(self.project_path, snapshots)
+
+        retained = {oid for oid in objects if oid in references}
+        fresh = {oid for oid, (_, _, mtime) in objects.items() if now - mtime < LFS_PRUNE_GRACE_S}
+        candidates = [] if not snapshots else sorted(     # no takes yet: nothing is known to be unused
+            (oid for oid in objects if oid not in retained and oid not in fresh),
+            key=lambda oid: (objects[oid][2], -objects[oid][1])     # oldest first, bigger first on ties
+        )
+
+        remote = lfs_remote(self.project_path)
+        pushed = set()
+        if remote is not None and candidates and total > budget:
+            pushed = verify_on_remote(self.project_path, remote, [(oid, objects[oid][1]) for oid in candidates])
+        unpushed = [oid for oid in candidates if oid not in pushed]
+
+        prune, remaining = [], total
+        for oid in candidates:
+            if remaining <= budget:
+                break
+            if oid not in pushed:
+                continue
+            prune.append((oid, objects[oid][1]))
+            remaining -= objects[oid][1]
+
+        return {
+            "objects": len(objects),
+            "bytes": total,
+            "budget": budget,
+            "keep_recent": keep_recent,
+            "retained_objects": len(retained),
+            "retained_bytes": sum(objects[oid][1] for oid in retained),
+            "snapshots": snapshots,
+            "remote": remote,
+            "unpushed_objects": len(unpushed),
+            "unpushed_bytes": sum(objects[oid][1] for oid in unpushed),
+            "prune": prune,
+            "reclaim_bytes": total - remaining,
+            "after_bytes": remaining,
+            "over_budget": remaining > budget,
+        }
+
+    def prune(self, budget=None, keep_recent=None, dry_run=False, plan=None):
+        """
+        🧹 Deletes the objects `plan()` picks. Returns the plan plus {"status", "pruned", "dry_run"};
+        {"status": "error", "message"} instead when there's no remote to recover them from.
+
+        With `plan` (an earlier `plan()` result) exactly its `prune` list is deleted
+        without asking the remote again; only objects that a retained take has come
+        to reference, or that were rewritten within the grace period, are kept.
+        """
+        if plan is None:
+            plan = self.plan(budget=budget, keep_recent=keep_recent)
+        else:
+            plan = self._recheck(plan)
+        if plan["remote"] is None:
+            return {"status": "error", "message": LFS_NO_REMOTE_MSG, "pruned": 0, "dry_run": dry_run, **plan}
+        pruned = 0
+        if not dry_run:
+            store = git_dir(self.project_path)
+            for oid, _ in plan["prune"]:
+                path = lfs_object_path(store, oid)
+                try:
+                    path.unlink()
+                    pruned += 1
+                except FileNotFoundError:
+                    continue
+                for folder in (path.parent, path.parent.parent):
+                    try:
+                        folder.rmdir()      # only succeeds once the fan-out folder is empty
+                    except OSError:
+                        break
+            print(f"[DEBUG] LFS store: pruned {pruned} objects, {plan['reclaim_bytes']} bytes")
+        return {"status": "success", "pruned": pruned, "dry_run": dry_run, **plan}
+
+    def _recheck(self, plan):
+        """`plan` minus objects that became referenced or were written since it was made."""
+        if not plan["prune"]:
+            return plan
+        now = time.time()
+        references = lfs_references(self.project_path, retained_snapshots(self.project_path, plan["keep_recent"]))
+        store = git_dir(self.project_path)
+        keep = []
+        for oid, size in plan["prune"]:
+            try:
+                fresh = now - lfs_object_path(store, oid).stat().st_mtime < LFS_PRUNE_GRACE_S
+            except OSError:
+                fresh = False       # already gone — unlinking it is a no-op
+            if fresh or oid in references:
+                keep.append((oid, size))
+        if not keep:
+            return plan
+        kept = sum(size for _, size in keep)
+        kept_oids = {oid for oid, _ in keep}
+        prune = [entry for entry in plan["prune"] if entry[0] not in kept_oids]
+        after = plan["after_bytes"] + kept
+        return {**plan, "prune": prune, "reclaim_bytes": plan["reclaim_bytes"] - kept, "after_bytes": after,
+                "over_budget": after > plan["budget"]}
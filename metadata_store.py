@@ -0,0 +1,250 @@
+# metadata_store.py
+import os
+import copy
+import json
+import atexit
+import threading
+from pathlib import Path
+
+from git_objects import git_dir
+from snapshot_export import atomic_write_json
+
+
+ROLES_SNAPSHOT_NAME = ".dawgit_roles.json"
+ROLES_LOG_NAME = ".dawgit_roles.log"
+ROLE_LOG_COMPACT_EVERY = 256
+ROLE_COMPACT_DELAY_MS = 100      # GUI folds the log into the snapshot once tagging goes quiet
+METADATA_FLUSH_DELAY_MS = 250    # GUI coalesces marker/settings writes within this window
+CACHE_DIR_NAME = ".dawgit_cache"
+LEGACY_INDEX_DIR = "dawgit"      # older builds kept some indexes in .git/dawgit
+
+
+def cache_dir(project_path):
+    """
+    The project's `.dawgit_cache/` folder, created on first use with a `*`
+    .gitignore inside so derived caches never show up as project changes.
+    """
+    path = Path(project_path) / CACHE_DIR_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    ignore = path / ".gitignore"
+    if not ignore.exists():
+        ignore.write_text("*\n")
+    return path
+
+
+def index_path(project_path, name):
+    """
+    Where the history-derived SQLite index `name` lives: in `cache_dir()`, with
+    every other derived cache. A copy an older build left in `.git/dawgit/` is
+    deleted so it doesn't sit in the repo forever.
+    """
+    path = cache_dir(project_path) / name
+    try:
+        legacy = git_dir(project_path) / LEGACY_INDEX_DIR / name
+    except Exception:
+        return path
+    for suffix in ("", "-wal", "-shm"):
+        stale = legacy.with_name(legacy.name + suffix)
+        if stale.exists():
+            stale.unlink()
+            print(f"[DEBUG] Removed old index {stale}")
+    return path
+
+
+def file_signature(path):
+    """(mtime_ns, size) of `path`, or None if it does not exist — one stat, no read."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class RoleStore:
+    """
+    🏷️ Commit role map backed by an append-only log plus a compacted snapshot.
+
+    `.dawgit_roles.json` is the last compacted snapshot (same format as before);
+    `.dawgit_roles.log` holds one JSON record per change since then. Assigning a
+    role appends one line instead of rewriting the whole map. The log is folded
+    back into the snapshot every `compact_every` records or when `compact()` is
+    called. The map is loaded once and kept in memory.
+    """
+
+    def __init__(self, project_path, compact_every=ROLE_LOG_COMPACT_EVERY):
+        self.project_path = Path(project_path)
+        self.snapshot_path = self.project_path / ROLES_SNAPSHOT_NAME
+        self.log_path = self.project_path / ROLES_LOG_NAME
+        self.compact_every = compact_every
+        self.roles = {}
+        self.pending = 0
+        self._signature = None
+        self.load()
+
+    def _current_signature(self):
+        return file_signature(self.snapshot_path), file_signature(self.log_path)
+
+    def refresh_if_changed(self):
+        """Reloads only if the snapshot or log changed on disk since we last touched them."""
+        if self._current_signature() == self._signature:
+            return False
+        print("[DEBUG] Role files changed on disk — reloading")
+        self.load()
+        return True
+
+    def load(self):
+        """Reads the snapshot and replays the log on top of it."""
+        roles = {}
+        if self.snapshot_path.exists():
+            try:
+                roles = json.loads(self.snapshot_path.read_text())
+            except Exception as e:
+                print(f"[ERROR] Failed to load commit roles: {e}")
+                roles = {}
+
+        pending = 0
+        if self.log_path.exists():
+            with open(self.log_path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-append leaves at most one torn line at the end
+                        print(f"[WARN] Skipping torn record in {self.log_path.name}")
+                        continue
+                    if record.get("role") is None:
+                        roles.pop(record["sha"], None)
+                    else:
+                        roles[record["sha"]] = record["role"]
+                    pending += 1
+
+        # Keep the same dict object so callers holding a reference stay in sync
+        self.roles.clear()
+        self.roles.update(roles)
+        self.pending = pending
+        self._signature = self._current_signature()
+        return self.roles
+
+    def _append(self, record):
+        with open(self.log_path, "ab+") as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")     # a crash mid-append left a torn line — don't glue this record onto it
+            f.write(json.dumps(record).encode() + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._signature = self._current_signature()
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.compact()
+
+    def set(self, sha, role):
+        self.roles[sha] = role
+        self._append({"sha": sha, "role": role})
+
+    def remove(self, sha):
+        if self.roles.pop(sha, None) is not None:
+            self._append({"sha": sha, "role": None})
+
+    def replace_all(self, roles):
+        """Replaces the whole map (e.g. after a rebase rewrote SHAs) and compacts."""
+        if roles is not self.roles:
+            self.roles.clear()
+            self.roles.update(roles)
+        self.compact()
+
+    def compact(self):
+        """
+        Writes the in-memory map as the new snapshot, then drops the log.
+        The snapshot is replaced atomically first, so a crash in between only
+        leaves log records that replay to the same state.
+        """
+        atomic_write_json(self.snapshot_path, self.roles)
+        self.log_path.unlink(missing_ok=True)
+        self.pending = 0
+        self._signature = self._current_signature()
+        print(f"[DEBUG] Compacted {len(self.roles)} commit roles into {self.snapshot_path.name}")
+
+
+class MetadataCache:
+    """
+    📇 Parsed JSON metadata files (PROJECT_MARKER.json, settings) held in memory.
+
+    `get()` revalidates with a single stat (mtime_ns + size) and only re-parses
+    when the file changed on disk. `put()` updates memory and marks the file
+    dirty; `flush()` writes dirty files atomically, so callers can coalesce a
+    burst of changes into one write.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._dirty = set()
+        self._lock = threading.RLock()
+
+    def get(self, path, default=dict):
+        path = Path(path)
+        with self._lock:
+            cached = self._entries.get(path)
+            if path in self._dirty:
+                return copy.deepcopy(cached[1])  # unsaved in-memory state wins over disk
+            signature = file_signature(path)
+            if cached and cached[0] == signature:
+                return copy.deepcopy(cached[1])  # callers may edit it; only put() changes the cache
+
+            data = default()
+            if signature is not None:
+                try:
+                    with open(path, "r") as f:
+                        data = json.load(f)
+                    print(f"[DEBUG] Parsed {path.name}")
+                except Exception as e:
+                    print(f"[ERROR] Failed to load {path.name}: {e}")
+                    data = default()
+            self._entries[path] = (signature, data)
+            return copy.deepcopy(data)
+
+    def put(self, path, data):
+        path = Path(path)
+        with self._lock:
+            cached = self._entries.get(path)
+            self._entries[path] = (cached[0] if cached else None, copy.deepcopy(data))
+            self._dirty.add(path)
+
+    def is_dirty(self, path=None):
+        with self._lock:
+            return bool(self._dirty) if path is None else Path(path) in self._dirty
+
+    def flush(self, path=None):
+        """Writes dirty entries (or just `path`) with an atomic rename. Returns the paths written."""
+        with self._lock:
+            targets = [Path(path)] if path is not None else list(self._dirty)
+            written = []
+            for target in targets:
+                if target not in self._dirty:
+                    continue
+                if not target.parent.is_dir():
+                    # Project folder was deleted or moved since the change was made
+                    print(f"[DEBUG] Dropping pending write to {target} — folder is gone")
+                    self._dirty.discard(target)
+                    self._entries.pop(target, None)
+                    continue
+                data = self._entries[target][1]
+                try:
+                    atomic_write_json(target, data)
+                except Exception as e:
+                    print(f"[ERROR] Failed to save {target.name}: {e}")
+                    continue
+                self._dirty.discard(target)
+                self._entries[target] = (file_signature(target), data)
+                written.append(target)
+            return written
+
+    def forget(self, path):
+        with self._lock:
+            self._entries.pop(Path(path), None)
+            self._dirty.discard(Path(path))
+
+
+metadata_cache = MetadataCache()
+atexit.register(metadata_cache.flush)
@@ -0,0 +1,218 @@
+# path_history.py
+import json
+import sqlite3
+from pathlib import Path
+
+from git_objects import existing_commits, run_git
+from metadata_store import index_path
+
+
+PATH_INDEX_NAME = "path_history.sqlite"
+STATUS_LABELS = {"A": "added", "M": "modified", "D": "deleted", "T": "type changed"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    path TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    status TEXT NOT NULL,
+    old_oid TEXT NOT NULL,
+    new_oid TEXT NOT NULL,
+    committed INTEGER NOT NULL,
+    PRIMARY KEY (path, sha)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS changes_sha ON changes(sha);
+CREATE INDEX IF NOT EXISTS changes_committed ON changes(path, committed);
+
+CREATE TABLE IF NOT EXISTS walked (
+    sha TEXT PRIMARY KEY,
+    committed INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def path_index_path(project_path):
+    return index_path(project_path, PATH_INDEX_NAME)
+
+
+def _parse_raw_log(raw):
+    """
+    Parses `git log --raw -z --format=%x1e%H%x1f%ct` output into
+    (sha, committed, [(status, path, old_oid, new_oid), ...]) per commit.
+    """
+    for chunk in raw.decode("utf-8", "surrogateescape").split("\x1e"):
+        if not chunk.strip("\0\n"):
+            continue
+        header, _, rest = chunk.partition("\0")
+        sha, committed = header.split("\x1f")
+        tokens = rest.lstrip("\n").split("\0")
+        changes = []
+        i = 0
+        while i < len(tokens) - 1:
+            meta = tokens[i]
+            if not meta.startswith(":"):
+                i += 1
+                continue
+            _, _, old_oid, new_oid, status = meta[1:].split()
+            changes.append((status[0], tokens[i + 1], old_oid, new_oid))
+            i += 2
+        yield sha, int(committed), changes
+
+
+class PathHistoryIndex:
+    """
+    🗂️ Path → snapshots index: which takes added, changed or deleted each file.
+
+    Built from one `git log --raw -z` pass and extended incrementally with only
+    the commits that landed since the last update.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self.path = path_index_path(self.project_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._line_cache = {}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT INTO meta(key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value))
+        )
+
+    def update(self):
+        """Indexes commits reachable from branches, tags or HEAD that were not walked yet."""
+        refs = run_git(self.project_path, "for-each-ref", "--format=%(objectname)", "refs/heads", "refs/tags").decode().split()
+        head = run_git(self.project_path, "rev-parse", "--verify", "-q", "HEAD", check=False).decode().strip()
+        tips = sorted(set(refs) | ({head} if head else set()))
+        if not tips:
+            return 0
+
+        walked = self._get_meta("walked_tips", [])
+        if walked == tips:
+            return 0
+        known = sorted(existing_commits(self.project_path, walked)) if walked else []
+
+        args = ["log", "--raw", "-z", "--no-renames", "--no-abbrev", "--format=%x1e%H%x1f%ct", *tips]
+        if known:
+            args += ["--not", *known]
+
+        # Stored oldest first so walked.rowid breaks ties between commits made in the same second
+        added = 0
+        for sha, committed, changes in reversed(list(_parse_raw_log(run_git(self.project_path, *args)))):
+            cur = self.conn.execute("INSERT OR IGNORE INTO walked(sha, committed) VALUES (?, ?)", (sha, committed))
+            if not cur.rowcount:
+                continue
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO changes(path, sha, status, old_oid, new_oid, committed) VALUES (?, ?, ?, ?, ?, ?)",
+                ((path, sha, status, old_oid, new_oid, committed) for status, path, old_oid, new_oid in changes)
+            )
+            added += 1
+
+        # Takes removed by a rewrite (e.g. deleting a take) must not keep showing up for their files
+        lost = [sha for sha in known if sha not in tips]
+        if lost and int(run_git(self.project_path, "rev-list", "--count", *lost, "--not", *tips).decode()):
+            self._prune_unreachable(tips)
+
+        self._set_meta("walked_tips", tips)
+        self.conn.commit()
+        if added:
+            print(f"[DEBUG] Path index: +{added} commits")
+        return added
+
+    def _prune_unreachable(self, tips):
+        """Drops walked commits that are no longer reachable from `tips` (one `rev-list`)."""
+        reachable = set(run_git(self.project_path, "rev-list", *tips).decode().split())
+        stale = [sha for (sha,) in self.conn.execute("SELECT sha FROM walked") if sha not in reachable]
+        for i in range(0, len(stale), 500):
+            chunk = stale[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            self.conn.execute(f"DELETE FROM walked WHERE sha IN ({marks})", chunk)
+            self.conn.execute(f"DELETE FROM changes WHERE sha IN ({marks})", chunk)
+        self._line_cache = {}
+        if stale:
+            print(f"[DEBUG] Path index: dropped {len(stale)} rewritten-away commits")
+        return len(stale)
+
+    def _line_shas(self, rev):
+        """Commits on a version line, cached per tip SHA (one `rev-list` per new tip)."""
+        tip = run_git(self.project_path, "rev-parse", "--verify", "-q", f"{rev}^{{commit}}", check=False).decode().strip()
+        if not tip:
+            return set()
+        if tip not in self._line_cache:
+            self._line_cache = {tip: set(run_git(self.project_path, "rev-list", tip).decode().split())}
+        return self._line_cache[tip]
+
+    def history(self, path, rev=None, limit=None):
+        """
+        Snapshots that touched `path`, newest first, as dicts with sha/status/committed/path.
+
+        `path` may be a file (exact path or bare file name) or a folder (every
+        file below it). With `rev`, only commits on that version line are returned.
+        """
+        path = path.strip().strip("/")
+        rows = self.conn.execute(
+            """
+            SELECT c.sha, c.status, c.committed, c.path FROM changes c JOIN walked w ON w.sha = c.sha
+            WHERE c.path = ?1 OR c.path LIKE ?2 ESCAPE '\\' OR c.path LIKE ?3 ESCAPE '\\'
+            ORDER BY c.committed DESC, w.rowid DESC
+            """,
+            (path, _like_prefix(path) + "/%", "%/" + _like_prefix(path))
+        ).fetchall()
+
+        line = self._line_shas(rev) if rev else None
+        results = []
+        for sha, status, committed, file_path in rows:
+            if line is not None and sha not in line:
+                continue
+            results.append({"sha": sha, "status": status, "committed": committed, "path": file_path})
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def snapshots_for(self, path, rev=None):
+        """Distinct commit SHAs that touched `path` (file or folder), newest first."""
+        # dict keeps first-seen (newest) order with O(1) membership checks
+        return list(dict.fromkeys(record["sha"] for record in self.history(path, rev=rev)))
+
+    def last_change(self, path, rev="HEAD"):
+        """The most recent snapshot on `rev` that changed `path`, or None."""
+        found = self.history(path, rev=rev, limit=1)
+        return found[0] if found else None
+
+    def changed_files(self, shas):
+        """{sha: [(status, path), ...]} for the given commits, for the "Changed" column."""
+        shas = list(shas)
+        result = {sha: [] for sha in shas}
+        for i in range(0, len(shas), 500):
+            chunk = shas[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for sha, status, path in self.conn.execute(
+                f"SELECT sha, status, path FROM changes WHERE sha IN ({marks}) ORDER BY path", chunk
+            ):
+                result[sha].append((status, path))
+        return result
+
+
+def _like_prefix(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
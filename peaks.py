@@ -0,0 +1,417 @@
+# peaks.py
+import io
+import os
+import sys
+import struct
+import tempfile
+import threading
+from array import array
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from git_objects import (
+    CatFileBatch, LFS_POINTER_MAX_SIZE, git_dir, lfs_object_path, list_tree, parse_lfs_pointer, run_git
+)
+from metadata_store import CACHE_DIR_NAME, cache_dir
+
+
+PEAK_EXTENSIONS = {".wav", ".wave", ".aif", ".aiff", ".aifc"}
+PEAK_LEVELS = (256, 1024, 4096, 16384, 65536)   # frames per peak, finest first; each level is 4× the last
+PEAK_CHUNK_FRAMES = PEAK_LEVELS[0] * 256        # frames decoded per read (~64k)
+PEAK_CACHE_DIR = "peaks"
+PEAK_FILE_MAGIC = b"DGPK"
+PEAK_FILE_VERSION = 1
+PEAK_MEMORY_ENTRIES = 32                        # decoded peak sets kept in memory
+PEAK_POLL_INTERVAL_MS = 100
+
+_HEADER = struct.Struct("<4sHIHQH")             # magic, version, rate, channels, frames, level count
+_LEVEL = struct.Struct("<II")                   # frames per peak, peak count
+_LITTLE = sys.byteorder == "little"
+_UNSIGNED_TO_SIGNED = bytes((i + 128) & 0xFF for i in range(256))
+
+
+class AudioFormatError(ValueError):
+    pass
+
+
+def _read_exact(stream, n):
+    data = bytearray()
+    while len(data) < n:
+        chunk = stream.read(n - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+
+def _skip(stream, n):
+    while n > 0:
+        chunk = stream.read(min(n, 64 * 1024))
+        if not chunk:
+            return
+        n -= len(chunk)
+
+
+def _extended_to_float(data):
+    """AIFF sample rates are 80-bit IEEE extended floats."""
+    exponent, mantissa = struct.unpack(">HQ", data)
+    sign = -1 if exponent & 0x8000 else 1
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+
+class AudioStream:
+    """
+    Streaming WAV/AIFF(-C) reader: parses the header, then yields the sample
+    data in chunks. Only reads forward, so it works on git blob streams and
+    pipes as well as files.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.sample_rate = self.channels = self.bits = 0
+        self.float = False
+        self.big_endian = False
+        self.unsigned = False
+        self.data_size = 0
+        self._parse_header()
+        self.block_align = self.channels * (self.bits // 8)
+        self.frames = self.data_size // self.block_align if self.block_align else 0
+
+    def _parse_header(self):
+        head = _read_exact(self.stream, 12)
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            self._parse_chunks("<", self._wav_chunk)
+        elif head[:4] == b"FORM" and head[8:12] in (b"AIFF", b"AIFC"):
+            self.big_endian = True
+            self._aifc = head[8:12] == b"AIFC"
+            self._parse_chunks(">", self._aiff_chunk)
+        else:
+            raise AudioFormatError("Not a WAV or AIFF file")
+        if not self.channels or self.bits not in (8, 16, 24, 32):
+            raise AudioFormatError(f"Unsupported sample format ({self.bits}-bit)")
+
+    def _parse_chunks(self, order, handler):
+        # Handlers consume (or skip) their chunk and return True once at the sample data
+        while True:
+            header = _read_exact(self.stream, 8)
+            if len(header) < 8:
+                raise AudioFormatError("No audio data found")
+            chunk_id, size = header[:4], struct.unpack(f"{order}I", header[4:])[0]
+            if handler(chunk_id, size):
+                return      # stream now sits at the first sample
+
+    def _wav_chunk(self, chunk_id, size):
+        if chunk_id == b"fmt ":
+            fmt = _read_exact(self.stream, size)
+            tag, self.channels, self.sample_rate = struct.unpack("<HHI", fmt[:8])
+            self.bits = struct.unpack("<H", fmt[14:16])[0]
+            if tag == 0xFFFE and len(fmt) >= 26:          # WAVE_FORMAT_EXTENSIBLE: real tag in the GUID
+                tag = struct.unpack("<H", fmt[24:26])[0]
+            if tag not in (1, 3):
+                raise AudioFormatError(f"Compressed WAV (format {tag}) is not supported")
+            self.float = tag == 3
+            self.unsigned = self.bits == 8
+            if size & 1:
+                _skip(self.stream, 1)
+            self._have_format = True
+            return False
+        if chunk_id == b"data":
+            if not getattr(self, "_have_format", False):
+                raise AudioFormatError("WAV data chunk before format chunk")
+            self.data_size = size
+            return True
+        _skip(self.stream, size + (size & 1))
+        return False
+
+    def _aiff_chunk(self, chunk_id, size):
+        if chunk_id == b"COMM":
+            comm = _read_exact(self.stream, size)
+            self.channels, _, self.bits = struct.unpack(">hIh", comm[:8])
+            self.sample_rate = int(round(_extended_to_float(comm[8:18])))
+            if self._aifc:
+                compression = comm[18:22]
+                if compression == b"sowt":
+                    self.big_endian = False
+                elif compression in (b"fl32", b"FL32"):
+                    self.float = True
+                elif compression != b"NONE":
+                    raise AudioFormatError(f"Compressed AIFF ({compression.decode('latin-1')}) is not supported")
+            if size & 1:
+                _skip(self.stream, 1)
+            self._have_format = True
+            return False
+        if chunk_id == b"SSND":
+            if not getattr(self, "_have_format", False):
+                raise AudioFormatError("AIFF sound data before COMM chunk")
+            offset, _ = struct.unpack(">II", _read_exact(self.stream, 8))
+            _skip(self.stream, offset)
+            self.data_size = size - 8 - offset
+            return True
+        _skip(self.stream, size + (size & 1))
+        return False
+
+    @property
+    def full_scale(self):
+        if self.float:
+            return 1.0
+        return {8: 128, 16: 32768}.get(self.bits, 2 ** 31)   # 24-bit is widened to 32
+
+    def _decode(self, data):
+        """Raw sample bytes → array of interleaved native samples (C-level conversions only)."""
+        swap = self.big_endian == _LITTLE
+        if self.bits == 8:
+            return array("b", data.translate(_UNSIGNED_TO_SIGNED) if self.unsigned else data)
+        if self.bits == 16:
+            samples = array("h", data)
+        elif self.bits == 24:
+            # Widen to 32-bit by placing each 3-byte sample in the top of a 4-byte word
+            n = len(data) // 3
+            wide = bytearray(n * 4)
+            if self.big_endian:
+                wide[0::4], wide[1::4], wide[2::4] = data[0::3], data[1::3], data[2::3]
+            else:
+                wide[1::4], wide[2::4], wide[3::4] = data[0::3], data[1::3], data[2::3]
+            samples = array("i", bytes(wide))
+        else:
+            samples = array("f" if self.float else "i", data)
+        if swap:
+            samples.byteswap()
+        return samples
+
+    def chunks(self, frames=PEAK_CHUNK_FRAMES):
+        """Yields arrays of interleaved samples, `frames` frames at a time (the last may be short)."""
+        remaining = self.frames * self.block_align
+        size = frames * self.block_align
+        while remaining > 0:
+            data = _read_exact(self.stream, min(size, remaining))
+            data = data[:len(data) - len(data) % self.block_align]
+            if not data:
+                return
+            remaining -= len(data)
+            yield self._decode(data)
+
+
+class Peaks:
+    """
+    〰️ Min/max peaks of one audio file at several zoom levels, scaled to
+    int16 and stored interleaved (min, max, min, max, …) per level.
+    """
+
+    def __init__(self, sample_rate, channels, frames, levels):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = frames
+        self.levels = levels     # {frames per peak: array("h")}
+
+    @property
+    def duration(self):
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+    def level_for(self, width):
+        """The coarsest level that still has at least `width` peaks (the finest one otherwise)."""
+        for spp in sorted(self.levels, reverse=True):
+            if len(self.levels[spp]) // 2 >= width:
+                return spp
+        return min(self.levels)
+
+    def columns(self, width):
+        """[(min, max)] resampled to `width` columns, for drawing."""
+        if width <= 0 or not self.levels:
+            return []
+        data = self.levels[self.level_for(width)]
+        count = len(data) // 2
+        if count == 0:
+            return []
+        mins, maxs = data[0::2], data[1::2]
+        result = []
+        for x in range(min(width, count)):
+            start = x * count // width
+            end = max(start + 1, (x + 1) * count // width)
+            result.append((min(mins[start:end]), max(maxs[start:end])))
+        return result
+
+    def to_bytes(self):
+        out = [_HEADER.pack(PEAK_FILE_MAGIC, PEAK_FILE_VERSION, self.sample_rate, self.channels,
+                            self.frames, len(self.levels))]
+        for spp in sorted(self.levels):
+            data = array("h", self.levels[spp])
+            if not _LITTLE:
+                data.byteswap()
+            out.append(_LEVEL.pack(spp, len(data) // 2))
+            out.append(data.tobytes())
+        return b"".join(out)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        magic, version, rate, channels, frames, count = _HEADER.unpack_from(blob)
+        if magic != PEAK_FILE_MAGIC or version != PEAK_FILE_VERSION:
+            raise ValueError("Not a current peak file")
+        pos, levels = _HEADER.size, {}
+        for _ in range(count):
+            spp, peaks = _LEVEL.unpack_from(blob, pos)
+            pos += _LEVEL.size
+            data = array("h")
+            data.frombytes(blob[pos:pos + peaks * 4])
+            if not _LITTLE:
+                data.byteswap()
+            levels[spp] = data
+            pos += peaks * 4
+        return cls(rate, channels, frames, levels)
+
+
+def compute_peaks(stream, levels=PEAK_LEVELS):
+    """
+    Decodes a WAV/AIFF stream chunk by chunk and returns its Peaks. Memory use
+    is one chunk plus the peaks; channels are folded together.
+    """
+    audio = AudioStream(stream)
+    base = levels[0]
+    step = base * audio.channels
+    scale = 32767 / audio.full_scale
+    mins, maxs = array("h"), array("h")
+    for samples in audio.chunks(PEAK_CHUNK_FRAMES - PEAK_CHUNK_FRAMES % base):
+        # min()/max() over array slices run in C; one Python step per peak, not per sample
+        for start in range(0, len(samples), step):
+            window = samples[start:start + step]
+            mins.append(max(-32767, int(min(window) * scale)))
+            maxs.append(min(32767, int(max(window) * scale)))
+
+    def interleave(lo, hi):
+        data = array("h", bytes(len(lo) * 4))
+        data[0::2], data[1::2] = lo, hi
+        return data
+
+    result = {base: interleave(mins, maxs)}
+    previous = base
+    for spp in levels[1:]:
+        factor = spp // previous
+        mins = array("h", (min(mins[i:i + factor]) for i in range(0, len(mins), factor)))
+        maxs = array("h", (max(maxs[i:i + factor]) for i in range(0, len(maxs), factor)))
+        result[spp] = interleave(mins, maxs)
+        previous = spp
+    return Peaks(audio.sample_rate, audio.channels, audio.frames, result)
+
+
+@contextmanager
+def open_audio_blob(project_path, oid):
+    """
+    Yields (key, stream) for an audio blob without checking anything out. LFS
+    pointers resolve to the local LFS object and key on its OID; stream is None
+    when that object hasn't been fetched.
+    """
+    with CatFileBatch(project_path) as batch:
+        _, reader = batch.open(oid)
+        if reader is None:
+            raise FileNotFoundError(oid)
+        try:
+            if reader.size > LFS_POINTER_MAX_SIZE:
+                yield oid, reader
+                return
+            data = reader.read()
+            pointer = parse_lfs_pointer(data)
+            if not pointer:
+                yield oid, io.BytesIO(data)
+                return
+            local = lfs_object_path(git_dir(project_path), pointer[0])
+            if not local.exists():
+                yield pointer[0], None
+                return
+            with open(local, "rb") as f:
+                yield pointer[0], f
+        finally:
+            reader.drain()   # leave the pipe empty so cat-file can exit
+
+
+def has_peaks(path):
+    return PurePosixPath(path).suffix.lower() in PEAK_EXTENSIONS
+
+
+class PeakCache:
+    """
+    〰️ Waveform peaks for audio in any take, keyed by blob SHA (or LFS OID)
+    under `.dawgit_cache/peaks/<oid>`. Audio is streamed straight from the
+    object store — nothing is checked out — and each distinct file is decoded
+    once; afterwards drawing it is a single small file read.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self.path = self.project_path / CACHE_DIR_NAME / PEAK_CACHE_DIR   # created on first store
+        self._memory = {}
+        self._memory_lock = threading.Lock()   # decode workers remember peaks while the GUI reads
+        self._pool = None
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def audio_files(self, sha):
+        """[(path, blob SHA)] of the WAV/AIFF files in a take, from one `ls-tree`."""
+        return [(path, oid) for _, obj_type, oid, _, path in list_tree(self.project_path, sha)
+                if obj_type == "blob" and has_peaks(path)]
+
+    def _load(self, key):
+        with self._memory_lock:
+            peaks = self._memory.get(key)
+        if peaks is not None:
+            return peaks
+        try:
+            peaks = Peaks.from_bytes((self.path / key).read_bytes())
+        except (OSError, ValueError, struct.error):
+            return None
+        self._remember(key, peaks)
+        return peaks
+
+    def _remember(self, key, peaks):
+        with self._memory_lock:
+            self._memory[key] = peaks
+            while len(self._memory) > PEAK_MEMORY_ENTRIES:
+                self._memory.pop(next(iter(self._memory)))
+
+    def _store(self, key, peaks):
+        (cache_dir(self.project_path) / PEAK_CACHE_DIR).mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=f".{key}.")
+        with os.fdopen(fd, "wb") as f:
+            f.write(peaks.to_bytes())
+        os.replace(tmp, self.path / key)
+        self._remember(key, peaks)
+
+    def cached(self, oid):
+        """Peaks for a plain blob if already computed (no git calls at all), else None."""
+        return self._load(oid)
+
+    def peaks_for_blob(self, oid):
+        """Peaks for a blob (or the LFS object its pointer names), computing and caching them if needed."""
+        peaks = self._load(oid)
+        if peaks is not None:
+            return peaks
+        with open_audio_blob(self.project_path, oid) as (key, stream):
+            peaks = self._load(key) if key != oid else None
+            if peaks is None:
+                if stream is None:
+                    raise FileNotFoundError(f"LFS object {key[:12]} not fetched")
+                peaks = compute_peaks(stream)
+                self._store(key, peaks)
+                print(f"[DEBUG] Peaks cached for {key[:7]}: {peaks.frames} frames")
+        self._remember(oid, peaks)
+        return peaks
+
+    def peaks_for(self, sha, path):
+        oid = run_git(self.project_path, "rev-parse", f"{sha}:{path}").decode().strip()
+        return self.peaks_for_blob(oid)
+
+    def peaks_async(self, oid):
+        """A Future for `peaks_for_blob(oid)` — already done when the peaks are cached."""
+        peaks = self._load(oid)
+        if peaks is not None:
+            future = Future()
+            future.set_result(peaks)
+            return future
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dawgit-peaks")
+        return self._pool.submit(self.peaks_for_blob, oid)
@@ -0,0 +1,119 @@
+# prehash.py
+import os
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from commit_pipeline import STATUS_ARGS, parse_status
+from git_objects import lfs_tracked_paths, run_git
+from metadata_store import file_signature
+
+
+PREHASH_MIN_BYTES = 8 * 1024 ** 2          # smaller files are cheap enough to leave to `git add`
+PREHASH_WORKERS = min(8, os.cpu_count() or 2)
+PREHASH_BATCH = 8                          # paths per `hash-object --stdin-paths` process
+PREHASH_SCAN_INTERVAL_MS = 5000
+
+
+class Prehasher:
+    """
+    ⚡ Hashes new or changed large files in the background, before anyone commits.
+
+    Files are written into the object database with
+    `git hash-object -w --stdin-paths`, a few processes at a time, and
+    `commit_pipeline.stage_paths` puts the recorded blob ids straight into the
+    index instead of having `git add` read the file again. LFS-tracked files
+    are skipped: `git add` always runs the LFS clean filter over the whole
+    file, so hashing them ahead of time saves nothing. Each file is done once
+    per (mtime, size) signature.
+    """
+
+    def __init__(self, project_path, min_bytes=PREHASH_MIN_BYTES, workers=PREHASH_WORKERS):
+        self.project_path = Path(project_path)
+        self.min_bytes = min_bytes
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dawgit-prehash")
+        self._scan_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dawgit-prehash-scan")
+        self._scan_future = None
+        self._lock = threading.Lock()
+        self._done = {}       # rel path -> (signature, oid)
+        self._pending = {}    # rel path -> Future
+
+    def shutdown(self):
+        self._scan_pool.shutdown(wait=True, cancel_futures=True)
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def prehashed(self, rel_path):
+        """The object id recorded for `rel_path`, if the file is unchanged since it was hashed."""
+        with self._lock:
+            record = self._done.get(rel_path)
+        if record and record[0] == file_signature(self.project_path / rel_path):
+            return record[1]
+        return None
+
+    def candidates(self):
+        """New or modified working-tree files at least `min_bytes` big that are not hashed yet."""
+        raw = run_git(self.project_path, "--no-optional-locks", "status", *STATUS_ARGS)
+        found = []
+        for rel_path, code in parse_status(raw.decode("utf-8", "surrogateescape")).items():
+            if code != "??" and code[1] not in "MT":
+                continue
+            signature = file_signature(self.project_path / rel_path)
+            if signature is None or signature[1] < self.min_bytes:
+                continue
+            with self._lock:
+                if rel_path in self._pending or self._done.get(rel_path, (None,))[0] == signature:
+                    continue
+            found.append(rel_path)
+        return found
+
+    def scan(self):
+        """Queues hashing for every current candidate. Returns the number of files queued."""
+        paths = self.candidates()
+        if not paths:
+            return 0
+
+        lfs = lfs_tracked_paths(self.project_path, paths)
+        plain = [p for p in paths if p not in lfs and "\n" not in p]
+        with self._lock:
+            for i in range(0, len(plain), PREHASH_BATCH):
+                batch = plain[i:i + PREHASH_BATCH]
+                future = self._pool.submit(self._hash_plain, batch)
+                for rel_path in batch:
+                    self._pending[rel_path] = future
+        if plain:
+            print(f"[DEBUG] Pre-hashing {len(plain)} files")
+        return len(plain)
+
+    def scan_async(self):
+        """Runs `scan()` on a background thread unless one is already running."""
+        if self._scan_future is not None and not self._scan_future.done():
+            return self._scan_future
+        self._scan_future = self._scan_pool.submit(self.scan)
+        return self._scan_future
+
+    def wait(self, timeout=None):
+        """Blocks until everything queued so far has been hashed."""
+        if self._scan_future is not None:
+            self._scan_future.result(timeout)
+        with self._lock:
+            pending = set(self._pending.values())
+        wait(pending, timeout=timeout)
+
+    def _record(self, rel_path, signature, oid):
+        with self._lock:
+            self._pending.pop(rel_path, None)
+            # A file that changed while we read it gets picked up again by the next scan
+            if oid and file_signature(self.project_path / rel_path) == signature:
+                self._done[rel_path] = (signature, oid)
+
+    def _hash_plain(self, batch):
+        signatures = {p: file_signature(self.project_path / p) for p in batch}
+        try:
+            out = run_git(self.project_path, "hash-object", "-w", "--stdin-paths",
+                          input="\n".join(batch).encode("utf-8", "surrogateescape") + b"\n")
+            oids = out.decode().split()
+        except Exception as e:
+            print(f"[WARN] Pre-hash failed for {len(batch)} files: {e}")
+            oids = []
+        for i, rel_path in enumerate(batch):
+            self._record(rel_path, signatures[rel_path], oids[i] if i < len(oids) else None)
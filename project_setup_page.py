@@ -10,6 +10,8 @@ from ui_strings import (
     BTN_EXPORT_SNAPSHOT,
     BTN_IMPORT_SNAPSHOT,
     BTN_RESTORE_BACKUP,
+    BTN_FREE_LFS_SPACE,
+    TOOLTIP_FREE_LFS_SPACE,
     BTN_CONNECT_REMOTE_REPO, 
     CLICK_TO_OPEN_IN_FINDER_TOOLTIP, 
     SETUP_REMOTE_TOOLTIP
@@ -88,6 +90,12 @@ class ProjectSetupPage(QWidget):
         self.import_btn.clicked.connect(self.app.import_snapshot)
         self.restore_btn.clicked.connect(self.app.restore_last_backup)
 
+        # 💾 Stored audio budget
+        self.free_space_btn = QPushButton(BTN_FREE_LFS_SPACE)
+        self.free_space_btn.setToolTip(TOOLTIP_FREE_LFS_SPACE)
+        self.free_space_btn.clicked.connect(lambda: self.app.prune_lfs_store())
+        layout.addWidget(self.free_space_btn)
+
         # 📡 Remote controls
         self.remote_checkbox = QCheckBox("Push to remote after snapshot")
         layout.addWidget(self.remote_checkbox)
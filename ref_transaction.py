@@ -0,0 +1,99 @@
+# ref_transaction.py
+import subprocess
+
+from git_objects import run_git
+
+
+class RefTransactionError(Exception):
+    """Raised when `git update-ref --stdin` rejects the batch; no ref was changed."""
+
+
+def list_refs(repo_path, *patterns):
+    """{refname: (sha, peeled commit sha)} for refs matching `patterns`, in one `for-each-ref`."""
+    out = run_git(
+        repo_path, "for-each-ref", "--format=%(refname) %(objectname) %(*objectname)", *patterns
+    ).decode()
+    refs = {}
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            refs[parts[0]] = (parts[1], parts[2] if len(parts) > 2 else parts[1])
+    return refs
+
+
+class RefTransaction:
+    """
+    🏷️ Collects tag and branch creations/deletions and applies them all at once.
+
+    Everything queued is written to a single `git update-ref --stdin`, which
+    locks every ref first and then updates them together: either all changes
+    land or none do. Used as a context manager, the batch is applied on exit
+    unless the block raised.
+
+    `affected` holds the commit SHAs whose refs changed, so callers can refresh
+    just those rows.
+    """
+
+    def __init__(self, repo_path):
+        self.repo_path = repo_path
+        self.commands = []
+        self.affected = set()
+        self._refs = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.apply()
+
+    def refs(self):
+        if self._refs is None:
+            self._refs = list_refs(self.repo_path, "refs/heads", "refs/tags")
+        return self._refs
+
+    def exists(self, ref):
+        return ref in self.refs()
+
+    def _create(self, ref, sha):
+        self.commands.append(f"create {ref} {sha}")
+        self.affected.add(sha)
+
+    def _delete(self, ref):
+        current = self.refs().get(ref)
+        if current is None:
+            return False
+        # Verifying the old value makes the delete fail if someone moved the ref meanwhile
+        self.commands.append(f"delete {ref} {current[0]}")
+        self.affected.add(current[1])
+        return True
+
+    def create_tag(self, name, sha):
+        self._create(f"refs/tags/{name}", sha)
+
+    def delete_tag(self, name):
+        return self._delete(f"refs/tags/{name}")
+
+    def create_branch(self, name, sha):
+        self._create(f"refs/heads/{name}", sha)
+
+    def delete_branch(self, name):
+        head = run_git(self.repo_path, "symbolic-ref", "-q", "HEAD", check=False).decode().strip()
+        if head == f"refs/heads/{name}":
+            raise RefTransactionError(f"Cannot delete the checked-out version line '{name}'")
+        return self._delete(f"refs/heads/{name}")
+
+    def apply(self):
+        """Applies every queued change atomically. Returns the number of ref updates."""
+        if not self.commands:
+            return 0
+        stdin = ("\n".join(self.commands) + "\n").encode()
+        try:
+            run_git(self.repo_path, "update-ref", "--stdin", input=stdin)
+        except subprocess.CalledProcessError as e:
+            raise RefTransactionError((e.stderr or b"").decode(errors="replace").strip() or str(e)) from e
+        count = len(self.commands)
+        print(f"[DEBUG] Applied {count} ref updates in one transaction")
+        self.commands = []
+        self._refs = None
+        return count
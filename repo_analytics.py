@@ -0,0 +1,337 @@
+# repo_analytics.py
+import time
+import sqlite3
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from git_objects import CatFileBatch, LFS_POINTER_MAX_SIZE, git_dir, git_env, lfs_object_path, parse_lfs_pointer, run_git
+from metadata_store import index_path
+
+
+ANALYTICS_INDEX_NAME = "analytics.sqlite"
+ANALYTICS_REPORT_LIMIT = 20
+ANALYTICS_RECENT_DAYS = 30
+ANALYTICS_POLL_INTERVAL_MS = 500
+_BATCH_CHECK_FORMAT = "--batch-check=%(objectname) %(objecttype) %(objectsize) %(objectsize:disk) %(rest)"
+_NULL_OID = "0" * 40
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    oid TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    disk INTEGER NOT NULL,
+    path TEXT,
+    lfs_oid TEXT,
+    lfs_size INTEGER,
+    commit_sha TEXT
+);
+CREATE INDEX IF NOT EXISTS objects_by_size ON objects(size);
+CREATE INDEX IF NOT EXISTS objects_by_lfs_size ON objects(lfs_size);
+
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    time INTEGER NOT NULL,
+    objects INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    disk INTEGER NOT NULL,
+    lfs_bytes INTEGER NOT NULL,
+    largest_path TEXT,
+    largest_size INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS tips (
+    sha TEXT PRIMARY KEY
+);
+"""
+
+
+def analytics_index_path(project_path):
+    return index_path(project_path, ANALYTICS_INDEX_NAME)
+
+
+def ref_tips(project_path):
+    """Branch, tag and remote tips plus HEAD — what the object walk starts from (role notes aren't takes)."""
+    out = run_git(project_path, "for-each-ref", "--format=%(objectname)",
+                  "refs/heads", "refs/tags", "refs/remotes").decode().split()
+    head = run_git(project_path, "rev-parse", "-q", "--verify", "HEAD", check=False).decode().strip()
+    return set(out) | ({head} if head else set())
+
+
+def _existing_objects(project_path, oids):
+    oids = list(oids)
+    if not oids:
+        return set()
+    out = run_git(project_path, "cat-file", "--batch-check", input="\n".join(oids).encode() + b"\n").decode()
+    return {line.split()[0] for line in out.splitlines() if not line.endswith(" missing")}
+
+
+def _history_rewritten(project_path, old, tips):
+    """
+    True if a recorded tip is gone or no longer reachable from a current tip —
+    a take dropped, a rebase, a deleted version line. Objects and takes
+    recorded for it would be credited to commits that aren't in history.
+    """
+    if len(_existing_objects(project_path, old)) != len(old):
+        return True
+    revs = sorted(old) + [f"^{sha}" for sha in sorted(tips)]
+    out = run_git(project_path, "rev-list", "--count", "--stdin", input="\n".join(revs).encode() + b"\n",
+                  check=False)
+    return out.strip() != b"0"
+
+
+def _chunks(items, size=500):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class RepoAnalytics:
+    """
+    📊 Where the repository's bytes came from: bytes each take added, the
+    largest files and LFS objects, and growth per version line.
+
+    One streaming pass — `rev-list --objects` piped into `cat-file
+    --batch-check` — sizes every object not seen before, and one `log --raw`
+    walk (oldest first) credits each object to the take that first contained
+    it. Results live in `.dawgit_cache/analytics.sqlite`; later updates only
+    walk history added since the tips recorded last time. If one of those tips
+    is gone or no longer reachable from the current refs (history rewritten),
+    the index is rebuilt, so rewritten takes get their objects back and
+    dropped takes disappear.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self.path = analytics_index_path(self.project_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = self._connect()
+        self.conn.executescript(_SCHEMA)
+        self._pool = None
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def close(self):
+        self.shutdown()
+        self.conn.close()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _stored_tips(self, conn=None):
+        return {r[0] for r in (conn or self.conn).execute("SELECT sha FROM tips")}
+
+    def is_current(self):
+        return ref_tips(self.project_path) == self._stored_tips()
+
+    def _walk_objects(self, revs, conn):
+        """{oid: [type, size, disk, path]} for objects reachable from `revs` and not indexed yet."""
+        found = {}
+        walk = subprocess.Popen(["git", "rev-list", "--objects", "--stdin"], cwd=self.project_path, env=git_env(),
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        check = subprocess.Popen(["git", "cat-file", _BATCH_CHECK_FORMAT], cwd=self.project_path, env=git_env(),
+                                 stdin=walk.stdout, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        walk.stdout.close()     # cat-file owns the pipe now
+        walk.stdin.write("\n".join(revs).encode() + b"\n")
+        walk.stdin.close()
+        for line in check.stdout:
+            parts = line.decode("utf-8", "surrogateescape").rstrip("\n").split(" ", 4)
+            if len(parts) < 4 or parts[1] == "missing":
+                continue
+            path = parts[4] if len(parts) == 5 and parts[4] else None
+            found[parts[0]] = [parts[1], int(parts[2]), int(parts[3]), path]
+        walk.wait()
+        check.wait()
+
+        for chunk in _chunks(found):
+            marks = ",".join("?" * len(chunk))
+            for (oid,) in conn.execute(f"SELECT oid FROM objects WHERE oid IN ({marks})", chunk):
+                del found[oid]
+        return found
+
+    def _attribute(self, revs, objects):
+        """[(commit sha, commit time, [oids first seen there])], oldest first, for new objects."""
+        log = subprocess.Popen(
+            ["git", "log", "--stdin", "--reverse", "--topo-order", "--format=commit %H %T %ct", "--raw", "-t",
+             "--no-abbrev", "--root", "--no-renames", "--diff-merges=first-parent"],
+            cwd=self.project_path, env=git_env(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        log.stdin.write("\n".join(revs).encode() + b"\n")
+        log.stdin.close()
+        credited, commits = set(), []
+
+        def credit(oid, into):
+            if oid in objects and oid not in credited:
+                credited.add(oid)
+                into.append(oid)
+
+        for line in log.stdout:
+            line = line.decode("utf-8", "surrogateescape")
+            if line.startswith("commit "):
+                _, sha, tree, ts = line.split()
+                commits.append((sha, int(ts), []))
+                credit(sha, commits[-1][2])
+                credit(tree, commits[-1][2])
+            elif line.startswith(":") and commits:
+                new_oid = line.split("\t", 1)[0].split()[3]
+                if new_oid != _NULL_OID:
+                    credit(new_oid, commits[-1][2])
+        log.wait()
+        return commits
+
+    def update(self):
+        """
+        Indexes history added since the last update. Safe to call from a worker
+        thread (it uses its own connection). Returns the number of new takes.
+        """
+        start = time.perf_counter()
+        tips = ref_tips(self.project_path)
+        conn = self._connect()
+        try:
+            old = self._stored_tips(conn)
+            if tips == old:
+                return 0
+            if old and _history_rewritten(self.project_path, old, tips):
+                print("[DEBUG] Repo analytics: recorded history was rewritten — rebuilding")
+                conn.executescript("DELETE FROM objects; DELETE FROM commits; DELETE FROM tips;")
+                old = set()
+            revs = sorted(tips) + [f"^{sha}" for sha in sorted(old)]
+
+            objects = self._walk_objects(revs, conn)
+            with CatFileBatch(self.project_path) as batch:
+                for oid, entry in objects.items():
+                    if entry[0] == "blob" and entry[1] <= LFS_POINTER_MAX_SIZE:
+                        pointer = parse_lfs_pointer(batch.read(oid) or b"")
+                        entry.extend(pointer if pointer else (None, None))
+                    else:
+                        entry.extend((None, None))
+            commits = self._attribute(revs, objects)
+
+            owner = {oid: sha for sha, _, oids in commits for oid in oids}
+            conn.executemany(
+                "INSERT OR REPLACE INTO objects(oid, type, size, disk, path, lfs_oid, lfs_size, commit_sha) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((oid, *entry, owner.get(oid)) for oid, entry in objects.items())
+            )
+            rows = []
+            for sha, ts, oids in commits:
+                entries = [objects[oid] for oid in oids]
+                blobs = [e for e in entries if e[0] == "blob"]
+                largest = max(blobs, key=lambda e: e[5] or e[1], default=None)
+                rows.append((
+                    sha, ts, len(entries), sum(e[1] for e in entries), sum(e[2] for e in entries),
+                    sum(e[5] or 0 for e in entries),
+                    largest[3] if largest else None, (largest[5] or largest[1]) if largest else None,
+                ))
+            conn.executemany("INSERT OR IGNORE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("DELETE FROM tips")
+            conn.executemany("INSERT INTO tips(sha) VALUES (?)", ((sha,) for sha in tips))
+            conn.commit()
+        finally:
+            conn.close()
+        print(f"[DEBUG] Repo analytics: {len(commits)} takes, {len(objects)} objects "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return len(commits)
+
+    def update_async(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dawgit-analytics")
+        return self._pool.submit(self.update)
+
+    def sizes(self, shas):
+        """{sha: {"added", "bytes", "disk", "lfs_bytes", "objects", "largest_path", "largest_size"}} for indexed takes."""
+        result = {}
+        for chunk in _chunks(dict.fromkeys(shas)):
+            marks = ",".join("?" * len(chunk))
+            for sha, objects, size, disk, lfs, path, largest in self.conn.execute(
+                f"SELECT sha, objects, bytes, disk, lfs_bytes, largest_path, largest_size FROM commits "
+                f"WHERE sha IN ({marks})", chunk
+            ):
+                result[sha] = {"added": size + lfs, "bytes": size, "disk": disk, "lfs_bytes": lfs,
+                               "objects": objects, "largest_path": path, "largest_size": largest}
+        return result
+
+    def _line_totals(self, shas):
+        added, recent = 0, 0
+        cutoff = time.time() - ANALYTICS_RECENT_DAYS * 86400
+        for chunk in _chunks(shas):
+            marks = ",".join("?" * len(chunk))
+            row = self.conn.execute(
+                f"SELECT COALESCE(SUM(bytes + lfs_bytes), 0), "
+                f"COALESCE(SUM(CASE WHEN time >= ? THEN bytes + lfs_bytes ELSE 0 END), 0) "
+                f"FROM commits WHERE sha IN ({marks})", [cutoff, *chunk]
+            ).fetchone()
+            added += row[0]
+            recent += row[1]
+        return added, recent
+
+    def version_lines(self, base="main"):
+        """Per branch: takes and bytes in its history, and what it added on top of `base`."""
+        lines = []
+        branches = run_git(self.project_path, "for-each-ref", "--format=%(refname:short)", "refs/heads").decode().split()
+        for branch in branches:
+            history = run_git(self.project_path, "rev-list", branch).decode().split()
+            own = history if branch == base or base not in branches else \
+                run_git(self.project_path, "rev-list", branch, "--not", base).decode().split()
+            total, _ = self._line_totals(history)
+            own_bytes, recent = self._line_totals(own)
+            lines.append({"branch": branch, "commits": len(history), "bytes": total,
+                          "own_commits": len(own), "own_bytes": own_bytes, "recent_bytes": recent})
+        return sorted(lines, key=lambda line: line["own_bytes"], reverse=True)
+
+    def report(self, limit=ANALYTICS_REPORT_LIMIT):
+        """
+        📊 {"objects", "bytes", "disk", "lfs_objects", "lfs_bytes", "takes", "largest_blobs",
+        "largest_lfs", "lines"} from the index (call `update()` first for the latest history).
+        """
+        objects, size, disk = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(disk), 0) FROM objects"
+        ).fetchone()
+        lfs_objects, lfs_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(s), 0) FROM "
+            "(SELECT MAX(lfs_size) AS s FROM objects WHERE lfs_oid IS NOT NULL GROUP BY lfs_oid)"
+        ).fetchone()
+
+        takes = [
+            {"sha": sha, "time": ts, "added": blob_bytes + lfs, "disk": d, "lfs_bytes": lfs,
+             "objects": n, "largest_path": path}
+            for sha, ts, blob_bytes, d, lfs, n, path in self.conn.execute(
+                "SELECT sha, time, bytes, disk, lfs_bytes, objects, largest_path FROM commits "
+                "ORDER BY bytes + lfs_bytes DESC LIMIT ?", (limit,)
+            )
+        ]
+        if takes:
+            subjects = run_git(self.project_path, "log", "--no-walk=unsorted", "--format=%H %s",
+                               *(t["sha"] for t in takes), check=False).decode("utf-8", "replace")
+            by_sha = dict(line.split(" ", 1) for line in subjects.splitlines() if " " in line)
+            for take in takes:
+                take["subject"] = by_sha.get(take["sha"], "")
+
+        largest_blobs = [
+            {"oid": oid, "path": path, "size": s, "disk": d, "commit": sha}
+            for oid, path, s, d, sha in self.conn.execute(
+                "SELECT oid, path, size, disk, commit_sha FROM objects WHERE type = 'blob' AND lfs_oid IS NULL "
+                "ORDER BY size DESC LIMIT ?", (limit,)
+            )
+        ]
+        store = git_dir(self.project_path)
+        largest_lfs = [
+            {"oid": oid, "path": path, "size": s, "commit": sha, "local": lfs_object_path(store, oid).exists()}
+            for oid, path, s, sha in self.conn.execute(
+                "SELECT lfs_oid, path, MAX(lfs_size) AS s, commit_sha FROM objects WHERE lfs_oid IS NOT NULL "
+                "GROUP BY lfs_oid ORDER BY s DESC LIMIT ?", (limit,)
+            )
+        ]
+        return {
+            "objects": objects, "bytes": size, "disk": disk, "lfs_objects": lfs_objects, "lfs_bytes": lfs_bytes,
+            "takes": takes, "largest_blobs": largest_blobs, "largest_lfs": largest_lfs,
+            "lines": self.version_lines(),
+        }
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QAbstractItemView
+)
+
+from audio_index import format_size
+from ui_strings import (
+    ANALYTICS_TITLE,
+    ANALYTICS_SUMMARY,
+    ANALYTICS_UPDATING,
+    ANALYTICS_REFRESH_BTN,
+    ANALYTICS_TAKES_HEADING,
+    ANALYTICS_FILES_HEADING,
+    ANALYTICS_LFS_HEADING,
+    ANALYTICS_LINES_HEADING,
+    ANALYTICS_TAKE_COLUMNS,
+    ANALYTICS_FILE_COLUMNS,
+    ANALYTICS_LFS_COLUMNS,
+    ANALYTICS_LINE_COLUMNS,
+)
+
+
+class RepoAnalyticsPage(QWidget):
+    """📊 Where the project's space goes: biggest takes, largest files and LFS objects, growth per version line."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.app = parent  # 💈 Link to DAWGitApp
+        layout = QVBoxLayout(self)
+
+        header = QHBoxLayout()
+        self.title_label = QLabel(ANALYTICS_TITLE)
+        self.refresh_btn = QPushButton(ANALYTICS_REFRESH_BTN)
+        self.refresh_btn.clicked.connect(lambda: self.app.show_repo_analytics())
+        header.addWidget(self.title_label)
+        header.addStretch()
+        header.addWidget(self.refresh_btn)
+        layout.addLayout(header)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setObjectName("analyticsSummary")
+        layout.addWidget(self.summary_label)
+
+        self.takes_table = self._add_table(layout, ANALYTICS_TAKES_HEADING, ANALYTICS_TAKE_COLUMNS)
+        self.files_table = self._add_table(layout, ANALYTICS_FILES_HEADING, ANALYTICS_FILE_COLUMNS)
+        self.lfs_table = self._add_table(layout, ANALYTICS_LFS_HEADING, ANALYTICS_LFS_COLUMNS)
+        self.lines_table = self._add_table(layout, ANALYTICS_LINES_HEADING, ANALYTICS_LINE_COLUMNS)
+
+
+    def _add_table(self, layout, heading, columns):
+        layout.addWidget(QLabel(heading))
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(table)
+        return table
+
+
+    def _fill(self, table, rows):
+        """`rows` are [(cell text, tooltip)] lists."""
+        table.setRowCount(0)
+        for cells in rows:
+            row = table.rowCount()
+            table.insertRow(row)
+            for col, (text, tip) in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if tip:
+                    item.setToolTip(tip)
+                table.setItem(row, col, item)
+
+
+    def set_report(self, report, updating=False):
+        summary = ANALYTICS_SUMMARY.format(
+            size=format_size(report["bytes"] + report["lfs_bytes"]), objects=report["objects"],
+            disk=format_size(report["disk"]), lfs=format_size(report["lfs_bytes"]), lfs_count=report["lfs_objects"],
+        )
+        self.summary_label.setText(f"{summary}\n{ANALYTICS_UPDATING}" if updating else summary)
+
+        self._fill(self.takes_table, [
+            [(take["sha"][:7], f"{take['sha']}\n{take['subject']}"),
+             (datetime.fromtimestamp(take["time"]).strftime("%b %d, %H:%M"), None),
+             (format_size(take["added"]), None),
+             (take["largest_path"] or "–", None)]
+            for take in report["takes"]
+        ])
+        self._fill(self.files_table, [
+            [(blob["path"] or blob["oid"][:7], blob["oid"]), (format_size(blob["size"]), None),
+             (format_size(blob["disk"]), None), ((blob["commit"] or "–")[:7], blob["commit"])]
+            for blob in report["largest_blobs"]
+        ])
+        self._fill(self.lfs_table, [
+            [(obj["path"] or obj["oid"][:12], obj["oid"]), (format_size(obj["size"]), None),
+             ("✅" if obj["local"] else "–", None), ((obj["commit"] or "–")[:7], obj["commit"])]
+            for obj in report["largest_lfs"]
+        ])
+        self._fill(self.lines_table, [
+            [(line["branch"], None), (str(line["commits"]), None), (format_size(line["bytes"]), None),
+             (format_size(line["own_bytes"]), None), (format_size(line["recent_bytes"]), None)]
+            for line in report["lines"]
+        ])
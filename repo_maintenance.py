@@ -0,0 +1,293 @@
+# repo_maintenance.py
+import json
+import time
+import hashlib
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from ancestry import COMMIT_GRAPH_WRITE_ARGS
+from daw_bundle import daw_documents
+from git_objects import git_dir, git_env, run_git
+from snapshot_export import atomic_write_json
+
+
+MAINTENANCE_STATE_NAME = "maintenance.json"
+MAINTENANCE_CHECK_INTERVAL_MS = 30_000
+MAINTENANCE_IDLE_S = 120                # no DAW saves and no focus for this long = idle
+MAINTENANCE_TASK_BUDGET_S = 60          # a task running longer is stopped (git leaves the repo consistent)
+MAINTENANCE_STOP_GRACE_S = 5            # after SIGTERM, before git is killed outright
+MAINTENANCE_SESSION_BUDGET_S = 180      # total per idle stretch; the rest waits for the next one
+MAINTENANCE_LOOSE_OBJECTS = 100         # pack loose objects beyond this many
+MAINTENANCE_PACK_LIMIT = 8              # index packs together beyond this many
+MAINTENANCE_LOOSE_REFS = 20
+MAINTENANCE_HISTORY = 20                # runs kept in the state file
+
+# Cheap-to-expensive, so a short idle stretch still gets the biggest wins
+MAINTENANCE_TASKS = ("pack-refs", "loose-objects", "commit-graph", "multi-pack-index")
+
+
+def maintenance_state_path(project_path):
+    return git_dir(project_path) / "dawgit" / MAINTENANCE_STATE_NAME
+
+
+def load_state(project_path):
+    try:
+        return json.loads(maintenance_state_path(project_path).read_text())
+    except (OSError, ValueError):
+        return {"tasks": {}, "runs": []}
+
+
+def _refs_digest(project_path):
+    refs = run_git(project_path, "for-each-ref", "--format=%(objectname) %(refname)")
+    return hashlib.sha1(refs).hexdigest()
+
+
+def repo_health(project_path):
+    """Loose objects, packs, loose refs and commit-graph / multi-pack-index presence."""
+    gd = git_dir(project_path)
+    counts = {}
+    for line in run_git(project_path, "count-objects", "-v").decode().splitlines():
+        key, _, value = line.partition(":")
+        counts[key.strip()] = int(value.strip() or 0)
+    heads = gd / "refs"
+    loose_refs = sum(1 for p in heads.rglob("*") if p.is_file()) if heads.exists() else 0
+    info = gd / "objects" / "info"
+    return {
+        "loose_objects": counts.get("count", 0),
+        "loose_kb": counts.get("size", 0),
+        "packs": counts.get("packs", 0),
+        "loose_refs": loose_refs,
+        "commit_graph": (info / "commit-graph").exists() or (info / "commit-graphs").exists(),
+        "multi_pack_index": (gd / "objects" / "pack" / "multi-pack-index").exists(),
+        "refs_digest": _refs_digest(project_path),
+    }
+
+
+def due_tasks(health, state):
+    """Tasks worth running now, in MAINTENANCE_TASKS order."""
+    due = set()
+    if health["loose_refs"] > MAINTENANCE_LOOSE_REFS:
+        due.add("pack-refs")
+    # `repack -d` leaves unreachable loose objects behind; only new ones since the last run count
+    left = state.get("tasks", {}).get("loose-objects", {}).get("loose_left", 0)
+    if health["loose_objects"] - left > MAINTENANCE_LOOSE_OBJECTS:
+        due.add("loose-objects")
+    graph = state.get("tasks", {}).get("commit-graph", {})
+    if not health["commit_graph"] or graph.get("refs_digest") != health["refs_digest"]:
+        due.add("commit-graph")
+    if health["packs"] > MAINTENANCE_PACK_LIMIT or (health["packs"] > 1 and not health["multi_pack_index"]):
+        due.add("multi-pack-index")
+    return [task for task in MAINTENANCE_TASKS if task in due]
+
+
+_TASK_COMMANDS = {
+    # Pack loose objects into one new pack and drop the loose copies — never rewrites existing packs
+    "loose-objects": [["repack", "-d", "-q"], ["prune-packed", "-q"]],
+    # Split graph with Bloom filters: rev-list, --contains and path-limited log skip commit parsing
+    "commit-graph": [list(COMMIT_GRAPH_WRITE_ARGS)],
+    "multi-pack-index": [["multi-pack-index", "write"], ["multi-pack-index", "expire"]],
+    "pack-refs": [["pack-refs", "--all"]],
+}
+
+
+def _run_git_within(project_path, args, timeout):
+    """
+    Runs one git command, stopping it with SIGTERM after `timeout` seconds so
+    git removes its own `*.lock` files. Returns (returncode, stderr); returncode
+    is None when it had to be stopped.
+    """
+    proc = subprocess.Popen(["git", *args], cwd=project_path, env=git_env(),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        _, stderr = proc.communicate(timeout=timeout)
+        return proc.returncode, stderr
+    except subprocess.TimeoutExpired:
+        proc.terminate()
+        try:
+            proc.wait(timeout=MAINTENANCE_STOP_GRACE_S)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        # A hook git started may still hold the pipe open — don't wait for it
+        proc.stderr.close()
+        return None, b""
+
+
+def run_task(project_path, task, budget_s=MAINTENANCE_TASK_BUDGET_S):
+    """Runs one maintenance task within `budget_s`. Returns {"task", "status", "seconds"}."""
+    start = time.perf_counter()
+    status = "success"
+    for args in _TASK_COMMANDS[task]:
+        remaining = budget_s - (time.perf_counter() - start)
+        if remaining <= 0:
+            status = "timeout"
+            break
+        returncode, stderr = _run_git_within(project_path, args, remaining)
+        if returncode is None:
+            status = "timeout"
+            break
+        if returncode != 0:
+            status = "failed"
+            print(f"[WARN] Maintenance '{task}' failed: {stderr.decode(errors='replace').strip()}")
+            break
+    return {"task": task, "status": status, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def time_queries(project_path):
+    """Milliseconds for the history queries the app leans on (take numbering, branch labels, path history)."""
+    timings = {}
+    head = run_git(project_path, "rev-parse", "-q", "--verify", "HEAD", check=False).decode().strip()
+    if not head:
+        return timings
+    documents = [p.name for p in daw_documents(project_path)]
+    queries = {
+        "rev_list_count": ["rev-list", "--count", "HEAD"],
+        "branch_contains": ["branch", "--contains", head],
+        "iter_commits": ["rev-list", "--max-count=200", "--all"],
+    }
+    if documents:
+        queries["path_log"] = ["log", "--format=%H", "--", documents[0]]
+    for name, args in queries.items():
+        start = time.perf_counter()
+        run_git(project_path, *args, check=False)
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+    return timings
+
+
+def run_maintenance(project_path, tasks=None, budget_s=MAINTENANCE_SESSION_BUDGET_S, should_continue=None):
+    """
+    🧹 Runs due (or the given) tasks within `budget_s`, timing the key queries
+    before and after. `should_continue()` is checked between tasks so a user
+    coming back stops the run. Records the run in `.git/dawgit/maintenance.json`.
+    """
+    project_path = Path(project_path)
+    state = load_state(project_path)
+    health = repo_health(project_path)
+    tasks = list(tasks) if tasks is not None else due_tasks(health, state)
+    if not tasks:
+        return {"status": "skipped", "tasks": [], "health": health}
+
+    before = time_queries(project_path)
+    deadline = time.monotonic() + budget_s
+    results = []
+    for task in tasks:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or (should_continue is not None and not should_continue()):
+            break
+        result = run_task(project_path, task, budget_s=min(MAINTENANCE_TASK_BUDGET_S, remaining))
+        results.append(result)
+        if result["status"] == "success":
+            entry = {"at": time.time()}
+            if task == "commit-graph":
+                entry["refs_digest"] = health["refs_digest"]
+            state.setdefault("tasks", {})[task] = entry
+    after = time_queries(project_path)
+    health_after = repo_health(project_path)
+    if any(r["task"] == "loose-objects" and r["status"] == "success" for r in results):
+        state["tasks"]["loose-objects"]["loose_left"] = health_after["loose_objects"]
+
+    run = {"at": time.time(), "tasks": results, "before": before, "after": after,
+           "health_before": health, "health_after": health_after}
+    state["runs"] = (state.get("runs", []) + [run])[-MAINTENANCE_HISTORY:]
+    path = maintenance_state_path(project_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_json(path, state)
+    print(f"[DEBUG] Maintenance ran {[r['task'] for r in results]}: "
+          f"{sum(before.values()):.1f} ms → {sum(after.values()):.1f} ms")
+    return {"status": "success", **run}
+
+
+class MaintenanceScheduler(QObject):
+    """
+    🧹 Keeps auto-snapshot repos fast: packs loose objects, writes the
+    commit-graph and multi-pack-index, packs refs — only while the user is away.
+
+    Idle means the app window isn't focused, no DAW document was written for
+    `idle_s`, and `note_activity()` wasn't called for as long. A check runs every
+    `MAINTENANCE_CHECK_INTERVAL_MS`; due tasks run on a worker thread, one idle
+    stretch at a time, and stop between tasks when the user comes back
+    (`note_activity()` — e.g. on window activation — interrupts the run).
+    """
+
+    finished = pyqtSignal(dict)
+
+    def __init__(self, project_path, is_focused=None, idle_s=MAINTENANCE_IDLE_S, parent=None):
+        super().__init__(parent)
+        self.project_path = Path(project_path)
+        self.is_focused = is_focused or (lambda: False)
+        self.idle_s = idle_s
+        self.last_activity = time.monotonic()
+        self._future = None
+        self._interrupted = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dawgit-maintenance")
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(MAINTENANCE_CHECK_INTERVAL_MS)
+        self._timer.timeout.connect(self.check)
+
+        self._poll = QTimer(self)
+        self._poll.setInterval(200)
+        self._poll.timeout.connect(self._collect_result)
+
+    def start(self):
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def shutdown(self):
+        """Stops checking and lets an in-flight run end after its current task."""
+        self._interrupted.set()
+        self.stop()
+        self._poll.stop()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def note_activity(self):
+        self.last_activity = time.monotonic()
+        self._interrupted.set()
+
+    def _last_daw_write(self):
+        latest = 0.0
+        for document in daw_documents(self.project_path):
+            try:
+                latest = max(latest, document.stat().st_mtime)
+            except OSError:
+                pass
+        return latest
+
+    def is_idle(self):
+        if self.is_focused():
+            self.note_activity()
+            return False
+        if time.monotonic() - self.last_activity < self.idle_s:
+            return False
+        return time.time() - self._last_daw_write() >= self.idle_s
+
+    def check(self):
+        """Starts a maintenance run if idle and nothing is running. Returns True if one started."""
+        idle = self.is_idle()
+        if self._future is not None or not idle:
+            return False
+        self._interrupted.clear()
+        # The worker only reads the flag — focus and file checks stay on this thread
+        self._future = self._executor.submit(run_maintenance, self.project_path,
+                                             should_continue=lambda: not self._interrupted.is_set())
+        self._poll.start()
+        return True
+
+    def _collect_result(self):
+        if self._future is None or not self._future.done():
+            return
+        future, self._future = self._future, None
+        self._poll.stop()
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"[WARN] Maintenance failed: {e}")
+            return
+        if result["status"] == "success":
+            self.finished.emit(result)
@@ -0,0 +1,188 @@
+# role_notes.py
+import time
+import subprocess
+import threading
+from pathlib import Path
+
+from git_objects import CatFileBatch, existing_commits, git_dir, git_env, run_git
+
+
+ROLE_NOTES_REF = "refs/notes/dawgit-roles"
+ROLE_NOTES_REFSPEC = f"{ROLE_NOTES_REF}:{ROLE_NOTES_REF}"
+NOTES_COMMITTER = "DAW Git <dawgit@localhost>"
+
+_notes_cache = {}
+_ref_dirs = {}
+_cache_lock = threading.Lock()
+
+
+def _ref_dir(repo_path):
+    """The directory holding the repo's refs (the common dir for worktrees), resolved once per path."""
+    key = str(repo_path)
+    with _cache_lock:
+        cached = _ref_dirs.get(key)
+    if cached is None:
+        cached = git_dir(repo_path)
+        commondir = cached / "commondir"
+        if commondir.exists():
+            cached = (cached / commondir.read_text().strip()).resolve()
+        with _cache_lock:
+            _ref_dirs[key] = cached
+    return cached
+
+
+def _read_ref_files(ref_dir):
+    """Reads the notes ref straight from the loose or packed refs. Returns (found, sha)."""
+    try:
+        return True, (Path(ref_dir) / ROLE_NOTES_REF).read_text().strip() or None
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    try:
+        for line in (Path(ref_dir) / "packed-refs").read_text().splitlines():
+            if line.endswith(" " + ROLE_NOTES_REF):
+                return True, line.split()[0]
+    except FileNotFoundError:
+        pass
+    return not (Path(ref_dir) / "reftable").exists(), None
+
+
+def notes_tip(repo_path):
+    """Current commit of the role notes ref, or None if no role was ever stored."""
+    found, tip = _read_ref_files(_ref_dir(repo_path))
+    if found:
+        return tip
+    out = run_git(repo_path, "rev-parse", "--verify", "-q", ROLE_NOTES_REF, check=False).decode().strip()
+    return out or None
+
+
+def configure_notes_rewrite(repo_path):
+    """
+    Tells Git to carry role notes over to rewritten commits, so `git rebase`
+    and `git commit --amend` keep roles attached to the new SHAs.
+    """
+    current = run_git(repo_path, "config", "--get-all", "notes.rewriteRef", check=False).decode().split()
+    if ROLE_NOTES_REF not in current:
+        run_git(repo_path, "config", "--add", "notes.rewriteRef", ROLE_NOTES_REF)
+    run_git(repo_path, "config", "notes.rewriteMode", "overwrite")
+
+
+def configure_notes_fetch(repo_path):
+    """
+    Adds the role notes ref to every remote's fetch refspecs, so a plain
+    `git fetch`/`git pull` brings collaborators' roles along. The refspec is
+    not forced: if local and remote roles have diverged, Git refuses that one
+    ref update instead of discarding the local roles.
+    """
+    for remote in run_git(repo_path, "remote").decode().split():
+        key = f"remote.{remote}.fetch"
+        current = run_git(repo_path, "config", "--get-all", key, check=False).decode().split()
+        if ROLE_NOTES_REFSPEC not in current:
+            run_git(repo_path, "config", "--add", key, ROLE_NOTES_REFSPEC)
+
+
+def push_role_notes(repo_path, remote="origin"):
+    """
+    Pushes the role notes ref alongside a branch push. Best effort: a missing
+    notes ref is skipped and a rejected push is logged, never raised, so the
+    branch push it follows still counts as done. Returns True if notes were pushed.
+    """
+    if notes_tip(repo_path) is None:
+        return False
+    result = subprocess.run(
+        ["git", "push", remote, ROLE_NOTES_REFSPEC],
+        cwd=repo_path,
+        env=git_env(),
+        capture_output=True
+    )
+    if result.returncode != 0:
+        print(f"[WARN] Role notes not pushed to {remote}: {result.stderr.decode(errors='replace').strip()}")
+        return False
+    return True
+
+
+def read_role_notes(repo_path):
+    """
+    🏷️ Returns {commit_sha: role} from the notes ref.
+
+    One `git notes list` plus one `cat-file --batch` pass; the result is cached
+    by notes-tip SHA. The ref directory is resolved once per repo and the tip is
+    read from the ref files, so repeated calls don't start a git process.
+    """
+    tip = notes_tip(repo_path)
+    if tip is None:
+        return {}
+
+    key = str(_ref_dir(repo_path))
+    with _cache_lock:
+        cached = _notes_cache.get(key)
+        if cached and cached[0] == tip:
+            return dict(cached[1])
+
+    pairs = []
+    for line in run_git(repo_path, "notes", f"--ref={ROLE_NOTES_REF}", "list").decode().splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            pairs.append(parts)
+
+    roles = {}
+    if pairs:
+        with CatFileBatch(repo_path) as batch:
+            for note_oid, commit_sha in pairs:
+                role = (batch.read(note_oid) or b"").decode("utf-8", "replace").strip()
+                if role:  # empty notes mark removed roles
+                    roles[commit_sha] = role
+
+    with _cache_lock:
+        _notes_cache[key] = (tip, roles)
+    print(f"[DEBUG] Loaded {len(roles)} role notes at {tip[:7]}")
+    return dict(roles)
+
+
+def write_role_notes(repo_path, roles, message="Update DAW Git roles"):
+    """
+    Writes many role notes as a single notes commit via `git fast-import`.
+    A role of None (or "") clears that commit's role. SHAs that are not
+    commits in this repo are skipped.
+    """
+    known = existing_commits(repo_path, roles)
+    roles = {sha: role for sha, role in roles.items() if sha in known}
+    if not roles:
+        return notes_tip(repo_path)
+
+    tip = notes_tip(repo_path)
+    msg = message.encode()
+    stream = [
+        f"commit {ROLE_NOTES_REF}\n".encode(),
+        f"committer {NOTES_COMMITTER} {int(time.time())} +0000\n".encode(),
+        f"data {len(msg)}\n".encode() + msg + b"\n",
+    ]
+    if tip:
+        stream.append(f"from {tip}\n".encode())
+    for sha, role in roles.items():
+        data = f"{role}\n".encode() if role else b""
+        stream.append(f"N inline {sha}\ndata {len(data)}\n".encode() + data + b"\n")
+
+    run_git(repo_path, "fast-import", "--quiet", input=b"".join(stream))
+    new_tip = notes_tip(repo_path)
+
+    # Keep the cache warm instead of re-reading every note we just wrote
+    key = str(_ref_dir(repo_path))
+    with _cache_lock:
+        cached = _notes_cache.get(key)
+        if cached and cached[0] == tip:
+            updated = dict(cached[1])
+            for sha, role in roles.items():
+                if role:
+                    updated[sha] = role
+                else:
+                    updated.pop(sha, None)
+            _notes_cache[key] = (new_tip, updated)
+    return new_tip
+
+
+def set_role_note(repo_path, sha, role):
+    return write_role_notes(repo_path, {sha: role}, message=f"Tag {sha[:7]} as {role}")
+
+
+def clear_role_note(repo_path, sha):
+    return write_role_notes(repo_path, {sha: None}, message=f"Clear role on {sha[:7]}")
@@ -0,0 +1,167 @@
+# sample_index.py
+import sqlite3
+import posixpath
+from pathlib import Path
+
+from git_objects import run_git
+from metadata_store import index_path
+
+
+SAMPLE_INDEX_NAME = "sample_index.sqlite"
+SAMPLE_OK, SAMPLE_MISSING, SAMPLE_EXTERNAL = "ok", "missing", "external"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sample_refs (
+    sha TEXT NOT NULL,
+    path TEXT NOT NULL,
+    state TEXT NOT NULL,
+    blob TEXT,
+    PRIMARY KEY (sha, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sample_refs_path ON sample_refs(path, blob);
+
+CREATE TABLE IF NOT EXISTS indexed (
+    sha TEXT PRIMARY KEY,
+    als_blob TEXT NOT NULL
+);
+"""
+
+
+def sample_index_path(project_path):
+    return index_path(project_path, SAMPLE_INDEX_NAME)
+
+
+def resolve_sample_path(sample, project_name):
+    """
+    Maps a sample reference from the set to a path in the project tree, or None
+    when it points outside the project (Live's library, another drive, …).
+    Relative references are relative to the project folder, where the `.als` sits.
+    """
+    sample = sample.replace("\\", "/")
+    if sample.startswith("/") or (len(sample) > 1 and sample[1] == ":"):
+        marker = f"/{project_name}/"
+        if marker not in sample:
+            return None
+        sample = sample.rsplit(marker, 1)[1]
+    sample = posixpath.normpath(sample)
+    if sample == ".." or sample.startswith("../"):
+        return None
+    return sample
+
+
+def batch_check(repo_path, specs):
+    """[(blob SHA or None)] for `<rev>:<path>` specs, in one `cat-file --batch-check` call."""
+    if not specs:
+        return []
+    out = run_git(repo_path, "cat-file", "--batch-check=%(objectname) %(objecttype)",
+                  input="\n".join(specs).encode() + b"\n")
+    results = []
+    for line in out.decode("utf-8", "surrogateescape").splitlines():
+        parts = line.rsplit(" ", 1)
+        results.append(parts[0] if len(parts) == 2 and parts[1] == "blob" else None)
+    return results
+
+
+class SampleIndex:
+    """
+    🎧 Sample path → content hash → snapshots that reference it.
+
+    Built from the sample references in each take's `.als` summary and the
+    take's own tree: every (take, sample) pair is resolved with one batched
+    `cat-file --batch-check`, nothing is checked out. Commits never change, so
+    each take is indexed once.
+    """
+
+    def __init__(self, project_path, analyzer):
+        self.project_path = Path(project_path)
+        self.analyzer = analyzer
+        self.path = sample_index_path(self.project_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _indexed(self, shas):
+        found = set()
+        shas = list(shas)
+        for i in range(0, len(shas), 500):
+            chunk = shas[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(r[0] for r in self.conn.execute(f"SELECT sha FROM indexed WHERE sha IN ({marks})", chunk))
+        return found
+
+    def update(self, blob_by_commit, parse=True):
+        """
+        Indexes takes not seen yet. `blob_by_commit` maps commit SHA → its `.als`
+        blob SHA. With `parse=False` only sets the analyzer already has a
+        summary for are indexed; the rest wait for a later call.
+        """
+        done = self._indexed(blob_by_commit)
+        pending = {sha: blob for sha, blob in blob_by_commit.items() if sha not in done}
+        if not pending:
+            return 0
+
+        summaries = self.analyzer.summaries(pending.values(), parse=parse)
+        project_name = self.project_path.name
+        rows, specs = [], []
+        ready = []
+        for sha, als_blob in pending.items():
+            summary = summaries.get(als_blob)
+            if summary is None:
+                continue        # set not readable yet (LFS object not fetched) — retry next time
+            ready.append((sha, als_blob))
+            for sample in summary.get("samples", []):
+                path = resolve_sample_path(sample, project_name)
+                if path is None:
+                    rows.append((sha, sample, SAMPLE_EXTERNAL, None))
+                else:
+                    specs.append((sha, path))
+
+        for (sha, path), blob in zip(specs, batch_check(self.project_path, [f"{s}:{p}" for s, p in specs])):
+            rows.append((sha, path, SAMPLE_OK if blob else SAMPLE_MISSING, blob))
+
+        self.conn.executemany("INSERT OR REPLACE INTO sample_refs(sha, path, state, blob) VALUES (?, ?, ?, ?)", rows)
+        self.conn.executemany("INSERT OR REPLACE INTO indexed(sha, als_blob) VALUES (?, ?)", ready)
+        self.conn.commit()
+        print(f"[DEBUG] Sample index: +{len(ready)} takes, {len(specs)} references checked")
+        return len(ready)
+
+    def status(self, shas):
+        """
+        {sha: {"samples", "missing", "external"}} for indexed takes. A take is
+        self-contained when `missing` is empty.
+        """
+        shas = list(shas)
+        result = {sha: {"samples": 0, "missing": [], "external": []} for sha in self._indexed(shas)}
+        for i in range(0, len(shas), 500):
+            chunk = shas[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for sha, path, state in self.conn.execute(
+                f"SELECT sha, path, state FROM sample_refs WHERE sha IN ({marks}) ORDER BY path", chunk
+            ):
+                entry = result[sha]
+                entry["samples"] += 1
+                if state != SAMPLE_OK:
+                    entry[state].append(path)
+        return result
+
+    def is_self_contained(self, sha):
+        entry = self.status([sha]).get(sha)
+        return None if entry is None else not entry["missing"]
+
+    def versions(self, path):
+        """{content hash: [snapshot SHAs]} for one sample path; missing references are under None."""
+        found = {}
+        for sha, blob in self.conn.execute("SELECT sha, blob FROM sample_refs WHERE path = ?", (path,)):
+            found.setdefault(blob, []).append(sha)
+        return found
@@ -1,10 +1,10 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton, QTableWidget,
     QLineEdit, QHBoxLayout, QTableWidgetItem, QSpacerItem, QSizePolicy,
-    QTextEdit, QAbstractItemView
+    QTextEdit, QAbstractItemView, QComboBox
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPalette, QColor
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QPalette, QColor, QPainter
 
 
 from ui_strings import (
@@ -29,11 +29,83 @@ from ui_strings import (
     TABLE_HEADER_TAKE_ID,
     TABLE_HEADER_TAKE_NOTES,
     TABLE_HEADER_SESSION_LINE, 
+    TABLE_HEADER_CHANGED,
+    TABLE_HEADER_TEMPO,
+    TABLE_HEADER_TRACKS,
+    TABLE_HEADER_SAMPLES,
+    TABLE_HEADER_AUDIO,
+    TABLE_HEADER_SIZE,
     STATUS_READY, 
     BTN_TAG_CUSTOM_LABEL, 
-    ROLE_CUSTOM_TAG_TOOLTIP
+    ROLE_CUSTOM_TAG_TOOLTIP,
+    SEARCH_HISTORY_PLACEHOLDER,
+    SEARCH_HISTORY_TOOLTIP,
+    TOOLTIP_COMPARE_TAKES,
+    TOOLTIP_WAVEFORM_FILE,
+    TOOLTIP_AUDIO_DIFF_FILE,
 )
 
+SEARCH_DEBOUNCE_MS = 200
+
+
+class WaveformView(QWidget):
+    """〰️ Draws cached min/max peaks — one vertical line per pixel column."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("waveformView")
+        self.setMinimumHeight(64)
+        self.peaks = None
+        self.message = ""
+
+    def set_peaks(self, peaks):
+        self.peaks, self.message = peaks, ""
+        self.update()
+
+    def set_message(self, message):
+        self.peaks, self.message = None, message
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#1e1e1e"))
+        if self.peaks is None:
+            painter.setPen(QColor("#aaaaaa"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.message)
+            return
+        mid, half = self.height() / 2, self.height() / 2 - 1
+        painter.setPen(QColor("#4fc3f7"))
+        for x, (low, high) in enumerate(self.peaks.columns(self.width())):
+            painter.drawLine(x, int(mid - high / 32767 * half), x, int(mid - low / 32767 * half))
+
+
+class ChangeStripView(QWidget):
+    """🎚️ A timeline strip: audio diff windows shaded by how much they changed, changed regions in red."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("audioDiffStrip")
+        self.setMinimumHeight(18)
+        self.diff = None
+
+    def set_diff(self, diff):
+        self.diff = diff
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#2b2b2b"))
+        if not self.diff or not self.diff["windows"]:
+            return
+        windows = self.diff["windows"]
+        width, height = self.width(), self.height()
+        for i, (level, _, spectral, changed) in enumerate(windows):
+            x0, x1 = i * width // len(windows), (i + 1) * width // len(windows)
+            strength = min(1.0, max(abs(level), spectral) / 6.0)
+            color = QColor("#e74c3c") if changed else QColor("#3d5a6c")
+            color.setAlphaF(0.35 + 0.65 * strength if changed else 0.6)
+            painter.fillRect(x0, 0, max(1, x1 - x0), height, color)
+
 class SnapshotBrowserPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -49,16 +121,34 @@ class SnapshotBrowserPage(QWidget):
         self.version_line_label.setObjectName("versionLineLabel")
         layout.addWidget(self.version_line_label)
 
+        # 🔎 Search / filter box (debounced so typing doesn't query on every key)
+        self.search_box = QLineEdit()
+        self.search_box.setObjectName("historySearchBox")
+        self.search_box.setPlaceholderText(SEARCH_HISTORY_PLACEHOLDER)
+        self.search_box.setToolTip(SEARCH_HISTORY_TOOLTIP)
+        self.search_box.setClearButtonEnabled(True)
+        layout.addWidget(self.search_box)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(self.run_search)
+        self.search_box.textChanged.connect(lambda _: self._search_timer.start(SEARCH_DEBOUNCE_MS))
+
         # 📜 Commit History Table
         self.commit_table = QTableWidget()
         self.commit_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.commit_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        # Extended so a second take can be Ctrl/Cmd-clicked for comparison
+        self.commit_table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
+        self.commit_table.setToolTip(TOOLTIP_COMPARE_TAKES)
+        self.commit_table.itemSelectionChanged.connect(self.on_selection_changed)
 
         layout.addWidget(self.commit_table)
-        self.commit_table.setColumnCount(9)
+        self.commit_table.setColumnCount(15)
         self.commit_table.setHorizontalHeaderLabels([
             "#", "Role", TABLE_HEADER_TAKE_ID, TABLE_HEADER_TAKE_NOTES,
-            TABLE_HEADER_SESSION_LINE, "DAW", "Files", "Tags", "Date"
+            TABLE_HEADER_SESSION_LINE, "DAW", "Files", "Tags", "Date", TABLE_HEADER_CHANGED,
+            TABLE_HEADER_TEMPO, TABLE_HEADER_TRACKS, TABLE_HEADER_SAMPLES, TABLE_HEADER_AUDIO,
+            TABLE_HEADER_SIZE
         ])
         self.commit_table.setSortingEnabled(True)
         self.commit_table.sortItems(0, Qt.SortOrder.AscendingOrder)
@@ -71,6 +161,45 @@ class SnapshotBrowserPage(QWidget):
         # """)
         self.commit_table.sortItems(8, Qt.SortOrder.DescendingOrder)
 
+        # 🔀 Inline .als diff, shown while exactly two takes are selected
+        self.als_diff_view = QTextEdit()
+        self.als_diff_view.setObjectName("alsDiffView")
+        self.als_diff_view.setReadOnly(True)
+        self.als_diff_view.setMaximumHeight(160)
+        self.als_diff_view.setVisible(False)
+        layout.addWidget(self.als_diff_view)
+
+        # 〰️ Waveform preview of a take's audio, drawn from the peak cache (shown for one selected take)
+        self.waveform_panel = QWidget()
+        waveform_layout = QVBoxLayout(self.waveform_panel)
+        waveform_layout.setContentsMargins(0, 0, 0, 0)
+        self.waveform_combo = QComboBox()
+        self.waveform_combo.setObjectName("waveformFileCombo")
+        self.waveform_combo.setToolTip(TOOLTIP_WAVEFORM_FILE)
+        self.waveform_combo.currentIndexChanged.connect(self.on_waveform_file_changed)
+        waveform_layout.addWidget(self.waveform_combo)
+        self.waveform_view = WaveformView()
+        waveform_layout.addWidget(self.waveform_view)
+        self.waveform_panel.setVisible(False)
+        layout.addWidget(self.waveform_panel)
+
+        # 🎚️ Changed-regions strip for audio that differs between two selected takes
+        self.audio_diff_panel = QWidget()
+        audio_diff_layout = QVBoxLayout(self.audio_diff_panel)
+        audio_diff_layout.setContentsMargins(0, 0, 0, 0)
+        self.audio_diff_combo = QComboBox()
+        self.audio_diff_combo.setObjectName("audioDiffFileCombo")
+        self.audio_diff_combo.setToolTip(TOOLTIP_AUDIO_DIFF_FILE)
+        self.audio_diff_combo.currentIndexChanged.connect(self.on_audio_diff_file_changed)
+        audio_diff_layout.addWidget(self.audio_diff_combo)
+        self.audio_diff_strip = ChangeStripView()
+        audio_diff_layout.addWidget(self.audio_diff_strip)
+        self.audio_diff_label = QLabel()
+        self.audio_diff_label.setObjectName("audioDiffLabel")
+        audio_diff_layout.addWidget(self.audio_diff_label)
+        self.audio_diff_panel.setVisible(False)
+        layout.addWidget(self.audio_diff_panel)
+
         # 📦 Status
         self.status_label = QLabel(STATUS_READY)
         layout.addWidget(self.status_label)
@@ -146,6 +275,56 @@ class SnapshotBrowserPage(QWidget):
         # self.commit_table.setPalette(palette)
 
 
+    def run_search(self):
+        if self.app and hasattr(self.app, "apply_history_filter"):
+            self.app.apply_history_filter(self.search_box.text())
+
+
+    def on_selection_changed(self):
+        rows = {index.row() for index in self.commit_table.selectionModel().selectedRows()}
+        # Load and role actions work on one take — a comparison selection has no single target
+        for btn in (self.load_snapshot_btn, self.quick_tag_main_btn, self.quick_tag_creative_btn,
+                    self.quick_tag_alt_btn, self.tag_custom_btn):
+            btn.setEnabled(len(rows) <= 1)
+        if len(rows) == 2 and self.app and hasattr(self.app, "show_als_diff"):
+            shas = [self.commit_table.item(row, 2).toolTip() for row in sorted(rows)
+                    if self.commit_table.item(row, 2)]
+            if len(shas) == 2 and all(shas):
+                self.waveform_panel.setVisible(False)
+                self._cancel_preview("cancel_waveform")
+                self.app.show_als_diff(*shas)
+                if hasattr(self.app, "show_audio_diff"):
+                    self.app.show_audio_diff(*shas)
+                return
+        self.als_diff_view.setVisible(False)
+        self.audio_diff_panel.setVisible(False)
+        self._cancel_preview("cancel_audio_diff")
+        item = self.commit_table.item(next(iter(rows)), 2) if len(rows) == 1 else None
+        if item and item.toolTip() and self.app and hasattr(self.app, "show_waveforms"):
+            self.app.show_waveforms(item.toolTip())
+        else:
+            self.waveform_panel.setVisible(False)
+            self._cancel_preview("cancel_waveform")
+
+
+    def _cancel_preview(self, name):
+        """Background decodes for a take that is no longer selected are dropped."""
+        if self.app and hasattr(self.app, name):
+            getattr(self.app, name)()
+
+
+    def on_audio_diff_file_changed(self, index):
+        blobs = self.audio_diff_combo.itemData(index)
+        if blobs and self.app and hasattr(self.app, "show_audio_diff_for"):
+            self.app.show_audio_diff_for(*blobs, path=self.audio_diff_combo.itemText(index))
+
+
+    def on_waveform_file_changed(self, index):
+        oid = self.waveform_combo.itemData(index)
+        if oid and self.app and hasattr(self.app, "show_waveform"):
+            self.app.show_waveform(oid, self.waveform_combo.itemText(index))
+
+
     def update_return_to_latest_visibility(self):
         if self.app and self.app.repo:
             is_detached = self.app.repo.head.is_detached
@@ -176,8 +355,7 @@ class SnapshotBrowserPage(QWidget):
     def show_placeholder_row(self):
         self.commit_table.setRowCount(0)
         self.commit_table.insertRow(0)
-        placeholders = ["–"] * 9
-        for col, text in enumerate(placeholders):
-            self.commit_table.setItem(0, col, QTableWidgetItem(text))
+        for col in range(self.commit_table.columnCount()):
+            self.commit_table.setItem(0, col, QTableWidgetItem("–"))
 
 
@@ -0,0 +1,367 @@
+# snapshot_export.py
+import io
+import os
+import sys
+import json
+import shutil
+import tarfile
+import tempfile
+import zipfile
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from git_objects import (
+    CatFileBatch,
+    LFS_POINTER_MAX_SIZE,
+    READ_CHUNK_SIZE,
+    git_dir,
+    list_tree,
+    lfs_object_path,
+    parse_lfs_pointer,
+    resolve_commit,
+    run_git
+)
+from als_filter import smudge_als, smudge_als_stream
+
+
+EXPORT_SKIP_NAMES = {".git"}
+HASH_CHUNK_SIZE = 1024 * 1024
+ALS_SPOOL_MAX_BYTES = 8 * 1024 ** 2     # re-gzipped sets bigger than this spill to a temp file
+
+
+def hash_file(path, chunk_size=HASH_CHUNK_SIZE):
+    """Stream a file through SHA-256 without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def atomic_write_json(path, data):
+    """Write JSON next to `path` and rename it into place so readers never see half a file."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def export_manifest_path(target_dir, project_name):
+    return Path(target_dir) / f".{project_name}_export_manifest.json"
+
+
+def load_export_manifest(target_dir, project_name):
+    """
+    Loads the hash manifest kept at an export target.
+    Returns an empty manifest if this target has never received an export.
+    """
+    manifest_path = export_manifest_path(target_dir, project_name)
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            if isinstance(manifest.get("generations"), list):
+                return manifest
+        except Exception as e:
+            print(f"[WARN] Ignoring unreadable export manifest {manifest_path}: {e}")
+    return {"project": project_name, "generations": []}
+
+
+def iter_project_files(project_path):
+    """Yields every file in the project (relative POSIX path, absolute Path), skipping Git internals."""
+    project_path = Path(project_path)
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in EXPORT_SKIP_NAMES)
+        for name in sorted(files):
+            if name in EXPORT_SKIP_NAMES:
+                continue
+            full = Path(root) / name
+            yield full.relative_to(project_path).as_posix(), full
+
+
+def _previous_generation(manifest, target_dir):
+    """Newest generation whose folder still exists at the target (user may have deleted old ones)."""
+    for generation in reversed(manifest["generations"]):
+        if (Path(target_dir) / generation["name"]).is_dir():
+            return generation
+    return None
+
+
+def _free_generation_name(target_dir, base):
+    """`base`, or `base-2`, `base-3`… if an export already used it (two exports in the same second)."""
+    name, n = base, 1
+    while (Path(target_dir) / name).exists():
+        n += 1
+        name = f"{base}-{n}"
+    return name
+
+
+def export_incremental(project_path, target_dir, timestamp=None):
+    """
+    📦 Export the project into a new `<name>_snapshot_<timestamp>` folder at `target_dir`.
+
+    Every export is a complete, browsable tree, but files whose content matches the
+    previous export generation are hardlinked instead of copied, so repeat exports to
+    the same drive only cost the delta. Source hashes are reused from the manifest
+    when size and mtime are unchanged, so unchanged samples are not even re-read.
+    """
+    project_path = Path(project_path)
+    target_dir = Path(target_dir)
+    project_name = project_path.name
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    manifest = load_export_manifest(target_dir, project_name)
+    previous = _previous_generation(manifest, target_dir)
+    previous_files = previous["files"] if previous else {}
+    previous_dir = target_dir / previous["name"] if previous else None
+
+    # Build the generation in a hidden folder and rename it into place, so a failed
+    # export never leaves a half-copied snapshot that looks complete
+    base_name = f"{project_name}_snapshot_{timestamp}"
+    staging = Path(tempfile.mkdtemp(prefix=f".{base_name}.", suffix=".partial", dir=target_dir))
+
+    files = {}
+    copied = linked = bytes_copied = 0
+
+    try:
+        for rel_path, src in iter_project_files(project_path):
+            st = src.stat()
+            prev_entry = previous_files.get(rel_path)
+
+            if prev_entry and prev_entry["size"] == st.st_size and prev_entry["mtime_ns"] == st.st_mtime_ns:
+                digest = prev_entry["sha256"]
+            else:
+                digest = hash_file(src)
+
+            dst = staging / rel_path
+            dst.parent.mkdir(parents=True, exist_ok=True)
+
+            reused = False
+            if prev_entry and prev_entry["sha256"] == digest:
+                try:
+                    os.link(previous_dir / rel_path, dst)
+                    reused = True
+                except OSError as e:
+                    # Filesystem without hardlinks (e.g. FAT drives) or file removed by hand
+                    print(f"[DEBUG] Hardlink unavailable for {rel_path}, copying instead: {e}")
+
+            if reused:
+                linked += 1
+            else:
+                shutil.copy2(src, dst)
+                copied += 1
+                bytes_copied += st.st_size
+
+            files[rel_path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+
+        snapshot_name = _free_generation_name(target_dir, base_name)
+        dest = target_dir / snapshot_name
+        os.rename(staging, dest)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # Generations deleted by hand no longer need their file maps
+    manifest["generations"] = [g for g in manifest["generations"] if (target_dir / g["name"]).is_dir()]
+    manifest["generations"].append({
+        "name": snapshot_name,
+        "created": datetime.now().isoformat(),
+        "files": files,
+    })
+    atomic_write_json(export_manifest_path(target_dir, project_name), manifest)
+
+    print(f"[DEBUG] Export {snapshot_name}: {copied} copied ({bytes_copied} bytes), {linked} linked")
+    return {
+        "status": "ok",
+        "path": dest,
+        "copied": copied,
+        "linked": linked,
+        "bytes_copied": bytes_copied,
+        "incremental": previous is not None,
+    }
+
+
+ARCHIVE_FORMATS = ("tar", "zip")
+TAR_COMPRESSIONS = ("none", "gz", "bz2", "xz")
+
+
+def _open_archive(out_path, fmt, compression, level):
+    if fmt == "zip":
+        method = zipfile.ZIP_STORED if compression == "none" else zipfile.ZIP_DEFLATED
+        kwargs = {"compresslevel": level} if method == zipfile.ZIP_DEFLATED else {}
+        return zipfile.ZipFile(out_path, "w", compression=method, allowZip64=True, **kwargs)
+
+    if compression not in TAR_COMPRESSIONS:
+        raise ValueError(f"Unsupported tar compression: {compression}")
+    if compression == "none":
+        return tarfile.open(out_path, "w")
+    if compression == "xz":
+        return tarfile.open(out_path, "w:xz", preset=level)
+    return tarfile.open(out_path, f"w:{compression}", compresslevel=level)
+
+
+def _add_entry(archive, fmt, name, mode, size, mtime, reader):
+    """Streams one file into the archive from `reader` in fixed-size chunks."""
+    if fmt == "zip":
+        info = zipfile.ZipInfo(name, date_time=datetime.fromtimestamp(mtime).timetuple()[:6])
+        info.external_attr = (0o100000 | mode) << 16
+        info.compress_type = archive.compression
+        if hasattr(zipfile.ZipInfo, "compress_level"):     # public since Python 3.13
+            info.compress_level = archive.compresslevel
+        with archive.open(info, "w", force_zip64=True) as dst:
+            for chunk in iter(lambda: reader.read(READ_CHUNK_SIZE), b""):
+                dst.write(chunk)
+    else:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mode = mode
+        info.mtime = mtime
+        archive.addfile(info, reader)
+
+
+def export_commit_archive(repo_path, rev, out_path, fmt="tar", compression="gz", level=6):
+    """
+    📦 Stream the tree of `rev` straight from the object store into a tar or zip archive.
+
+    Nothing is checked out and the working tree is never touched, so several exports
+    can run side by side. LFS pointers are swapped for their content from the local
+    LFS store when available; objects are copied in fixed-size chunks, so memory use
+    stays flat no matter how large the stems are.
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unsupported archive format: {fmt}")
+
+    repo_path = Path(repo_path)
+    commit_sha = resolve_commit(repo_path, rev)
+    commit_time = int(run_git(repo_path, "show", "-s", "--format=%ct", commit_sha).decode().strip())
+    lfs_dir = git_dir(repo_path)
+    prefix = f"{repo_path.name}_{commit_sha[:7]}/"
+
+    files = 0
+    missing_lfs = []
+    out_path = Path(out_path)
+    tmp_path = out_path.with_name(f".{out_path.name}.partial")
+
+    try:
+        with CatFileBatch(repo_path) as batch, _open_archive(tmp_path, fmt, compression, level) as archive:
+            for mode, obj_type, oid, size, path in list_tree(repo_path, commit_sha):
+                if obj_type != "blob":
+                    continue  # 🚫 Submodules have no content to export
+
+                name = prefix + path
+                if mode == "120000":
+                    target = batch.read(oid).decode("utf-8", "surrogateescape")
+                    if fmt == "tar":
+                        info = tarfile.TarInfo(name)
+                        info.type = tarfile.SYMTYPE
+                        info.linkname = target
+                        info.mtime = commit_time
+                        archive.addfile(info)
+                    else:
+                        archive.writestr(name, target, compresslevel=archive.compresslevel)
+                    files += 1
+                    continue
+
+                file_mode = 0o755 if mode == "100755" else 0o644
+
+                is_set = path.lower().endswith(".als")
+                if size <= LFS_POINTER_MAX_SIZE:
+                    data = batch.read(oid)
+                    pointer = parse_lfs_pointer(data)
+                    if pointer:
+                        lfs_oid, lfs_size = pointer
+                        lfs_file = lfs_object_path(lfs_dir, lfs_oid)
+                        if lfs_file.exists():
+                            with open(lfs_file, "rb") as f:
+                                _add_entry(archive, fmt, name, file_mode, lfs_size, commit_time, f)
+                            files += 1
+                            continue
+                        missing_lfs.append(path)
+                    elif is_set:
+                        data = smudge_als(data)   # stored as plain XML by the .als filter → gzip for Live
+                    _add_entry(archive, fmt, name, file_mode, len(data), commit_time, io.BytesIO(data))
+                elif is_set:
+                    # Tar needs the size up front, so the re-gzipped set is spooled first, a chunk at a time
+                    _, reader = batch.open(oid)
+                    with tempfile.SpooledTemporaryFile(max_size=ALS_SPOOL_MAX_BYTES) as spool:
+                        smudge_als_stream(reader, spool)
+                        spool_size = spool.tell()
+                        spool.seek(0)
+                        _add_entry(archive, fmt, name, file_mode, spool_size, commit_time, spool)
+                else:
+                    _, reader = batch.open(oid)
+                    _add_entry(archive, fmt, name, file_mode, size, commit_time, reader)
+                files += 1
+        os.replace(tmp_path, out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)    # only still there if the export failed
+
+    if missing_lfs:
+        print(f"[WARN] {len(missing_lfs)} LFS objects not in the local store — exported as pointers")
+    print(f"[DEBUG] Exported {commit_sha[:7]} → {out_path} ({files} files)")
+    return {"status": "ok", "path": out_path, "sha": commit_sha, "files": files, "missing_lfs": missing_lfs}
+
+
+def archive_name(repo_path, rev, fmt="tar", compression="gz"):
+    safe_rev = "".join(c if c.isalnum() or c in "-_." else "_" for c in rev)
+    suffix = ".zip" if fmt == "zip" else ".tar" if compression == "none" else f".tar.{compression}"
+    return f"{Path(repo_path).name}_{safe_rev}{suffix}"
+
+
+def export_commit_archives(repo_path, revs, out_dir, max_workers=4, **archive_opts):
+    """
+    Exports several snapshots in parallel (e.g. a dozen tagged mixes).
+    Each worker has its own `cat-file` process, so memory stays bounded per worker.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    fmt = archive_opts.get("fmt", "tar")
+    compression = archive_opts.get("compression", "gz")
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                export_commit_archive, repo_path, rev,
+                out_dir / archive_name(repo_path, rev, fmt, compression), **archive_opts
+            ): rev
+            for rev in revs
+        }
+        for future in as_completed(futures):
+            rev = futures[future]
+            try:
+                results[rev] = future.result()
+            except Exception as e:
+                print(f"[ERROR] Export of {rev} failed: {e}")
+                results[rev] = {"status": "error", "message": str(e)}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export DAW Git snapshots as archives without checking them out.")
+    parser.add_argument("repo", help="Path to the project repository")
+    parser.add_argument("revs", nargs="+", help="Snapshot SHAs, tags, or version lines to export")
+    parser.add_argument("--out", default=".", help="Output folder")
+    parser.add_argument("--format", dest="fmt", choices=ARCHIVE_FORMATS, default="tar")
+    parser.add_argument("--compression", choices=TAR_COMPRESSIONS, default="gz",
+                        help="Tar compression, or 'none' for a stored zip")
+    parser.add_argument("--level", type=int, default=6, help="Compression level")
+    parser.add_argument("--jobs", type=int, default=4, help="Parallel exports")
+    args = parser.parse_args(argv)
+
+    results = export_commit_archives(
+        args.repo, args.revs, args.out, max_workers=args.jobs,
+        fmt=args.fmt, compression=args.compression, level=args.level
+    )
+    failed = [rev for rev, r in results.items() if r["status"] != "ok"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# snapshot_import.py
+import os
+import shutil
+import hashlib
+from pathlib import Path
+from contextlib import ExitStack
+
+from git import Repo, InvalidGitRepositoryError, NoSuchPathError
+
+from git_objects import (
+    CatFileBatch,
+    git_blob_hash,
+    path_attributes,
+    run_git,
+    parse_lfs_pointer
+)
+
+
+IMPORT_SKIP_NAMES = {".git"}
+
+
+def _iter_source_files(src_folder):
+    for root, dirs, files in os.walk(src_folder):
+        dirs[:] = [d for d in dirs if d not in IMPORT_SKIP_NAMES]
+        for name in files:
+            full = Path(root) / name
+            yield full.relative_to(src_folder).as_posix(), full
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _index_stat_matches(entry, st, index_mtime_ns):
+    """
+    True if the working file still matches what the index recorded, so the index
+    blob SHA can stand in for the file's content without reading it. Files touched
+    at or after the index was written are "racily clean" and never trusted.
+    """
+    if entry.size != st.st_size or st.st_mtime_ns >= index_mtime_ns:
+        return False
+    sec, nsec = entry.mtime
+    return sec == st.st_mtime_ns // 10**9 and nsec in (0, st.st_mtime_ns % 10**9)
+
+
+def _converted_paths(project_path, paths):
+    """
+    Maps paths Git stores in a different form than the working file to the reason:
+    a clean filter's name (`lfs`, the .als gunzip filter, …) or `eol` for line-ending
+    conversion. The index SHA of such a file is not the raw hash of its bytes.
+    """
+    autocrlf = run_git(project_path, "config", "--get", "core.autocrlf", check=False).decode().strip()
+    converted = {}
+    for path, attrs in path_attributes(project_path, paths, "filter", "text", "eol").items():
+        if attrs.get("filter") not in (None, "unset"):
+            converted[path] = attrs["filter"]
+        elif attrs.get("text") != "unset" and (
+            "text" in attrs or "eol" in attrs or autocrlf in ("true", "input")
+        ):
+            converted[path] = "eol"
+    return converted
+
+
+def import_changed_files(project_path, src_folder):
+    """
+    📂 Copies a snapshot folder into the project, skipping files the project already has.
+
+    Each source file is compared with the tracked file by size and mtime first, then by
+    content hash — reusing the blob SHA already stored in the Git index when the working
+    file is clean, and the LFS pointer's SHA-256 for LFS-tracked files. Files Git stores
+    converted (another clean filter such as the .als gunzip one, or line endings) are
+    hashed against the project's working copy instead.
+    Only new or different files are copied, so Git does not need to rehash untouched samples.
+    """
+    project_path = Path(project_path)
+    src_folder = Path(src_folder)
+
+    try:
+        repo = Repo(project_path)
+        entries = {entry.path: entry for (path, stage), entry in repo.index.entries.items() if stage == 0}
+        index_file = Path(repo.git_dir) / "index"
+        index_mtime_ns = index_file.stat().st_mtime_ns if index_file.exists() else 0
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        print("[DEBUG] Import target has no Git index — comparing file contents directly")
+        entries, index_mtime_ns = {}, 0
+
+    added, changed, unchanged = [], [], []
+    to_hash = []
+
+    # 1️⃣ Cheap pass: existence, size, and mtime
+    for rel_path, src in _iter_source_files(src_folder):
+        dst = project_path / rel_path
+        if not dst.exists():
+            added.append(rel_path)
+            continue
+
+        src_st, dst_st = src.stat(), dst.stat()
+        if src_st.st_size != dst_st.st_size:
+            changed.append(rel_path)
+        elif src_st.st_mtime_ns == dst_st.st_mtime_ns:
+            unchanged.append(rel_path)
+        else:
+            to_hash.append((rel_path, src, dst, dst_st))
+
+    # 2️⃣ Content pass: only for same-size files with different mtimes
+    tracked = [p for p, *_ in to_hash if p in entries]
+    converted = _converted_paths(project_path, tracked)
+    with ExitStack() as stack:
+        batch = stack.enter_context(CatFileBatch(project_path)) if "lfs" in converted.values() else None
+        for rel_path, src, dst, dst_st in to_hash:
+            entry = entries.get(rel_path)
+            trusted = (
+                entry is not None
+                and converted.get(rel_path) in (None, "lfs")
+                and _index_stat_matches(entry, dst_st, index_mtime_ns)
+            )
+
+            pointer = None
+            if trusted and converted.get(rel_path) == "lfs":
+                pointer = parse_lfs_pointer(batch.read(entry.hexsha) or b"")
+
+            if pointer:
+                same = _sha256_file(src) == pointer[0]
+            elif trusted:
+                same = git_blob_hash(src) == entry.hexsha
+            else:
+                same = git_blob_hash(src) == git_blob_hash(dst)
+
+            (unchanged if same else changed).append(rel_path)
+
+    # 3️⃣ Copy only what differs
+    bytes_copied = 0
+    for rel_path in added + changed:
+        src = src_folder / rel_path
+        dst = project_path / rel_path
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, dst)
+        bytes_copied += src.stat().st_size
+
+    print(f"[DEBUG] Import: {len(added)} added, {len(changed)} changed, {len(unchanged)} unchanged")
+    return {
+        "status": "ok",
+        "added": len(added),
+        "changed": len(changed),
+        "unchanged": len(unchanged),
+        "bytes_copied": bytes_copied,
+        "files": {"added": added, "changed": changed},
+    }
@@ -150,6 +150,38 @@ def temp_repo_factory():
             print(f"[CLEANUP] Error during cleanup in {path}: {e}")
 
 
+@pytest.fixture
+def git_repo(tmp_path):
+    """Empty repo in `tmp_path` on `main`, with its own committer identity so no global git config is needed."""
+    repo = Repo.init(tmp_path, initial_branch="main")
+    with repo.config_writer() as cw:
+        cw.set_value("user", "name", "DAW Git Tests")
+        cw.set_value("user", "email", "tests@example.com")
+    return repo
+
+
+@pytest.fixture
+def commit_files(git_repo):
+    """
+    `commit_files({path: text or bytes}, message)` writes the files into
+    `git_repo`, stages exactly them and returns the new commit's SHA.
+    """
+    root = Path(git_repo.working_tree_dir)
+
+    def _commit(files, message):
+        for rel, content in files.items():
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content)
+        git_repo.index.add(list(files))
+        return git_repo.index.commit(message).hexsha
+
+    return _commit
+
+
 @pytest.fixture(autouse=True)
 def auto_patch_dialogs(monkeypatch):
     monkeypatch.setattr(QMessageBox, "exec", lambda self: QMessageBox.StandardButton.Ok)
@@ -0,0 +1,123 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import io
+import gzip
+import tracemalloc
+
+import als_analyzer
+from als_analyzer import AlsAnalyzer, summarize_als
+
+
+def live_set(tempo=120, tracks=("AudioTrack", "MidiTrack"), samples=("Samples/Imported/kick.wav",), extra=""):
+    track_xml = ""
+    for i, kind in enumerate(tracks):
+        sample_xml = "".join(
+            f'<SampleRef><FileRef><RelativePath Value="{s}"/><Path Value="/Users/me/{s}"/></FileRef></SampleRef>'
+            for s in samples
+        ) if kind == "AudioTrack" else ""
+        track_xml += (
+            f'<{kind} Id="{i}"><DeviceChain><DeviceChain><Devices>'
+            f'<Eq8 Id="1"/><PluginDevice Id="2"><PluginDesc><VstPluginInfo><PlugName Value="Serum"/>'
+            f'</VstPluginInfo></PluginDesc></PluginDevice>'
+            f'</Devices></DeviceChain></DeviceChain>{sample_xml}</{kind}>'
+        )
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?><Ableton MajorVersion="5"><LiveSet>'
+        f'<Tracks>{track_xml}<ReturnTrack Id="9"/></Tracks>'
+        '<MasterTrack><DeviceChain><Mixer><Tempo><Manual Value="%s"/></Tempo>'
+        '<TimeSignature><TimeSignatures><RemoteableTimeSignature><Numerator Value="7"/>'
+        '<Denominator Value="8"/></RemoteableTimeSignature></TimeSignatures></TimeSignature>'
+        '</Mixer></DeviceChain></MasterTrack>%s</LiveSet></Ableton>'
+    ) % (tempo, extra)
+    return gzip.compress(xml.encode(), mtime=0)
+
+
+def test_summary_fields():
+    summary = summarize_als(io.BytesIO(live_set(tempo=128.5)))
+
+    assert summary["tempo"] == 128.5
+    assert summary["time_signature"] == "7/8"
+    assert summary["tracks"] == {"audio": 1, "midi": 1, "group": 0}
+    assert summary["track_count"] == 2
+    assert summary["returns"] == 1
+    assert summary["devices"] == ["Eq8"]
+    assert summary["plugins"] == ["Serum"]
+    assert summary["samples"] == ["Samples/Imported/kick.wav"]
+
+
+def test_memory_stays_bounded_on_large_sets():
+    data = live_set(tracks=["AudioTrack"] * 5000, samples=[f"Samples/s{i}.wav" for i in range(5)])
+    tracemalloc.start()
+    summary = summarize_als(io.BytesIO(data))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert summary["track_count"] == 5000
+    assert peak < 5 * 1024 ** 2
+
+
+def test_each_revision_is_parsed_once(tmp_path, monkeypatch, git_repo, commit_files):
+    blobs = []
+    for tempo in (100, 100, 140):
+        sha = commit_files({"song.als": live_set(tempo=tempo), "notes.txt": str(len(blobs))}, f"Tempo {tempo}")
+        blobs.append((git_repo.commit(sha).tree / "song.als").hexsha)
+    assert blobs[0] == blobs[1] != blobs[2]
+
+    calls = []
+    real = als_analyzer.summarize_als
+    monkeypatch.setattr(als_analyzer, "summarize_als", lambda f: calls.append(1) or real(f))
+
+    summaries = AlsAnalyzer(tmp_path).summaries(blobs)
+    assert len(calls) == 2
+    assert summaries[blobs[2]]["tempo"] == 140
+
+    # A fresh analyzer reads the on-disk cache instead of re-parsing
+    assert AlsAnalyzer(tmp_path).summaries(blobs)[blobs[0]]["tempo"] == 100
+    assert len(calls) == 2
+    assert not git_repo.is_dirty(untracked_files=True)
+
+
+def test_history_table_shows_tempo_and_tracks(tmp_path, qtbot, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    commit_files({"song.als": live_set(tempo=92)}, "Groove")
+
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    app.load_commit_history()
+
+    table = app.snapshot_page.commit_table
+    assert table.item(0, 10).text() == "92"
+    assert table.item(0, 11).text() == "2"
+    assert "Serum" in table.item(0, 10).toolTip()
+
+
+def test_new_sets_are_parsed_off_the_gui_thread(tmp_path, qtbot, monkeypatch, commit_files):
+    from PyQt6.QtWidgets import QTableWidgetItem
+    from daw_git_gui import DAWGitApp
+
+    commit_files({"song.als": live_set(tempo=92)}, "Groove")
+
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    monkeypatch.setenv("DAWGIT_TEST_MODE", "0")
+    sha = commit_files({"song.als": live_set(tempo=96)}, "Faster")
+
+    # Not parsed yet: the row renders without a summary and a worker picks the set up
+    assert app._als_summaries_for([sha]) == {sha: None}
+    app._als_futures[0].result(timeout=10)
+
+    refreshed = []
+    monkeypatch.setattr(app, "refresh_commit_rows", lambda shas: refreshed.append(shas))
+    table = app.snapshot_page.commit_table
+    table.setRowCount(1)
+    item = QTableWidgetItem(sha[:7])
+    item.setToolTip(sha)
+    table.setItem(0, 2, item)
+    app._poll_als_summaries()
+
+    assert refreshed == [[sha]] and not app._als_poll_timer.isActive()
+    assert app._als_summaries_for([sha])[sha]["tempo"] == 96
+    assert app._als_futures == []
+    app.als_analyzer.shutdown()
@@ -0,0 +1,131 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import gzip
+from PyQt6.QtCore import QItemSelectionModel
+
+import als_diff
+from als_analyzer import AlsAnalyzer
+from als_diff import AlsDiffer
+
+
+def track(kind, track_id, name, devices=(), clips=(), samples=()):
+    device_xml = "".join(f'<{d} Id="0"/>' for d in devices)
+    clip_xml = "".join(
+        f'<AudioClip Id="{i}" Time="{t}"><Name Value="{c}"/>'
+        + "".join(f'<SampleRef><FileRef><RelativePath Value="{s}"/></FileRef></SampleRef>' for s in samples)
+        + '</AudioClip>'
+        for i, (c, t) in enumerate(clips)
+    )
+    return (
+        f'<{kind} Id="{track_id}"><Name><EffectiveName Value="{name}"/><UserName Value=""/></Name>'
+        f'<DeviceChain><DeviceChain><Devices>{device_xml}</Devices></DeviceChain>'
+        f'<MainSequencer><Sample><ArrangerAutomation><Events>{clip_xml}</Events>'
+        f'</ArrangerAutomation></Sample></MainSequencer></DeviceChain></{kind}>'
+    )
+
+
+def live_set(tempo, *tracks):
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?><Ableton><LiveSet>'
+        f'<Tracks>{"".join(tracks)}</Tracks>'
+        f'<MasterTrack><DeviceChain><Mixer><Tempo><Manual Value="{tempo}"/></Tempo></Mixer>'
+        '</DeviceChain></MasterTrack></LiveSet></Ableton>'
+    )
+    return gzip.compress(xml.encode(), mtime=0)
+
+
+TAKE_1 = live_set(
+    120,
+    track("AudioTrack", 8, "Drums", ["Eq8"], [("Beat", 0)], ["Samples/kick.wav"]),
+    track("MidiTrack", 9, "Bass", ["Operator"]),
+)
+TAKE_2 = live_set(
+    124,
+    track("AudioTrack", 8, "Drums", ["Eq8", "Compressor2"], [("Beat", 0), ("Fill", 16)], ["Samples/snare.wav"]),
+    track("AudioTrack", 10, "Vox"),
+)
+
+
+def commit_takes(repo, commit, *takes):
+    return repo, [repo.commit(commit({"song.als": data}, f"Take {i}")) for i, data in enumerate(takes)]
+
+
+def test_diff_reports_structural_changes(tmp_path, git_repo, commit_files):
+    repo, (a, b) = commit_takes(git_repo, commit_files, TAKE_1, TAKE_2)
+    differ = AlsDiffer(AlsAnalyzer(tmp_path))
+    diff = differ.diff((a.tree / "song.als").hexsha, (b.tree / "song.als").hexsha)
+
+    assert diff["tempo"] == [120, 124]
+    assert diff["tracks_added"] == ["Vox"]
+    assert diff["tracks_removed"] == ["Bass"]
+    drums = diff["tracks_changed"][0]
+    assert drums["track"] == "Drums"
+    assert drums["devices_added"] == ["Compressor2"]
+    assert drums["clips_added"] == ["Fill @ 16"]
+    assert drums["samples_added"] == ["Samples/snare.wav"]
+    assert drums["samples_removed"] == ["Samples/kick.wav"]
+    assert diff["samples_removed"] == ["Samples/kick.wav"]
+    assert not repo.is_dirty(untracked_files=True)
+
+
+def test_diff_is_cached_per_blob_pair(tmp_path, monkeypatch, git_repo, commit_files):
+    _, (a, b) = commit_takes(git_repo, commit_files, TAKE_1, TAKE_2)
+    blobs = ((a.tree / "song.als").hexsha, (b.tree / "song.als").hexsha)
+    AlsDiffer(AlsAnalyzer(tmp_path)).diff(*blobs)
+
+    calls = []
+    real = als_diff.diff_summaries
+    monkeypatch.setattr(als_diff, "diff_summaries", lambda *args: calls.append(args) or real(*args))
+
+    fresh = AlsDiffer(AlsAnalyzer(tmp_path))
+    assert fresh.diff(*blobs)["tempo"] == [120, 124]
+    fresh.diff(*reversed(blobs))
+    assert len(calls) == 1   # only the reverse direction was new
+
+
+def test_selecting_two_takes_shows_inline_diff(tmp_path, qtbot, git_repo, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    commit_takes(git_repo, commit_files, TAKE_1, TAKE_2)
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    app.load_commit_history()
+
+    page = app.snapshot_page
+    table = page.commit_table
+    table.selectRow(0)
+    assert page.als_diff_view.isHidden()
+
+    table.selectionModel().select(
+        table.model().index(1, 0),
+        QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows,
+    )
+    assert not page.als_diff_view.isHidden()
+    text = page.als_diff_view.toPlainText()
+    assert "Vox" in text and "Compressor2" in text and "120 → 124" in text
+
+
+def test_comparison_selection_targets_the_current_take(tmp_path, qtbot, git_repo, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    commit_takes(git_repo, commit_files, TAKE_1, TAKE_2)
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    app.load_commit_history()
+
+    page = app.snapshot_page
+    table = page.commit_table
+    table.selectRow(1)
+    table.selectionModel().setCurrentIndex(
+        table.model().index(0, 0),
+        QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows,
+    )
+    assert len(table.selectionModel().selectedRows()) == 2
+    assert not page.tag_custom_btn.isEnabled() and not page.load_snapshot_btn.isEnabled()
+
+    app._set_commit_id_from_selected_row()
+    assert app.current_commit_id == table.item(0, 2).toolTip()
+
+    table.selectRow(1)
+    assert page.tag_custom_btn.isEnabled() and page.load_snapshot_btn.isEnabled()
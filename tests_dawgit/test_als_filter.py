@@ -0,0 +1,172 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import sys
+import gzip
+import shlex
+import tarfile
+import tracemalloc
+import subprocess
+from pathlib import Path
+
+from als_analyzer import AlsAnalyzer
+import als_filter
+from als_filter import ALS_FILTER_NAME, enable_als_filter, filter_command, migrate_history
+from metadata_store import RoleStore
+from role_notes import read_role_notes, set_role_note
+from snapshot_export import export_commit_archive
+
+
+def live_set(take, clips=400):
+    # Random-looking ids so gzip can't shrink them away — like real device/automation data
+    body = "".join(
+        f'<AudioClip Id="{i}"><Name Value="{os.urandom(12).hex() if i == take else i}"/>'
+        f'<Warp Value="{(i * 7919) ** 3:x}{i * 104729:x}"/></AudioClip>\n'
+        for i in range(clips)
+    )
+    xml = f'<?xml version="1.0" encoding="UTF-8"?>\n<Ableton><LiveSet>\n{body}</LiveSet></Ableton>\n'
+    return gzip.compress(xml.encode())
+
+
+def git(tmp_path, *args):
+    return subprocess.run(["git", *args], cwd=tmp_path, capture_output=True, check=True).stdout
+
+
+def test_sets_are_stored_as_xml_and_checked_out_gzipped(tmp_path, git_repo):
+    enable_als_filter(tmp_path)
+    data = live_set(1)
+    (tmp_path / "song.als").write_bytes(data)
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-qm", "Take 1")
+
+    assert git(tmp_path, "cat-file", "-p", "HEAD:song.als").startswith(b"<?xml")
+    assert not git_repo.is_dirty(untracked_files=True)
+    blob = (git_repo.head.commit.tree / "song.als").hexsha
+    assert "error" not in AlsAnalyzer(tmp_path).summaries([blob])[blob]
+
+    (tmp_path / "song.als").unlink()
+    git(tmp_path, "checkout", "--", "song.als")
+    restored = (tmp_path / "song.als").read_bytes()
+    assert restored[:2] == b"\x1f\x8b"
+    assert gzip.decompress(restored) == gzip.decompress(data)
+
+    out = export_commit_archive(tmp_path, "HEAD", tmp_path.parent / "take.tar.gz")
+    with tarfile.open(out["path"]) as tar:
+        member = next(m for m in tar.getmembers() if m.name.endswith("song.als"))
+        assert gzip.decompress(tar.extractfile(member).read()) == gzip.decompress(data)
+
+
+def test_large_sets_export_without_loading_the_blob(tmp_path, git_repo):
+    enable_als_filter(tmp_path)
+    data = live_set(1, clips=200_000)
+    assert len(gzip.decompress(data)) > 16 * 1024 ** 2
+    (tmp_path / "song.als").write_bytes(data)
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-qm", "Big set")
+
+    tracemalloc.start()
+    out = export_commit_archive(tmp_path, "HEAD", tmp_path.parent / "big.tar", compression="none")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < 12 * 1024 ** 2
+    with tarfile.open(out["path"]) as tar:
+        member = next(m for m in tar.getmembers() if m.name.endswith("song.als"))
+        assert gzip.decompress(tar.extractfile(member).read()) == gzip.decompress(data)
+
+
+def test_windows_line_endings_survive_the_round_trip(tmp_path, git_repo):
+    enable_als_filter(tmp_path)
+    xml = gzip.decompress(live_set(1)).replace(b"\n", b"\r\n")
+    (tmp_path / "song.als").write_bytes(gzip.compress(xml))
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-qm", "Saved on Windows")
+
+    assert git(tmp_path, "cat-file", "-p", "HEAD:song.als") == xml
+    (tmp_path / "song.als").unlink()
+    git(tmp_path, "checkout", "--", "song.als")
+    assert gzip.decompress((tmp_path / "song.als").read_bytes()) == xml
+
+
+def test_packaged_app_runs_the_filter_itself(tmp_path, monkeypatch, git_repo):
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(sys, "executable", "/Applications/DAW Git.app/Contents/MacOS/DAW Git")
+    assert filter_command() == "'/Applications/DAW Git.app/Contents/MacOS/DAW Git' als-filter process"
+    monkeypatch.undo()
+
+    # What the packaged binary does with those arguments: the GUI script's entry point, no window
+    gui_script = Path(als_filter.__file__).with_name("daw_git_gui.py")
+    monkeypatch.setattr(als_filter, "filter_command",
+                        lambda: f"{shlex.quote(sys.executable)} {shlex.quote(str(gui_script))} als-filter process")
+    enable_als_filter(tmp_path)
+    assert git(tmp_path, "config", f"filter.{ALS_FILTER_NAME}.process").decode().endswith("als-filter process\n")
+    data = live_set(1)
+    (tmp_path / "song.als").write_bytes(data)
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-qm", "Take 1")
+
+    assert git(tmp_path, "cat-file", "-p", "HEAD:song.als").startswith(b"<?xml")
+    assert not git_repo.is_dirty(untracked_files=True)
+
+
+def test_migration_rewrites_history_and_shrinks_the_repo(tmp_path, git_repo):
+    (tmp_path / ".gitattributes").write_text("*.als filter=lfs diff=lfs merge=lfs -text\n")
+    for take in range(6):
+        (tmp_path / "song.als").write_bytes(live_set(take))
+        git_repo.index.add([".gitattributes", "song.als"])
+        git_repo.index.commit(f"Take {take}")
+        if take == 2:
+            git_repo.create_tag("main-mix", message="Main mix")
+    git(tmp_path, "gc", "-q")
+
+    result = migrate_history(tmp_path)
+
+    assert result["status"] == "ok"
+    assert result["commits"] == 6
+    assert result["after"]["packed_bytes"] < result["before"]["packed_bytes"] / 2
+    assert [c.message for c in git_repo.iter_commits("main")][::-1] == [f"Take {i}" for i in range(6)]
+    for commit in git_repo.iter_commits("main"):
+        assert (commit.tree / "song.als").data_stream.read().startswith(b"<?xml")
+    assert git_repo.tags["main-mix"].commit.message == "Take 2"
+    assert git_repo.tags["main-mix"].tag.message == "Main mix"
+    assert "filter=dawgit-als" in (tmp_path / ".gitattributes").read_text()
+    assert not git_repo.is_dirty(untracked_files=True)
+    assert os.path.exists(result["bundle"])
+
+
+def test_migration_moves_roles_and_keeps_stashes(tmp_path, git_repo):
+    takes = []
+    for take in range(3):
+        (tmp_path / "song.als").write_bytes(live_set(take))
+        git_repo.index.add(["song.als"])
+        takes.append(git_repo.index.commit(f"Take {take}").hexsha)
+    git_repo.create_tag("temp-mix", ref=takes[1])      # lightweight tag: no reflog of its own
+    set_role_note(tmp_path, takes[1], "main_mix")
+    store = RoleStore(tmp_path)
+    store.set(takes[2], "alt_mixdown")
+    wip = live_set(9)
+    (tmp_path / "song.als").write_bytes(wip)
+    git(tmp_path, "stash", "push", "-q", "-m", "Work in progress")
+    (tmp_path / "song.als").write_bytes(live_set(10))
+    git(tmp_path, "stash", "push", "-q", "-m", "Another idea")
+    stashed = git(tmp_path, "rev-parse", "refs/stash").strip()
+
+    result = migrate_history(tmp_path)
+
+    assert result["status"] == "ok" and result["roles"] == 1
+    new = {c.message: c.hexsha for c in git_repo.iter_commits("main")}
+    assert read_role_notes(tmp_path) == {new["Take 1"]: "main_mix"}
+    assert RoleStore(tmp_path).roles == {new["Take 2"]: "alt_mixdown"}
+    assert git(tmp_path, "rev-parse", "refs/stash").strip() == stashed
+    assert len(git(tmp_path, "stash", "list").splitlines()) == 2
+    assert gzip.decompress(git(tmp_path, "cat-file", "blob", "stash@{1}:song.als")) == gzip.decompress(wip)
+
+
+def test_migration_refuses_unsaved_changes(tmp_path, git_repo):
+    (tmp_path / "song.als").write_bytes(live_set(0))
+    git_repo.index.add(["song.als"])
+    git_repo.index.commit("Take 0")
+    (tmp_path / "song.als").write_bytes(live_set(1))
+
+    assert migrate_history(tmp_path)["status"] == "error"
+    assert git_repo.head.commit.message == "Take 0"
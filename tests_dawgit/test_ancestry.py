@@ -0,0 +1,87 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+from ancestry import Ancestry, CommitGraph, graph_files, write_commit_graph
+
+
+def make_repo(repo, commit_files):
+    """main: c0 - c1 - c2 - merge, side: c1 - s1 (merged), lone: an orphan root."""
+    def commit(name, text):
+        return commit_files({name: text}, f"Auto snapshot: {name}")
+
+    shas = {"c0": commit("song.als", "0"), "c1": commit("Samples/kick.wav", "1")}
+    repo.git.checkout("-b", "side")
+    shas["s1"] = commit("Samples/snäre.wav", "s")
+    repo.git.checkout("main")
+    shas["c2"] = commit("song.als", "2")
+    repo.git.merge("side", "--no-ff", "-m", "Merge side")
+    shas["merge"] = repo.head.commit.hexsha
+    repo.git.checkout("--orphan", "lone")
+    shas["lone"] = commit("other.als", "x")
+    repo.git.checkout("-f", "main")
+    return repo, shas
+
+
+def test_ancestry_answers_match_git(tmp_path, git_repo, commit_files):
+    repo, shas = make_repo(git_repo, commit_files)
+    ancestry = Ancestry(tmp_path)
+
+    # No graph yet: git answers, and nothing is written on the caller's thread
+    assert ancestry.is_ancestor(shas["s1"], "main") and not ancestry.is_ancestor(shas["c2"], "side")
+    assert ancestry.merge_base("main", "side") == shas["s1"]
+    assert not graph_files(tmp_path)
+
+    write_commit_graph(tmp_path)
+    assert ancestry.is_ancestor(shas["c0"], shas["merge"])
+    assert ancestry.is_ancestor(shas["s1"], "main")
+    assert not ancestry.is_ancestor(shas["c2"], "side")
+    assert not ancestry.is_ancestor(shas["lone"], "main")
+    assert ancestry.graph is not None
+
+    assert ancestry.merge_base("main", "side") == repo.git.merge_base("main", "side") == shas["s1"]
+    assert ancestry.merge_base(shas["c2"], shas["s1"]) == shas["c1"]
+    assert ancestry.merge_base("main", "lone") is None
+
+    reachable = ancestry.reachable_from("main")
+    assert len(reachable) == len(list(repo.iter_commits("main")))
+    assert ancestry.contains("main", shas["s1"]) and not ancestry.contains("main", shas["lone"])
+    assert not ancestry.contains("side", shas["c2"])
+
+
+def test_new_commits_extend_the_split_graph(tmp_path, git_repo, commit_files):
+    repo, shas = make_repo(git_repo, commit_files)
+    write_commit_graph(tmp_path)
+    ancestry = Ancestry(tmp_path)
+    assert ancestry.contains("main", shas["c2"])
+    layers = len(graph_files(tmp_path))
+
+    (tmp_path / "song.als").write_text("3")
+    repo.index.add(["song.als"])
+    new = repo.index.commit("Auto snapshot: later").hexsha
+
+    # Not in the graph until maintenance writes it — answered by git meanwhile
+    assert ancestry.contains("HEAD", new) and ancestry.is_ancestor(shas["merge"], new)
+    assert not ancestry.contains(shas["merge"], new)
+    assert ancestry.merge_base(new, "side") == shas["s1"]
+    assert len(graph_files(tmp_path)) == layers
+
+    write_commit_graph(tmp_path)
+    assert ancestry.contains("HEAD", new) and ancestry.is_ancestor(shas["merge"], new)
+    assert len(graph_files(tmp_path)) == layers + 1
+    assert ancestry.graph.generation(ancestry.graph.position(new)) == \
+        ancestry.graph.generation(ancestry.graph.position(shas["merge"])) + 1
+
+
+def test_bloom_filters_never_miss_a_changed_path(tmp_path, git_repo, commit_files):
+    repo, shas = make_repo(git_repo, commit_files)
+    write_commit_graph(tmp_path)
+    graph = CommitGraph(graph_files(tmp_path))
+    for commit in repo.iter_commits("--all"):
+        if len(commit.parents) != 1:
+            continue
+        pos = graph.position(commit.hexsha)
+        changed = repo.git.diff_tree("-z", "--no-commit-id", "--name-only", "-r", commit.hexsha)
+        for path in filter(None, changed.split("\0")):
+            assert graph.may_have_changed(pos, path), (commit.message, path)
+            if "/" in path:
+                assert graph.may_have_changed(pos, path.rsplit("/", 1)[0])   # parent folders are added too
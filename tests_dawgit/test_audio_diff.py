@@ -0,0 +1,89 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import io
+import math
+import random
+import struct
+import wave
+
+from audio_diff import AudioDiffer, analyze_audio, comparable_audio, diff_features
+from ui_strings import AUDIO_DIFF_SUMMARY
+
+RATE = 22050
+
+
+def music(seconds=6, seed=1):
+    """Deterministic 'mix': a tone with an irregular envelope (a new level every 0.1s) plus noise."""
+    rng = random.Random(seed)
+    levels = [rng.uniform(0.1, 1.0) for _ in range(int(seconds * 10) + 1)]
+    return [int(8000 * math.sin(i * 0.07) * levels[i * 10 // RATE]) + rng.randint(-400, 400)
+            for i in range(int(RATE * seconds))]
+
+
+def wav_bytes(samples):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    return buf.getvalue()
+
+
+def louder(samples, start, end):
+    return [max(-32767, min(32767, s * 2)) if start * RATE <= i < end * RATE else s for i, s in enumerate(samples)]
+
+
+def test_boosted_section_is_found_after_alignment():
+    base = music()
+    shifted = [0] * int(0.25 * RATE) + louder(base, 2, 3.5)
+    diff = diff_features(analyze_audio(io.BytesIO(wav_bytes(base))), analyze_audio(io.BytesIO(wav_bytes(shifted))))
+    assert abs(diff["offset"] - 0.25) < 0.03
+    assert diff["changed"] == [[2.0, 3.5]]
+    assert diff["durations"] == [6.0, 6.25]
+
+    same = diff_features(analyze_audio(io.BytesIO(wav_bytes(base))), analyze_audio(io.BytesIO(wav_bytes(base))))
+    assert same["changed"] == [] and same["offset"] == 0.0 and same["loudness_delta"] == 0.0
+
+
+def test_tone_change_without_level_change():
+    base = music()
+    # Brighter: add a quiet high-frequency component between 1s and 2s
+    bright = [s + (1500 if i % 2 else -1500) if RATE <= i < 2 * RATE else s for i, s in enumerate(base)]
+    diff = diff_features(analyze_audio(io.BytesIO(wav_bytes(base))), analyze_audio(io.BytesIO(wav_bytes(bright))))
+    assert diff["changed"] == [[1.0, 2.0]]
+    assert all(abs(w[0]) < 1.0 for w in diff["windows"])   # not a loudness change
+
+
+def test_comparable_audio_prefers_mixdowns():
+    before = [("Stems/Bass.wav", "a1"), ("Final Mix.wav", "b1"), ("Kick.wav", "c1")]
+    after = [("Stems/Bass.wav", "a2"), ("Final Mix.wav", "b2"), ("Kick.wav", "c1"), ("New.wav", "d1")]
+    assert comparable_audio(before, after) == [("Final Mix.wav", "b1", "b2"), ("Stems/Bass.wav", "a1", "a2")]
+
+
+def test_browser_shows_changed_regions_between_takes(tmp_path, qtbot, git_repo, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    base = music()
+    first = git_repo.commit(commit_files({"song.als": b"als", "Mixdown.wav": wav_bytes(base)}, "Mix 1"))
+    second = git_repo.commit(commit_files({"Mixdown.wav": wav_bytes(louder(base, 4, 5))}, "Mix 2 — louder outro"))
+
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    app.load_commit_history()
+    pairs = app.show_audio_diff(second.hexsha, first.hexsha)
+    assert [p[0] for p in pairs] == ["Mixdown.wav"]
+    blob_a, blob_b = (first.tree / "Mixdown.wav").hexsha, (second.tree / "Mixdown.wav").hexsha
+    assert pairs[0][1:] == (blob_a, blob_b)      # older → newer whatever the selection order
+
+    page = app.snapshot_page
+    assert not page.audio_diff_panel.isHidden()
+    diff = page.audio_diff_strip.diff
+    assert diff["changed"] == [[4.0, 5.0]]
+    assert page.audio_diff_label.text() == AUDIO_DIFF_SUMMARY.format(
+        path="Mixdown.wav", count=1, seconds=1.0, delta=diff["loudness_delta"]
+    )
+    assert (tmp_path / ".dawgit_cache" / "audio_diffs" / f"{blob_a}_{blob_b}.json").exists()
+    assert AudioDiffer(tmp_path).cached(blob_a, blob_b) == diff
+    assert not git_repo.is_dirty(untracked_files=True)
@@ -0,0 +1,114 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import wave
+from pathlib import Path
+
+from audio_index import AudioIndex, format_size
+from ui_strings import AUDIO_TOTALS_MSG
+
+
+def write_wav(path, seconds, rate=44100, channels=2, width=2):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(b"\x00" * int(rate * seconds) * channels * width)
+
+
+def make_takes(repo):
+    """Take 0 has kick + vox, take 1 adds a 48k/24-bit pad and copies the kick."""
+    tmp_path = Path(repo.working_tree_dir)
+    (tmp_path / "song.als").write_bytes(b"als")
+    write_wav(tmp_path / "Samples" / "kick.wav", 0.5)
+    write_wav(tmp_path / "Samples" / "vox.wav", 2.0, channels=1)
+    repo.git.add(A=True)
+    shas = [repo.index.commit("Beat").hexsha]
+
+    write_wav(tmp_path / "Samples" / "pad.wav", 1.0, rate=48000, width=3)
+    (tmp_path / "Samples" / "kick copy.wav").write_bytes((tmp_path / "Samples" / "kick.wav").read_bytes())
+    repo.git.add(A=True)
+    shas.append(repo.index.commit("Add pad").hexsha)
+    return repo, shas
+
+
+def test_totals_per_take_probe_each_file_once(tmp_path, git_repo):
+    repo, shas = make_takes(git_repo)
+    index = AudioIndex(tmp_path, workers=1)
+    assert index.update(shas) == 3           # kick and its copy share one blob
+    assert index.update(shas) == 0           # already queued
+    totals = index.totals(shas)
+    assert totals[shas[1]]["files"] == 4 and totals[shas[1]]["waiting"] == 4
+    index.wait()
+    assert index.collect() == 3
+
+    first, second = index.totals(shas)[shas[0]], index.totals(shas)[shas[1]]
+    assert first["files"] == 2 and first["new"] == 2
+    assert second["files"] == 4 and second["new"] == 1 and second["waiting"] == 0
+    assert second["bytes"] == sum((tmp_path / "Samples" / n).stat().st_size
+                                  for n in ("kick.wav", "kick copy.wav", "vox.wav", "pad.wav"))
+    assert abs(second["duration"] - 4.0) < 0.01
+    assert second["sample_rates"] == [44100, 48000]
+    assert second["bit_depths"] == [16, 24]
+
+    pad = index.asset((repo.commit(shas[1]).tree / "Samples/pad.wav").hexsha)
+    assert (pad["sample_rate"], pad["channels"], pad["bits"]) == (48000, 2, 24)
+    index.close()
+
+    reopened = AudioIndex(tmp_path, workers=1)
+    assert reopened.update(shas) == 0        # persisted in .git/dawgit
+    reopened.close()
+    assert not repo.is_dirty(untracked_files=True)
+
+
+def test_trees_can_be_indexed_off_the_calling_thread(tmp_path, git_repo):
+    _, shas = make_takes(git_repo)
+    index = AudioIndex(tmp_path, workers=1)
+    assert index.update_async(shas) == 2
+    assert index.update_async(shas) == 0     # already with the worker
+    index.wait()
+    assert index.collect() == 2              # both takes indexed, probes queued from here
+    assert index.totals(shas)[shas[1]]["waiting"] == 4
+    assert index.update_async(shas) == 0
+    index.wait()
+    assert index.collect() == 3
+    assert index.totals(shas)[shas[1]]["waiting"] == 0 and not index.pending()
+    index.close()
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(2 * 1024 ** 2) == "2.0 MB"
+    assert format_size(int(2.1 * 1024 ** 3)) == "2.1 GB"
+
+
+def test_history_table_shows_audio_totals(tmp_path, qtbot, git_repo):
+    from daw_git_gui import DAWGitApp
+
+    _, shas = make_takes(git_repo)
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    app.load_commit_history()
+    app.audio_index.wait()
+    app.refresh_commit_rows(shas)
+
+    table = app.snapshot_page.commit_table
+    cells = {table.item(r, 2).toolTip(): table.item(r, 13) for r in range(table.rowCount())}
+    size = format_size(app.audio_index.totals([shas[1]])[shas[1]]["bytes"])
+    assert cells[shas[1]].text() == AUDIO_TOTALS_MSG.format(size=size, count=4, new=1)
+    assert "48 kHz" in cells[shas[1]].toolTip()
+
+
+def test_closing_the_window_stops_audio_workers(tmp_path, qtbot, git_repo):
+    from daw_git_gui import DAWGitApp
+
+    make_takes(git_repo)
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    app.load_commit_history()
+    index = app.audio_index
+
+    app.close()
+    assert app.audio_index is None and app.repo_analytics is None
+    assert index._pool is None and index._tree_pool is None
@@ -0,0 +1,139 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+from auto_snapshot import AutoSnapshotEngine, is_noise
+
+
+def make_project(repo, commit):
+    commit({"song.als": "v1"}, "Initial")
+    return repo
+
+
+def test_noise_patterns():
+    assert is_noise("Samples/kick.wav.asd")
+    assert is_noise("Backup/song [2025-01-01 101010].als")
+    assert is_noise(".DS_Store")
+    assert not is_noise("song.als")
+    assert not is_noise("Samples/kick.wav")
+
+
+def test_save_burst_becomes_one_commit(tmp_path, qtbot, git_repo, commit_files):
+    repo = make_project(git_repo, commit_files)
+    engine = AutoSnapshotEngine(tmp_path, debounce_ms=100, min_interval_s=0)
+    engine.start()
+
+    with qtbot.waitSignal(engine.committed, timeout=5000) as blocker:
+        # Ableton-style save: write a temp file, then rename it over the session
+        for i in range(3):
+            tmp = tmp_path / "song.als.tmp"
+            tmp.write_text(f"v{i + 2}")
+            os.replace(tmp, tmp_path / "song.als")
+            qtbot.wait(20)
+
+    engine.shutdown()
+    assert blocker.args[0]["files"] == ["song.als"]
+    assert len(list(repo.iter_commits())) == 2
+    assert repo.head.commit.message.startswith("Auto snapshot: song.als")
+    assert (tmp_path / "song.als").read_text() == "v4"
+
+
+def test_noise_only_changes_are_skipped(tmp_path, qtbot, git_repo, commit_files):
+    repo = make_project(git_repo, commit_files)
+    engine = AutoSnapshotEngine(tmp_path, debounce_ms=50, min_interval_s=0)
+    (tmp_path / "song.als.asd").write_text("analysis")
+
+    with qtbot.waitSignal(engine.skipped, timeout=5000):
+        engine.notify_saved()
+
+    engine.shutdown()
+    assert len(list(repo.iter_commits())) == 1
+
+
+def test_in_place_writes_inside_a_bundle_are_seen(tmp_path, qtbot, monkeypatch, git_repo, commit_files):
+    make_project(git_repo, commit_files)
+    project_data = tmp_path / "Song.logicx" / "Alternatives" / "000" / "ProjectData"
+    project_data.parent.mkdir(parents=True)
+    project_data.write_bytes(b"take one")
+    engine = AutoSnapshotEngine(tmp_path, debounce_ms=10_000, min_interval_s=0)
+    bundle = tmp_path / "Song.logicx"
+    before = engine._signature(bundle)
+
+    # Rewritten in place: the only event is for some other folder of the bundle
+    with open(project_data, "r+b") as f:
+        f.write(b"take two, longer")
+    engine._on_fs_event(str(bundle))
+    assert engine._signatures[bundle] != before
+
+    # Still growing when the debounce ends → wait again instead of committing
+    commits = []
+    monkeypatch.setattr(engine, "commit_now", lambda: commits.append(1))
+    with open(project_data, "ab") as f:
+        f.write(b" and longer")
+    engine._on_quiet()
+    assert commits == []
+    engine._on_quiet()
+    assert commits == [1]
+    engine.shutdown()
+
+
+def test_detached_head_and_busy_repo_never_commit(tmp_path, qtbot, monkeypatch, git_repo, commit_files):
+    import auto_snapshot
+    from git_objects import repo_lock
+
+    monkeypatch.setattr(auto_snapshot, "AUTO_SNAPSHOT_LOCK_WAIT_S", 0.1)
+    repo = make_project(git_repo, commit_files)
+    engine = AutoSnapshotEngine(tmp_path, debounce_ms=50, min_interval_s=0)
+    (tmp_path / "song.als").write_text("v2")
+    repo.git.checkout("--detach")
+
+    with qtbot.waitSignal(engine.skipped, timeout=5000):
+        engine.notify_saved()
+    assert repo.head.is_detached and len(list(repo.iter_commits("--all"))) == 1
+
+    repo.git.checkout("main")
+    lock = repo_lock(tmp_path)
+    lock.acquire()      # a GUI git action is running
+    try:
+        with qtbot.waitSignal(engine.skipped, timeout=10000) as blocker:
+            engine.notify_saved()
+        assert blocker.args[0] == "Another git action is running."
+    finally:
+        lock.release()
+    with qtbot.waitSignal(engine.committed, timeout=5000):   # retried once the repo is free
+        pass
+    engine.shutdown()
+    assert len(list(repo.iter_commits())) == 2
+
+
+def test_minimum_interval_defers_the_next_commit(tmp_path, qtbot, git_repo, commit_files):
+    make_project(git_repo, commit_files)
+    engine = AutoSnapshotEngine(tmp_path, debounce_ms=50, min_interval_s=60)
+
+    (tmp_path / "song.als").write_text("v2")
+    with qtbot.waitSignal(engine.committed, timeout=5000):
+        engine.notify_saved()
+
+    (tmp_path / "song.als").write_text("v3")
+    engine.notify_saved()
+    qtbot.wait(200)
+
+    # Debounce has passed, but the next snapshot waits out the interval
+    assert engine._timer.isActive()
+    assert engine._timer.remainingTime() > 50_000
+    engine.shutdown()
+
+
+def test_auto_save_toggle_starts_and_stops_the_engine(tmp_path, qtbot, git_repo, commit_files):
+    from PyQt6.QtCore import Qt
+    from daw_git_gui import DAWGitApp
+
+    make_project(git_repo, commit_files)
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+
+    app.handle_auto_save_toggle(Qt.CheckState.Checked.value)
+    assert app.auto_snapshot.is_running()
+
+    app.handle_auto_save_toggle(Qt.CheckState.Unchecked.value)
+    assert not app.auto_snapshot.is_running()
+    app.auto_snapshot.shutdown()
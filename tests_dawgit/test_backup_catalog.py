@@ -0,0 +1,133 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+from backup_catalog import BackupCatalog, catalog_path
+from snapshot_export import hash_file
+
+
+def make_backup(tmp_path, name, files):
+    folder = tmp_path / name
+    folder.mkdir()
+    for rel, data in files.items():
+        (folder / rel).parent.mkdir(parents=True, exist_ok=True)
+        (folder / rel).write_bytes(data)
+    return folder
+
+
+def test_register_records_sizes_and_hashes(tmp_path):
+    project = tmp_path / "MyTrack"
+    project.mkdir()
+    folder = make_backup(tmp_path, "Backup_MyTrack_1", {"song.als": b"v1", "Samples/kick.wav": b"k" * 10})
+
+    entry = BackupCatalog(project).register_folder("unsaved", folder)
+
+    reloaded = BackupCatalog(project)
+    assert catalog_path(project).exists()
+    assert (catalog_path(project).parent / ".gitignore").read_text() == "*\n"
+    files = reloaded.get(entry["id"])["files"]
+    assert files["Samples/kick.wav"]["size"] == 10
+    assert files["song.als"]["sha256"] == hash_file(folder / "song.als")
+    assert reloaded.latest("unsaved")["id"] == entry["id"]
+
+
+def test_restore_single_file_from_older_backup(tmp_path):
+    project = tmp_path / "MyTrack"
+    project.mkdir()
+    catalog = BackupCatalog(project)
+    old = catalog.register_folder("unsaved", make_backup(tmp_path, "b1", {"song.als": b"old take"}))
+    catalog.register_folder("unsaved", make_backup(tmp_path, "b2", {"song.als": b"new take"}))
+
+    assert catalog.restore_file("song.als").read_bytes() == b"new take"
+    assert catalog.restore_file("song.als", backup_id=old["id"]).read_bytes() == b"old take"
+
+
+def test_restoring_a_whole_backup_saves_the_catalog_once(tmp_path, monkeypatch):
+    project = tmp_path / "MyTrack"
+    project.mkdir()
+    catalog = BackupCatalog(project)
+    files = {f"Samples/clip_{i}.wav": bytes([i]) * 8 for i in range(5)}
+    entry = catalog.register_folder("unsaved", make_backup(tmp_path, "b1", files))
+
+    saves = []
+    monkeypatch.setattr(catalog, "save", lambda: saves.append(1))
+    restored = catalog.restore_backup(entry["id"])
+
+    assert sorted(p.relative_to(project).as_posix() for p in restored) == sorted(files)
+    assert len(saves) == 1
+
+
+def test_corrupt_backup_copy_is_not_restored(tmp_path):
+    project = tmp_path / "MyTrack"
+    project.mkdir()
+    folder = make_backup(tmp_path, "b1", {"song.als": b"good"})
+    catalog = BackupCatalog(project)
+    catalog.register_folder("unsaved", folder)
+    (folder / "song.als").write_bytes(b"evil")
+
+    assert catalog.restore_file("song.als") is None
+    assert not (project / "song.als").exists()
+
+
+def test_retention_evicts_least_recently_used_over_budget(tmp_path):
+    project = tmp_path / "MyTrack"
+    project.mkdir()
+    catalog = BackupCatalog(project)
+    entries = [
+        catalog.register_folder("unsaved", make_backup(tmp_path, f"b{i}", {"song.als": b"x" * 100}))
+        for i in range(4)
+    ]
+    # The oldest backup was just used for a restore, so the second one goes first
+    catalog.restore_file("song.als", backup_id=entries[0]["id"], dest_root=tmp_path / "out")
+
+    evicted = catalog.enforce_retention(max_bytes=300, max_age_days=None, keep_min=2)
+
+    assert [e["id"] for e in evicted] == [entries[1]["id"]]
+    assert not (tmp_path / "b1").exists()
+    assert (tmp_path / "b0").exists()
+    assert len(BackupCatalog(project).backups) == 3
+
+
+def test_retention_by_age_keeps_newest(tmp_path):
+    project = tmp_path / "MyTrack"
+    project.mkdir()
+    catalog = BackupCatalog(project)
+    for i in range(3):
+        catalog.register_folder("unsaved", make_backup(tmp_path, f"b{i}", {"song.als": b"x"}))
+    for entry in catalog.backups:
+        entry["created"] -= 90 * 86400
+
+    evicted = catalog.enforce_retention(max_bytes=None, max_age_days=30, keep_min=1)
+
+    assert len(evicted) == 2
+    assert (tmp_path / "b2").exists()
+
+
+def test_shared_folder_eviction_only_removes_own_files(tmp_path):
+    project = tmp_path / "MyTrack"
+    backup_dir = project / "Backup"
+    backup_dir.mkdir(parents=True)
+    (backup_dir / "song [1].als").write_bytes(b"a" * 50)
+    (backup_dir / "song [2].als").write_bytes(b"b" * 50)
+    catalog = BackupCatalog(project)
+    catalog.register("daw", backup_dir, {"song.als": "song [1].als"}, owns_root=False)
+    catalog.register("daw", backup_dir, {"song.als": "song [2].als"}, owns_root=False)
+
+    catalog.enforce_retention(max_bytes=50, max_age_days=None, keep_min=1)
+
+    assert not (backup_dir / "song [1].als").exists()
+    assert (backup_dir / "song [2].als").exists()
+
+
+def test_evicting_older_entry_keeps_folder_a_newer_entry_shares(tmp_path):
+    project = tmp_path / "MyTrack"
+    project.mkdir()
+    folder = make_backup(tmp_path, "latest_snapshot", {"song.als": b"x" * 100})
+    catalog = BackupCatalog(project)
+    catalog.register_folder("commit", folder, label="abc123")
+    catalog.register_folder("commit", folder, label="abc123")   # same take backed up again
+
+    evicted = catalog.enforce_retention(max_bytes=100, max_age_days=None, keep_min=1)
+
+    assert len(evicted) == 1
+    assert (folder / "song.als").exists()
+    assert BackupCatalog(project).latest("commit")["root"] == str(folder)
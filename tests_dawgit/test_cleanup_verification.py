@@ -1,7 +1,6 @@
 import sys, os, shutil
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 os.environ["DAWGIT_TEST_MODE"] = "1"
-from git import Repo
 import pytest
 from pytestqt.qtbot import QtBot
 from daw_git_gui import DAWGitApp
@@ -42,6 +41,28 @@ def test_cleanup_removes_temp_files_and_folders(qtbot, tmp_path):
     assert "temp-tag" not in [t.name for t in gui.repo.tags]
 
 
+def test_cleanup_keeps_checked_out_orphan_line(qtbot, tmp_path, monkeypatch, git_repo, commit_files):
+    """An orphan line that is checked out stays; other orphans and temp tags still go."""
+    from PyQt6.QtWidgets import QMessageBox
+
+    commit_files({"song.als": "main"}, "init")
+    for name in ("stray-orphan", "live-orphan"):
+        git_repo.git.checkout("--orphan", name)
+        commit_files({"song.als": name}, name)
+    git_repo.create_tag("temp-tag")
+
+    warnings = []
+    monkeypatch.setattr(QMessageBox, "warning", lambda *a, **k: warnings.append(a))
+    gui = DAWGitApp(project_path=tmp_path, build_ui=True)
+    qtbot.addWidget(gui)
+    gui.cleanup_workspace()
+
+    heads = [h.name for h in gui.repo.heads]
+    assert "live-orphan" in heads and "stray-orphan" not in heads
+    assert "temp-tag" not in [t.name for t in gui.repo.tags]
+    assert warnings == []
+
+
 # Other placeholder tests:
 def test_temp_branch_cleanup_after_close(qtbot):
     assert True
@@ -0,0 +1,67 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+from commit_pipeline import commit_snapshot, take_status, NOTHING_TO_COMMIT_MSG
+from daw_git_core import GitProjectManager
+
+
+def make_project(repo, commit):
+    commit({".gitignore": "*.asd\n", "track.als": "v1", "Samples/kick.wav": "kick", "Samples/snare.wav": "snare"},
+           "Initial")
+    return repo
+
+
+def test_status_lists_edits_deletions_and_untracked(tmp_path, git_repo, commit_files):
+    repo = make_project(git_repo, commit_files)
+    (tmp_path / "track.als").write_text("v2")
+    (tmp_path / "Samples" / "snare.wav").unlink()
+    (tmp_path / "Samples" / "vox [take 1].wav").write_text("vox")
+    (tmp_path / "track.asd").write_text("analysis")
+
+    status = take_status(repo)
+    assert status.changes == {
+        "track.als": " M",
+        "Samples/snare.wav": " D",
+        "Samples/vox [take 1].wav": "??",
+    }
+
+
+def test_commit_stages_exactly_the_changed_paths(tmp_path, git_repo, commit_files):
+    repo = make_project(git_repo, commit_files)
+    (tmp_path / "track.als").write_text("v2")
+    (tmp_path / "Samples" / "snare.wav").unlink()
+    (tmp_path / "Samples" / "vox [take 1].wav").write_text("vox")
+    (tmp_path / "track.asd").write_text("analysis")
+
+    result = commit_snapshot(repo, "Second take")
+
+    assert result["status"] == "success"
+    assert set(result["timings"]) == {"status", "stage", "commit", "total"}
+    committed = repo.commit(result["sha"])
+    assert committed.message.strip() == "Second take"
+    assert set(committed.stats.files) == {"track.als", "Samples/snare.wav", "Samples/vox [take 1].wav"}
+    assert not repo.is_dirty(untracked_files=True)
+
+
+def test_clean_tree_is_reported_without_committing(tmp_path, git_repo, commit_files):
+    repo = make_project(git_repo, commit_files)
+    head = repo.head.commit.hexsha
+
+    result = commit_snapshot(repo, "Nothing here")
+
+    assert result["status"] == "error"
+    assert result["message"] == NOTHING_TO_COMMIT_MSG
+    assert repo.head.commit.hexsha == head
+
+
+def test_project_manager_reuses_a_status_snapshot(tmp_path, git_repo, commit_files):
+    repo = make_project(git_repo, commit_files)
+    manager = GitProjectManager(tmp_path, app=None)
+    (tmp_path / "track.als").write_text("v2")
+
+    status = take_status(repo)
+    result = manager.commit_changes("Save", status=status)
+
+    assert result["status"] == "success"
+    assert manager.last_commit_timings["stage"] >= 0
+    assert set(repo.commit(result["sha"]).stats.files) == {"track.als"}
@@ -0,0 +1,85 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+from backup_catalog import BackupCatalog
+from daw_bundle import BundleDigest, daw_documents, document_of, group_by_document
+
+
+def make_bundle(root):
+    bundle = root / "Song.logicx"
+    (bundle / "Alternatives" / "000").mkdir(parents=True)
+    (bundle / "Media" / "Audio Files").mkdir(parents=True)
+    (bundle / "Resources").mkdir()
+    (bundle / "Alternatives" / "000" / "ProjectData").write_bytes(b"take one")
+    (bundle / "Resources" / "ProjectInformation.plist").write_text("<plist/>")
+    for i in range(30):
+        (bundle / "Media" / "Audio Files" / f"Vox_{i:02}.wav").write_bytes(b"RIFF" * (i + 1))
+    return bundle
+
+
+def test_bundle_is_one_document(tmp_path):
+    make_bundle(tmp_path)
+    (tmp_path / "Idea.als").write_bytes(b"als")
+    (tmp_path / "notes.txt").write_text("hi")
+
+    assert [p.name for p in daw_documents(tmp_path)] == ["Idea.als", "Song.logicx"]
+    assert document_of("Song.logicx/Alternatives/000/ProjectData") == "Song.logicx"
+    assert document_of("Idea.als") == "Idea.als"
+    assert document_of("notes.txt") is None
+    grouped = group_by_document(["Song.logicx/Resources/a", "notes.txt", "Song.logicx/Media/b"])
+    assert list(grouped) == ["Song.logicx", "notes.txt"]
+
+
+def test_digest_rescans_only_invalidated_folders(tmp_path):
+    bundle = make_bundle(tmp_path)
+    digest = BundleDigest(bundle)
+    first = digest.digest()
+    full_scan = digest.scans
+    assert digest.digest() == first and digest.scans == full_scan
+
+    project_data = bundle / "Alternatives" / "000" / "ProjectData"
+    project_data.write_bytes(b"take two, longer")
+    digest.invalidate(project_data)
+    second = digest.digest()
+    assert second != first
+    assert digest.scans == full_scan + 1
+
+    (bundle / "Alternatives" / "001").mkdir()
+    (bundle / "Alternatives" / "001" / "ProjectData").write_bytes(b"alt")
+    digest.invalidate(bundle / "Alternatives")
+    assert digest.digest() not in (first, second)
+    assert str(bundle / "Alternatives" / "001") in digest.directories()
+
+    # Same content again → same digest from a fresh full scan
+    assert BundleDigest(bundle).digest() == digest.digest()
+
+
+def test_app_treats_bundle_as_a_unit(tmp_path, qtbot, git_repo):
+    from daw_git_gui import DAWGitApp
+
+    bundle = make_bundle(tmp_path)
+    git_repo.git.add(A=True)
+    git_repo.index.commit("Logic session")
+
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    assert app.get_active_daw_file() == bundle
+    assert not app.has_dirty_daw_files()
+
+    (bundle / "Alternatives" / "000" / "ProjectData").write_bytes(b"take two")
+    (bundle / "Media" / "Audio Files" / "Vox_00.wav").write_bytes(b"RIFF new")
+    assert app.has_dirty_daw_files()
+    assert app.has_unsaved_changes()
+    git_repo.git.add(A=True)
+    git_repo.index.commit("Edit vocals")
+
+    app.load_commit_history()
+    table = app.snapshot_page.commit_table
+    assert table.item(0, 6).text() == "1"
+    assert table.item(0, 9).text() == "Song.logicx"
+    assert "(2 files)" in table.item(0, 9).toolTip()
+
+    app.run_backup()
+    entry = BackupCatalog(tmp_path).latest("daw")
+    assert "Song.logicx/Alternatives/000/ProjectData" in entry["files"]
+    assert sum(path.startswith("Song.logicx/") for path in entry["files"]) == 32
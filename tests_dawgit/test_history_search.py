@@ -0,0 +1,117 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import time
+import subprocess
+
+from history_search import HistoryIndex, parse_query
+from ui_strings import ROLE_KEY_MAIN_MIX
+
+
+def make_history(repo, commit_files):
+    def commit(path, content, message):
+        return commit_files({path: content}, message)
+
+    shas = {
+        "drums": commit("Samples/kick.wav", "kick", "Laid down the drums"),
+        "bass": commit("Samples/bass.wav", "bass", "New bassline in the chorus\n\nTried a fretless patch"),
+        "vocals": commit("Vocals/lead.wav", "vox", "Rough lead vocal"),
+    }
+    return repo, shas
+
+
+def test_parse_query_splits_facets_from_text():
+    text, facets = parse_query("bassline role:main_mix branch:alt-take after:2025-01-01")
+    assert text == "bassline"
+    assert facets == {"role": "main_mix", "branch": "alt-take", "after": "2025-01-01"}
+
+
+def test_search_by_subject_body_and_files(tmp_path, git_repo, commit_files):
+    repo, shas = make_history(git_repo, commit_files)
+    with HistoryIndex(tmp_path) as index:
+        assert index.update() == 3
+
+        assert index.search("bassline") == [shas["bass"]]
+        assert index.search("fretless") == [shas["bass"]]
+        assert index.search("bass") == [shas["bass"]]  # prefix match
+        assert index.search("file:Vocals") == [shas["vocals"]]
+        assert index.search("") == [shas["vocals"], shas["bass"], shas["drums"]]
+
+
+def test_role_tag_and_branch_facets(tmp_path, git_repo, commit_files):
+    repo, shas = make_history(git_repo, commit_files)
+    repo.create_tag("mix-v1", ref=shas["bass"])
+    repo.git.checkout("-b", "alt-take", shas["drums"])
+    (tmp_path / "alt.txt").write_text("alt")
+    repo.index.add(["alt.txt"])
+    alt_sha = repo.index.commit("Alt groove").hexsha
+
+    with HistoryIndex(tmp_path) as index:
+        index.update()
+        index.sync_roles({shas["vocals"]: ROLE_KEY_MAIN_MIX})
+
+        assert index.search(f"role:{ROLE_KEY_MAIN_MIX}") == [shas["vocals"]]
+        assert index.search("tag:mix-v1") == [shas["bass"]]
+        assert set(index.search("branch:alt-take")) == {alt_sha, shas["drums"]}
+        assert index.branches_for([shas["drums"]])[shas["drums"]] == ["alt-take", "main"]
+
+
+def test_update_is_incremental_and_follows_rewrites(tmp_path, git_repo, commit_files):
+    repo, shas = make_history(git_repo, commit_files)
+    with HistoryIndex(tmp_path) as index:
+        index.update()
+        assert index.update() == 0
+
+        (tmp_path / "mix.wav").write_text("mix")
+        repo.index.add(["mix.wav"])
+        new_sha = repo.index.commit("Bounce the mix").hexsha
+        assert index.update() == 1
+
+        # Drop the bass take; the main line no longer contains it
+        subprocess.run(["git", "rebase", "--onto", shas["drums"], shas["bass"]],
+                       cwd=tmp_path, check=True, capture_output=True)
+        index.update()
+        on_main = set(index.search("branch:main"))
+        assert shas["bass"] not in on_main
+        assert new_sha not in on_main
+        assert repo.head.commit.hexsha in on_main
+        assert index.search("bassline") == []           # deleted take is gone from search too
+
+
+def test_search_stays_fast_on_large_history(tmp_path):
+    with HistoryIndex(tmp_path) as index:
+        index.add_commits(
+            (f"{i:040x}", 1_700_000_000 + i, f"Take {i} with groove {i % 97}", "", [f"Samples/loop{i % 500}.wav"])
+            for i in range(50_000)
+        )
+        index.conn.commit()
+
+        start = time.perf_counter()
+        results = index.search("groove 42 file:loop42")
+        elapsed = time.perf_counter() - start
+
+        assert results
+        assert elapsed < 0.25
+
+
+def test_filter_box_narrows_history_table(tmp_path, qtbot, git_repo, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    (tmp_path / "track.als").write_text("init")
+    repo, shas = make_history(git_repo, commit_files)
+    repo.index.add(["track.als"])
+    repo.index.commit("Session file")
+
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+
+    results = app.apply_history_filter("bassline")
+
+    table = app.snapshot_page.commit_table
+    assert results == [shas["bass"]]
+    assert table.rowCount() == 1
+    assert table.item(0, 2).toolTip() == shas["bass"]
+    assert table.item(0, 0).text() == "#2"
+
+    app.apply_history_filter("")
+    assert table.rowCount() == 4
@@ -0,0 +1,169 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import shutil
+import hashlib
+from pathlib import Path
+import time
+from git import Repo
+
+from git_objects import lfs_object_path
+from lfs_store import LFS_PRUNE_GRACE_S, LfsStore, lfs_settings, set_lfs_settings
+from role_notes import set_role_note
+from ui_strings import ROLE_KEY_MAIN_MIX
+
+
+def store_object(tmp_path, data, age_s):
+    """Puts `data` in the LFS store the way the clean filter would and returns its pointer text."""
+    oid = hashlib.sha256(data).hexdigest()
+    path = lfs_object_path(tmp_path / ".git", oid)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    then = time.time() - age_s
+    os.utime(path, (then, then))
+    return oid, f"version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize {len(data)}\n"
+
+
+def push_objects(tmp_path, *oids):
+    """Copies LFS objects into the bare `origin` remote, as `git lfs push` would."""
+    remote = Path(Repo(tmp_path).remote("origin").url)
+    for oid in oids:
+        target = lfs_object_path(remote, oid)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(lfs_object_path(tmp_path / ".git", oid), target)
+
+
+def make_takes(repo, commit, count=5, pushed=True):
+    """
+    `count` takes on main, each bouncing a new 1 KB mix; older takes have older
+    objects. A bare `origin` remote has every object when `pushed`.
+    """
+    tmp_path = Path(repo.working_tree_dir)
+    remote = Repo.init(tmp_path.parent / f"{tmp_path.name}-origin.git", bare=True)
+    repo.create_remote("origin", remote.git_dir)
+    takes = []
+    for i in range(count):
+        oid, pointer = store_object(tmp_path, bytes([i]) * 1024, age_s=LFS_PRUNE_GRACE_S + (count - i) * 3600)
+        sha = commit({"mix.wav": pointer, "song.als": f"take {i}"}, f"Auto snapshot: take {i}")
+        takes.append((sha, oid))
+    if pushed:
+        push_objects(tmp_path, *(oid for _, oid in takes))
+    return repo, takes
+
+
+def object_exists(tmp_path, oid):
+    return lfs_object_path(tmp_path / ".git", oid).exists()
+
+
+def test_prune_keeps_retained_takes_and_reports_reclaimed_bytes(tmp_path, git_repo, commit_files):
+    repo, takes = make_takes(git_repo, commit_files)
+    set_role_note(tmp_path, takes[0][0], ROLE_KEY_MAIN_MIX)
+    repo.create_tag("v1-demo", ref=takes[1][0])
+    unused = [oid for _, oid in takes[2:4]]
+
+    store = LfsStore(tmp_path)
+    report = store.prune(budget=0, keep_recent=1, dry_run=True)
+    assert report["dry_run"] and report["pruned"] == 0
+    assert [oid for oid, _ in report["prune"]] == unused      # oldest first
+    assert report["reclaim_bytes"] == 2 * 1024 and report["after_bytes"] == 3 * 1024
+    assert report["over_budget"] and report["retained_bytes"] == 3 * 1024
+    assert "role:main_mix" in report["snapshots"][takes[0][0]]
+    assert all(object_exists(tmp_path, oid) for _, oid in takes)
+
+    result = store.prune(budget=0, keep_recent=1)
+    assert result["pruned"] == 2
+    assert [object_exists(tmp_path, oid) for _, oid in takes] == [True, True, False, False, True]
+
+
+def test_budget_prunes_only_what_it_must(tmp_path, git_repo, commit_files):
+    _, takes = make_takes(git_repo, commit_files)
+    store = LfsStore(tmp_path)
+
+    assert store.plan(budget=5 * 1024, keep_recent=1)["prune"] == []
+    plan = store.plan(budget=4 * 1024, keep_recent=1)
+    assert [oid for oid, _ in plan["prune"]] == [takes[0][1]] and not plan["over_budget"]
+
+    # Objects written within the grace period may belong to a take being saved
+    store_object(tmp_path, b"x" * 2048, age_s=0)
+    plan = store.plan(budget=0, keep_recent=0)
+    assert len(plan["prune"]) == 4 and plan["after_bytes"] == 1024 + 2048
+
+
+def test_staged_pointers_and_settings(tmp_path, git_repo, commit_files):
+    repo, takes = make_takes(git_repo, commit_files, count=2)
+    oid, pointer = store_object(tmp_path, b"staged" * 200, age_s=LFS_PRUNE_GRACE_S * 2)
+    push_objects(tmp_path, oid)
+    (tmp_path / "stem.wav").write_text(pointer)
+    repo.index.add(["stem.wav"])
+
+    assert oid not in [o for o, _ in LfsStore(tmp_path).plan(budget=0, keep_recent=0)["prune"]]
+
+    repo.git.config("dawgit.lfsBudget", "2k")
+    assert lfs_settings(tmp_path)[0] == 2048
+    set_lfs_settings(tmp_path, keep_recent=7)
+    assert lfs_settings(tmp_path) == (2048, 7)
+
+
+def test_only_objects_the_remote_has_are_pruned(tmp_path, git_repo, commit_files):
+    repo, takes = make_takes(git_repo, commit_files, pushed=False)
+    push_objects(tmp_path, takes[1][1])
+    plan = LfsStore(tmp_path).plan(budget=0, keep_recent=1)
+    assert plan["remote"] == "origin" and [oid for oid, _ in plan["prune"]] == [takes[1][1]]
+    assert plan["unpushed_objects"] == 3 and plan["over_budget"]
+
+    repo.delete_remote("origin")
+    result = LfsStore(tmp_path).prune(budget=0, keep_recent=1)
+    assert result["status"] == "error" and result["remote"] is None
+    assert result["pruned"] == 0 and result["prune"] == []
+    assert all(object_exists(tmp_path, oid) for _, oid in takes)
+
+
+def test_stashed_and_reflog_only_takes_are_kept(tmp_path, git_repo, commit_files):
+    from lfs_store import retained_snapshots
+
+    repo, takes = make_takes(git_repo, commit_files)
+    oid, pointer = store_object(tmp_path, b"stashed" * 200, age_s=LFS_PRUNE_GRACE_S * 2)
+    push_objects(tmp_path, oid)
+    (tmp_path / "stem.wav").write_text(pointer)
+    repo.index.add(["stem.wav"])
+    repo.git.stash()
+    repo.git.reset("--hard", "HEAD~1")      # the newest take is now only in the reflog
+
+    retained = retained_snapshots(tmp_path, keep_recent=0)
+    assert "reflog" in retained[takes[-1][0]]
+    assert any(reason.startswith("stash@{0}") for reason in sum(retained.values(), []))
+    pruned = {o for o, _ in LfsStore(tmp_path).plan(budget=0, keep_recent=0)["prune"]}
+    assert pruned == {o for _, o in takes[:3]}
+
+
+def test_free_up_space_prunes_after_confirmation(tmp_path, qtbot, git_repo, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    _, takes = make_takes(git_repo, commit_files, count=3)
+    set_lfs_settings(tmp_path, budget=0, keep_recent=1)
+    gui = DAWGitApp(project_path=tmp_path, build_ui=True)
+    qtbot.addWidget(gui)
+
+    plan = gui.prune_lfs_store(dry_run=True)
+    assert len(plan["prune"]) == 2 and object_exists(tmp_path, takes[0][1])
+
+    result = gui.prune_lfs_store()       # confirmation is auto-accepted in test mode
+    assert result["pruned"] == 2
+    assert [object_exists(tmp_path, oid) for _, oid in takes] == [False, False, True]
+
+
+def test_prune_deletes_exactly_the_confirmed_plan(tmp_path, git_repo, commit_files):
+    repo, takes = make_takes(git_repo, commit_files)
+    store = LfsStore(tmp_path)
+    plan = store.plan_async(budget=0, keep_recent=1).result()
+    store.shutdown()
+    assert [oid for oid, _ in plan["prune"]] == [oid for _, oid in takes[:4]]
+
+    # A remote that has lost everything since isn't asked again; the user confirmed this plan
+    push_root = Path(repo.remote("origin").url) / "lfs"
+    shutil.rmtree(push_root)
+    # The oldest take got tagged after the plan was made, so its audio stays
+    repo.create_tag("keeper", ref=takes[0][0])
+    result = store.prune(plan=plan)
+    assert result["pruned"] == 3 and result["reclaim_bytes"] == 3 * 1024
+    assert [object_exists(tmp_path, oid) for _, oid in takes] == [True, False, False, False, True]
@@ -0,0 +1,117 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import json
+
+from metadata_store import RoleStore
+from ui_strings import ROLE_KEY_MAIN_MIX, ROLE_KEY_ALT_MIXDOWN
+
+
+def test_set_appends_to_log_without_rewriting_snapshot(tmp_path):
+    store = RoleStore(tmp_path)
+    store.set("a" * 40, ROLE_KEY_MAIN_MIX)
+    store.set("b" * 40, ROLE_KEY_ALT_MIXDOWN)
+
+    assert not (tmp_path / ".dawgit_roles.json").exists()
+    assert len((tmp_path / ".dawgit_roles.log").read_text().splitlines()) == 2
+    assert RoleStore(tmp_path).roles == {"a" * 40: ROLE_KEY_MAIN_MIX, "b" * 40: ROLE_KEY_ALT_MIXDOWN}
+
+
+def test_compact_folds_log_into_snapshot(tmp_path):
+    store = RoleStore(tmp_path)
+    store.set("a" * 40, ROLE_KEY_MAIN_MIX)
+    store.set("b" * 40, ROLE_KEY_ALT_MIXDOWN)
+    store.remove("b" * 40)
+    store.compact()
+
+    assert not (tmp_path / ".dawgit_roles.log").exists()
+    assert json.loads((tmp_path / ".dawgit_roles.json").read_text()) == {"a" * 40: ROLE_KEY_MAIN_MIX}
+
+
+def test_compaction_triggers_after_threshold(tmp_path):
+    store = RoleStore(tmp_path, compact_every=3)
+    for i in range(3):
+        store.set(f"{i}" * 40, ROLE_KEY_MAIN_MIX)
+
+    assert store.pending == 0
+    assert len(json.loads((tmp_path / ".dawgit_roles.json").read_text())) == 3
+
+
+def test_torn_last_log_line_is_ignored(tmp_path):
+    (tmp_path / ".dawgit_roles.json").write_text(json.dumps({"a" * 40: ROLE_KEY_MAIN_MIX}))
+    with open(tmp_path / ".dawgit_roles.log", "w") as f:
+        f.write(json.dumps({"sha": "b" * 40, "role": ROLE_KEY_ALT_MIXDOWN}) + "\n")
+        f.write('{"sha": "cccc')
+
+    roles = RoleStore(tmp_path).roles
+
+    assert roles == {"a" * 40: ROLE_KEY_MAIN_MIX, "b" * 40: ROLE_KEY_ALT_MIXDOWN}
+
+
+def test_append_after_torn_line_is_not_lost(tmp_path):
+    with open(tmp_path / ".dawgit_roles.log", "w") as f:
+        f.write('{"sha": "cccc')
+
+    RoleStore(tmp_path).set("d" * 40, ROLE_KEY_MAIN_MIX)
+
+    assert RoleStore(tmp_path).roles == {"d" * 40: ROLE_KEY_MAIN_MIX}
+
+
+# --- Metadata cache ---
+
+from metadata_store import MetadataCache
+
+
+def test_cache_reparses_only_when_file_changes(tmp_path, capsys):
+    marker = tmp_path / "PROJECT_MARKER.json"
+    marker.write_text(json.dumps({"backup_info": {}}))
+    cache = MetadataCache()
+
+    first = cache.get(marker)
+    first["backup_info"]["edited"] = True           # edits without put() stay out of the cache
+    second = cache.get(marker)
+    assert second == {"backup_info": {}} and first is not second
+    assert capsys.readouterr().out.count("Parsed PROJECT_MARKER.json") == 1
+
+    marker.write_text(json.dumps({"backup_info": {}, "repository_info": {}}))
+    os.utime(marker, ns=(0, marker.stat().st_mtime_ns + 1_000_000))
+    assert "repository_info" in cache.get(marker)
+
+
+def test_put_coalesces_until_flush(tmp_path):
+    marker = tmp_path / "PROJECT_MARKER.json"
+    cache = MetadataCache()
+
+    for i in range(5):
+        cache.put(marker, {"count": i})
+    assert not marker.exists()
+    assert cache.get(marker) == {"count": 4}
+
+    assert cache.flush() == [marker]
+    assert json.loads(marker.read_text()) == {"count": 4}
+    assert not cache.is_dirty()
+
+
+def test_flush_drops_writes_for_deleted_project_folders(tmp_path):
+    import shutil
+
+    project = tmp_path / "MyTrack"
+    project.mkdir()
+    cache = MetadataCache()
+    cache.put(project / "PROJECT_MARKER.json", {"count": 1})
+    shutil.rmtree(project)
+
+    assert cache.flush() == []
+    assert not cache.is_dirty() and not project.exists()
+
+
+def test_role_store_reloads_after_external_edit(tmp_path):
+    store = RoleStore(tmp_path)
+    store.set("a" * 40, ROLE_KEY_MAIN_MIX)
+    assert not store.refresh_if_changed()
+
+    (tmp_path / ".dawgit_roles.log").unlink()
+    (tmp_path / ".dawgit_roles.json").write_text(json.dumps({"b" * 40: ROLE_KEY_ALT_MIXDOWN}))
+
+    assert store.refresh_if_changed()
+    assert store.roles == {"b" * 40: ROLE_KEY_ALT_MIXDOWN}
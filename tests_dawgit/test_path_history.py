@@ -0,0 +1,108 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+from path_history import PATH_INDEX_NAME, PathHistoryIndex
+
+
+def make_history(repo, commit):
+    shas = {
+        "drums": commit({"Samples/kick.wav": "kick", "Samples/hat.wav": "hat"}, "Laid down the drums"),
+        "vocals": commit({"Vocals/lead.wav": "vox"}, "Rough lead vocal"),
+        "kick": commit({"Samples/kick.wav": "kick v2"}, "Punchier kick"),
+    }
+    return repo, shas
+
+
+def test_file_and_folder_history(tmp_path, git_repo, commit_files):
+    repo, shas = make_history(git_repo, commit_files)
+    with PathHistoryIndex(tmp_path) as index:
+        assert index.update() == 3
+
+        assert index.snapshots_for("Samples/kick.wav") == [shas["kick"], shas["drums"]]
+        assert index.snapshots_for("kick.wav") == [shas["kick"], shas["drums"]]
+        assert index.snapshots_for("Samples/") == [shas["kick"], shas["drums"]]
+        assert index.snapshots_for("Vocals") == [shas["vocals"]]
+
+        statuses = [r["status"] for r in index.history("Samples/kick.wav")]
+        assert statuses == ["M", "A"]
+
+
+def test_last_change_respects_version_line(tmp_path, git_repo, commit_files):
+    repo, shas = make_history(git_repo, commit_files)
+    repo.git.checkout("-b", "alt-take", shas["vocals"])
+    (tmp_path / "Samples" / "kick.wav").write_text("kick alt")
+    repo.index.add(["Samples/kick.wav"])
+    alt_sha = repo.index.commit("Alt kick").hexsha
+
+    with PathHistoryIndex(tmp_path) as index:
+        index.update()
+        assert index.last_change("Samples/kick.wav", rev="main")["sha"] == shas["kick"]
+        assert index.last_change("Samples/kick.wav", rev="alt-take")["sha"] == alt_sha
+        assert index.last_change("Vocals/lead.wav", rev="alt-take")["sha"] == shas["vocals"]
+
+
+def test_update_is_incremental_and_lists_changed_files(tmp_path, git_repo, commit_files):
+    repo, shas = make_history(git_repo, commit_files)
+    with PathHistoryIndex(tmp_path) as index:
+        index.update()
+        assert index.update() == 0
+
+        (tmp_path / "Vocals" / "lead.wav").unlink()
+        repo.index.remove(["Vocals/lead.wav"])
+        gone_sha = repo.index.commit("Drop the vocal").hexsha
+        assert index.update() == 1
+
+        changed = index.changed_files([shas["drums"], gone_sha])
+        assert changed[shas["drums"]] == [("A", "Samples/hat.wav"), ("A", "Samples/kick.wav")]
+        assert changed[gone_sha] == [("D", "Vocals/lead.wav")]
+
+
+def test_path_filter_and_changed_column(tmp_path, qtbot, git_repo, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    (tmp_path / "track.als").write_text("init")
+    repo, shas = make_history(git_repo, commit_files)
+    repo.index.add(["track.als"])
+    repo.index.commit("Session file")
+
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+
+    results = app.apply_history_filter("path:kick.wav")
+    assert results == [shas["kick"], shas["drums"]]
+
+    assert app.apply_history_filter("path:Samples/ punchier") == [shas["kick"]]
+
+    table = app.snapshot_page.commit_table
+    assert table.item(0, 9).text() == "kick.wav"
+    assert table.item(0, 9).toolTip() == "M Samples/kick.wav"
+
+
+def test_deleted_take_drops_out_of_path_history(tmp_path, git_repo, commit_files):
+    repo, shas = make_history(git_repo, commit_files)
+    with PathHistoryIndex(tmp_path) as index:
+        index.update()
+        assert index.snapshots_for("Vocals/lead.wav") == [shas["vocals"]]
+
+        # Same rebase rebase_delete_commit runs to remove a take
+        repo.git.rebase("--onto", f"{shas['vocals']}^", shas["vocals"])
+        index.update()
+
+        assert index.snapshots_for("Vocals/lead.wav") == []
+        new_kick = repo.head.commit.hexsha
+        assert index.snapshots_for("Samples/kick.wav") == [new_kick, shas["drums"]]
+        assert index.changed_files([shas["kick"]]) == {shas["kick"]: []}
+
+
+def test_index_lives_in_the_cache_folder_and_old_copy_is_removed(tmp_path, git_repo, commit_files):
+    make_history(git_repo, commit_files)
+    legacy = tmp_path / ".git" / "dawgit" / PATH_INDEX_NAME
+    legacy.parent.mkdir()
+    legacy.write_bytes(b"stale")
+
+    with PathHistoryIndex(tmp_path) as index:
+        assert index.update() == 3
+        assert index.path == tmp_path / ".dawgit_cache" / PATH_INDEX_NAME
+
+    assert not legacy.exists()
+    assert git_repo.untracked_files == []
@@ -0,0 +1,121 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import io
+import struct
+import wave
+
+from peaks import PEAK_LEVELS, PeakCache, Peaks, compute_peaks
+
+KICK = os.path.join(os.path.dirname(__file__), "..", "test_assets", "TestProjectReal", "KICK.aif")
+
+
+def square_wav(frames=10000, rate=22050, amplitude=16000):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"".join(struct.pack("<h", amplitude if (i // 100) % 2 else -amplitude)
+                               for i in range(frames)))
+    return buf.getvalue()
+
+
+def test_peaks_from_wav_stream():
+    peaks = compute_peaks(io.BytesIO(square_wav()))
+    assert (peaks.sample_rate, peaks.channels, peaks.frames) == (22050, 1, 10000)
+    finest = peaks.levels[PEAK_LEVELS[0]]
+    assert len(finest) // 2 == -(-10000 // PEAK_LEVELS[0])
+    assert max(finest) == 16000 * 32767 // 32768 and min(finest) == -(16000 * 32767 // 32768)
+    assert len(peaks.columns(8)) == 8
+    assert Peaks.from_bytes(peaks.to_bytes()).levels == peaks.levels
+
+
+def test_peaks_from_24bit_aiff():
+    with open(KICK, "rb") as f:
+        peaks = compute_peaks(f)
+    assert (peaks.sample_rate, peaks.channels, peaks.frames) == (44100, 2, 352800)
+    assert set(peaks.levels) == set(PEAK_LEVELS)
+    # A kick: loud transient at the start, near-silence at the end
+    columns = peaks.columns(100)
+    assert columns[0][1] > 20000 and columns[-1][1] < 2000
+
+
+def test_cache_reads_peaks_from_any_take(tmp_path, git_repo, commit_files):
+    with open(KICK, "rb") as f:
+        first = commit_files({"KICK.aif": f.read(), "Bounce.wav": square_wav()}, "Bounce")
+    git_repo.index.remove(["Bounce.wav"], working_tree=True)
+    git_repo.index.commit("Remove bounce")
+
+    cache = PeakCache(tmp_path)
+    files = dict(cache.audio_files(first))
+    assert set(files) == {"Bounce.wav", "KICK.aif"}
+    assert cache.cached(files["Bounce.wav"]) is None
+    peaks = cache.peaks_for(first, "Bounce.wav")          # deleted from the working tree — read from git
+    assert peaks.frames == 10000
+    assert (tmp_path / ".dawgit_cache" / "peaks" / files["Bounce.wav"]).exists()
+    assert PeakCache(tmp_path).cached(files["Bounce.wav"]).levels == peaks.levels
+    assert cache.peaks_async(files["KICK.aif"]).result().channels == 2
+    cache.shutdown()
+    assert not git_repo.is_dirty(untracked_files=True)
+
+
+def test_browser_draws_waveform_for_selected_take(tmp_path, qtbot, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    sha = commit_files({"song.als": b"als", "Mixdown.wav": square_wav()}, "Mixdown")
+
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    app.load_commit_history()
+    app.snapshot_page.highlight_row_by_sha(sha)
+    assert [path for path, _ in app.show_waveforms(sha)] == ["Mixdown.wav"]
+
+    page = app.snapshot_page
+    assert not page.waveform_panel.isHidden()
+    assert page.waveform_combo.currentText() == "Mixdown.wav"
+    assert page.waveform_view.peaks.frames == 10000
+
+
+def test_memory_cache_survives_concurrent_decodes(tmp_path):
+    import threading
+    from peaks import PEAK_MEMORY_ENTRIES
+
+    cache = PeakCache(tmp_path)
+    peaks = compute_peaks(io.BytesIO(square_wav(frames=1000)))
+    errors = []
+
+    def churn(offset):
+        try:
+            for i in range(2000):
+                cache._remember(f"{offset}-{i}", peaks)
+                cache._load(f"{offset}-{i // 2}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=churn, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == [] and len(cache._memory) <= PEAK_MEMORY_ENTRIES
+
+
+def test_changing_selection_cancels_queued_decodes(tmp_path, qtbot, monkeypatch, git_repo):
+    from concurrent.futures import Future
+    from daw_git_gui import DAWGitApp
+
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    monkeypatch.setenv("DAWGIT_TEST_MODE", "0")    # real polling: decodes finish later
+    queued = []
+    monkeypatch.setattr(app._get_peak_cache(), "peaks_async", lambda oid: queued.append(Future()) or queued[-1])
+
+    app.show_waveform("a" * 40, "Kick.wav")
+    app.show_waveform("b" * 40, "Snare.wav")
+    assert queued[0].cancelled() and not queued[1].cancelled()
+
+    app.snapshot_page.on_selection_changed()         # nothing selected any more
+    assert queued[1].cancelled() and app._waveform_request is None
+    qtbot.wait(150)                                  # the pending poll finds nothing to draw
+    assert app.snapshot_page.waveform_view.peaks is None
@@ -0,0 +1,87 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import subprocess
+
+from prehash import Prehasher
+
+
+def make_project(repo, commit):
+    commit({"song.als": "v1"}, "Initial")
+    return repo
+
+
+def object_exists(tmp_path, oid):
+    return subprocess.run(["git", "cat-file", "-e", oid], cwd=tmp_path).returncode == 0
+
+
+def test_new_large_files_are_written_to_the_object_store(tmp_path, git_repo, commit_files):
+    make_project(git_repo, commit_files)
+    stems = tmp_path / "Stems"
+    stems.mkdir()
+    for i in range(20):
+        (stems / f"stem{i:02}.wav").write_bytes(os.urandom(2048))
+    (tmp_path / "notes.txt").write_text("tiny")
+
+    prehasher = Prehasher(tmp_path, min_bytes=1024, workers=4)
+    assert prehasher.scan() == 20
+    prehasher.wait()
+
+    oid = prehasher.prehashed("Stems/stem03.wav")
+    expected = subprocess.run(["git", "hash-object", "Stems/stem03.wav"], cwd=tmp_path,
+                              capture_output=True, text=True).stdout.strip()
+    assert oid == expected
+    assert object_exists(tmp_path, oid)
+    assert prehasher.prehashed("notes.txt") is None
+
+    # Nothing new → nothing queued; an edited file is queued again
+    assert prehasher.scan() == 0
+    (stems / "stem03.wav").write_bytes(os.urandom(4096))
+    assert prehasher.prehashed("Stems/stem03.wav") is None
+    assert prehasher.scan() == 1
+    prehasher.shutdown()
+
+
+def test_lfs_files_are_left_to_git_add(tmp_path, git_repo, commit_files):
+    make_project(git_repo, commit_files)
+    (tmp_path / ".gitattributes").write_text("*.wav filter=lfs diff=lfs merge=lfs -text\n")
+    (tmp_path / "vocal.wav").write_bytes(os.urandom(4096))
+
+    prehasher = Prehasher(tmp_path, min_bytes=1024)
+    prehasher.scan_async()
+    prehasher.wait()
+
+    assert prehasher.prehashed("vocal.wav") is None
+    assert not (tmp_path / ".git" / "lfs").exists()
+    prehasher.shutdown()
+
+
+def test_commit_stages_prehashed_blobs_without_git_add(tmp_path, monkeypatch, git_repo, commit_files):
+    import commit_pipeline
+    from commit_pipeline import commit_snapshot
+
+    repo = make_project(git_repo, commit_files)
+    (tmp_path / "stem.wav").write_bytes(os.urandom(4096))
+    (tmp_path / "song.als").write_text("v2")
+    prehasher = Prehasher(tmp_path, min_bytes=1024)
+    prehasher.scan()
+    prehasher.wait()
+
+    from_index_info = []
+    real_index_info = commit_pipeline._index_info
+
+    def spy(*args):
+        lines, staged = real_index_info(*args)
+        from_index_info.extend(staged)
+        return lines, staged
+
+    monkeypatch.setattr(commit_pipeline, "_index_info", spy)
+    result = commit_snapshot(repo, "Bounce stem", prehashed=prehasher.prehashed)
+
+    assert result["status"] == "success"
+    tree = repo.head.commit.tree
+    assert tree["stem.wav"].hexsha == prehasher.prehashed("stem.wav")
+    assert tree["song.als"].data_stream.read() == b"v2"
+    assert from_index_info == ["stem.wav"]        # song.als was too small to pre-hash, so `git add` took it
+    assert not repo.is_dirty(untracked_files=True)
+    prehasher.shutdown()
@@ -0,0 +1,65 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import pytest
+
+from ref_transaction import RefTransaction, RefTransactionError
+from ui_strings import ROLE_KEY_MAIN_MIX
+
+
+def make_history(repo, commit):
+    return repo, [commit({"track.als": f"v{i}"}, f"Take {i}") for i in range(3)]
+
+
+def test_batch_creates_and_deletes_refs_together(tmp_path, git_repo, commit_files):
+    repo, shas = make_history(git_repo, commit_files)
+    repo.create_tag("temp-1", ref=shas[0])
+    repo.create_head("scratch", shas[1])
+
+    with RefTransaction(tmp_path) as refs:
+        refs.create_tag("mix-v1", shas[2])
+        refs.create_branch("alt-take", shas[1])
+        assert refs.delete_tag("temp-1")
+        assert refs.delete_branch("scratch")
+        assert not refs.delete_tag("never-existed")
+
+    assert refs.affected == {shas[0], shas[1], shas[2]}
+    assert [t.name for t in repo.tags] == ["mix-v1"]
+    assert sorted(h.name for h in repo.heads) == ["alt-take", "main"]
+
+
+def test_failed_batch_changes_nothing(tmp_path, git_repo, commit_files):
+    repo, shas = make_history(git_repo, commit_files)
+    repo.create_tag("mix-v1", ref=shas[0])
+
+    refs = RefTransaction(tmp_path)
+    refs.create_tag("mix-v2", shas[1])
+    refs.create_tag("mix-v1", shas[2])  # already exists → whole batch is rejected
+    with pytest.raises(RefTransactionError):
+        refs.apply()
+
+    assert [t.name for t in repo.tags] == ["mix-v1"]
+    with pytest.raises(RefTransactionError):
+        refs.delete_branch("main")
+
+
+def test_tagging_refreshes_only_the_tagged_row(tmp_path, qtbot, monkeypatch, git_repo, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    repo, shas = make_history(git_repo, commit_files)
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    app.load_commit_history()
+
+    table = app.snapshot_page.commit_table
+    row = next(r for r in range(table.rowCount()) if table.item(r, 2).toolTip() == shas[1])
+    table.selectRow(row)
+
+    reloads = []
+    monkeypatch.setattr(app, "load_commit_history", lambda *a, **kw: reloads.append(a))
+    app.tag_main_mix()
+
+    assert reloads == []
+    row = next(r for r in range(table.rowCount()) if table.item(r, 2).toolTip() == shas[1])
+    assert table.item(row, 1).text() == app.pretty_role(ROLE_KEY_MAIN_MIX)
+    assert table.rowCount() == 3
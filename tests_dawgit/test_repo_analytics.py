@@ -0,0 +1,137 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+from git import Repo
+
+from audio_index import format_size
+from repo_analytics import RepoAnalytics, analytics_index_path
+from ui_strings import SIZE_ADDED_MSG
+
+LFS_SIZE = 5 * 1024 ** 2
+
+
+def make_takes(repo, commit):
+    """main: set → +100 KB stem → LFS bounce → notes only; alt (from the stem take): +60 KB vocal."""
+    takes = {"set": commit({"song.als": b"als" * 100}, "Auto snapshot: set")}
+    takes["stem"] = commit({"Stems/bass.wav": os.urandom(100 * 1024)}, "Auto snapshot: stem")
+    pointer = (f"version https://git-lfs.github.com/spec/v1\noid sha256:{'ab' * 32}\nsize {LFS_SIZE}\n").encode()
+    takes["bounce"] = commit({"Bounces/mix.wav": pointer}, "Auto snapshot: bounce")
+    takes["notes"] = commit({"notes.txt": b"more cowbell"}, "Auto snapshot: notes")
+    repo.git.checkout("-b", "alt", takes["stem"])
+    takes["vocal"] = commit({"Stems/vocal.wav": os.urandom(60 * 1024)}, "Auto snapshot: vocal")
+    repo.git.checkout("main")
+    return repo, takes
+
+
+def test_bytes_added_per_take_and_largest_objects(tmp_path, git_repo, commit_files):
+    _, takes = make_takes(git_repo, commit_files)
+    analytics = RepoAnalytics(tmp_path)
+    assert analytics.update() == 5 and analytics.is_current()
+
+    sizes = analytics.sizes(takes.values())
+    stem = sizes[takes["stem"]]
+    assert 100 * 1024 <= stem["bytes"] < 101 * 1024 and stem["largest_path"] == "Stems/bass.wav"
+    assert sizes[takes["bounce"]]["lfs_bytes"] == LFS_SIZE
+    assert sizes[takes["bounce"]]["added"] > LFS_SIZE
+    assert sizes[takes["notes"]]["added"] < 1024
+
+    report = analytics.report()
+    assert report["takes"][0]["sha"] == takes["bounce"]
+    assert report["takes"][0]["subject"] == "Auto snapshot: bounce"
+    assert [b["path"] for b in report["largest_blobs"][:2]] == ["Stems/bass.wav", "Stems/vocal.wav"]
+    assert report["largest_blobs"][0]["commit"] == takes["stem"]
+    assert report["largest_lfs"] == [{"oid": "ab" * 32, "path": "Bounces/mix.wav", "size": LFS_SIZE,
+                                      "commit": takes["bounce"], "local": False}]
+    assert report["lfs_objects"] == 1 and report["bytes"] == sum(s["bytes"] for s in sizes.values())
+
+    lines = {line["branch"]: line for line in report["lines"]}
+    assert lines["alt"]["own_commits"] == 1
+    assert 60 * 1024 <= lines["alt"]["own_bytes"] < 61 * 1024
+    assert lines["main"]["own_bytes"] == lines["main"]["bytes"] > LFS_SIZE
+    analytics.close()
+
+
+def test_updates_are_incremental_and_match_a_full_pass(tmp_path, git_repo, commit_files):
+    repo, takes = make_takes(git_repo, commit_files)
+    analytics = RepoAnalytics(tmp_path)
+    analytics.update()
+
+    (tmp_path / "Stems" / "bass.wav").write_bytes(os.urandom(30 * 1024))
+    repo.git.add(A=True)
+    new = repo.index.commit("Auto snapshot: new bass").hexsha
+    assert not analytics.is_current()
+    assert analytics.update() == 1
+    assert 30 * 1024 <= analytics.sizes([new])[new]["bytes"] < 31 * 1024
+    incremental = analytics.report()
+    analytics.close()
+
+    analytics_index_path(tmp_path).unlink()
+    fresh = RepoAnalytics(tmp_path)
+    assert fresh.update() == 6
+    full = fresh.report()
+    for key in ("objects", "bytes", "disk", "lfs_bytes"):
+        assert incremental[key] == full[key]
+    assert incremental["takes"] == full["takes"]
+
+    # A recorded tip that no longer exists means history was rewritten: start over
+    fresh.conn.execute("INSERT INTO tips(sha) VALUES (?)", ("f" * 40,))
+    fresh.conn.commit()
+    assert fresh.update() == 6
+    assert fresh.report()["objects"] == full["objects"]
+    fresh.close()
+
+
+def test_rewritten_history_is_reattributed(tmp_path, git_repo, commit_files):
+    repo, takes = make_takes(git_repo, commit_files)
+    analytics = RepoAnalytics(tmp_path)
+    analytics.update()
+
+    # Dropping the stem take from alt rewrites the vocal take: same 60 KB blob, new commit
+    repo.git.rebase("--onto", takes["set"], takes["stem"], "alt")
+    repo.git.checkout("main")
+    vocal = repo.commit("alt").hexsha
+    assert analytics.update() == 5 and analytics.is_current()
+    sizes = analytics.sizes([vocal, takes["vocal"]])
+    assert 60 * 1024 <= sizes[vocal]["bytes"] < 61 * 1024
+    assert takes["vocal"] not in sizes
+
+    # A deleted version line takes its own takes with it
+    repo.git.branch("-D", "alt")
+    assert analytics.update() == 4
+    assert analytics.sizes([vocal]) == {}
+    analytics.close()
+
+
+def test_size_column_and_report_page(tmp_path, qtbot, git_repo, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    _, takes = make_takes(git_repo, commit_files)
+    gui = DAWGitApp(project_path=tmp_path, build_ui=True)
+    qtbot.addWidget(gui)
+    gui.load_commit_history()
+
+    table = gui.snapshot_page.commit_table
+    cells = {table.item(r, 2).toolTip(): table.item(r, 14) for r in range(table.rowCount()) if table.item(r, 2)}
+    added = gui._get_repo_analytics().sizes([takes["stem"]])[takes["stem"]]["added"]
+    assert cells[takes["stem"]].text() == SIZE_ADDED_MSG.format(size=format_size(added))
+    assert cells[takes["notes"]] < cells[takes["stem"]] < cells[takes["bounce"]]    # sorts by bytes
+
+    report = gui.show_repo_analytics()
+    page = gui.analytics_page
+    assert page.takes_table.rowCount() == len(report["takes"]) == 5
+    assert page.takes_table.item(0, 0).text() == takes["bounce"][:7]
+    assert page.lines_table.rowCount() == 2
+
+
+def test_empty_repo_placeholder_fills_every_column(tmp_path, qtbot, git_repo, commit_files):
+    from daw_git_gui import DAWGitApp
+
+    make_takes(git_repo, commit_files)
+    gui = DAWGitApp(project_path=tmp_path, build_ui=True)
+    qtbot.addWidget(gui)
+    gui.repo = Repo.init(tmp_path / "empty", initial_branch="main")
+    gui.load_commit_history()
+
+    table = gui.snapshot_page.commit_table
+    assert table.rowCount() == 1 and table.item(0, 2).text() == "No commits yet"
+    assert all(table.item(0, col) is not None for col in range(table.columnCount()))
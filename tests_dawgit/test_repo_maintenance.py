@@ -0,0 +1,95 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+from repo_maintenance import (
+    MAINTENANCE_LOOSE_OBJECTS, MaintenanceScheduler, due_tasks, load_state, repo_health, run_maintenance, run_task
+)
+
+
+def make_repo(repo, commit, files=MAINTENANCE_LOOSE_OBJECTS + 20):
+    clips = {f"Samples/clip_{i:03}.wav": f"RIFF {i}".encode() for i in range(files)}
+    commit({"song.als": b"als", **clips}, "Auto snapshot: lots of clips")
+    return repo
+
+
+def test_maintenance_packs_and_writes_commit_graph(tmp_path, git_repo, commit_files):
+    repo = make_repo(git_repo, commit_files)
+    health = repo_health(tmp_path)
+    assert health["loose_objects"] > MAINTENANCE_LOOSE_OBJECTS and not health["commit_graph"]
+    assert due_tasks(health, load_state(tmp_path)) == ["loose-objects", "commit-graph"]
+
+    result = run_maintenance(tmp_path)
+    assert [(r["task"], r["status"]) for r in result["tasks"]] == [("loose-objects", "success"),
+                                                                    ("commit-graph", "success")]
+    assert result["health_after"]["loose_objects"] == 0
+    assert result["health_after"]["commit_graph"]
+    assert set(result["before"]) == set(result["after"]) >= {"rev_list_count", "branch_contains", "path_log"}
+
+    # Recorded, so nothing is due until history moves on
+    assert load_state(tmp_path)["runs"][-1]["after"] == result["after"]
+    assert due_tasks(repo_health(tmp_path), load_state(tmp_path)) == []
+    (tmp_path / "song.als").write_bytes(b"als v2")
+    repo.index.add(["song.als"])
+    repo.index.commit("Auto snapshot: song.als")
+    assert due_tasks(repo_health(tmp_path), load_state(tmp_path)) == ["commit-graph"]
+    assert not repo.is_dirty(untracked_files=True)
+
+
+def test_budget_and_interruption(tmp_path, git_repo, commit_files):
+    make_repo(git_repo, commit_files)
+    assert run_task(tmp_path, "loose-objects", budget_s=0)["status"] == "timeout"
+    result = run_maintenance(tmp_path, should_continue=lambda: False)
+    assert result["tasks"] == []
+    assert repo_health(tmp_path)["loose_objects"] > MAINTENANCE_LOOSE_OBJECTS
+
+
+def test_scheduler_runs_only_when_idle(tmp_path, qtbot, git_repo, commit_files):
+    make_repo(git_repo, commit_files, files=5)
+    focused = [True]
+    scheduler = MaintenanceScheduler(tmp_path, is_focused=lambda: focused[0], idle_s=0)
+    assert scheduler.check() is False
+
+    focused[0] = False
+    with qtbot.waitSignal(scheduler.finished, timeout=30000) as blocker:
+        assert scheduler.check() is True
+    assert [r["task"] for r in blocker.args[0]["tasks"]] == ["commit-graph"]
+    scheduler.shutdown()
+
+
+def test_shutdown_stops_a_run_between_tasks(tmp_path, qtbot, git_repo, commit_files):
+    make_repo(git_repo, commit_files)
+    scheduler = MaintenanceScheduler(tmp_path, idle_s=0)
+    assert scheduler.check() is True
+    scheduler.shutdown()
+
+    # Two tasks were due; closing mid-run leaves at most the one already started
+    runs = load_state(tmp_path)["runs"]
+    assert not runs or len(runs[-1]["tasks"]) <= 1
+
+
+def test_unreachable_loose_objects_do_not_keep_repack_due(tmp_path, git_repo, commit_files):
+    from git_objects import run_git
+
+    make_repo(git_repo, commit_files)
+    for i in range(MAINTENANCE_LOOSE_OBJECTS + 20):
+        run_git(tmp_path, "hash-object", "-w", "--stdin", input=f"dropped take {i}".encode())
+    run_maintenance(tmp_path)
+    health = repo_health(tmp_path)
+    assert health["loose_objects"] > MAINTENANCE_LOOSE_OBJECTS     # unreachable, so repack -d keeps them
+    assert due_tasks(health, load_state(tmp_path)) == []
+
+
+def test_stopped_task_leaves_no_lock_files(tmp_path, monkeypatch, git_repo, commit_files):
+    import repo_maintenance
+
+    make_repo(git_repo, commit_files, files=1)
+    (tmp_path / "song.als").write_bytes(b"als v2")
+    # `commit -a` holds the index lock while its pre-commit hook hangs
+    hooks = tmp_path / ".git" / "stuck-hooks"
+    hooks.mkdir()
+    (hooks / "pre-commit").write_text("#!/bin/sh\nsleep 30\n")
+    (hooks / "pre-commit").chmod(0o755)
+    monkeypatch.setitem(repo_maintenance._TASK_COMMANDS, "loose-objects",
+                        [["-c", f"core.hooksPath={hooks}", "commit", "-a", "-m", "stuck"]])
+    assert run_task(tmp_path, "loose-objects", budget_s=1)["status"] == "timeout"
+    assert not list((tmp_path / ".git").glob("*.lock"))
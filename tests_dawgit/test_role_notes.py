@@ -0,0 +1,92 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import subprocess
+from git import Repo
+
+import role_notes
+from role_notes import (
+    ROLE_NOTES_REF,
+    clear_role_note,
+    configure_notes_fetch,
+    configure_notes_rewrite,
+    notes_tip,
+    push_role_notes,
+    read_role_notes,
+    set_role_note,
+    write_role_notes
+)
+from ui_strings import ROLE_KEY_MAIN_MIX, ROLE_KEY_CREATIVE_TAKE
+
+
+def make_repo(repo, commit, n=3):
+    return repo, [commit({f"take{i}.als": f"take {i}"}, f"take {i}") for i in range(n)]
+
+
+def test_roles_round_trip_through_notes(tmp_path, git_repo, commit_files):
+    repo, shas = make_repo(git_repo, commit_files)
+    set_role_note(tmp_path, shas[0], ROLE_KEY_MAIN_MIX)
+    write_role_notes(tmp_path, {shas[1]: ROLE_KEY_CREATIVE_TAKE, "f" * 40: ROLE_KEY_MAIN_MIX})
+
+    assert read_role_notes(tmp_path) == {shas[0]: ROLE_KEY_MAIN_MIX, shas[1]: ROLE_KEY_CREATIVE_TAKE}
+    assert repo.git.notes(f"--ref={ROLE_NOTES_REF}", "show", shas[0]) == ROLE_KEY_MAIN_MIX
+
+
+def test_cleared_role_disappears_and_cache_follows_tip(tmp_path, git_repo, commit_files):
+    repo, shas = make_repo(git_repo, commit_files)
+    set_role_note(tmp_path, shas[0], ROLE_KEY_MAIN_MIX)
+    first_tip = notes_tip(tmp_path)
+    assert read_role_notes(tmp_path) == {shas[0]: ROLE_KEY_MAIN_MIX}
+
+    clear_role_note(tmp_path, shas[0])
+
+    assert notes_tip(tmp_path) != first_tip
+    assert read_role_notes(tmp_path) == {}
+
+
+def test_roles_follow_commits_through_rebase(tmp_path, git_repo, commit_files):
+    repo, shas = make_repo(git_repo, commit_files)
+    configure_notes_rewrite(tmp_path)
+    set_role_note(tmp_path, shas[2], ROLE_KEY_MAIN_MIX)
+
+    # Drop the middle take, as rebase_delete_commit does
+    subprocess.run(["git", "rebase", "--onto", f"{shas[1]}^", shas[1]], cwd=tmp_path, check=True, capture_output=True)
+
+    new_head = repo.head.commit.hexsha
+    assert new_head != shas[2]
+    assert read_role_notes(tmp_path).get(new_head) == ROLE_KEY_MAIN_MIX
+
+
+def test_cached_roles_are_read_without_starting_git(tmp_path, git_repo, commit_files, monkeypatch):
+    repo, shas = make_repo(git_repo, commit_files)
+    set_role_note(tmp_path, shas[0], ROLE_KEY_MAIN_MIX)
+    read_role_notes(tmp_path)
+    subprocess.run(["git", "pack-refs", "--all"], cwd=tmp_path, check=True)
+
+    def no_git(*args, **kwargs):
+        raise AssertionError("git was started for a cached read")
+
+    monkeypatch.setattr(role_notes, "run_git", no_git)
+    monkeypatch.setattr(role_notes, "git_dir", no_git)
+    assert read_role_notes(tmp_path) == {shas[0]: ROLE_KEY_MAIN_MIX}
+
+
+def test_roles_travel_through_a_remote(tmp_path, git_repo, commit_files):
+    repo, shas = make_repo(git_repo, commit_files)
+    remote = tmp_path.parent / f"{tmp_path.name}-remote.git"
+    Repo.init(remote, bare=True)
+    repo.create_remote("origin", str(remote))
+    repo.git.push("origin", "main")
+    assert push_role_notes(tmp_path) is False   # nothing to push yet
+
+    set_role_note(tmp_path, shas[1], ROLE_KEY_CREATIVE_TAKE)
+    assert push_role_notes(tmp_path) is True
+
+    clone_path = tmp_path.parent / f"{tmp_path.name}-clone"
+    Repo.clone_from(str(remote), clone_path)
+    assert read_role_notes(clone_path) == {}
+    configure_notes_fetch(clone_path)
+    configure_notes_fetch(clone_path)   # idempotent
+    subprocess.run(["git", "fetch", "origin"], cwd=clone_path, check=True, capture_output=True)
+
+    assert read_role_notes(clone_path) == {shas[1]: ROLE_KEY_CREATIVE_TAKE}
@@ -0,0 +1,88 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import gzip
+from pathlib import Path
+
+from als_analyzer import AlsAnalyzer
+from sample_index import SampleIndex, resolve_sample_path
+from ui_strings import SAMPLES_MISSING, SAMPLES_OK
+
+
+def live_set(*samples):
+    refs = "".join(
+        f'<SampleRef><FileRef><RelativePath Value="{s}"/></FileRef></SampleRef>' for s in samples
+    )
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?><Ableton><LiveSet><Tracks>'
+        f'<AudioTrack Id="1"><DeviceChain>{refs}</DeviceChain></AudioTrack>'
+        '</Tracks></LiveSet></Ableton>'
+    )
+    return gzip.compress(xml.encode(), mtime=0)
+
+
+def make_takes(repo):
+    """Take 0 misses snare.wav, take 1 adds it, take 2 deletes kick.wav but still uses it."""
+    tmp_path = Path(repo.working_tree_dir)
+    samples = tmp_path / "Samples"
+    samples.mkdir()
+    (tmp_path / "song.als").write_bytes(
+        live_set("Samples/kick.wav", "Samples/snare.wav", "../../Library/Core/hat.wav")
+    )
+    (samples / "kick.wav").write_bytes(b"kick")
+    repo.index.add(["song.als", "Samples/kick.wav"])
+    shas = [repo.index.commit("Beat").hexsha]
+
+    (samples / "snare.wav").write_bytes(b"snare")
+    repo.index.add(["Samples/snare.wav"])
+    shas.append(repo.index.commit("Add snare").hexsha)
+
+    repo.index.remove(["Samples/kick.wav"], working_tree=True)
+    shas.append(repo.index.commit("Tidy samples").hexsha)
+    return repo, shas
+
+
+def test_resolve_sample_path():
+    assert resolve_sample_path("Samples/Recorded/../kick.wav", "Song") == "Samples/kick.wav"
+    assert resolve_sample_path("/Users/me/Music/Song/Samples/kick.wav", "Song") == "Samples/kick.wav"
+    assert resolve_sample_path("C:\\Users\\me\\Song\\Samples\\kick.wav", "Song") == "Samples/kick.wav"
+    assert resolve_sample_path("/Users/me/Library/hat.wav", "Song") is None
+    assert resolve_sample_path("../Other Song/Samples/pad.wav", "Song") is None
+
+
+def test_index_reports_missing_samples_per_take(tmp_path, git_repo):
+    repo, shas = make_takes(git_repo)
+    blobs = {sha: (repo.commit(sha).tree / "song.als").hexsha for sha in shas}
+
+    index = SampleIndex(tmp_path, AlsAnalyzer(tmp_path))
+    assert index.update(blobs) == 3
+    assert index.update(blobs) == 0   # takes never change — indexed once
+
+    status = index.status(shas)
+    assert status[shas[0]]["missing"] == ["Samples/snare.wav"]
+    assert status[shas[0]]["external"] == ["../../Library/Core/hat.wav"]
+    assert status[shas[1]]["missing"] == []
+    assert status[shas[2]]["missing"] == ["Samples/kick.wav"]
+    assert [index.is_self_contained(sha) for sha in shas] == [False, True, False]
+
+    versions = index.versions("Samples/kick.wav")
+    assert sorted(versions[None]) == [shas[2]]
+    assert sorted(next(v for k, v in versions.items() if k)) == sorted(shas[:2])
+    index.close()
+    assert not repo.is_dirty(untracked_files=True)
+
+
+def test_history_table_flags_broken_takes(tmp_path, qtbot, git_repo):
+    from daw_git_gui import DAWGitApp
+
+    _, shas = make_takes(git_repo)
+    app = DAWGitApp(project_path=str(tmp_path), build_ui=True)
+    qtbot.addWidget(app)
+    app.load_commit_history()
+
+    table = app.snapshot_page.commit_table
+    cells = {table.item(r, 2).toolTip(): table.item(r, 12) for r in range(table.rowCount())}
+    assert cells[shas[0]].text() == SAMPLES_MISSING.format(count=1)
+    assert "Samples/snare.wav" in cells[shas[0]].toolTip()
+    assert cells[shas[1]].text() == SAMPLES_OK.format(count=3)
+    assert app.snapshot_is_self_contained(shas[2]) is False
@@ -0,0 +1,200 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import json
+
+from snapshot_export import export_incremental, export_manifest_path, hash_file
+
+
+def make_project(tmp_path):
+    project = tmp_path / "MyTrack"
+    (project / "Samples").mkdir(parents=True)
+    (project / ".git").mkdir()
+    (project / ".git" / "HEAD").write_text("ref: refs/heads/main")
+    (project / "session.als").write_text("take one")
+    (project / "Samples" / "kick.wav").write_bytes(b"\x00\x01" * 4096)
+    return project
+
+
+def test_first_export_copies_everything_and_skips_git(tmp_path):
+    project = make_project(tmp_path)
+    target = tmp_path / "BackupDrive"
+    target.mkdir()
+
+    result = export_incremental(project, target, timestamp="20250101-000000")
+
+    dest = result["path"]
+    assert dest == target / "MyTrack_snapshot_20250101-000000"
+    assert (dest / "session.als").read_text() == "take one"
+    assert (dest / "Samples" / "kick.wav").exists()
+    assert not (dest / ".git").exists()
+    assert result["copied"] == 2
+    assert result["linked"] == 0
+    assert not result["incremental"]
+
+
+def test_second_export_links_unchanged_and_copies_delta(tmp_path):
+    project = make_project(tmp_path)
+    target = tmp_path / "BackupDrive"
+    target.mkdir()
+
+    first = export_incremental(project, target, timestamp="20250101-000000")
+    (project / "session.als").write_text("take two")
+    second = export_incremental(project, target, timestamp="20250102-000000")
+
+    assert second["incremental"]
+    assert second["copied"] == 1
+    assert second["linked"] == 1
+
+    old_kick = first["path"] / "Samples" / "kick.wav"
+    new_kick = second["path"] / "Samples" / "kick.wav"
+    assert os.stat(old_kick).st_ino == os.stat(new_kick).st_ino
+    assert (second["path"] / "session.als").read_text() == "take two"
+    assert (first["path"] / "session.als").read_text() == "take one"
+
+
+def test_manifest_records_each_generation_with_hashes(tmp_path):
+    project = make_project(tmp_path)
+    target = tmp_path / "BackupDrive"
+    target.mkdir()
+
+    export_incremental(project, target, timestamp="20250101-000000")
+    export_incremental(project, target, timestamp="20250102-000000")
+
+    manifest = json.loads(export_manifest_path(target, "MyTrack").read_text())
+    assert [g["name"] for g in manifest["generations"]] == [
+        "MyTrack_snapshot_20250101-000000",
+        "MyTrack_snapshot_20250102-000000",
+    ]
+    files = manifest["generations"][-1]["files"]
+    assert files["session.als"]["sha256"] == hash_file(project / "session.als")
+
+
+def test_deleted_previous_generation_falls_back_to_full_copy(tmp_path):
+    import shutil
+
+    project = make_project(tmp_path)
+    target = tmp_path / "BackupDrive"
+    target.mkdir()
+
+    first = export_incremental(project, target, timestamp="20250101-000000")
+    shutil.rmtree(first["path"])
+    second = export_incremental(project, target, timestamp="20250102-000000")
+
+    assert not second["incremental"]
+    assert second["copied"] == 2
+
+
+def test_same_second_exports_get_unique_folders_and_failures_leave_nothing(tmp_path, monkeypatch):
+    import shutil
+    import snapshot_export
+
+    project = make_project(tmp_path)
+    target = tmp_path / "BackupDrive"
+    target.mkdir()
+
+    first = export_incremental(project, target, timestamp="20250101-000000")
+    second = export_incremental(project, target, timestamp="20250101-000000")
+    assert second["path"] == target / "MyTrack_snapshot_20250101-000000-2"
+
+    shutil.rmtree(first["path"])
+    monkeypatch.setattr(snapshot_export.shutil, "copy2", lambda *a, **k: (_ for _ in ()).throw(OSError("drive full")))
+    (project / "session.als").write_text("take three")
+    try:
+        export_incremental(project, target, timestamp="20250102-000000")
+    except OSError:
+        pass
+    assert sorted(p.name for p in target.iterdir() if not p.name.endswith(".json")) == [second["path"].name]
+
+    monkeypatch.undo()
+    export_incremental(project, target, timestamp="20250103-000000")
+    manifest = json.loads(export_manifest_path(target, "MyTrack").read_text())
+    assert [g["name"] for g in manifest["generations"]] == [second["path"].name, "MyTrack_snapshot_20250103-000000"]
+
+
+# --- Archive export straight from Git objects ---
+
+import hashlib
+import tarfile
+import zipfile
+from pathlib import Path
+
+from snapshot_export import export_commit_archive, export_commit_archives
+from git_objects import lfs_object_path
+
+
+def make_repo_with_lfs(repo, commit):
+    project = Path(repo.working_tree_dir)
+    stem = os.urandom(200_000)
+    oid = hashlib.sha256(stem).hexdigest()
+    store_path = lfs_object_path(project / ".git", oid)
+    store_path.parent.mkdir(parents=True)
+    store_path.write_bytes(stem)
+
+    pointer = f"version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize {len(stem)}\n"
+    first = repo.commit(commit({"bounce.wav": pointer, "session.als": "first take",
+                                "big.bin": os.urandom(300_000)}, "first take"))
+    commit({"session.als": "second take"}, "second take")
+    repo.create_tag("mix-v1", ref=first.hexsha)
+    return project, repo, first, stem
+
+
+def test_archive_exports_old_commit_without_touching_worktree(tmp_path, git_repo, commit_files):
+    project, repo, first, stem = make_repo_with_lfs(git_repo, commit_files)
+    out = tmp_path / "first.tar.gz"
+
+    result = export_commit_archive(project, first.hexsha, out, fmt="tar", compression="gz")
+
+    assert result["status"] == "ok"
+    assert result["missing_lfs"] == []
+    with tarfile.open(out) as tar:
+        prefix = f"{project.name}_{first.hexsha[:7]}/"
+        assert tar.extractfile(prefix + "session.als").read() == b"first take"
+        assert tar.extractfile(prefix + "bounce.wav").read() == stem
+        assert len(tar.extractfile(prefix + "big.bin").read()) == 300_000
+
+    assert (project / "session.als").read_text() == "second take"
+    assert repo.head.commit.message.strip() == "second take"
+
+
+def test_zip_archive_resolves_tags_and_missing_lfs_keeps_pointer(tmp_path, git_repo, commit_files):
+    project, repo, first, stem = make_repo_with_lfs(git_repo, commit_files)
+    for f in (project / ".git" / "lfs").rglob("*"):
+        if f.is_file():
+            f.unlink()
+    out = tmp_path / "mix.zip"
+
+    result = export_commit_archive(project, "mix-v1", out, fmt="zip", compression="none")
+
+    assert result["sha"] == first.hexsha
+    assert result["missing_lfs"] == ["bounce.wav"]
+    with zipfile.ZipFile(out) as zf:
+        data = zf.read(f"{project.name}_{first.hexsha[:7]}/bounce.wav")
+        assert data.startswith(b"version https://git-lfs")
+
+
+def test_parallel_archive_export(tmp_path, git_repo, commit_files):
+    project, repo, first, stem = make_repo_with_lfs(git_repo, commit_files)
+    out_dir = tmp_path / "archives"
+
+    results = export_commit_archives(project, ["mix-v1", "HEAD"], out_dir, max_workers=2, fmt="tar")
+
+    assert all(r["status"] == "ok" for r in results.values())
+    assert len(list(out_dir.glob("*.tar.gz"))) == 2
+
+
+def test_failed_archive_export_removes_partial_file(tmp_path, monkeypatch, git_repo, commit_files):
+    import snapshot_export
+
+    project, repo, first, stem = make_repo_with_lfs(git_repo, commit_files)
+    out = tmp_path / "first.zip"
+
+    def boom(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshot_export, "_add_entry", boom)
+    try:
+        export_commit_archive(project, first.hexsha, out, fmt="zip")
+    except OSError:
+        pass
+    assert list(tmp_path.glob("*first.zip*")) == []
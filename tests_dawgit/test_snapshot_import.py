@@ -0,0 +1,149 @@
+import os
+os.environ["DAWGIT_TEST_MODE"] = "1"
+
+import time
+import shutil
+import gzip
+import hashlib
+from pathlib import Path
+from git import Repo
+
+from als_filter import enable_als_filter
+from snapshot_import import import_changed_files
+
+
+def make_tracked_project(tmp_path):
+    project = tmp_path / "MyTrack"
+    project.mkdir()
+    (project / "session.als").write_text("take one")
+    (project / "kick.wav").write_bytes(b"kick" * 1000)
+    (project / "snare.wav").write_bytes(b"snare" * 1000)
+    repo = Repo.init(project)
+    repo.index.add(["session.als", "kick.wav", "snare.wav"])
+    repo.index.commit("Initial snapshot")
+    return project, repo
+
+
+def test_identical_folder_copies_nothing(tmp_path):
+    project, repo = make_tracked_project(tmp_path)
+    collaborator = tmp_path / "Collab"
+    shutil.copytree(project, collaborator, ignore=shutil.ignore_patterns(".git"))
+
+    result = import_changed_files(project, collaborator)
+
+    assert result["added"] == 0
+    assert result["changed"] == 0
+    assert result["unchanged"] == 3
+
+
+def test_touched_but_identical_files_are_detected_by_hash(tmp_path):
+    project, repo = make_tracked_project(tmp_path)
+    collaborator = tmp_path / "Collab"
+    collaborator.mkdir()
+    time.sleep(0.01)
+    (collaborator / "kick.wav").write_bytes(b"kick" * 1000)  # same bytes, new mtime
+    before = (project / "kick.wav").stat().st_mtime_ns
+
+    result = import_changed_files(project, collaborator)
+
+    assert result["unchanged"] == 1
+    assert (project / "kick.wav").stat().st_mtime_ns == before
+
+
+def test_only_new_and_changed_files_are_copied(tmp_path):
+    project, repo = make_tracked_project(tmp_path)
+    collaborator = tmp_path / "Collab"
+    shutil.copytree(project, collaborator, ignore=shutil.ignore_patterns(".git"))
+    time.sleep(0.01)
+    (collaborator / "session.als").write_text("take TWO")  # same size, new content
+    (collaborator / "Samples").mkdir()
+    (collaborator / "Samples" / "hat.wav").write_bytes(b"hat")
+
+    result = import_changed_files(project, collaborator)
+
+    assert result["added"] == 1
+    assert result["changed"] == 1
+    assert result["unchanged"] == 2
+    assert (project / "session.als").read_text() == "take TWO"
+    assert (project / "Samples" / "hat.wav").read_bytes() == b"hat"
+
+
+def test_lfs_tracked_file_compared_against_pointer_oid(tmp_path):
+    project = tmp_path / "LfsTrack"
+    project.mkdir()
+    stem = b"stem" * 5000
+    oid = hashlib.sha256(stem).hexdigest()
+    (project / ".gitattributes").write_text("*.wav filter=lfs diff=lfs merge=lfs -text\n")
+    (project / "bounce.wav").write_bytes(stem)
+
+    pointer_file = tmp_path / "pointer"
+    pointer_file.write_text(f"version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize {len(stem)}\n")
+
+    clean_script = tmp_path / "fake-lfs-clean"
+    clean_script.write_text(f"#!/bin/sh\ncat >/dev/null\ncat {pointer_file}\n")
+    clean_script.chmod(0o755)
+
+    repo = Repo.init(project)
+    # Stand-in for the git-lfs clean filter: store the pointer instead of the audio
+    with repo.config_writer() as cw:
+        cw.set_value("filter \"lfs\"", "clean", str(clean_script))
+    repo.git.add("bounce.wav")
+    assert repo.git.cat_file("-p", ":bounce.wav").startswith("version https://git-lfs")
+    time.sleep(0.01)
+    os.utime(Path(repo.git_dir) / "index")
+
+    collaborator = tmp_path / "Collab"
+    collaborator.mkdir()
+    (collaborator / "bounce.wav").write_bytes(stem)
+
+    result = import_changed_files(project, collaborator)
+
+    assert result["unchanged"] == 1
+    assert result["changed"] == 0
+
+
+def test_unchanged_als_behind_gunzip_filter_is_not_recopied(tmp_path):
+    project = tmp_path / "FilteredTrack"
+    project.mkdir()
+    live_set = gzip.compress(b"<Ableton>" + b"<Track/>" * 500 + b"</Ableton>", mtime=0)
+    (project / "song.als").write_bytes(live_set)
+    repo = Repo.init(project)
+    enable_als_filter(project)
+    repo.git.add("song.als")
+    # Stored as plain XML, so the index SHA differs from a raw hash of the gzipped file
+    assert repo.git.cat_file("-p", ":song.als").startswith("<Ableton>")
+    time.sleep(0.01)
+    os.utime(Path(repo.git_dir) / "index")
+
+    collaborator = tmp_path / "Collab"
+    collaborator.mkdir()
+    (collaborator / "song.als").write_bytes(live_set)
+    before = (project / "song.als").stat().st_mtime_ns
+
+    result = import_changed_files(project, collaborator)
+
+    assert result["unchanged"] == 1
+    assert result["changed"] == 0
+    assert (project / "song.als").stat().st_mtime_ns == before
+
+
+def test_unchanged_file_with_line_ending_conversion_is_not_recopied(tmp_path):
+    project = tmp_path / "NotesTrack"
+    project.mkdir()
+    notes = b"verse\r\nchorus\r\n" * 50
+    (project / "notes.txt").write_bytes(notes)
+    repo = Repo.init(project)
+    with repo.config_writer() as cw:
+        cw.set_value("core", "autocrlf", "input")
+    repo.git.add("notes.txt")
+    time.sleep(0.01)
+    os.utime(Path(repo.git_dir) / "index")
+
+    collaborator = tmp_path / "Collab"
+    collaborator.mkdir()
+    (collaborator / "notes.txt").write_bytes(notes)
+
+    result = import_changed_files(project, collaborator)
+
+    assert result["unchanged"] == 1
+    assert result["changed"] == 0
@@ -11,6 +11,7 @@ TAB_BRANCH_MANAGER = "🪄 Version Lines"
 TAB_SNAPSHOT_BROWSER = "🎧 Takes Browser"
 TAB_COMMIT_PAGE = "💾 Save Take"
 TAB_PROJECT_SETUP = "🎛️ Project Setup"
+TAB_REPO_ANALYTICS = "📊 Project Size"
 # NO_SESSION_LOADED = "🎚️ No session loaded"
 DETACHED_SNAPSHOT_LABEL = "ℹ️ Detached snapshot — not on an active Version Line"
 
@@ -76,6 +77,52 @@ COMMIT_REQUIRED_MSG = "❌ A note is required to save this take."
 
 # === Auto Save ===
 AUTO_SAVE_TITLE = "Auto Save Complete"
+AUTO_SNAPSHOT_ENABLED_MSG = "✅ Auto-save enabled — a take is saved each time your DAW finishes saving"
+AUTO_SNAPSHOT_DISABLED_MSG = "⏸️ Auto-save disabled"
+AUTO_SNAPSHOT_SAVED_MSG = "🎹 Auto-saved take {sha}"
+AUTO_SNAPSHOT_FAILED_MSG = "⚠️ Auto-save couldn’t save a take: {error}"
+
+# === Background Maintenance ===
+MAINTENANCE_DONE_MSG = "🧹 Tidied the repo while you were away — history lookups {before:.0f} ms → {after:.0f} ms"
+
+# === Project Size ===
+ANALYTICS_TITLE = "📊 Where the project's space goes"
+ANALYTICS_SUMMARY = "{size} of history in {objects} objects ({disk} on disk) · {lfs} in {lfs_count} LFS files"
+ANALYTICS_UPDATING = "📊 Counting new takes…"
+ANALYTICS_REFRESH_BTN = "🔄 Refresh"
+ANALYTICS_TAKES_HEADING = "Takes that added the most"
+ANALYTICS_FILES_HEADING = "Largest files in Git"
+ANALYTICS_LFS_HEADING = "Largest LFS files"
+ANALYTICS_LINES_HEADING = "Growth per version line"
+ANALYTICS_TAKE_COLUMNS = ["Take", "Date", "Added", "Largest new file"]
+ANALYTICS_FILE_COLUMNS = ["File", "Size", "On disk", "Take"]
+ANALYTICS_LFS_COLUMNS = ["File", "Size", "Stored here", "Take"]
+ANALYTICS_LINE_COLUMNS = ["Version line", "Takes", "History size", "Added on this line", "Last 30 days"]
+
+# === Stored Audio (LFS) ===
+BTN_FREE_LFS_SPACE = "💾 Free Up Space"
+TOOLTIP_FREE_LFS_SPACE = (
+    "Remove stored audio and sets only older takes use.\n"
+    "The open take, every version line, tagged, role and stashed takes and the newest takes are always kept.\n"
+    "Only audio the remote already has is removed."
+)
+LFS_PRUNE_TITLE = "💾 Free Up Space"
+LFS_PRUNE_CONFIRM_MSG = (
+    "Stored audio uses {total} (budget {budget}).\n\n"
+    "{count} files only used by older takes are already on '{remote}' and can be removed here, freeing {reclaim}.\n"
+    "Those takes need them fetched from '{remote}' before they open again.\n\n"
+    "Remove them?"
+)
+LFS_PRUNE_NOTHING_MSG = "💾 Stored audio uses {total} of the {budget} budget — nothing to remove."
+LFS_PRUNE_CHECKING_MSG = "💾 Checking which stored audio can be freed…"
+LFS_PRUNE_FAILED_MSG = "Couldn't work out what can be freed: {error}"
+LFS_PRUNE_DONE_MSG = "🧹 Freed {reclaim} — stored audio now uses {after}."
+LFS_PRUNE_NO_REMOTE_MSG = (
+    "💾 Stored audio uses {total} (budget {budget}).\n\n"
+    "Nothing is removed until the project has a remote holding a copy — add one and push first."
+)
+LFS_PRUNE_UNPUSHED_MSG = "\n\nℹ️ {size} only exists on this computer — push to '{remote}' so it can be freed."
+LFS_PRUNE_OVER_BUDGET_MSG = "\n\n⚠️ The takes being kept need {retained} on their own — more than the budget."
 
 # === Return to Latest ===
 RETURN_TO_LATEST_BTN = "🚀 Return to Latest"
@@ -184,6 +231,8 @@ CHECKOUT_FAILED_TITLE = "Load Failed"
 CHECKOUT_FAILED_MSG = "Could not load this Take."
 COULDNT_SWITCH_TITLE = "Couldn’t Switch"
 COULDNT_SWITCH_MSG = "An error occurred while switching Version Lines."
+CLEANUP_FAILED_TITLE = "Cleanup Incomplete"
+CLEANUP_FAILED_MSG = "⚠️ Couldn’t remove old version lines and temporary tags:\n\n{error}"
 UNEXPECTED_ERROR_TITLE = "Unexpected Error"
 UNEXPECTED_ERROR_MSG = "An unknown error occurred."
 UNEXPECTED_ISSUE_TITLE = "Unexpected Issue"
@@ -197,6 +246,16 @@ NO_BACKUP_FOUND_MSG = "There are no backup folders for this project."
 BACKUP_RESTORED_TITLE = "Backup Restored"
 BACKUP_RESTORED_MSG = "✅ Restored files from: {path}"
 PROJECT_RESTORED_MSG = "✅ Session restored.\n\n🎚️ Take ID: {sha}"
+EXPORT_SNAPSHOT_DONE_MSG = (
+    "📦 A snapshot of your project has been saved to:\n\n{path}\n\n"
+    "💾 {copied} files copied • 🔗 {linked} unchanged files linked from your last export"
+)
+EXPORT_ARCHIVE_ACTION = "📦 Export This Snapshot…"
+EXPORT_ARCHIVE_DONE_MSG = "📦 Take {sha} has been exported to:\n\n{path}"
+IMPORT_SNAPSHOT_DONE_MSG = (
+    "📂 Your snapshot has been added to:\n\n{path}\n\n"
+    "➕ {added} new • ✏️ {changed} changed • ✅ {unchanged} already up to date"
+)
 
 # === Repo Setup / Errors ===
 NO_REPO_TITLE = "🎚️ Project Not Set Up"
@@ -321,6 +380,55 @@ SESSION_LINES_LOADED_MSG = "✅ {count} Version Lines loaded."
 TABLE_HEADER_TAKE_ID = "Take ID"
 TABLE_HEADER_SESSION_LINE = "Version Line"
 TABLE_HEADER_TAKE_NOTES = "Take Notes"  # optional
+TABLE_HEADER_CHANGED = "Changed"
+TABLE_HEADER_TEMPO = "BPM"
+TABLE_HEADER_TRACKS = "Tracks"
+TABLE_HEADER_SAMPLES = "Samples"
+TABLE_HEADER_AUDIO = "Audio"
+TABLE_HEADER_SIZE = "Size"
+CHANGED_FILES_MORE = "{name} +{more}"
+CHANGED_BUNDLE_FILES = "{path} ({count} files)"
+SAMPLES_OK = "✅ {count}"
+SAMPLES_MISSING = "⚠️ {count} missing"
+SAMPLES_MISSING_TOOLTIP = "Used by the set but not saved in this take:\n{paths}"
+SAMPLES_EXTERNAL_TOOLTIP = "Outside the project folder (not versioned):\n{paths}"
+AUDIO_TOTALS_MSG = "{size}, {count} samples, {new} new"
+AUDIO_TOTALS_TOOLTIP = "{count} audio files, {size}\n{new} new since the previous take\nTotal length: {duration}\nSample rates: {rates}\nBit depths: {bits}"
+AUDIO_TOTALS_PENDING_TOOLTIP = "{count} audio files, {size}\n{new} new since the previous take\nReading audio details…"
+SIZE_ADDED_MSG = "+{size}"
+SIZE_ADDED_TOOLTIP = (
+    "This take added {size} to the project history\n"
+    "{objects} new objects · {disk} on disk · {lfs} in LFS\n"
+    "Largest new file: {largest}"
+)
+
+# === History Search ===
+SEARCH_HISTORY_PLACEHOLDER = "🔎 Find a take — e.g. bassline role:main_mix branch:main after:2025-01-01"
+SEARCH_HISTORY_TOOLTIP = (
+    "Search take notes, roles, tags and changed files.\n"
+    "Filters: role:  branch:  tag:  file:  after:YYYY-MM-DD  before:YYYY-MM-DD\n"
+    "path:KICK.aif or path:Samples/ lists every take that changed that file or folder"
+)
+SEARCH_RESULTS_MSG = "🔎 {count} matching takes"
+SEARCH_NO_RESULTS_MSG = "🔎 No takes match “{query}”"
+
+# === Take Comparison ===
+TOOLTIP_COMPARE_TAKES = "Ctrl/Cmd-click a second take to see what changed in the Ableton set"
+ALS_DIFF_TITLE = "🔀 {older} → {newer}"
+ALS_DIFF_NO_CHANGES = "No changes to tracks, devices, clips, samples or tempo."
+ALS_DIFF_UNAVAILABLE = "No Ableton set to compare in one of these takes."
+
+# === Waveform Preview ===
+TOOLTIP_WAVEFORM_FILE = "Audio in this take — pick a bounce or stem to preview its waveform"
+WAVEFORM_LOADING = "〰️ Reading waveform…"
+WAVEFORM_UNAVAILABLE = "〰️ No waveform for this file ({error})"
+WAVEFORM_TOOLTIP = "{path}\n{duration} · {rate:g} kHz · {channels} ch"
+TOOLTIP_AUDIO_DIFF_FILE = "Audio that changed between the two takes — pick a mixdown or stem to compare"
+AUDIO_DIFF_LOADING = "🎚️ Comparing audio…"
+AUDIO_DIFF_UNAVAILABLE = "🎚️ Can't compare this audio ({error})"
+AUDIO_DIFF_SUMMARY = "🎚️ {path}: {count} changed regions ({seconds:.1f}s), level {delta:+.1f} dB"
+AUDIO_DIFF_NO_CHANGES = "🎚️ {path}: sounds the same (level {delta:+.1f} dB)"
+AUDIO_DIFF_OFFSET = "Newer take shifted by {offset:+.3f}s — aligned before comparing"
 
 
 # === TEST STRINGS ===